@@ -68,8 +68,6 @@ from flask import Flask, render_template, request, redirect, url_for, jsonify, s
 from match_archiver import MatchArchiver, find_original_json_file, reverse_player_aggregates
 from engine import motm_service
 from engine.match import Match
-from engine.toss import home_bats_first
-from engine.cricket_math import balls_to_overs_str
 from flask_login import (
     LoginManager,
     UserMixin,
@@ -104,6 +102,7 @@ from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
 from engine.stats_aggregator import StatsAggregator 
 from engine.stats_service import StatsService
+from engine.scorecard_aggregates import aggregate_player_totals
 import glob
 import pandas as pd 
 from tabulate import tabulate
@@ -158,6 +157,7 @@ from database.models import (
     AuthEventLog,
 )
 from engine.tournament_engine import TournamentEngine
+from engine.match_completion import complete_tournament_match
 from sqlalchemy import func, text  # For aggregate functions
 
 # Backward-compatibility export for tests/importers that still expect `User` from app.
@@ -1548,6 +1548,20 @@ def create_app():
         except Exception:
             log_exception(source="backend")
 
+        try:
+            from services import stats_exports
+            stats_exports.start_worker(app)
+            app.logger.info("[StatsExports] PDF export worker started")
+        except Exception:
+            log_exception(source="backend")
+
+        try:
+            from services import tournament_autosim
+            tournament_autosim.start_worker(app)
+            app.logger.info("[TournamentAutosim] Simulation worker started")
+        except Exception:
+            log_exception(source="backend")
+
         # Per-session log capture handler for support diagnostics.
         try:
             from middleware import session_log_capture
@@ -1569,6 +1583,18 @@ def create_app():
             github_issue_queue.start_worker(app)  # also stores app ref for sync dispatch
         except Exception:
             log_exception(source="backend")
+        try:
+            from services import stats_exports
+            stats_exports.set_synchronous_mode(True)
+            stats_exports.start_worker(app)
+        except Exception:
+            log_exception(source="backend")
+        try:
+            from services import tournament_autosim
+            tournament_autosim.set_synchronous_mode(True)
+            tournament_autosim.start_worker(app)
+        except Exception:
+            log_exception(source="backend")
         # Install session log handler in tests too (no sweeper) so widget /
         # log-capture tests can observe behavior end-to-end.
         try:
@@ -1758,16 +1784,10 @@ def create_app():
         non-fatal scorecard save above failed) just means no MOTM this time,
         not a crash."""
         try:
-            result = motm_service.select_match_motm(
-                db_match.id, db_match.winner_team_id, db_match.match_status
-            )
+            result = motm_service.award_motm(db_match, outcome)
             if not result:
                 return
-            db_match.motm_player_id = result["player_id"]
             db.session.commit()
-            outcome["commentary"] = (
-                outcome.get("commentary", "") + motm_service.build_motm_commentary(result, db_match)
-            )
             logger.info(f"[MOTM] {result['player_name']} awarded Man of the Match for {db_match.id}")
         except Exception as motm_err:
             log_exception(motm_err)
@@ -1780,275 +1800,27 @@ def create_app():
     # --- Tournament Match Completion Handler ---
     def _handle_tournament_match_completion(match, match_id, outcome, logger):
         """
-        Handle tournament match completion with proper transaction management.
-        
-        This function follows SOLID principles:
-        - Single Responsibility: Handles only tournament match completion
-        - Open/Closed: Extensible through tournament_engine methods
-        - Dependency Inversion: Depends on abstractions (logger, db.session)
-        
-        Args:
-            match: Match instance with completed game data
-            match_id: Unique identifier for the match
-            outcome: Match outcome dictionary from engine
-            logger: Logger instance for tracking operations
-            
-        Raises:
-            ValueError: If required tournament data is missing
-            Exception: For any database or processing errors
+        Persist a completed tournament match: archive, fixture link and
+        standings, MOTM and dashboard in one transaction, via the staged
+        pipeline in engine/match_completion.py (which logs per-stage
+        timings and sets current_state to "completed" only after its commit).
+
+        Failures are logged and rolled back, never raised, so the match
+        stays in progress and the next request can retry it.
         """
         try:
-            # Step 1: Validate tournament context
-            tournament_id = match.data.get("tournament_id")
-            fixture_id = match.data.get("fixture_id")
-            
-            if not tournament_id:
-                logger.error(f"[Tournament] Match {match_id} missing tournament_id")
-                return
-                
-            if not fixture_id:
-                logger.error(f"[Tournament] Match {match_id} missing fixture_id")
-                return
-            
-            tournament_id = int(tournament_id)
-            try:
-                fixture_id = int(fixture_id)
-            except Exception:
-                log_exception(source="backend")
-                raise ValueError(f"Invalid fixture_id '{fixture_id}' for match {match_id}")
-            logger.info(f"[Tournament] Starting completion handler for match {match_id} in tournament {tournament_id}")
-            
-            # Step 2: Begin explicit transaction (not nested)
-            # Using manual transaction control for better error handling
-            try:
-                # Step 2a: Handle resimulation - reverse previous standings if match exists
-                existing_match = db.session.get(DBMatch, match_id)
-                if existing_match:
-                    logger.info(f"[Tournament] Existing match {match_id} found. Reversing previous standings.")
-                    tournament_engine.reverse_standings(existing_match, commit=False)
-                    # Reverse player career stats BEFORE deleting scorecards
-                    old_scorecards = MatchScorecard.query.filter_by(match_id=match_id).all()
-                    if old_scorecards:
-                        reverse_player_aggregates(old_scorecards, logger=logger)
-                    # Clean up dependent rows to avoid FK nulling issues (sqlite NOT NULL)
-                    try:
-                        db.session.query(MatchPartnership).filter_by(match_id=match_id).delete(synchronize_session=False)
-                        db.session.query(MatchScorecard).filter_by(match_id=match_id).delete(synchronize_session=False)
-                    except Exception as cleanup_err:
-                        log_exception(cleanup_err)
-                        logger.error(f"[Tournament] Failed to clean dependent rows for match {match_id}: {cleanup_err}", exc_info=True)
-                        raise
-                    db.session.delete(existing_match)
-                    db.session.flush()
-                    logger.info(f"[Tournament] Previous match data cleared for {match_id}")
-                
-                # Step 3: Validate fixture exists and is accessible
-                fixture = db.session.get(TournamentFixture, fixture_id)
-                if not fixture:
-                    raise ValueError(f"Tournament fixture {fixture_id} not found; cannot proceed safely.")
-                
-                if not fixture.home_team_id or not fixture.away_team_id:
-                    raise ValueError(f"Fixture {fixture_id} missing team assignments")
-                
-                logger.info(f"[Tournament] Validated fixture {fixture_id}: {fixture.home_team.name} vs {fixture.away_team.name}")
-                
-                # Step 4: Prepare match result data
-                final_result = outcome.get("result", "Match Ended")
-                match.data["result_description"] = final_result
-                # NOTE: current_state is set to "completed" only after the outer
-                # commit succeeds — see Step 12 below (Fix 2).
-                
-                # Step 5: Create database match record
-                db_match = DBMatch(
-                    id=match_id,
-                    user_id=current_user.id,
-                    tournament_id=tournament_id,
-                    home_team_id=fixture.home_team_id,
-                    away_team_id=fixture.away_team_id,
-                    match_json_path="autosaved",
-                    result_description=final_result,
-                    date=datetime.now(),
-                    overs_per_side=match.data.get('overs', 20)
-                )
-                
-                logger.info(f"[Tournament] Created DBMatch record for {match_id}")
-                
-                # Step 6: Calculate and assign innings statistics
-                team_home_code = match.data["team_home"].split("_")[0]
-                first_bat_is_home = home_bats_first(
-                    match.toss_winner, match.toss_decision, team_home_code
-                )
-                
-                ops = int(match.data.get('overs', 20) or 20)
-
-                def calculate_innings_stats(batting_stats, bowling_stats, innings_label="?"):
-                    """Calculate runs, wickets, and overs from stats dictionaries."""
-                    runs = sum(p.get("runs", 0) for p in batting_stats.values())
-                    wickets = sum(1 for p in batting_stats.values() if p.get("wicket_type"))
-                    balls_total = sum(b.get("balls_bowled", 0) for b in bowling_stats.values())
-                    if balls_total > ops * 6:
-                        try:
-                            from utils.exception_tracker import log_data_anomaly
-                            log_data_anomaly(
-                                "OversExceedQuota",
-                                f"innings {innings_label} reported {balls_total} legal balls "
-                                f"in a {ops}-over match (capped to {ops * 6})",
-                                payload={
-                                    "match_id": match_id,
-                                    "tournament_id": tournament_id,
-                                    "innings": innings_label,
-                                    "raw_balls": balls_total,
-                                    "overs_per_side": ops,
-                                    "writer": "app.calculate_innings_stats",
-                                },
-                            )
-                        except Exception:
-                            pass
-                        balls_total = ops * 6
-                    overs = balls_to_overs_str(balls_total)
-                    return runs, wickets, overs
-                
-                # First innings stats
-                s1_runs, s1_wickets, s1_overs = calculate_innings_stats(
-                    match.first_innings_batting_stats,
-                    match.first_innings_bowling_stats,
-                    innings_label="1",
-                )
-
-                # Second innings stats
-                s2_runs, s2_wickets, s2_overs = calculate_innings_stats(
-                    match.batsman_stats,
-                    match.bowler_stats,
-                    innings_label="2",
-                )
-                
-                # Assign scores based on batting order
-                if first_bat_is_home:
-                    db_match.home_team_score = s1_runs
-                    db_match.home_team_wickets = s1_wickets
-                    db_match.home_team_overs = s1_overs
-                    db_match.away_team_score = s2_runs
-                    db_match.away_team_wickets = s2_wickets
-                    db_match.away_team_overs = s2_overs
-                else:
-                    db_match.away_team_score = s1_runs
-                    db_match.away_team_wickets = s1_wickets
-                    db_match.away_team_overs = s1_overs
-                    db_match.home_team_score = s2_runs
-                    db_match.home_team_wickets = s2_wickets
-                    db_match.home_team_overs = s2_overs
-                
-                logger.info(
-                    f"[Tournament] Match scores - Home: {db_match.home_team_score}/{db_match.home_team_wickets} "
-                    f"({db_match.home_team_overs}), Away: {db_match.away_team_score}/{db_match.away_team_wickets} "
-                    f"({db_match.away_team_overs})"
-                )
-                
-                # Step 7: Resolve winner team ID — read the structured outcome the
-                # engine set directly (Match._set_outcome) instead of parsing the
-                # result prose. This also fixes a prior bug where this resolution
-                # and match_archiver.py's (Step 13, below) could independently
-                # disagree, since the archiver would silently overwrite whatever
-                # was set here — both now derive from the same match.winner_is_home.
-                winner_is_home = getattr(match, 'winner_is_home', None)
-                if winner_is_home is True:
-                    db_match.winner_team_id = fixture.home_team_id
-                    logger.info(f"[Tournament] Winner: {fixture.home_team.name} (Home)")
-                elif winner_is_home is False:
-                    db_match.winner_team_id = fixture.away_team_id
-                    logger.info(f"[Tournament] Winner: {fixture.away_team.name} (Away)")
-                else:
-                    logger.info(f"[Tournament] Match ended without clear winner (tie/no result)")
-                db_match.margin_type = getattr(match, 'margin_type', None)
-                db_match.margin_value = getattr(match, 'margin_value', None)
-                db_match.match_status = getattr(match, 'match_status', None)
-                
-                # Step 8: Add match to session
-                db.session.add(db_match)
-                db.session.flush()  # Ensure match is persisted before scorecard
-                logger.info(f"[Tournament] DBMatch added to session for {match_id}")
-                
-                # Step 9: Link the match to its fixture. The terminal status
-                # (Completed, or Scheduled if this ended with no winner on a
-                # knockout/playoff fixture — a tie/no-result a super over
-                # couldn't resolve) is decided by update_standings below,
-                # the single authoritative place for that rule since it's
-                # also called directly by the standalone orphaned-match
-                # repair script without going through this path.
-                fixture.match_id = match_id
-                fixture.winner_team_id = db_match.winner_team_id
-
-                # Step 10: Update tournament standings (critical operation)
-                logger.info(f"[Tournament] Updating standings for tournament {tournament_id}")
-                standings_updated = tournament_engine.update_standings(db_match, commit=False)
-                logger.info(f"[Tournament] Fixture {fixture_id} status is now {fixture.status}")
-
-                if standings_updated:
-                    logger.info(f"[Tournament] Standings updated successfully for tournament {tournament_id}")
-                else:
-                    logger.warning(f"[Tournament] Standings update returned False for match {match_id}")
-
-                # Step 11: Commit fixture + standings atomically (Fix 3).
-                # The archiver's _save_to_database() was deliberately moved to
-                # Step 13 so its inner commit cannot split this transaction.
-                db.session.commit()
-                logger.info(
-                    f"[Tournament] ✓ Match {match_id} fixture linked and standings committed. "
-                    f"Tournament {tournament_id}."
-                )
-
-                # Step 12: Mark match as completed ONLY after commit succeeded (Fix 2).
-                # Setting this earlier would permanently block retry if the commit failed.
-                match.data["current_state"] = "completed"
-                logger.info(f"[Tournament] Match {match_id} state set to completed.")
-
-                # Step 13: Persist detailed scorecard — non-fatal supplementary data (Fix 3).
-                # Runs after the atomic commit so a scorecard failure never rolls back
-                # the fixture link or standings.
-                scorecard_data = outcome.get("scorecard_data")
-                if scorecard_data:
-                    try:
-                        archiver = MatchArchiver(match.data, match)
-                        archiver._save_to_database()
-                        logger.info(f"[Tournament] Scorecard saved successfully for {match_id}")
-                        _assign_motm(db_match, outcome, logger)
-                    except Exception as scorecard_err:
-                        log_exception(scorecard_err)
-                        logger.error(
-                            f"[Tournament] Scorecard save failed (non-fatal): {scorecard_err}",
-                            exc_info=True,
-                        )
-
-            except ValueError as ve:
-                log_exception(ve)
-                # Validation errors - log and rollback
-                logger.error(f"[Tournament] Validation error for match {match_id}: {ve}", exc_info=True)
-                db.session.rollback()
-                raise
-                
-            except Exception as db_err:
-                log_exception(db_err)
-                # Database or processing errors - rollback and log
-                logger.error(
-                    f"[Tournament] Database error during match {match_id} completion: {db_err}",
-                    exc_info=True
-                )
-                db.session.rollback()
-                raise
-                
-        except Exception as outer_err:
-            log_exception(outer_err)
-            # Catch-all for any unexpected errors
+            logger.info(f"[Tournament] Starting completion handler for match {match_id}")
+            result = complete_tournament_match(match, match_id, outcome, tournament_engine)
+            logger.info(
+                f"[Tournament] ✓ Match {match_id} completed for tournament "
+                f"{result['db_match'].tournament_id} in {sum(result['timings'].values()):.1f}ms"
+            )
+        except Exception as completion_err:
+            log_exception(completion_err)
             logger.error(
-                f"[Tournament] Critical error in match completion handler for {match_id}: {outer_err}",
-                exc_info=True
+                f"[Tournament] Completion failed for match {match_id}; rolled back: {completion_err}",
+                exc_info=True,
             )
-            # Ensure rollback even if inner try didn't catch it
-            try:
-                db.session.rollback()
-            except Exception:  # Fix D7: Don't swallow SystemExit/KeyboardInterrupt
-                log_exception(source="backend")
-                pass
 
     def _persist_non_tournament_match_completion(match, match_id, outcome, logger):
         """
@@ -2076,21 +1848,11 @@ def create_app():
         """
         Aggregate batting/bowling/fielding stats from match_scorecards for a given tournament.
         """
-        q = (
-            db.session.query(MatchScorecard, DBMatch, DBPlayer, DBTeam)
-            .join(DBMatch, MatchScorecard.match_id == DBMatch.id)
-            .join(DBPlayer, MatchScorecard.player_id == DBPlayer.id)
-            .join(DBTeam, DBPlayer.team_id == DBTeam.id)
-            .filter(DBMatch.tournament_id == tournament_id)
-            .filter(DBTeam.user_id == user_id)
-            # Super-over career-stat rows are not real innings — exclude them
-            # from per-innings counts/averages.
-            .filter(MatchScorecard.is_super_over.isnot(True))
-        )
-
-        records = q.all()
-        app.logger.info(f"STATS DEBUG: User {user_id} Tournament {tournament_id} - Found {len(records)} records")
-        if not records:
+        # One GROUP BY in SQLite (engine/scorecard_aggregates.py). Super-over
+        # career-stat rows are not real innings and are excluded there.
+        rows = aggregate_player_totals(user_id, tournament_id=tournament_id)
+        app.logger.info(f"STATS DEBUG: User {user_id} Tournament {tournament_id} - Aggregated {len(rows)} players")
+        if not rows:
             try:
                 total = MatchScorecard.query.join(DBMatch).filter(DBMatch.tournament_id == tournament_id).count()
                 app.logger.info(f"STATS DEBUG: Total scorecards for tournament {tournament_id} (ignoring user filter): {total}")
@@ -2099,69 +1861,18 @@ def create_app():
                 app.logger.error(f"STATS DEBUG: Error checking total: {e}")
             return [], [], [], {}
 
-        agg = {}
-        match_sets = {}
-
-        for card, match, player, team in records:
-            pid = player.id
-            if pid not in agg:
-                agg[pid] = {
-                    "player": player.name,
-                    "team": team.name,
-                    "bat_runs": 0,
-                    "bat_balls": 0,
-                    "bat_fours": 0,
-                    "bat_sixes": 0,
-                    "bat_innings": 0,
-                    "bat_not_outs": 0,
-                    "bowl_balls": 0,
-                    "bowl_runs": 0,
-                    "bowl_wkts": 0,
-                    "bowl_maidens": 0,
-                    "bowl_best": (0, 9999),  # (wkts, runs)
-                    "bowl_innings": 0,
-                    "catches": 0,
-                    "run_outs": 0,
-                    "stumpings": 0,
-                }
-                match_sets[pid] = set()
-
-            match_sets[pid].add(card.match_id)
-
-            if card.record_type == "batting":
-                faced = (card.balls or 0) > 0 or (card.runs or 0) > 0 or bool(card.is_out)
-                if faced:
-                    agg[pid]["bat_innings"] += 1
-                    if not card.is_out:
-                        agg[pid]["bat_not_outs"] += 1
-                agg[pid]["bat_runs"] += card.runs or 0
-                agg[pid]["bat_balls"] += card.balls or 0
-                agg[pid]["bat_fours"] += card.fours or 0
-                agg[pid]["bat_sixes"] += card.sixes or 0
-
-            if card.record_type == "bowling":
-                balls = card.balls_bowled or 0
-                if balls > 0:
-                    agg[pid]["bowl_innings"] += 1
-                agg[pid]["bowl_balls"] += balls
-                agg[pid]["bowl_runs"] += card.runs_conceded or 0
-                agg[pid]["bowl_wkts"] += card.wickets or 0
-                agg[pid]["bowl_maidens"] += card.maidens or 0
-                # best figure: higher wickets, then lower runs
-                best_w, best_r = agg[pid]["bowl_best"]
-                if (card.wickets or 0) > best_w or ((card.wickets or 0) == best_w and (card.runs_conceded or 0) < best_r):
-                    agg[pid]["bowl_best"] = (card.wickets or 0, card.runs_conceded or 0)
-
-            agg[pid]["catches"] += card.catches or 0
-            agg[pid]["run_outs"] += card.run_outs or 0
-            agg[pid]["stumpings"] += card.stumpings or 0
-
         batting_stats = []
         bowling_stats = []
         fielding_stats = []
 
-        for pid, d in agg.items():
-            matches_played = len(match_sets[pid])
+        for row in rows:
+            d = {
+                **row._mapping,
+                "player": row.name,
+                "bowl_wkts": row.bowl_wickets,
+                "bowl_best": (row.best_bowling_wickets, row.best_bowling_runs),
+            }
+            matches_played = row.matches
 
             # Batting
             if matches_played > 0:
@@ -2200,7 +1911,7 @@ def create_app():
                     "Overs": overs_float,
                     "Economy": round(econ, 2),
                     "Average": bowl_avg,
-                    "Best": f"{best_w}/{best_r}" if best_w or best_r < 9999 else "-",
+                    "Best": f"{best_w}/{best_r}" if best_w or best_r is not None else "-",
                 })
 
             # Fielding
@@ -2457,6 +2168,7 @@ def create_app():
         StatsService=StatsService,
         aliased=aliased,
         func=func,
+        _get_app_version=_get_app_version,
     )
 
 
@@ -68,6 +68,10 @@ class User(UserMixin, db.Model):
     pw_change_otp_expires = db.Column(db.DateTime, nullable=True)
     pw_change_pending_hash = db.Column(db.String(200), nullable=True)
 
+    # Bumped whenever this user's match/tournament stats change; keys the
+    # StatsService result cache and stats ETags (engine/stats_cache.py).
+    stats_version = db.Column(db.Integer, default=0, nullable=False)
+
     # Relationships — cascade so deleting a User removes all owned data
     teams = relationship('Team', backref='owner', lazy=True, cascade="all, delete-orphan")
     matches = relationship('Match', backref='user', lazy=True, cascade="all, delete-orphan")
@@ -772,10 +776,45 @@ class Tournament(db.Model):
     # Example: {"matches": [{"home": 1, "away": 2, "venue": "home"}, ...], "series_name": "Ashes"}
     series_config = db.Column(db.Text, nullable=True)
 
+    # Bumped whenever the dashboard's content changes (standings, fixtures,
+    # results); TournamentDashboard rows built at an older version are stale.
+    version = db.Column(db.Integer, default=0, nullable=False)
+
     # Relationships
     participating_teams = relationship('TournamentTeam', backref='tournament', cascade="all, delete-orphan")
     fixtures = relationship('TournamentFixture', backref='tournament', cascade="all, delete-orphan")
     player_stats_cache = relationship('TournamentPlayerStatsCache', backref='tournament', cascade="all, delete-orphan")
+    dashboard = relationship('TournamentDashboard', uselist=False, cascade="all, delete-orphan")
+
+
+class TournamentDashboard(db.Model):
+    """Materialized tournament dashboard (standings, fixtures by stage, leaders).
+
+    One row per tournament, built at Tournament.version; see
+    engine/tournament_dashboard.py.
+    """
+    __tablename__ = 'tournament_dashboards'
+
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    payload = db.Column(db.Text, nullable=False)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class MatchLedger(db.Model):
+    """What applying one tournament match changed: standings deltas, the
+    fixtures and tournament state progression moved, and the player stats
+    cache rows rebuilt. Written by TournamentEngine.update_standings() and
+    replayed by reverse_standings(); see engine/match_ledger.py.
+    """
+    __tablename__ = 'match_ledgers'
+
+    match_id = db.Column(db.String(36), db.ForeignKey('matches.id', ondelete='CASCADE'), primary_key=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.id', ondelete='CASCADE'), nullable=False, index=True)
+    fixture_id = db.Column(db.Integer, nullable=False)
+    entries = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 
 class MatchPartnership(db.Model):
     """Batting partnership records for each innings"""
@@ -799,6 +838,16 @@ class MatchPartnership(db.Model):
     # Partnership duration
     start_over = db.Column(db.Float)
     end_over = db.Column(db.Float)
+
+    # Partnership index (engine/partnership_index.py): copied from the match
+    # at archive time, plus the pair with the lower player id first, so
+    # partnership leaderboards never join or load matches.
+    user_id = db.Column(db.String(120))
+    tournament_id = db.Column(db.Integer)
+    match_format = db.Column(db.String(20))
+    batting_team_id = db.Column(db.Integer)
+    player_a_id = db.Column(db.Integer)
+    player_b_id = db.Column(db.Integer)
     
     # Relationships
     batsman1 = relationship('Player', foreign_keys=[batsman1_id])
@@ -808,6 +857,10 @@ class MatchPartnership(db.Model):
     # Indexes for efficient queries
     __table_args__ = (
         db.Index('ix_partnership_match_innings', 'match_id', 'innings_number'),
+        db.Index('ix_partnership_user_format_runs', 'user_id', 'match_format', 'runs'),
+        db.Index('ix_partnership_tournament_runs', 'tournament_id', 'runs'),
+        db.Index('ix_partnership_pair', 'user_id', 'player_a_id', 'player_b_id'),
+        db.Index('ix_partnership_player_b', 'user_id', 'player_b_id'),
     )
 
 class TournamentPlayerStatsCache(db.Model):
@@ -860,6 +913,214 @@ class TournamentPlayerStatsCache(db.Model):
         db.Index('ix_tournament_player_cache_tournament_id', 'tournament_id'),
     )
 
+class PlayerCareerStats(db.Model):
+    """Materialized per-player, per-format career totals for StatsService.
+
+    Maintained incrementally by MatchArchiver._save_to_database (add) and
+    reverse_player_aggregates (subtract), and rebuilt from scratch by
+    scripts/rebuild_career_stats.py. Counts follow the /statistics rules
+    exactly — super-over cards are excluded entirely — so unlike the
+    Player.total_* columns these are not the "career totals incl. super
+    overs" numbers. See engine/career_stats.py.
+    """
+    __tablename__ = 'player_career_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    match_format = db.Column(db.String(20), nullable=False, default='T20')
+
+    matches = db.Column(db.Integer, default=0)
+
+    # Batting
+    bat_innings = db.Column(db.Integer, default=0)
+    bat_runs = db.Column(db.Integer, default=0)
+    bat_balls = db.Column(db.Integer, default=0)
+    bat_not_outs = db.Column(db.Integer, default=0)
+    bat_fours = db.Column(db.Integer, default=0)
+    bat_sixes = db.Column(db.Integer, default=0)
+    bat_ones = db.Column(db.Integer, default=0)
+    bat_twos = db.Column(db.Integer, default=0)
+    bat_threes = db.Column(db.Integer, default=0)
+    bat_dots = db.Column(db.Integer, default=0)
+    bat_zeros = db.Column(db.Integer, default=0)
+    bat_thirties = db.Column(db.Integer, default=0)
+    bat_fifties = db.Column(db.Integer, default=0)
+    bat_hundreds = db.Column(db.Integer, default=0)
+
+    # Bowling
+    bowl_innings = db.Column(db.Integer, default=0)
+    bowl_balls = db.Column(db.Integer, default=0)
+    bowl_runs = db.Column(db.Integer, default=0)
+    bowl_wickets = db.Column(db.Integer, default=0)
+    bowl_maidens = db.Column(db.Integer, default=0)
+    bowl_dots = db.Column(db.Integer, default=0)
+    bowl_wides = db.Column(db.Integer, default=0)
+    bowl_noballs = db.Column(db.Integer, default=0)
+    bowl_byes = db.Column(db.Integer, default=0)
+    bowl_leg_byes = db.Column(db.Integer, default=0)
+    bowl_wickets_bowled = db.Column(db.Integer, default=0)
+    bowl_wickets_lbw = db.Column(db.Integer, default=0)
+    # Best figures over bowling cards: most wickets, then fewest runs.
+    # NULL runs = never bowled.
+    best_bowling_wickets = db.Column(db.Integer, default=0)
+    best_bowling_runs = db.Column(db.Integer, nullable=True)
+
+    # Fielding (from any record_type)
+    catches = db.Column(db.Integer, default=0)
+    run_outs = db.Column(db.Integer, default=0)
+    stumpings = db.Column(db.Integer, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    player = relationship('Player')
+
+    __table_args__ = (
+        db.UniqueConstraint('player_id', 'match_format', name='uq_player_career_format'),
+    )
+
+
+class TeamPairSummary(db.Model):
+    """Materialized head-to-head record for one team pair in one format.
+
+    The pair is stored normalized (team_a_id < team_b_id), so every "team_a"
+    column is from the lower id's point of view. Maintained incrementally by
+    MatchArchiver._save_to_database and rebuilt per pair when a match is
+    reversed; scripts/rebuild_head_to_head.py rebuilds everything. See
+    engine/head_to_head.py.
+    """
+    __tablename__ = 'team_pair_summaries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(120), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    team_a_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='CASCADE'), nullable=False)
+    team_b_id = db.Column(db.Integer, db.ForeignKey('teams.id', ondelete='CASCADE'), nullable=False)
+    match_format = db.Column(db.String(20), nullable=False, default='T20')
+
+    played = db.Column(db.Integer, default=0)
+    team_a_wins = db.Column(db.Integer, default=0)
+    team_b_wins = db.Column(db.Integer, default=0)
+    ties = db.Column(db.Integer, default=0)
+    no_results = db.Column(db.Integer, default=0)
+
+    # Runs scored by each side across the pair's matches
+    team_a_runs = db.Column(db.Integer, default=0)
+    team_b_runs = db.Column(db.Integer, default=0)
+
+    # Innings totals in decided/tied matches (no-results excluded). NULL = none yet.
+    highest_total = db.Column(db.Integer, nullable=True)
+    highest_total_team_id = db.Column(db.Integer, nullable=True)
+    highest_total_match_id = db.Column(db.String(36), nullable=True)
+    lowest_total = db.Column(db.Integer, nullable=True)
+    lowest_total_team_id = db.Column(db.Integer, nullable=True)
+    lowest_total_match_id = db.Column(db.String(36), nullable=True)
+
+    recent_results = db.Column(db.Text, default='[]')   # JSON, newest first, capped
+    performers = db.Column(db.Text, default='{}')       # JSON {player_id: {team_id, name, runs, wickets, matches}}
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'team_a_id', 'team_b_id', 'match_format', name='uq_team_pair_format'),
+    )
+
+
+class MatchPlayerAnalytics(db.Model):
+    """Post-match analytics for one player in one archived match.
+
+    Written once per archive by the analytics stage (engine/match_analytics.py):
+    Impact Index inputs and score (super-over cards excluded), the MOTM
+    ranking under engine/motm_service.py's weighting, and the career
+    milestones the match took the player past. Scope columns are copied
+    from the match so stats and tournament pages read it without a join.
+    """
+    __tablename__ = 'match_player_analytics'
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.String(36), db.ForeignKey('matches.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.String(120), nullable=True)
+    tournament_id = db.Column(db.Integer, nullable=True)
+    match_format = db.Column(db.String(20), nullable=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+    team_id = db.Column(db.Integer, nullable=True)
+
+    runs = db.Column(db.Integer, default=0)
+    wickets = db.Column(db.Integer, default=0)
+    catches = db.Column(db.Integer, default=0)
+    run_outs = db.Column(db.Integer, default=0)
+    impact_score = db.Column(db.Integer, default=0)
+
+    # MOTM candidates: 1 = Man of the Match. NULL when the match awards none.
+    weighted_score = db.Column(db.Float, nullable=True)
+    motm_rank = db.Column(db.Integer, nullable=True)
+
+    milestones = db.Column(db.Text, default='[]')   # JSON list of milestone strings
+
+    __table_args__ = (
+        db.UniqueConstraint('match_id', 'player_id', name='uq_match_player_analytics'),
+        db.Index('ix_match_analytics_user_impact', 'user_id', 'impact_score'),
+        db.Index('ix_match_analytics_tournament_impact', 'tournament_id', 'impact_score'),
+    )
+
+
+class ConditionsSummary(db.Model):
+    """Materialized venue / pitch scoring averages for the Statistics Hub.
+
+    One row per (user, format, kind, label), where kind is 'venue' or
+    'pitch' and runs/wickets are match totals (both innings). Maintained by
+    MatchArchiver._save_to_database and re-derived for the format when a
+    match is reversed; see engine/insights_store.py.
+    """
+    __tablename__ = 'conditions_summaries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(120), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    match_format = db.Column(db.String(20), nullable=False, default='T20')
+    kind = db.Column(db.String(10), nullable=False)    # 'venue' | 'pitch'
+    label = db.Column(db.String(200), nullable=False)
+
+    matches = db.Column(db.Integer, default=0)
+    runs = db.Column(db.Integer, default=0)
+    wickets = db.Column(db.Integer, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'match_format', 'kind', 'label', name='uq_conditions_label'),
+    )
+
+
+class PlayerFormSummary(db.Model):
+    """Materialized impact totals and recent form for one player in one format.
+
+    Impact counters follow get_insights(): runs only from innings that faced,
+    scored or were dismissed, wickets only from spells with balls bowled,
+    fielding from any card; super-over cards are excluded. The series hold
+    the last FORM_WINDOW values oldest-first. See engine/insights_store.py.
+    """
+    __tablename__ = 'player_form_summaries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(120), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    match_format = db.Column(db.String(20), nullable=False, default='T20')
+    player_id = db.Column(db.Integer, db.ForeignKey('players.id', ondelete='CASCADE'), nullable=False)
+
+    runs = db.Column(db.Integer, default=0)
+    wickets = db.Column(db.Integer, default=0)
+    catches = db.Column(db.Integer, default=0)
+    run_outs = db.Column(db.Integer, default=0)
+    bat_innings = db.Column(db.Integer, default=0)
+    bowl_innings = db.Column(db.Integer, default=0)
+
+    batting_series = db.Column(db.Text, default='[]')   # JSON [[date key, match_id, runs], ...]
+    bowling_series = db.Column(db.Text, default='[]')   # JSON [[date key, match_id, wickets], ...]
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'match_format', 'player_id', name='uq_player_form_format'),
+    )
+
+
 class TournamentTeam(db.Model):
     """Team stats within a specific tournament"""
     __tablename__ = 'tournament_teams'
@@ -876,11 +1137,14 @@ class TournamentTeam(db.Model):
     no_result = db.Column(db.Integer, default=0, nullable=False)
     points = db.Column(db.Integer, default=0, nullable=False)
 
-    # NRR Components
+    # NRR Components. balls_faced/balls_bowled are authoritative; the
+    # overs strings are kept in step with them for display and older readers.
     runs_scored = db.Column(db.Integer, default=0, nullable=False)
     overs_faced = db.Column(db.String(10), default='0.0', nullable=False)
     runs_conceded = db.Column(db.Integer, default=0, nullable=False)
     overs_bowled = db.Column(db.String(10), default='0.0', nullable=False)
+    balls_faced = db.Column(db.Integer, default=0, nullable=False)
+    balls_bowled = db.Column(db.Integer, default=0, nullable=False)
 
     net_run_rate = db.Column(db.Float, default=0.0, nullable=False)
 
@@ -707,6 +707,19 @@ def _select_fielder(fielding_team, wicket_type: str = None, exclude_name: str =
     return chosen["name"], chosen.get("fielding_rating", 60)
 
 
+def _drop_probability(fielding: float) -> float:
+    """Chance a Caught/Stumped chance goes down, for a fielder rated *fielding*."""
+    return max(0.02, 0.22 - (fielding / 100.0) * 0.19)
+
+
+def _misfield_probability(fielding: float) -> float:
+    """Chance a dot/single gains an extra run off a misfield."""
+    return max(0.01, 0.115 - (fielding / 100.0) * 0.105)
+
+
+# Drop runs are drawn from these weights in resolve_fielding_chance().
+DROP_RUNS = ([1, 2, 4], [35, 35, 30])
+
 # -----------------------------------------------------------------------------
 # 4d) Catch/stumping drop resolution — shared by calculate_outcome() and the
 # Super Over engine. The fielder is picked first (via _select_fielder above)
@@ -733,9 +746,9 @@ def resolve_fielding_chance(fielding_team, bowler_name: str, wicket_choice: str,
     if drop_quality is None:
         return False, fielder_name, 0
 
-    drop_prob = max(0.02, 0.22 - (drop_quality / 100.0) * 0.19)
+    drop_prob = _drop_probability(drop_quality)
     if random.random() < drop_prob:
-        drop_runs = random.choices([1, 2, 4], weights=[35, 35, 30])[0]
+        drop_runs = random.choices(DROP_RUNS[0], weights=DROP_RUNS[1])[0]
         logger.debug(
             "[Fielding] Catch dropped by %s (rating=%.1f, drop_prob=%.3f)",
             fielder_name or "?", drop_quality, drop_prob,
@@ -745,9 +758,9 @@ def resolve_fielding_chance(fielding_team, bowler_name: str, wicket_choice: str,
     return False, fielder_name, 0
 
 # -----------------------------------------------------------------------------
-# 5) Main outcome selection function: calculate_outcome
+# 4e) Outcome weights — everything in calculate_outcome() up to the draw.
 # -----------------------------------------------------------------------------
-def calculate_outcome(
+def outcome_weights(
     batter: dict,
     bowler: dict,
     pitch: str,
@@ -763,42 +776,19 @@ def calculate_outcome(
     pitch_wear: float = 0.0,
     batting_position: int = 5,
     game_mode_override: str = None,
-    fielding_quality: float = None,
-    fielding_team: list = None,
     ground_config_override: dict = None,
     format_config: Optional[FormatConfig] = None,
     is_day_night: bool = False,
 ) -> dict:
     """
-    Determines the outcome of a single delivery.
-    Returns a dict:
-      - "type"       ∈ {"run", "wicket", "extra"}
-      - "runs"       ∈ {0,1,2,3,4,6}
-      - "description": string commentary
-      - "wicket_type": if a wicket, one of ["Caught","Bowled","LBW","Run Out"], else None
-      - "is_extra"   ∈ {True, False}
-      - "batter_out" ∈ {True, False}
-
-    In the final 4 overs (over_number >= 16), boundary (4/6) and wicket probabilities
-    are boosted based on pitch type:
-      • Flat/Dead: largest boundary boost
-      • Hard     : moderate boundary boost
-      • Green/Dry: minimal boundary boost (max ~1 boundary/over)
-      • Wicket   : slight boost in all cases
+    The weight pipeline behind calculate_outcome(): pitch matrix, rating
+    blend, matchup, phase boosts, wear/dew, GSME, pressure and free hit.
 
-    fielding_team, if given, is the bowling XI (list of player dicts with
-    name/role/fielding_rating). On a Caught/Stumped chance or a misfield, a
-    specific fielder is picked first and THEIR rating (not the team average)
-    drives the drop/misfield odds; the pick is returned as result["fielder_name"].
-    fielding_quality is a fallback team-average used only when fielding_team
-    isn't supplied.
+    Returns the unnormalised {outcome: weight} dict in matrix order; the
+    probability of each outcome is its weight over the sum. Nothing here
+    touches the RNG, so tools can evaluate the exact distribution for a
+    ball (see engine/rating_sweep.py) instead of sampling it.
     """
-    # print("\n==================== New Delivery ====================")
-    # print(f"Ball context -> Over: {over_number + 1}, BatterRunsSoFar: {batter_runs}")
-    # print(f"Batter: {batter['name']}, BattingRating: {batter['batting_rating']}, BattingHand: {batter['batting_hand']}")
-    # print(f"Bowler: {bowler['name']}, BowlingRating: {bowler['bowling_rating']}, FieldingRating: {bowler['fielding_rating']}, BowlingHand: {bowler['bowling_hand']}, BowlingType: {bowler['bowling_type']}")
-    # print(f"Pitch type: {pitch}, Current Streak: {streak}")
-
     # 1) Unpack numeric ratings & attributes
     # Feature 9: batting position context — top-order batters have a higher
     # effective batting rating; tail-enders face a modest penalty.
@@ -1002,6 +992,77 @@ def calculate_outcome(
         raw_weights["Six"] *= FREE_HIT_BOUNDARY_BOOST
         total_weight = sum(raw_weights.values())
 
+    return raw_weights
+
+
+# -----------------------------------------------------------------------------
+# 5) Main outcome selection function: calculate_outcome
+# -----------------------------------------------------------------------------
+def calculate_outcome(
+    batter: dict,
+    bowler: dict,
+    pitch: str,
+    streak: dict,
+    over_number: int,
+    batter_runs: int,
+    innings: int = 1,
+    pressure_effects: dict = None,
+    allow_extras: bool = True,
+    free_hit: bool = False,
+    balls_faced: int = 0,
+    game_state: dict = None,
+    pitch_wear: float = 0.0,
+    batting_position: int = 5,
+    game_mode_override: str = None,
+    fielding_quality: float = None,
+    fielding_team: list = None,
+    ground_config_override: dict = None,
+    format_config: Optional[FormatConfig] = None,
+    is_day_night: bool = False,
+) -> dict:
+    """
+    Determines the outcome of a single delivery.
+    Returns a dict:
+      - "type"       ∈ {"run", "wicket", "extra"}
+      - "runs"       ∈ {0,1,2,3,4,6}
+      - "description": string commentary
+      - "wicket_type": if a wicket, one of ["Caught","Bowled","LBW","Run Out"], else None
+      - "is_extra"   ∈ {True, False}
+      - "batter_out" ∈ {True, False}
+
+    In the final 4 overs (over_number >= 16), boundary (4/6) and wicket probabilities
+    are boosted based on pitch type:
+      • Flat/Dead: largest boundary boost
+      • Hard     : moderate boundary boost
+      • Green/Dry: minimal boundary boost (max ~1 boundary/over)
+      • Wicket   : slight boost in all cases
+
+    fielding_team, if given, is the bowling XI (list of player dicts with
+    name/role/fielding_rating). On a Caught/Stumped chance or a misfield, a
+    specific fielder is picked first and THEIR rating (not the team average)
+    drives the drop/misfield odds; the pick is returned as result["fielder_name"].
+    fielding_quality is a fallback team-average used only when fielding_team
+    isn't supplied.
+    """
+    # print("\n==================== New Delivery ====================")
+    # print(f"Ball context -> Over: {over_number + 1}, BatterRunsSoFar: {batter_runs}")
+    # print(f"Batter: {batter['name']}, BattingRating: {batter['batting_rating']}, BattingHand: {batter['batting_hand']}")
+    # print(f"Bowler: {bowler['name']}, BowlingRating: {bowler['bowling_rating']}, FieldingRating: {bowler['fielding_rating']}, BowlingHand: {bowler['bowling_hand']}, BowlingType: {bowler['bowling_type']}")
+    # print(f"Pitch type: {pitch}, Current Streak: {streak}")
+
+    raw_weights = outcome_weights(
+        batter, bowler, pitch, streak, over_number, batter_runs,
+        innings=innings, pressure_effects=pressure_effects,
+        allow_extras=allow_extras, free_hit=free_hit, balls_faced=balls_faced,
+        game_state=game_state, pitch_wear=pitch_wear,
+        batting_position=batting_position, game_mode_override=game_mode_override,
+        ground_config_override=ground_config_override,
+        format_config=format_config, is_day_night=is_day_night,
+    )
+    total_weight = sum(raw_weights.values())
+    bowling_type = bowler["bowling_type"]
+    _is_lista = (format_config is not None and format_config.name == "ListA")
+
     # 5) Normalize weights into probabilities
     # print(f"\n[calculate_outcome] Total raw weight sum: {total_weight:.6f}")
     if total_weight <= 0:
@@ -1156,7 +1217,7 @@ def calculate_outcome(
             )
             misfield_quality = misfield_rating if misfield_rating is not None else fielding_quality
             if misfield_quality is not None:
-                misfield_prob = max(0.01, 0.115 - (misfield_quality / 100.0) * 0.105)
+                misfield_prob = _misfield_probability(misfield_quality)
                 if random.random() < misfield_prob:
                     result["runs"] += 1
                     result["misfield"] = True
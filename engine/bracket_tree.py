@@ -0,0 +1,114 @@
+"""
+bracket_tree.py
+===============
+
+Parent/child links between a tournament's playoff fixtures.
+
+Every bracket the engine builds is a small, fixed shape addressed by
+TournamentFixture.bracket_position:
+
+  knockout        a power-of-two elimination tree: round 1 is positions
+                  0 .. n/2-1, each later round follows on, and the winners
+                  of positions 2k and 2k+1 of a round meet in position k of
+                  the next
+  semifinals      (round_robin_knockout modes) SF1 = 1, SF2 = 2, Final = 3
+  IPL playoffs    Q1 = 1, Eliminator = 2, Q2 = 3, Final = 4; Q1's loser and
+                  the Eliminator's winner meet in Q2, Q1's and Q2's winners
+                  in the Final. Not a binary tree: Q1 feeds two fixtures.
+
+A BracketTree stores those links explicitly, once per shape (tree_for() is
+memoized on mode and bracket size), so TournamentEngine's feeder checks,
+descendant resets and winner advancement are dictionary walks of O(depth)
+instead of re-deriving round boundaries from bracket_position arithmetic on
+every call.
+"""
+
+from functools import lru_cache
+
+WINNER = "winner"
+LOSER = "loser"
+
+
+class BracketTree:
+    """
+    Links between bracket positions. *links* maps each fed position to its
+    (home, away) feeders, each a (position, outcome) pair; *rounds* lists the
+    positions of each round in play order.
+    """
+
+    def __init__(self, links, rounds):
+        self.links = dict(links)
+        self.rounds = tuple(tuple(r) for r in rounds)
+        self.children = {}
+        for child, feeders in self.links.items():
+            for slot, (parent, outcome) in zip(("home", "away"), feeders):
+                self.children.setdefault(parent, []).append((child, slot, outcome))
+        self.positions = frozenset(p for r in self.rounds for p in r)
+
+    def feeders(self, position):
+        """(home, away) feeder positions of *position*, or () for a first-round slot."""
+        return tuple(parent for parent, _ in self.links.get(position, ()))
+
+    def advances_to(self, position, outcome=WINNER):
+        """The position *outcome* of *position* moves into, or None."""
+        return next((child for child, _, o in self.children.get(position, ()) if o == outcome), None)
+
+    def descendants(self, position):
+        """Every position whose pairing depends on *position*'s result."""
+        found, frontier = set(), [position]
+        while frontier:
+            for child, _, _ in self.children.get(frontier.pop(), ()):
+                if child not in found:
+                    found.add(child)
+                    frontier.append(child)
+        return found
+
+
+def knockout_rounds(next_power):
+    """[(start_bracket_pos, match_count), ...] for a *next_power*-slot knockout."""
+    rounds = []
+    start = 0
+    count = next_power // 2
+    while count >= 1:
+        rounds.append((start, count))
+        start += count
+        count //= 2
+    return rounds
+
+
+def knockout_tree(next_power):
+    rounds = [list(range(start, start + count)) for start, count in knockout_rounds(next_power)]
+    links = {}
+    for previous, current in zip(rounds, rounds[1:]):
+        for k, child in enumerate(current):
+            links[child] = ((previous[2 * k], WINNER), (previous[2 * k + 1], WINNER))
+    return BracketTree(links, rounds)
+
+
+SEMIFINAL_TREE = BracketTree(
+    {3: ((1, WINNER), (2, WINNER))},          # Final: SF1 winner v SF2 winner
+    [[1, 2], [3]],
+)
+
+IPL_TREE = BracketTree(
+    {
+        3: ((1, LOSER), (2, WINNER)),         # Q2: Q1 loser v Eliminator winner
+        4: ((1, WINNER), (3, WINNER)),        # Final: Q1 winner v Q2 winner
+    },
+    [[1, 2], [3], [4]],
+)
+
+
+@lru_cache(maxsize=64)
+def tree_for(mode, next_power):
+    """
+    The BracketTree for a tournament *mode* (TournamentEngine.MODE_*) with
+    *next_power* bracket slots, or None for modes without a bracket.
+    """
+    if mode == "knockout":
+        return knockout_tree(next_power)
+    if mode in ("round_robin_knockout", "double_round_robin_knockout"):
+        return SEMIFINAL_TREE
+    if mode == "ipl_style":
+        return IPL_TREE
+    return None
@@ -0,0 +1,235 @@
+"""
+career_stats.py
+===============
+
+Materialized career totals (PlayerCareerStats) behind /statistics.
+
+StatsService.get_overall_stats() used to fold every MatchScorecard a user
+owns on every request. The same fold now runs once per archived match:
+
+  apply_match_cards()    — MatchArchiver._save_to_database, after the
+                           match's cards are flushed
+  reverse_match_cards()  — reverse_player_aggregates(), before a match's
+                           cards are deleted (re-sim / delete)
+  rebuild_career_stats() — from scratch, for backfill and repair
+                           (scripts/rebuild_career_stats.py)
+
+add_card() is the single definition of how one scorecard row contributes;
+StatsService's scorecard fold (tournament / fallback path) uses it too, so
+the two read paths cannot drift. Super-over cards never contribute — they
+are not innings (see MatchScorecard.is_super_over).
+"""
+
+from collections import defaultdict
+
+from database import db
+from database.models import Match, MatchScorecard, Player, PlayerCareerStats, Team
+
+# Plain additive counters, in PlayerCareerStats column order.
+COUNTERS = (
+    "bat_innings", "bat_runs", "bat_balls", "bat_not_outs", "bat_fours",
+    "bat_sixes", "bat_ones", "bat_twos", "bat_threes", "bat_dots",
+    "bat_zeros", "bat_thirties", "bat_fifties", "bat_hundreds",
+    "bowl_innings", "bowl_balls", "bowl_runs", "bowl_wickets", "bowl_maidens",
+    "bowl_dots", "bowl_wides", "bowl_noballs", "bowl_byes", "bowl_leg_byes",
+    "bowl_wickets_bowled", "bowl_wickets_lbw",
+    "catches", "run_outs", "stumpings",
+)
+
+
+def new_totals():
+    totals = dict.fromkeys(COUNTERS, 0)
+    totals["best_bowling_wickets"] = 0
+    totals["best_bowling_runs"] = None
+    return totals
+
+
+def better_figures(wickets, runs, best_wickets, best_runs):
+    """True when wickets/runs beats the current best (more wickets, then fewer runs)."""
+    if best_runs is None:
+        return True
+    return wickets > best_wickets or (wickets == best_wickets and runs < best_runs)
+
+
+def add_card(totals, card):
+    """Fold one non-super-over MatchScorecard into *totals*."""
+    if card.record_type == "batting":
+        runs = card.runs or 0
+        # An innings is anything that faced, scored, or was dismissed.
+        if (card.balls or 0) > 0 or runs > 0 or bool(card.is_out):
+            totals["bat_innings"] += 1
+            if not card.is_out:
+                totals["bat_not_outs"] += 1
+            if runs == 0 and card.is_out:
+                totals["bat_zeros"] += 1
+            if 30 <= runs <= 49:
+                totals["bat_thirties"] += 1
+            elif 50 <= runs < 100:
+                totals["bat_fifties"] += 1
+            elif runs >= 100:
+                totals["bat_hundreds"] += 1
+        totals["bat_runs"] += runs
+        totals["bat_balls"] += card.balls or 0
+        totals["bat_fours"] += card.fours or 0
+        totals["bat_sixes"] += card.sixes or 0
+        totals["bat_ones"] += card.ones or 0
+        totals["bat_twos"] += card.twos or 0
+        totals["bat_threes"] += card.threes or 0
+        totals["bat_dots"] += card.dot_balls or 0
+
+    elif card.record_type == "bowling":
+        balls = card.balls_bowled or 0
+        wickets = card.wickets or 0
+        runs = card.runs_conceded or 0
+        if balls > 0:
+            totals["bowl_innings"] += 1
+        totals["bowl_balls"] += balls
+        totals["bowl_runs"] += runs
+        totals["bowl_wickets"] += wickets
+        totals["bowl_maidens"] += card.maidens or 0
+        totals["bowl_dots"] += card.dot_balls_bowled or 0
+        totals["bowl_wides"] += card.wides or 0
+        totals["bowl_noballs"] += card.noballs or 0
+        totals["bowl_byes"] += card.byes or 0
+        totals["bowl_leg_byes"] += card.leg_byes or 0
+        totals["bowl_wickets_bowled"] += card.wickets_bowled or 0
+        totals["bowl_wickets_lbw"] += card.wickets_lbw or 0
+        if better_figures(wickets, runs, totals["best_bowling_wickets"], totals["best_bowling_runs"]):
+            totals["best_bowling_wickets"] = wickets
+            totals["best_bowling_runs"] = runs
+
+    # Fielding contributions can sit on any record_type.
+    totals["catches"] += card.catches or 0
+    totals["run_outs"] += card.run_outs or 0
+    totals["stumpings"] += card.stumpings or 0
+    return totals
+
+
+def merge_totals(into, other):
+    """Add *other* (a totals dict or PlayerCareerStats row) into *into*."""
+    get = other.get if isinstance(other, dict) else (lambda k: getattr(other, k))
+    for key in COUNTERS:
+        into[key] += get(key) or 0
+    w, r = get("best_bowling_wickets") or 0, get("best_bowling_runs")
+    if r is not None and better_figures(w, r, into["best_bowling_wickets"], into["best_bowling_runs"]):
+        into["best_bowling_wickets"], into["best_bowling_runs"] = w, r
+    return into
+
+
+def _per_player(cards):
+    per_player = defaultdict(new_totals)
+    for card in cards:
+        if card.is_super_over:
+            continue
+        add_card(per_player[card.player_id], card)
+    return per_player
+
+
+def _match_format(cards, match_format):
+    if match_format:
+        return match_format
+    match = db.session.get(Match, cards[0].match_id)
+    return (match.match_format if match else None) or "T20"
+
+
+def apply_match_cards(cards, match_format=None):
+    """Add one match's (already flushed) scorecards to the career table."""
+    if not cards:
+        return
+    fmt = _match_format(cards, match_format)
+    for player_id, totals in _per_player(cards).items():
+        row = PlayerCareerStats.query.filter_by(player_id=player_id, match_format=fmt).first()
+        if row is None:
+            row = PlayerCareerStats(player_id=player_id, match_format=fmt, matches=0)
+            for key in COUNTERS:
+                setattr(row, key, 0)
+            row.best_bowling_wickets = 0
+            db.session.add(row)
+        row.matches = (row.matches or 0) + 1
+        for key in COUNTERS:
+            setattr(row, key, (getattr(row, key) or 0) + totals[key])
+        if totals["best_bowling_runs"] is not None and better_figures(
+            totals["best_bowling_wickets"], totals["best_bowling_runs"],
+            row.best_bowling_wickets or 0, row.best_bowling_runs,
+        ):
+            row.best_bowling_wickets = totals["best_bowling_wickets"]
+            row.best_bowling_runs = totals["best_bowling_runs"]
+
+
+def reverse_match_cards(cards, match_format=None):
+    """Subtract one match's scorecards. Call before the cards are deleted."""
+    if not cards:
+        return
+    fmt = _match_format(cards, match_format)
+    match_id = cards[0].match_id
+    for player_id, totals in _per_player(cards).items():
+        row = PlayerCareerStats.query.filter_by(player_id=player_id, match_format=fmt).first()
+        if row is None:
+            continue
+        row.matches = max(0, (row.matches or 0) - 1)
+        if row.matches == 0:
+            db.session.delete(row)
+            continue
+        for key in COUNTERS:
+            setattr(row, key, max(0, (getattr(row, key) or 0) - totals[key]))
+        if totals["best_bowling_runs"] is not None:
+            # Best figures are a high-water mark: re-derive from the cards
+            # that remain once this match is gone.
+            best = (
+                db.session.query(MatchScorecard.wickets, MatchScorecard.runs_conceded)
+                .join(Match, MatchScorecard.match_id == Match.id)
+                .filter(
+                    MatchScorecard.player_id == player_id,
+                    MatchScorecard.record_type == "bowling",
+                    MatchScorecard.match_id != match_id,
+                    MatchScorecard.is_super_over.isnot(True),
+                    # Matches with no format are filed under T20 (_match_format).
+                    db.func.coalesce(Match.match_format, "T20") == fmt,
+                )
+                .order_by(MatchScorecard.wickets.desc(), MatchScorecard.runs_conceded.asc())
+                .first()
+            )
+            row.best_bowling_wickets = (best.wickets or 0) if best else 0
+            row.best_bowling_runs = (best.runs_conceded or 0) if best else None
+
+
+def rebuild_career_stats(user_id=None):
+    """
+    Regenerate PlayerCareerStats from MatchScorecard, for every player or
+    only *user_id*'s. Returns the number of rows written. Does not commit.
+    """
+    player_ids = None
+    if user_id is not None:
+        player_ids = db.session.query(Player.id).join(Team, Player.team_id == Team.id).filter(
+            Team.user_id == user_id
+        )
+        PlayerCareerStats.query.filter(
+            PlayerCareerStats.player_id.in_(player_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+    else:
+        PlayerCareerStats.query.delete(synchronize_session=False)
+
+    query = (
+        db.session.query(MatchScorecard, Match.match_format)
+        .join(Match, MatchScorecard.match_id == Match.id)
+        .filter(MatchScorecard.is_super_over.isnot(True))
+    )
+    if player_ids is not None:
+        query = query.filter(MatchScorecard.player_id.in_(player_ids.scalar_subquery()))
+
+    totals = defaultdict(new_totals)
+    match_ids = defaultdict(set)
+    for card, fmt in query.yield_per(1000):
+        key = (card.player_id, fmt or "T20")
+        add_card(totals[key], card)
+        match_ids[key].add(card.match_id)
+
+    for (player_id, fmt), t in totals.items():
+        row = PlayerCareerStats(player_id=player_id, match_format=fmt,
+                                matches=len(match_ids[(player_id, fmt)]))
+        for key in COUNTERS:
+            setattr(row, key, t[key])
+        row.best_bowling_wickets = t["best_bowling_wickets"]
+        row.best_bowling_runs = t["best_bowling_runs"]
+        db.session.add(row)
+    return len(totals)
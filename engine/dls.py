@@ -23,6 +23,12 @@ adjacent whole-over rows. The official ball-by-ball table differs from
 linear interpolation by at most ~0.1 percentage points, which is well under
 one run in any realistic scenario — this is the documented simplification.
 
+Because the sim only ever stops on whole balls, those interpolated values are
+also precomputed once at import into a flat per-ball surface
+(`_BALL_SURFACE[balls_remaining * 10 + wickets_lost]`). The `*_balls` helpers
+and the curve functions read that surface directly, so a whole innings' par
+curve costs one list walk instead of a table interpolation per ball.
+
 Target rules (Standard Edition)
 -------------------------------
 Let S be Team 1's score, R1/R2 each team's total resource percentages:
@@ -35,15 +41,18 @@ where G50 is the expected score for a *full 50-over* innings (100% of
 resources). Callers working in T20 terms must scale their expected total up
 to the 100%-resource equivalent (see `g50_from_expected_total`).
 
-The "par score" at any point of Team 2's innings is
-  par = floor(S * (resources Team 2 has consumed so far) / R1)
-Team 2 is ahead if score > par; score == par at abandonment is a tie.
+The "par score" at any point of Team 2's innings, with U2 the resources
+Team 2 has consumed so far, is
+  par = floor(S * U2/R1)                  (U2 <= R1, or no G50 given)
+  par = floor(S + G50 * (U2 - R1)/100)    (U2 >  R1)
+Team 2 is ahead if score > par; score == par at abandonment is a tie. At
+the end of Team 2's allocation U2 == R2, so par == target - 1 on every branch.
 """
 
 import json
 import math
 import os
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 _TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "dls_resource_table.json")
 
@@ -52,6 +61,29 @@ with open(_TABLE_PATH, "r") as _f:
     _RESOURCES: List[List[float]] = json.load(_f)["resources"]
 
 MAX_OVERS = len(_RESOURCES) - 1   # 50
+MAX_BALLS = MAX_OVERS * 6         # 300
+WICKETS = 10                      # surface row width (0-9 lost)
+
+
+def _interpolate(overs_remaining: float, wickets_lost: int) -> float:
+    """Linear interpolation between whole-over rows (inputs pre-clamped)."""
+    lower = int(math.floor(overs_remaining))
+    upper = min(lower + 1, MAX_OVERS)
+    frac = overs_remaining - lower
+
+    lo = _RESOURCES[lower][wickets_lost]
+    hi = _RESOURCES[upper][wickets_lost]
+    return lo + (hi - lo) * frac
+
+
+# Flat per-ball resource surface: index = balls_remaining * WICKETS + wickets_lost.
+# Built with the exact same interpolation as resources_remaining(), so the two
+# paths agree bit-for-bit on every whole ball.
+_BALL_SURFACE: List[float] = [
+    _interpolate(balls / 6.0, wkts)
+    for balls in range(MAX_BALLS + 1)
+    for wkts in range(WICKETS)
+]
 
 
 def resources_remaining(overs_remaining: float, wickets_lost: int) -> float:
@@ -66,14 +98,20 @@ def resources_remaining(overs_remaining: float, wickets_lost: int) -> float:
         return 0.0
     wickets_lost = max(0, wickets_lost)
     overs_remaining = max(0.0, min(float(overs_remaining), float(MAX_OVERS)))
+    return _interpolate(overs_remaining, wickets_lost)
 
-    lower = int(math.floor(overs_remaining))
-    upper = min(lower + 1, MAX_OVERS)
-    frac = overs_remaining - lower
 
-    lo = _RESOURCES[lower][wickets_lost]
-    hi = _RESOURCES[upper][wickets_lost]
-    return lo + (hi - lo) * frac
+def resources_remaining_balls(balls_remaining: int, wickets_lost: int) -> float:
+    """
+    Per-ball lookup into the precomputed surface. Equivalent to
+    `resources_remaining(overs_from_balls(balls_remaining), wickets_lost)`
+    with the same clamping, but O(1) with no interpolation.
+    """
+    if wickets_lost >= 10:
+        return 0.0
+    wickets_lost = max(0, wickets_lost)
+    balls_remaining = max(0, min(int(balls_remaining), MAX_BALLS))
+    return _BALL_SURFACE[balls_remaining * WICKETS + wickets_lost]
 
 
 def overs_from_balls(balls_remaining: int) -> float:
@@ -81,6 +119,38 @@ def overs_from_balls(balls_remaining: int) -> float:
     return max(0, balls_remaining) / 6.0
 
 
+def resource_curve(balls_remaining: Sequence[int],
+                   wickets_lost: Sequence[int]) -> List[float]:
+    """
+    Resources remaining for a whole sequence of (balls remaining, wickets
+    lost) states in one call — e.g. every ball of an innings, for charts.
+    The two sequences are paired element-wise and must be the same length.
+    """
+    if len(balls_remaining) != len(wickets_lost):
+        raise ValueError("balls_remaining and wickets_lost must be the same length")
+    surface = _BALL_SURFACE
+    out = []
+    for balls, wkts in zip(balls_remaining, wickets_lost):
+        if wkts >= 10:
+            out.append(0.0)
+            continue
+        balls = 0 if balls < 0 else (MAX_BALLS if balls > MAX_BALLS else balls)
+        out.append(surface[balls * WICKETS + (wkts if wkts > 0 else 0)])
+    return out
+
+
+def resource_column(wickets_lost: int, max_balls: int = MAX_BALLS) -> List[float]:
+    """
+    Resources remaining at 0..max_balls balls remaining for a fixed number
+    of wickets lost — one column of the surface, index = balls remaining.
+    """
+    max_balls = max(0, min(int(max_balls), MAX_BALLS))
+    if wickets_lost >= 10:
+        return [0.0] * (max_balls + 1)
+    wickets_lost = max(0, wickets_lost)
+    return _BALL_SURFACE[wickets_lost:(max_balls + 1) * WICKETS:WICKETS]
+
+
 def g50_from_expected_total(expected_total: float, scheduled_overs: int) -> float:
     """
     Convert a format-scale expected innings total (e.g. the sim's pitch
@@ -113,8 +183,33 @@ class ResourceLedger:
     def record_interruption(self, overs_remaining_at_stop: float, wickets_lost: int,
                             overs_remaining_at_resume: float) -> float:
         """Record a stoppage that resumes with fewer overs. Returns resources lost."""
-        at_stop = resources_remaining(overs_remaining_at_stop, wickets_lost)
-        at_resume = resources_remaining(overs_remaining_at_resume, wickets_lost)
+        return self._record(
+            overs_remaining_at_stop, wickets_lost, overs_remaining_at_resume,
+            resources_remaining(overs_remaining_at_stop, wickets_lost),
+            resources_remaining(overs_remaining_at_resume, wickets_lost),
+        )
+
+    def record_termination(self, overs_remaining_at_stop: float, wickets_lost: int) -> float:
+        """Record an innings ended outright by rain. Returns resources lost."""
+        return self.record_interruption(overs_remaining_at_stop, wickets_lost, 0.0)
+
+    def record_interruption_balls(self, balls_remaining_at_stop: int, wickets_lost: int,
+                                  balls_remaining_at_resume: int) -> float:
+        """`record_interruption` keyed on whole balls, read from the per-ball
+        surface the live par uses. Returns resources lost."""
+        return self._record(
+            overs_from_balls(balls_remaining_at_stop), wickets_lost,
+            overs_from_balls(balls_remaining_at_resume),
+            resources_remaining_balls(balls_remaining_at_stop, wickets_lost),
+            resources_remaining_balls(balls_remaining_at_resume, wickets_lost),
+        )
+
+    def record_termination_balls(self, balls_remaining_at_stop: int, wickets_lost: int) -> float:
+        """`record_termination` keyed on whole balls. Returns resources lost."""
+        return self.record_interruption_balls(balls_remaining_at_stop, wickets_lost, 0)
+
+    def _record(self, overs_remaining_at_stop: float, wickets_lost: int,
+                overs_remaining_at_resume: float, at_stop: float, at_resume: float) -> float:
         lost = max(0.0, at_stop - at_resume)
         self.lost += lost
         self.interruptions.append({
@@ -125,14 +220,19 @@ class ResourceLedger:
         })
         return lost
 
-    def record_termination(self, overs_remaining_at_stop: float, wickets_lost: int) -> float:
-        """Record an innings ended outright by rain. Returns resources lost."""
-        return self.record_interruption(overs_remaining_at_stop, wickets_lost, 0.0)
-
     def available(self) -> float:
         """Total resource percentage this innings had/has after all deductions."""
         return max(0.0, self.starting_resources - self.lost)
 
+    def par_curve(self, team1_score: int, r1: float,
+                  balls_remaining: Sequence[int],
+                  wickets_lost: Sequence[int],
+                  g50: Optional[float] = None) -> List[int]:
+        """Par score at each (balls remaining, wickets lost) state of this
+        (chasing) innings, netted against this ledger's deductions."""
+        return par_curve(team1_score, r1, self.available(),
+                         balls_remaining, wickets_lost, g50)
+
     # ── persistence ────────────────────────────────────────────────────────
     def to_dict(self) -> dict:
         return {
@@ -185,3 +285,68 @@ def par_score(team1_score: int, r1: float, team2_resources_available: float,
     remaining_now = resources_remaining(overs_remaining_now, wickets_lost_now)
     used = max(0.0, team2_resources_available - remaining_now)
     return int(math.floor(team1_score * used / r1))
+
+
+def _par_from_used(team1_score: int, r1: float, used: float,
+                   g50: Optional[float]) -> int:
+    """Par for `used` resources consumed; mirrors `compute_target`'s branches."""
+    if abs(used - r1) < 1e-9:
+        return team1_score
+    if g50 is not None and used > r1:
+        return int(math.floor(team1_score + g50 * (used - r1) / 100.0))
+    return int(math.floor(team1_score * used / r1))
+
+
+def par_score_balls(team1_score: int, r1: float, team2_resources_available: float,
+                    balls_remaining_now: int, wickets_lost_now: int,
+                    g50: Optional[float] = None) -> int:
+    """`par_score` keyed on whole balls remaining, read from the per-ball
+    surface. This is what the live match uses — it never stops mid-ball.
+
+    Pass `g50` when Team 1's innings was cut short, so that once Team 2 has
+    consumed more than R1 the par follows the same G50 branch as the target.
+    """
+    if r1 <= 0:
+        return 0
+    remaining_now = resources_remaining_balls(balls_remaining_now, wickets_lost_now)
+    used = max(0.0, team2_resources_available - remaining_now)
+    return _par_from_used(team1_score, r1, used, g50)
+
+
+def par_curve(team1_score: int, r1: float, team2_resources_available: float,
+              balls_remaining: Sequence[int],
+              wickets_lost: Sequence[int],
+              g50: Optional[float] = None) -> List[int]:
+    """
+    Par score for every (balls remaining, wickets lost) state in one call.
+    Element-wise identical to calling `par_score_balls` per state.
+    """
+    if r1 <= 0:
+        return [0] * len(balls_remaining)
+    return [
+        _par_from_used(team1_score, r1,
+                       max(0.0, team2_resources_available - rem), g50)
+        for rem in resource_curve(balls_remaining, wickets_lost)
+    ]
+
+
+def par_table(team1_score: int, r1: float, team2_resources_available: float,
+              innings_balls: int, g50: Optional[float] = None) -> List[List[int]]:
+    """
+    Full par grid for a chase of `innings_balls` balls:
+    `table[balls_remaining][wickets_lost]` for balls 0..innings_balls and
+    wickets 0..9. Handy for par-by-wickets chart lines and what-if tooling.
+    """
+    innings_balls = max(0, min(int(innings_balls), MAX_BALLS))
+    if r1 <= 0:
+        return [[0] * WICKETS for _ in range(innings_balls + 1)]
+    surface = _BALL_SURFACE
+    table = []
+    for balls in range(innings_balls + 1):
+        base = balls * WICKETS
+        table.append([
+            _par_from_used(team1_score, r1,
+                           max(0.0, team2_resources_available - surface[base + w]), g50)
+            for w in range(WICKETS)
+        ])
+    return table
@@ -0,0 +1,297 @@
+"""
+head_to_head.py
+===============
+
+Materialized head-to-head records (TeamPairSummary) behind /api/head-to-head.
+
+StatsService.get_head_to_head() used to load every match between two teams,
+classify each result and aggregate their scorecards on every request. The
+same fold now runs once per archived match:
+
+  apply_match()          — MatchArchiver._save_to_database, after the
+                           match's cards are flushed
+  reverse_match()        — reverse_player_aggregates(), before a match's
+                           cards are deleted (re-sim / delete); rebuilds
+                           the pair from its remaining matches, because
+                           highest/lowest totals and last-N results can't
+                           be un-applied
+  rebuild_head_to_head() — from scratch, for backfill and repair
+                           (scripts/rebuild_head_to_head.py)
+
+Rows are keyed (user, team_a, team_b, format) with team_a_id < team_b_id.
+Results follow TournamentEngine: a match with no winner is a no-result when
+_is_no_result() says so (or it was aborted), otherwise a tie. Super-over
+cards never count towards top performers.
+"""
+
+import json
+from collections import defaultdict
+
+from database import db
+from database.models import Match, MatchScorecard, Player, TeamPairSummary
+from engine.tournament_engine import TournamentEngine
+
+RECENT_RESULTS = 10
+TOP_PERFORMERS = 5
+WICKET_IMPACT = 20  # performer impact = runs + wickets * WICKET_IMPACT
+
+_BATCH = 500
+
+
+def pair_of(team1_id, team2_id):
+    """Normalized (team_a_id, team_b_id) for a pair of teams."""
+    return (team1_id, team2_id) if team1_id < team2_id else (team2_id, team1_id)
+
+
+def _is_no_result(match):
+    return match.match_status == "aborted" or TournamentEngine._is_no_result(match)
+
+
+def _reset(row):
+    for key in ("played", "team_a_wins", "team_b_wins", "ties", "no_results",
+                "team_a_runs", "team_b_runs"):
+        setattr(row, key, 0)
+    for key in ("highest_total", "highest_total_team_id", "highest_total_match_id",
+                "lowest_total", "lowest_total_team_id", "lowest_total_match_id"):
+        setattr(row, key, None)
+    row.recent_results, row.performers = "[]", "{}"
+    return row
+
+
+def _new_row(user_id, team_a_id, team_b_id, match_format):
+    return _reset(TeamPairSummary(
+        user_id=user_id, team_a_id=team_a_id, team_b_id=team_b_id, match_format=match_format,
+    ))
+
+
+def _fold(row, match, cards, names, recent, performers):
+    """Add one match (and its scorecards) to *row*, *recent* and *performers*."""
+    a, b = row.team_a_id, row.team_b_id
+    no_result = False
+    row.played += 1
+    if match.winner_team_id == a:
+        row.team_a_wins += 1
+    elif match.winner_team_id == b:
+        row.team_b_wins += 1
+    elif _is_no_result(match):
+        row.no_results += 1
+        no_result = True
+    else:
+        row.ties += 1
+
+    for team_id, score in ((match.home_team_id, match.home_team_score),
+                           (match.away_team_id, match.away_team_score)):
+        if team_id == a:
+            row.team_a_runs += score or 0
+        else:
+            row.team_b_runs += score or 0
+        if score is None or no_result:
+            continue
+        if row.highest_total is None or score > row.highest_total:
+            row.highest_total, row.highest_total_team_id, row.highest_total_match_id = score, team_id, match.id
+        if row.lowest_total is None or score < row.lowest_total:
+            row.lowest_total, row.lowest_total_team_id, row.lowest_total_match_id = score, team_id, match.id
+
+    recent.append({
+        "match_id": match.id,
+        "date": match.date.strftime("%Y-%m-%d") if match.date else "",
+        "sort_key": match.date.isoformat() if match.date else "",
+        "venue": match.venue or "",
+        "home_team_id": match.home_team_id,
+        "away_team_id": match.away_team_id,
+        "winner_team_id": match.winner_team_id,
+        "result": match.result_description or "",
+        "home_score": f"{match.home_team_score or 0}/{match.home_team_wickets or 0}",
+        "away_score": f"{match.away_team_score or 0}/{match.away_team_wickets or 0}",
+        "format": match.match_format or "T20",
+    })
+    recent.sort(key=lambda r: (r["sort_key"], r["match_id"]), reverse=True)
+    del recent[RECENT_RESULTS:]
+
+    seen = set()
+    for card in cards:
+        if card.is_super_over or card.team_id not in (a, b):
+            continue
+        entry = performers.setdefault(str(card.player_id), {
+            "team_id": card.team_id, "name": names.get(card.player_id, "Unknown"),
+            "runs": 0, "wickets": 0, "matches": 0,
+        })
+        if card.record_type == "batting":
+            entry["runs"] += card.runs or 0
+        elif card.record_type == "bowling":
+            entry["wickets"] += card.wickets or 0
+        if card.player_id not in seen:
+            entry["matches"] += 1
+            seen.add(card.player_id)
+
+
+def _player_names(cards):
+    ids = {c.player_id for c in cards}
+    if not ids:
+        return {}
+    return dict(db.session.query(Player.id, Player.name).filter(Player.id.in_(ids)).all())
+
+
+def _fold_all(row, matches, cards_by_match):
+    names = _player_names([c for cards in cards_by_match.values() for c in cards])
+    recent, performers = [], {}
+    for match in matches:
+        _fold(row, match, cards_by_match.get(match.id, ()), names, recent, performers)
+    row.recent_results = json.dumps(recent)
+    row.performers = json.dumps(performers)
+
+
+def _cards_for(match_ids):
+    by_match = defaultdict(list)
+    match_ids = list(match_ids)
+    for i in range(0, len(match_ids), _BATCH):
+        for card in MatchScorecard.query.filter(MatchScorecard.match_id.in_(match_ids[i:i + _BATCH])):
+            by_match[card.match_id].append(card)
+    return by_match
+
+
+def _countable(match):
+    return bool(match.user_id and match.home_team_id and match.away_team_id
+                and match.home_team_id != match.away_team_id)
+
+
+def apply_match(match, cards):
+    """Add one archived match (its scorecards already flushed) to its pair's summary."""
+    if not _countable(match):
+        return
+    a, b = pair_of(match.home_team_id, match.away_team_id)
+    fmt = match.match_format or "T20"
+    row = TeamPairSummary.query.filter_by(
+        user_id=match.user_id, team_a_id=a, team_b_id=b, match_format=fmt
+    ).first()
+    if row is None:
+        row = _new_row(match.user_id, a, b, fmt)
+        db.session.add(row)
+    recent = json.loads(row.recent_results or "[]")
+    performers = json.loads(row.performers or "{}")
+    _fold(row, match, cards, _player_names(cards), recent, performers)
+    row.recent_results = json.dumps(recent)
+    row.performers = json.dumps(performers)
+
+
+def rebuild_pair(user_id, team1_id, team2_id, match_format, exclude_match_id=None):
+    """Recompute one pair/format summary from its matches. Does not commit."""
+    a, b = pair_of(team1_id, team2_id)
+    row = TeamPairSummary.query.filter_by(
+        user_id=user_id, team_a_id=a, team_b_id=b, match_format=match_format
+    ).first()
+
+    query = Match.query.filter(
+        Match.user_id == user_id,
+        db.or_(
+            db.and_(Match.home_team_id == a, Match.away_team_id == b),
+            db.and_(Match.home_team_id == b, Match.away_team_id == a),
+        ),
+        # apply_match() files a NULL-format match under "T20"; match it here
+        # too, or rebuilding/reversing the pair would drop those matches.
+        db.func.coalesce(Match.match_format, "T20") == match_format,
+    )
+    if exclude_match_id is not None:
+        query = query.filter(Match.id != exclude_match_id)
+    matches = query.order_by(Match.date, Match.id).all()
+    if not matches:
+        if row is not None:
+            db.session.delete(row)
+        return None
+
+    if row is None:
+        row = _new_row(user_id, a, b, match_format)
+        db.session.add(row)
+    else:
+        _reset(row)
+    _fold_all(row, matches, _cards_for(m.id for m in matches))
+    return row
+
+
+def reverse_match(match_id, match_format=None):
+    """
+    Take one match out of its pair's summary. Call before the match's cards
+    are deleted; *match_format* is the format it was archived under when
+    the Match row has already been re-labelled (re-sim).
+    """
+    match = db.session.get(Match, match_id)
+    if match is None or not _countable(match):
+        return
+    rebuild_pair(match.user_id, match.home_team_id, match.away_team_id,
+                 match_format or match.match_format or "T20", exclude_match_id=match_id)
+
+
+def rebuild_head_to_head(user_id=None):
+    """
+    Regenerate TeamPairSummary from Match/MatchScorecard, for every user or
+    only *user_id*'s. Returns the number of rows written. Does not commit.
+    """
+    existing = TeamPairSummary.query
+    query = Match.query
+    if user_id is not None:
+        existing = existing.filter(TeamPairSummary.user_id == user_id)
+        query = query.filter(Match.user_id == user_id)
+    # Existing rows are reset in place rather than bulk-deleted, so the
+    # session never holds a deleted row and its re-inserted twin.
+    rows = {(r.user_id, r.team_a_id, r.team_b_id, r.match_format): r for r in existing}
+
+    groups = defaultdict(list)
+    for match in query.order_by(Match.date, Match.id).all():
+        if _countable(match):
+            a, b = pair_of(match.home_team_id, match.away_team_id)
+            groups[(match.user_id, a, b, match.match_format or "T20")].append(match)
+
+    for key, matches in groups.items():
+        row = rows.pop(key, None)
+        if row is None:
+            row = _new_row(*key)
+            db.session.add(row)
+        else:
+            _reset(row)
+        _fold_all(row, matches, _cards_for(m.id for m in matches))
+    for row in rows.values():
+        db.session.delete(row)
+    return len(groups)
+
+
+def merge_summaries(rows):
+    """
+    Combine one pair's per-format rows (all normalized to the same team_a /
+    team_b) into a single dict; used when no format filter is given.
+    """
+    merged = {
+        "played": 0, "team_a_wins": 0, "team_b_wins": 0, "ties": 0, "no_results": 0,
+        "team_a_runs": 0, "team_b_runs": 0, "highest": None, "lowest": None,
+        "recent": [], "performers": {},
+    }
+    for row in rows:
+        for key in ("played", "team_a_wins", "team_b_wins", "ties", "no_results",
+                    "team_a_runs", "team_b_runs"):
+            merged[key] += getattr(row, key) or 0
+        if row.highest_total is not None and (
+            merged["highest"] is None or row.highest_total > merged["highest"][0]
+        ):
+            merged["highest"] = (row.highest_total, row.highest_total_team_id, row.highest_total_match_id)
+        if row.lowest_total is not None and (
+            merged["lowest"] is None or row.lowest_total < merged["lowest"][0]
+        ):
+            merged["lowest"] = (row.lowest_total, row.lowest_total_team_id, row.lowest_total_match_id)
+        merged["recent"].extend(json.loads(row.recent_results or "[]"))
+        for pid, perf in json.loads(row.performers or "{}").items():
+            into = merged["performers"].setdefault(pid, {**perf, "runs": 0, "wickets": 0, "matches": 0})
+            for key in ("runs", "wickets", "matches"):
+                into[key] += perf[key]
+    merged["recent"].sort(key=lambda r: (r["sort_key"], r["match_id"]), reverse=True)
+    del merged["recent"][RECENT_RESULTS:]
+    return merged
+
+
+def top_performers(performers, team_id, limit=TOP_PERFORMERS):
+    """Top *limit* performers for *team_id* by runs + wickets * WICKET_IMPACT."""
+    perfs = [
+        {"name": p["name"], "runs": p["runs"], "wickets": p["wickets"], "matches": p["matches"],
+         "impact": p["runs"] + p["wickets"] * WICKET_IMPACT}
+        for p in performers.values() if p["team_id"] == team_id
+    ]
+    perfs.sort(key=lambda x: x["impact"], reverse=True)
+    return perfs[:limit]
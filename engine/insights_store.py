@@ -0,0 +1,468 @@
+"""
+insights_store.py
+=================
+
+Materialized Statistics Hub insights (ConditionsSummary, PlayerFormSummary)
+behind StatsService.get_insights().
+
+get_insights() used to walk every Match a user owns for venue and pitch
+averages, then every scorecard for impact and form, on each request. The
+same accumulators now run once per archived match, per (user, format):
+
+  ConditionsSummary      matches / runs / wickets per venue and per pitch
+  PlayerFormSummary      impact counters per player, plus their last
+                         FORM_WINDOW batting and bowling values
+
+  apply_match()          — MatchArchiver._save_to_database, after the
+                           match's cards are flushed
+  reverse_match()        — reverse_player_aggregates(), before a match's
+                           cards are deleted (re-sim / delete); subtracts
+                           the match's counters, and re-reads only the form
+                           windows it sat in (the player's newest
+                           FORM_WINDOW other cards), so it never refolds
+                           the user's history
+  rebuild_insights()     — from scratch, for backfill and repair
+                           (scripts/rebuild_insights.py)
+
+Both read paths return the same shape: stored_insights() merges the stored
+rows (across formats when none is given), fold_insights() runs the
+accumulators over matches in memory — the tournament view, whose history is
+bounded. Super-over cards never count.
+"""
+
+import json
+from collections import defaultdict
+
+from sqlalchemy import func
+
+from database import db
+from database.models import ConditionsSummary, Match, MatchScorecard, Player, PlayerFormSummary, Team
+
+FORM_WINDOW = 5
+
+# Plain additive counters, in PlayerFormSummary column order.
+COUNTERS = ("runs", "wickets", "catches", "run_outs", "bat_innings", "bowl_innings")
+
+_KINDS = {"venue": "venues", "pitch": "pitches"}
+
+
+# ---------------------------------------------------------------------------
+# Accumulators
+# ---------------------------------------------------------------------------
+
+
+def conditions_of(match):
+    """{kind: label} plus (runs, wickets) for a match with both scores, else None."""
+    if match.home_team_score is None or match.away_team_score is None:
+        return None
+    labels = {
+        "venue": (match.venue or "Unknown Venue").strip(),
+        "pitch": (match.pitch_type or "Unknown Pitch").strip(),
+    }
+    runs = (match.home_team_score or 0) + (match.away_team_score or 0)
+    wickets = (match.home_team_wickets or 0) + (match.away_team_wickets or 0)
+    return labels, runs, wickets
+
+
+def new_form():
+    form = dict.fromkeys(COUNTERS, 0)
+    form["batting"], form["bowling"] = [], []
+    return form
+
+
+def _trim(series):
+    """Keep the newest FORM_WINDOW entries, oldest first."""
+    series.sort(key=lambda e: (e[0], e[1]))
+    del series[:-FORM_WINDOW]
+
+
+def _date_key(match):
+    return match.date.isoformat() if match.date else ""
+
+
+def add_card(form, card, match):
+    """Fold one non-super-over scorecard of *match* into *form*."""
+    form["catches"] += card.catches or 0
+    form["run_outs"] += card.run_outs or 0
+    if card.record_type == "batting":
+        runs = card.runs or 0
+        if (card.balls or 0) > 0 or runs > 0 or bool(card.is_out):
+            form["runs"] += runs
+            form["bat_innings"] += 1
+            form["batting"].append([_date_key(match), match.id, runs])
+            _trim(form["batting"])
+    elif card.record_type == "bowling":
+        if (card.balls_bowled or 0) > 0:
+            wickets = card.wickets or 0
+            form["wickets"] += wickets
+            form["bowl_innings"] += 1
+            form["bowling"].append([_date_key(match), match.id, wickets])
+            _trim(form["bowling"])
+
+
+def merge_forms(into, other):
+    """Add *other* into *into* (the same player, another match or format)."""
+    for key in COUNTERS:
+        into[key] += other[key]
+    for key in ("batting", "bowling"):
+        into[key].extend(other[key])
+        _trim(into[key])
+    return into
+
+
+def _fold_conditions(conditions, match):
+    found = conditions_of(match)
+    if found is None:
+        return
+    labels, runs, wickets = found
+    for kind, label in labels.items():
+        agg = conditions[_KINDS[kind]].setdefault(label, {"runs": 0, "wkts": 0, "matches": 0})
+        agg["runs"] += runs
+        agg["wkts"] += wickets
+        agg["matches"] += 1
+
+
+def _new_conditions():
+    return {"venues": {}, "pitches": {}}
+
+
+# ---------------------------------------------------------------------------
+# Row <-> dict
+# ---------------------------------------------------------------------------
+
+
+def _load_form(row):
+    form = {key: getattr(row, key) or 0 for key in COUNTERS}
+    form["batting"] = json.loads(row.batting_series or "[]")
+    form["bowling"] = json.loads(row.bowling_series or "[]")
+    return form
+
+
+def _store_form(row, form):
+    for key in COUNTERS:
+        setattr(row, key, form[key])
+    row.batting_series = json.dumps(form["batting"])
+    row.bowling_series = json.dumps(form["bowling"])
+
+
+def _store_condition(row, agg):
+    row.matches, row.runs, row.wickets = agg["matches"], agg["runs"], agg["wkts"]
+
+
+def _replace(existing, fresh, create, store):
+    """
+    Make the rows in *existing* ({key: row}) hold *fresh* ({key: value}).
+    Rows are updated in place and leftovers deleted, so the session never
+    holds a deleted row and its re-inserted twin.
+    """
+    for key, value in fresh.items():
+        row = existing.pop(key, None)
+        if row is None:
+            row = create(*key)
+            db.session.add(row)
+        store(row, value)
+    for row in existing.values():
+        db.session.delete(row)
+    return len(fresh)
+
+
+def _new_condition_row(user_id, match_format, kind, label):
+    return ConditionsSummary(user_id=user_id, match_format=match_format, kind=kind, label=label)
+
+
+def _new_form_row(user_id, match_format, player_id):
+    return PlayerFormSummary(user_id=user_id, match_format=match_format, player_id=player_id)
+
+
+def _condition_values(conditions, user_id, match_format):
+    return {
+        (user_id, match_format, kind, label): agg
+        for kind, section in _KINDS.items()
+        for label, agg in conditions[section].items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+
+def _format_of(match):
+    return match.match_format or "T20"
+
+
+def _in_format(match_format):
+    return func.coalesce(Match.match_format, "T20") == match_format
+
+
+def apply_match(match, cards):
+    """Add one archived match (its scorecards already flushed) to the store."""
+    if not match.user_id:
+        return
+    fmt = _format_of(match)
+
+    conditions = _new_conditions()
+    _fold_conditions(conditions, match)
+    for (_, _, kind, label), agg in _condition_values(conditions, match.user_id, fmt).items():
+        row = ConditionsSummary.query.filter_by(
+            user_id=match.user_id, match_format=fmt, kind=kind, label=label
+        ).first()
+        if row is None:
+            row = _new_condition_row(match.user_id, fmt, kind, label)
+            row.matches = row.runs = row.wickets = 0
+            db.session.add(row)
+        row.matches += agg["matches"]
+        row.runs += agg["runs"]
+        row.wickets += agg["wkts"]
+
+    per_player = defaultdict(new_form)
+    for card in cards:
+        if not card.is_super_over:
+            add_card(per_player[card.player_id], card, match)
+    if not per_player:
+        return
+    rows = {
+        row.player_id: row
+        for row in PlayerFormSummary.query.filter(
+            PlayerFormSummary.user_id == match.user_id,
+            PlayerFormSummary.match_format == fmt,
+            PlayerFormSummary.player_id.in_(list(per_player)),
+        )
+    }
+    for player_id, delta in per_player.items():
+        row = rows.get(player_id)
+        if row is None:
+            row = _new_form_row(match.user_id, fmt, player_id)
+            db.session.add(row)
+            form = new_form()
+        else:
+            form = _load_form(row)
+        _store_form(row, merge_forms(form, delta))
+
+
+def _fold_forms(cards_with_matches, key_of):
+    forms = defaultdict(new_form)
+    for card, match in cards_with_matches:
+        add_card(forms[key_of(card, match)], card, match)
+    return forms
+
+
+def _scored_cards(query):
+    return (
+        query.join(Match, MatchScorecard.match_id == Match.id)
+        .filter(MatchScorecard.is_super_over.isnot(True))
+        .order_by(Match.date, Match.id)
+    )
+
+
+def _subtract_conditions(match, match_format):
+    found = conditions_of(match)
+    if found is None:
+        return
+    labels, runs, wickets = found
+    for kind, label in labels.items():
+        row = ConditionsSummary.query.filter_by(
+            user_id=match.user_id, match_format=match_format, kind=kind, label=label
+        ).first()
+        if row is None:
+            continue
+        row.matches = (row.matches or 0) - 1
+        if row.matches <= 0:
+            db.session.delete(row)
+            continue
+        row.runs = max(0, (row.runs or 0) - runs)
+        row.wickets = max(0, (row.wickets or 0) - wickets)
+
+
+def _counted(record_type):
+    """SQL twin of add_card()'s "does this card count" test."""
+    if record_type == "batting":
+        return ((MatchScorecard.balls > 0) | (MatchScorecard.runs > 0)
+                | (MatchScorecard.is_out.is_(True)))
+    return MatchScorecard.balls_bowled > 0
+
+
+def _window(user_id, match_format, player_id, record_type, exclude_match_id):
+    """A player's newest FORM_WINDOW counted values without one match, oldest first."""
+    value = MatchScorecard.runs if record_type == "batting" else MatchScorecard.wickets
+    rows = (
+        db.session.query(Match.date, Match.id, value)
+        .join(MatchScorecard, MatchScorecard.match_id == Match.id)
+        .filter(
+            Match.user_id == user_id, _in_format(match_format), Match.id != exclude_match_id,
+            MatchScorecard.player_id == player_id,
+            MatchScorecard.record_type == record_type,
+            MatchScorecard.is_super_over.isnot(True),
+            _counted(record_type),
+        )
+        .order_by(Match.date.desc(), Match.id.desc())
+        .limit(FORM_WINDOW)
+        .all()
+    )
+    return [[date.isoformat() if date else "", mid, v or 0] for date, mid, v in reversed(rows)]
+
+
+def reverse_match(match_id, match_format=None, cards=None):
+    """
+    Take one match out of the store. Call before the match's cards are
+    deleted and before its Match row is re-labelled (re-sim): the venue,
+    pitch and scores subtracted are the ones it was archived with.
+    *match_format* overrides the row's format, *cards* its scorecards
+    (looked up when not given).
+
+    Counters are subtracted directly; only a form window the match sits in
+    is re-read, as the player's newest FORM_WINDOW other cards.
+    """
+    match = db.session.get(Match, match_id)
+    if match is None or not match.user_id:
+        return
+    fmt = match_format or _format_of(match)
+    _subtract_conditions(match, fmt)
+
+    if cards is None:
+        cards = MatchScorecard.query.filter_by(match_id=match_id).all()
+    per_player = defaultdict(new_form)
+    for card in cards:
+        if not card.is_super_over:
+            add_card(per_player[card.player_id], card, match)
+    if not per_player:
+        return
+    player_ids = list(per_player)
+    rows = PlayerFormSummary.query.filter(
+        PlayerFormSummary.user_id == match.user_id,
+        PlayerFormSummary.match_format == fmt,
+        PlayerFormSummary.player_id.in_(player_ids),
+    ).all()
+    # A fold keeps a row for every player with a card in scope, counted or not.
+    remaining = {
+        pid for (pid,) in db.session.query(MatchScorecard.player_id)
+        .join(Match, MatchScorecard.match_id == Match.id)
+        .filter(
+            Match.user_id == match.user_id, _in_format(fmt), Match.id != match_id,
+            MatchScorecard.player_id.in_(player_ids),
+            MatchScorecard.is_super_over.isnot(True),
+        ).distinct()
+    }
+    for row in rows:
+        if row.player_id not in remaining:
+            db.session.delete(row)
+            continue
+        form, delta = _load_form(row), per_player[row.player_id]
+        for key in COUNTERS:
+            form[key] = max(0, form[key] - delta[key])
+        for key in ("batting", "bowling"):
+            if any(entry[1] == match_id for entry in form[key]):
+                form[key] = _window(match.user_id, fmt, row.player_id, key, match_id)
+        _store_form(row, form)
+
+
+def rebuild_insights(user_id=None):
+    """
+    Regenerate ConditionsSummary and PlayerFormSummary from Match /
+    MatchScorecard, for every user or only *user_id*'s. Returns the number
+    of rows written. Does not commit.
+    """
+    existing_conditions = ConditionsSummary.query
+    existing_forms = PlayerFormSummary.query
+    matches = Match.query.filter(Match.user_id.isnot(None))
+    cards = _scored_cards(db.session.query(MatchScorecard, Match)).filter(Match.user_id.isnot(None))
+    if user_id is not None:
+        existing_conditions = existing_conditions.filter(ConditionsSummary.user_id == user_id)
+        existing_forms = existing_forms.filter(PlayerFormSummary.user_id == user_id)
+        matches = matches.filter(Match.user_id == user_id)
+        cards = cards.filter(Match.user_id == user_id)
+
+    by_scope = defaultdict(_new_conditions)
+    for match in matches.all():
+        _fold_conditions(by_scope[(match.user_id, _format_of(match))], match)
+    conditions = {}
+    for (owner, fmt), folded in by_scope.items():
+        conditions.update(_condition_values(folded, owner, fmt))
+    written = _replace(
+        {(r.user_id, r.match_format, r.kind, r.label): r for r in existing_conditions},
+        conditions, _new_condition_row, _store_condition,
+    )
+
+    forms = _fold_forms(cards.yield_per(1000),
+                        lambda card, match: (match.user_id, _format_of(match), card.player_id))
+    written += _replace(
+        {(r.user_id, r.match_format, r.player_id): r for r in existing_forms},
+        forms, _new_form_row, _store_form,
+    )
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+def _with_names(forms, names):
+    """Attach player/team names; players not on one of the user's teams drop out."""
+    return {
+        pid: {**form, "player": names[pid][0], "team": names[pid][1]}
+        for pid, form in forms.items() if pid in names
+    }
+
+
+def stored_insights(user_id, match_format=None):
+    """
+    (conditions, forms) from the store, merged across formats when
+    *match_format* is not given.
+
+    conditions: {"venues"|"pitches": {label: {"runs", "wkts", "matches"}}}
+    forms:      {player_id: {player, team, <COUNTERS>, batting, bowling}}
+    """
+    condition_query = db.session.query(
+        ConditionsSummary.kind, ConditionsSummary.label,
+        func.sum(ConditionsSummary.matches), func.sum(ConditionsSummary.runs),
+        func.sum(ConditionsSummary.wickets),
+    ).filter(ConditionsSummary.user_id == user_id)
+    form_query = (
+        db.session.query(PlayerFormSummary, Player.name, Team.name)
+        .join(Player, PlayerFormSummary.player_id == Player.id)
+        .join(Team, Player.team_id == Team.id)
+        .filter(PlayerFormSummary.user_id == user_id, Team.user_id == user_id)
+    )
+    if match_format:
+        condition_query = condition_query.filter(ConditionsSummary.match_format == match_format)
+        form_query = form_query.filter(PlayerFormSummary.match_format == match_format)
+
+    conditions = _new_conditions()
+    for kind, label, matches, runs, wickets in condition_query.group_by(
+        ConditionsSummary.kind, ConditionsSummary.label
+    ):
+        conditions[_KINDS[kind]][label] = {"runs": runs or 0, "wkts": wickets or 0, "matches": matches or 0}
+
+    forms, names = defaultdict(new_form), {}
+    for row, player_name, team_name in form_query.all():
+        merge_forms(forms[row.player_id], _load_form(row))
+        names[row.player_id] = (player_name, team_name)
+    return conditions, _with_names(forms, names)
+
+
+def fold_insights(user_id, tournament_id=None, match_format=None):
+    """stored_insights()'s (conditions, forms), folded from the matches themselves."""
+    matches = Match.query.filter(Match.user_id == user_id)
+    cards = (
+        _scored_cards(db.session.query(MatchScorecard, Match, Player.name, Team.name))
+        .join(Player, MatchScorecard.player_id == Player.id)
+        .join(Team, Player.team_id == Team.id)
+        .filter(Team.user_id == user_id)
+    )
+    if tournament_id:
+        matches = matches.filter(Match.tournament_id == tournament_id)
+        cards = cards.filter(Match.tournament_id == tournament_id)
+    if match_format:
+        matches = matches.filter(_in_format(match_format))
+        cards = cards.filter(_in_format(match_format))
+
+    conditions = _new_conditions()
+    for match in matches.all():
+        _fold_conditions(conditions, match)
+
+    forms, names = defaultdict(new_form), {}
+    for card, match, player_name, team_name in cards.all():
+        add_card(forms[card.player_id], card, match)
+        names[card.player_id] = (player_name, team_name)
+    return conditions, _with_names(forms, names)
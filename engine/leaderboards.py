@@ -0,0 +1,188 @@
+"""
+leaderboards.py
+===============
+
+Top-K leaderboards computed in SQLite.
+
+compute_leaderboards() answers every category for one scope — overall,
+one tournament, optionally one format — with three statements:
+
+  1. player categories in one pass: the per-player GROUP BY from
+     scorecard_aggregates.player_totals_subquery(), ranked once per
+     category with ROW_NUMBER() OVER (ORDER BY …), keeping rows that
+     place top-K in any category
+        most_runs      bat_runs
+        most_wickets   bowl_wickets, then fewest runs conceded
+        best_strike    strike rate, qualified on min_balls faced
+        best_economy   economy, qualified on min_overs bowled
+        motm           Man-of-the-Match awards in scope
+  2. best_figures: single-spell figures, ORDER BY wickets DESC, runs ASC
+     LIMIT K over the bowling cards
+  3. partnerships: ORDER BY runs DESC LIMIT K
+
+Non-qualifying players are ranked after every qualifier so a top-K rank
+always means a genuine leaderboard place. Ties break on player_id so the
+output is deterministic. Super-over cards are excluded throughout.
+
+StatsService.get_leaderboards() wraps this in the versioned result cache.
+"""
+
+from sqlalchemy import and_, case, func, or_, select
+
+from database import db
+from database.models import Match, MatchPartnership, MatchScorecard, Player, Team
+from engine.cricket_math import balls_to_overs_float
+from engine.partnership_index import scoped as partnership_scope
+from engine.scorecard_aggregates import player_totals_subquery
+
+CATEGORIES = ("most_runs", "most_wickets", "best_strike", "best_economy",
+              "motm", "best_figures", "partnerships")
+
+DEFAULT_MIN_BALLS = 30
+DEFAULT_MIN_OVERS = 5
+
+
+def _motm_subquery(user_id, tournament_id, match_format):
+    query = (
+        db.session.query(Match.motm_player_id.label("player_id"),
+                         func.count(Match.id).label("awards"))
+        .filter(Match.user_id == user_id, Match.motm_player_id.isnot(None))
+    )
+    if tournament_id is not None:
+        query = query.filter(Match.tournament_id == tournament_id)
+    if match_format:
+        query = query.filter(Match.match_format == match_format)
+    return query.group_by(Match.motm_player_id).subquery()
+
+
+def _player_categories(user_id, tournament_id, match_format, k, min_balls, min_overs):
+    totals = player_totals_subquery(user_id, tournament_id, match_format)
+    motm = _motm_subquery(user_id, tournament_id, match_format)
+
+    # Every player with cards or an award in scope.
+    players = select(totals.c.player_id).union(select(motm.c.player_id)).subquery()
+    c = totals.c
+    runs, balls = func.coalesce(c.bat_runs, 0), func.coalesce(c.bat_balls, 0)
+    wickets = func.coalesce(c.bowl_wickets, 0)
+    conceded, bowled = func.coalesce(c.bowl_runs, 0), func.coalesce(c.bowl_balls, 0)
+    awards = func.coalesce(motm.c.awards, 0)
+
+    sr_ok = and_(balls > 0, balls >= min_balls)
+    econ_ok = and_(bowled > 0, bowled >= min_overs * 6)
+    strike_rate = case((sr_ok, runs * 100.0 / balls))
+    economy = case((econ_ok, conceded * 6.0 / bowled))
+    pid = players.c.player_id
+
+    def rank(*order):
+        return func.row_number().over(order_by=(*order, pid))
+
+    ranked = (
+        db.session.query(
+            pid.label("player_id"),
+            Player.name.label("name"),
+            Team.name.label("team"),
+            runs.label("runs"), balls.label("balls"),
+            wickets.label("wickets"), conceded.label("conceded"), bowled.label("bowled"),
+            awards.label("awards"),
+            strike_rate.label("strike_rate"), economy.label("economy"),
+            rank(case((runs > 0, 0), else_=1), runs.desc()).label("most_runs"),
+            rank(case((wickets > 0, 0), else_=1), wickets.desc(), conceded.asc()).label("most_wickets"),
+            rank(case((sr_ok, 0), else_=1), strike_rate.desc()).label("best_strike"),
+            rank(case((econ_ok, 0), else_=1), economy.asc()).label("best_economy"),
+            rank(case((awards > 0, 0), else_=1), awards.desc()).label("motm"),
+        )
+        .select_from(players)
+        .outerjoin(totals, totals.c.player_id == pid)
+        .outerjoin(motm, motm.c.player_id == pid)
+        .join(Player, Player.id == pid)
+        .join(Team, Team.id == Player.team_id)
+        .filter(Team.user_id == user_id)
+    ).subquery()
+
+    r = ranked.c
+    rows = (
+        db.session.query(ranked)
+        .filter(or_(r.most_runs <= k, r.most_wickets <= k, r.best_strike <= k,
+                    r.best_economy <= k, r.motm <= k))
+        .all()
+    )
+
+    boards = {name: [] for name in ("most_runs", "most_wickets", "best_strike", "best_economy", "motm")}
+    for row in rows:
+        base = {"player_id": row.player_id, "player": row.name, "team": row.team}
+        if row.most_runs <= k and row.runs > 0:
+            boards["most_runs"].append((row.most_runs, {**base, "runs": row.runs, "balls": row.balls}))
+        if row.most_wickets <= k and row.wickets > 0:
+            boards["most_wickets"].append((row.most_wickets, {
+                **base, "wickets": row.wickets, "runs": row.conceded,
+                "overs": balls_to_overs_float(row.bowled),
+            }))
+        if row.best_strike <= k and row.strike_rate is not None:
+            boards["best_strike"].append((row.best_strike, {
+                **base, "strike_rate": round(row.strike_rate, 2), "runs": row.runs, "balls": row.balls,
+            }))
+        if row.best_economy <= k and row.economy is not None:
+            boards["best_economy"].append((row.best_economy, {
+                **base, "economy": round(row.economy, 2), "overs": balls_to_overs_float(row.bowled),
+                "wickets": row.wickets,
+            }))
+        if row.motm <= k and row.awards > 0:
+            boards["motm"].append((row.motm, {**base, "awards": row.awards}))
+    return {name: [entry for _, entry in sorted(board, key=lambda x: x[0])]
+            for name, board in boards.items()}
+
+
+def _best_figures(user_id, tournament_id, match_format, k):
+    c = MatchScorecard
+    query = (
+        db.session.query(
+            c.player_id, Player.name, Team.name, Match.id, Match.date,
+            func.coalesce(c.wickets, 0).label("wickets"),
+            func.coalesce(c.runs_conceded, 0).label("runs"),
+            func.coalesce(c.balls_bowled, 0).label("balls"),
+        )
+        .join(Match, c.match_id == Match.id)
+        .join(Player, c.player_id == Player.id)
+        .join(Team, Player.team_id == Team.id)
+        .filter(Team.user_id == user_id, c.record_type == "bowling",
+                c.wickets > 0, c.is_super_over.isnot(True))
+    )
+    if tournament_id is not None:
+        query = query.filter(Match.tournament_id == tournament_id)
+    if match_format:
+        query = query.filter(Match.match_format == match_format)
+    rows = query.order_by(c.wickets.desc(), func.coalesce(c.runs_conceded, 0).asc(), c.id).limit(k).all()
+    return [{
+        "player_id": pid, "player": name, "team": team,
+        "figures": f"{wickets}/{runs}", "wickets": wickets, "runs": runs,
+        "overs": balls_to_overs_float(balls), "match_id": match_id,
+        "match_date": date.strftime("%Y-%m-%d") if date else "N/A",
+    } for pid, name, team, match_id, date, wickets, runs, balls in rows]
+
+
+def _partnerships(user_id, tournament_id, match_format, k):
+    # Scope columns live on the partnership row (engine/partnership_index.py).
+    query = db.session.query(MatchPartnership.batsman1_id, MatchPartnership.batsman2_id,
+                             MatchPartnership.runs, MatchPartnership.balls,
+                             MatchPartnership.wicket_number, MatchPartnership.match_id)
+    query = partnership_scope(query, user_id, tournament_id, match_format)
+    rows = query.order_by(MatchPartnership.runs.desc(), MatchPartnership.id).limit(k).all()
+    ids = {pid for row in rows for pid in (row[0], row[1])}
+    names = dict(db.session.query(Player.id, Player.name).filter(Player.id.in_(ids)).all()) if ids else {}
+    return [{
+        "batsman1": names.get(b1, "Unknown"), "batsman2": names.get(b2, "Unknown"),
+        "runs": runs, "balls": balls, "wicket": wicket, "match_id": match_id,
+    } for b1, b2, runs, balls, wicket, match_id in rows]
+
+
+def compute_leaderboards(user_id, tournament_id=None, match_format=None, k=5,
+                         min_balls=DEFAULT_MIN_BALLS, min_overs=DEFAULT_MIN_OVERS):
+    """
+    Every leaderboard category (see CATEGORIES) for one scope, top k each.
+
+    min_balls / min_overs qualify the strike-rate and economy tables.
+    """
+    boards = _player_categories(user_id, tournament_id, match_format, k, min_balls, min_overs)
+    boards["best_figures"] = _best_figures(user_id, tournament_id, match_format, k)
+    boards["partnerships"] = _partnerships(user_id, tournament_id, match_format, k)
+    return boards
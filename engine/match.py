@@ -1,4 +1,6 @@
 import builtins
+import contextlib
+import contextvars
 import copy
 import dataclasses
 import logging
@@ -11,7 +13,12 @@ from engine import dls
 from engine import weather as weather_engine
 from engine.ball_outcome import calculate_outcome
 from engine.super_over_outcome import calculate_super_over_outcome
+from engine.super_over_sim import (
+    SuperOverState, apply_super_over_ball, new_batsman_stats,
+    select_super_over_batsmen, select_super_over_bowler,
+)
 from engine.cricket_math import balls_to_overs_str
+from engine.scorecard import InningsScorecard, render_scorecard_block
 from match_archiver import MatchArchiver, find_original_json_file
 from engine.pressure_engine import PressureEngine
 from engine.game_state_engine import (
@@ -68,10 +75,25 @@ _CORRECT_TOSS_CHOICE: dict = {
 # Guard console output on Windows consoles that choke on emoji/unicode.
 from engine.commentary_engine import CommentaryEngine
 
+# Headless runs (tournament auto-sim) stay silent even with debug prints on;
+# a context variable, so a live match in another thread/greenlet still prints.
+_QUIET = contextvars.ContextVar("match_quiet", default=False)
+
+
+@contextlib.contextmanager
+def quiet_output():
+    """Suppress the engine's console output in the current context."""
+    token = _QUIET.set(True)
+    try:
+        yield
+    finally:
+        _QUIET.reset(token)
+
+
 def safe_print(*args, **kwargs):
     # Suppress high-volume simulation debug output in production by default.
     # Enable with `SIMCRICKET_DEBUG_PRINTS=1` when deep tracing is needed.
-    if not _MATCH_DEBUG_PRINTS:
+    if not _MATCH_DEBUG_PRINTS or _QUIET.get():
         return
     try:
         builtins.print(*args, **kwargs)
@@ -197,6 +219,9 @@ class Match:
         self.current_over_runs = 0
         self.current_over_outcomes = []
         self.bowler_stats = {p["name"]: self._new_bowling_stats(p) for p in self.bowling_team if p["will_bowl"]}
+        # Scorecard models (engine/scorecard.py): live innings + frozen innings.
+        self._scorecard_model = None
+        self._innings_scorecards = {}
 
         self.current_striker = self.batting_team[0]
         self.current_non_striker = self.batting_team[1]
@@ -228,6 +253,9 @@ class Match:
         # Feature 3: count of legal + extra deliveries bowled this innings
         # (used to compute pitch_wear = innings_balls_bowled / 120.0)
         self.innings_balls_bowled: int = 0
+        # Deliveries across the whole match (never reset; fast_forward() uses
+        # it to tell a delivery from a state-only next_ball() call)
+        self.deliveries_bowled: int = 0
 
         # Feature 8: runs conceded per over by each bowler (keyed by name)
         # populated at over completion; read in _get_effective_bowler_dict()
@@ -297,6 +325,7 @@ class Match:
 
         # Initialize Commentary Engine
         self.commentary_engine = CommentaryEngine()
+        self._fast_forwarding = False  # set by fast_forward(); skips rich commentary
 
         # Initialize Scenario Engine (if scenario_mode is set)
         self.scenario_mode = match_data.get("scenario_mode", None)
@@ -605,84 +634,47 @@ class Match:
         return result, 200
 
     def _format_scorecard_block(self, scorecard, title):
-        if not scorecard:
-            return ""
-        total = scorecard.get("total_score", 0)
-        wkts = scorecard.get("wickets", 0)
-        overs = scorecard.get("overs", "0.0")
-
-        def dismissal_text(player):
-            wicket_type = (player.get("wicket_type") or "").strip()
-            bowler_out = (player.get("bowler_out") or "").strip()
-            fielder_out = (player.get("fielder_out") or "").strip()
-            status = (player.get("status") or "").strip()
-            runs = player.get("runs", "")
-            balls = player.get("balls", "")
-
-            # Player has not batted.
-            if runs == "" and balls == "":
-                return "DNB"
-
-            # Not out batter at innings end.
-            if not wicket_type:
-                if status.lower() == "not out":
-                    return "not out*"
-                return status if status else "not out*"
-
-            if wicket_type == "Caught":
-                if fielder_out and bowler_out:
-                    return f"c {fielder_out} b {bowler_out}"
-                if bowler_out:
-                    return f"c ? b {bowler_out}"
-                return "c ? b ?"
-            if wicket_type == "Bowled":
-                return f"b {bowler_out}" if bowler_out else "b ?"
-            if wicket_type == "LBW":
-                return f"lbw b {bowler_out}" if bowler_out else "lbw b ?"
-            if wicket_type == "Run Out":
-                return f"run out ({fielder_out})" if fielder_out else "run out"
-            if wicket_type == "Stumped":
-                if fielder_out and bowler_out:
-                    return f"st {fielder_out} b {bowler_out}"
-                if bowler_out:
-                    return f"st ? b {bowler_out}"
-                return "st ? b ?"
-            if wicket_type == "Hit Wicket":
-                return f"hit wicket b {bowler_out}" if bowler_out else "hit wicket"
-
-            # Fallback for any uncommon dismissal status.
-            return status if status else wicket_type
-
-        batting_rows = "".join(
-            f"<tr><td>{p.get('name','')}</td><td>{dismissal_text(p)}</td><td>{p.get('runs',0)}</td><td>{p.get('balls',0)}</td><td>{p.get('fours',0)}</td><td>{p.get('sixes',0)}</td></tr>"
-            for p in scorecard.get("players", [])
-        )
-        bowling_rows = "".join(
-            f"<tr><td>{b.get('name','')}</td><td>{b.get('overs',0)}</td><td>{b.get('maidens',0)}</td><td>{b.get('runs',0)}</td><td>{b.get('wickets',0)}</td></tr>"
-            for b in scorecard.get("bowlers", [])
-        )
-        return (
-            f"<strong>{title}</strong><br>"
-            f"Total: {total}/{wkts} ({overs} ov)<br>"
-            f"<div style='margin-top:6px;font-weight:600;'>Batting</div>"
-            f"<table style='width:100%;border-collapse:collapse;font-size:0.85rem;'>"
-            f"<thead><tr><th style='text-align:left;border-bottom:1px solid #444;'>Batter</th>"
-            f"<th style='text-align:left;border-bottom:1px solid #444;'>Dismissal</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>R</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>B</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>4s</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>6s</th></tr></thead>"
-            f"<tbody>{batting_rows}</tbody></table>"
-            f"<div style='margin-top:8px;font-weight:600;'>Bowling</div>"
-            f"<table style='width:100%;border-collapse:collapse;font-size:0.85rem;'>"
-            f"<thead><tr><th style='text-align:left;border-bottom:1px solid #444;'>Bowler</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>O</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>M</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>R</th>"
-            f"<th style='text-align:right;border-bottom:1px solid #444;'>W</th></tr></thead>"
-            f"<tbody>{bowling_rows}</tbody></table>"
+        return render_scorecard_block(scorecard, title)
+
+    def _live_scorecard(self):
+        """The live innings' scorecard model, brought up to date with the
+        rows next_ball() marked dirty since the previous call."""
+        model = getattr(self, "_scorecard_model", None)
+        if model is None:
+            model = self._scorecard_model = InningsScorecard()
+        model.refresh(self.batsman_stats, self.bowler_stats)
+        return model
+
+    def _mark_scorecard_dirty(self):
+        """Flag the rows the current delivery can touch: both batters (runs,
+        balls, dismissals incl. non-striker run-outs) and the bowler."""
+        model = getattr(self, "_scorecard_model", None)
+        if model is None:
+            return
+        model.mark_dirty(
+            batters=[(p or {}).get("name") for p in (self.current_striker, self.current_non_striker)],
+            bowlers=[(self.current_bowler or {}).get("name")],
         )
 
+    def innings_scorecard(self, innings_number):
+        """Scorecard model for a completed innings (1 or 2), built once from
+        the frozen first/second innings stats — the archiver renders its text
+        and CSV outputs from this. Later calls only rebuild if the frozen
+        stats were replaced."""
+        if innings_number == 1:
+            batting = getattr(self, "first_innings_batting_stats", None)
+            bowling = getattr(self, "first_innings_bowling_stats", None)
+        else:
+            batting = getattr(self, "second_innings_batting_stats", None)
+            bowling = getattr(self, "second_innings_bowling_stats", None)
+        models = getattr(self, "_innings_scorecards", None)
+        if models is None:
+            models = self._innings_scorecards = {}
+        model = models.get(innings_number)
+        if model is None:
+            model = models[innings_number] = InningsScorecard()
+        model.refresh(batting, bowling)
+        return model
 
     def _calculate_current_match_state(self):
         """Calculate current match state for pressure calculation"""
@@ -3814,8 +3806,12 @@ class Match:
             self._dls_g50(),
         )
 
-    def _recompute_dls_target(self):
-        """Re-derive the chase target after an innings-2 interruption."""
+    def _recompute_dls_target(self, balls_at_stop, balls_at_resume):
+        """Charge an innings-2 interruption to the chase ledger and re-derive
+        the target. Both read the per-ball surface, like the live par."""
+        self.dls_ledger_innings2.record_interruption_balls(
+            balls_at_stop, self.wickets, balls_at_resume
+        )
         self.target = dls.compute_target(
             self.first_innings_score,
             self.dls_ledger_innings1.available(),
@@ -3824,20 +3820,24 @@ class Match:
         )
         return self.target
 
-    def _current_dls_par(self):
+    def _current_dls_par(self, balls_left=None):
         """Live DLS par score for the chase (None when not applicable). The
-        chasing side wins a washed-out match if it is ahead of this number."""
+        chasing side wins a washed-out match if it is ahead of this number.
+        `balls_left` overrides the live count (0 = the allocation is spent)."""
         if (self.innings != 2 or not self.rain_affected
                 or self.first_innings_score is None):
             return None
         if self.dls_ledger_innings2 is None:
             self.dls_ledger_innings2 = dls.ResourceLedger(self.overs)
-        return dls.par_score(
+        if balls_left is None:
+            balls_left = self._balls_left_in_innings()
+        return dls.par_score_balls(
             self.first_innings_score,
             self.dls_ledger_innings1.available(),
             self.dls_ledger_innings2.available(),
-            dls.overs_from_balls(self._balls_left_in_innings()),
+            balls_left,
             self.wickets,
+            self._dls_g50(),
         )
 
     def _rain_commentary(self, kind, **ctx):
@@ -3946,17 +3946,17 @@ class Match:
         if self.innings == 1:
             prev_allocation = self.overs
             if rtype == weather_engine.INNINGS_TERMINATED:
-                self.dls_ledger_innings1.record_termination(
-                    prev_allocation - overs_completed, self.wickets
+                self.dls_ledger_innings1.record_termination_balls(
+                    (prev_allocation - overs_completed) * 6, self.wickets
                 )
                 self._set_innings_overs(overs_completed)
                 lines += self._rain_commentary(
                     "innings1_cut", score=self.score, wickets=self.wickets
                 )
             else:  # RESUME
-                self.dls_ledger_innings1.record_interruption(
-                    prev_allocation - overs_completed, self.wickets,
-                    revised - overs_completed,
+                self.dls_ledger_innings1.record_interruption_balls(
+                    (prev_allocation - overs_completed) * 6, self.wickets,
+                    (revised - overs_completed) * 6,
                 )
                 self._set_innings_overs(revised)
                 lines += self._rain_commentary(
@@ -3979,19 +3979,15 @@ class Match:
         prev_allocation = self.overs
 
         if rtype == weather_engine.CHASE_TERMINATED:
-            self.dls_ledger_innings2.record_termination(
-                prev_allocation - overs_completed, self.wickets
-            )
-            self._recompute_dls_target()
+            self._recompute_dls_target((prev_allocation - overs_completed) * 6, 0)
             return {"final": self._finalize_chase_terminated(lines)}
 
         # RESUME
-        self.dls_ledger_innings2.record_interruption(
-            prev_allocation - overs_completed, self.wickets,
-            revised - overs_completed,
+        self._recompute_dls_target(
+            (prev_allocation - overs_completed) * 6,
+            (revised - overs_completed) * 6,
         )
         self._set_innings_overs(revised)
-        self._recompute_dls_target()
         kind = "chase_reduced_before_start" if overs_completed == 0 else "resume_chase"
         lines += self._rain_commentary(
             kind, target=self.target, revised_overs=revised,
@@ -4011,8 +4007,9 @@ class Match:
         }
         return {"lines": lines, "info": info}
 
-    def _rain_final_payload(self, scorecard_data, lines):
-        """Common shape for a rain-decided match-over response."""
+    def _rain_final_payload(self, scorecard_data, lines, dls_par=None):
+        """Common shape for a rain-decided match-over response. `dls_par` is
+        the par that decided a terminated chase (None otherwise)."""
         lines = list(lines)
         lines.append(f"<strong>Match Over!</strong> {self.result}")
         return {
@@ -4023,6 +4020,7 @@ class Match:
             "result": self.result,
             "commentary": "<br>".join(lines),
             "rain_affected": True,
+            "dls_par": dls_par,
         }
 
     def _finalize_no_result(self, lines):
@@ -4055,8 +4053,10 @@ class Match:
         return self._rain_final_payload(scorecard_data, lines)
 
     def _finalize_chase_terminated(self, lines):
-        """Rain has ended the chase after the minimum overs: DLS par decides."""
-        par = self.target - 1
+        """Rain has ended the chase after the minimum overs: DLS par decides.
+        The termination is already charged to the ledger, so par is read
+        with nothing left of the allocation — the same figure as target - 1."""
+        par = self._current_dls_par(balls_left=0)
         if self.wickets < 10 and self.current_partnership_balls > 0:
             self._save_partnership("not_out")
         chasing_code = self._get_team_name(self.batting_team)
@@ -4090,7 +4090,7 @@ class Match:
         self.innings = 3
         self._save_second_innings_stats()
         self._create_match_archive()
-        return self._rain_final_payload(scorecard_data, lines)
+        return self._rain_final_payload(scorecard_data, lines, dls_par=par)
 
     def _finalize_rain_chase_won(self, lines):
         """A target revision leaves the chasing side already home."""
@@ -4111,6 +4111,16 @@ class Match:
         return self._rain_final_payload(scorecard_data, lines)
 
     def next_ball(self):
+        # Every stats write for a delivery goes to the batters/bowler in place
+        # before or after it (strike rotation, new batter, over change), so
+        # marking both sides keeps the live scorecard exact without a diff.
+        self._mark_scorecard_dirty()
+        try:
+            return self._next_ball()
+        finally:
+            self._mark_scorecard_dirty()
+
+    def _next_ball(self):
         # Super Over guard: once a tie pushes the match into super-over state
         # (innings 4 = super over pending/in progress, 5 = decided), the normal
         # ball loop must NOT run. Without this guard a stray next_ball() — from a
@@ -4672,10 +4682,12 @@ class Match:
             this_ball_dot = outcome.get('runs', 0) == 0 or (outcome.get('is_extra') and outcome.get('extra_type', '') in ('Byes', 'Leg Bye') and outcome.get('runs', 0) == 0)
             comm_state['is_maiden_over'] = is_last_ball and self.current_over_runs == 0 and not self.current_over_maiden_invalid and this_ball_dot
 
-            # Generate new commentary
-            new_text = self.commentary_engine.get_commentary(outcome, comm_state)
-            if new_text:
-                outcome['description'] = new_text
+            # Generate new commentary (skipped while fast-forwarding — the
+            # outcome's plain description still goes into the replay log)
+            if not self._fast_forwarding:
+                new_text = self.commentary_engine.get_commentary(outcome, comm_state)
+                if new_text:
+                    outcome['description'] = new_text
 
         # No Ball: roll an additional bat outcome (no extras), wicket invalidated
         extra_type = outcome.get("extra_type")
@@ -4792,6 +4804,7 @@ class Match:
 
         # Feature 3: increment pitch wear counter for every delivery
         self.innings_balls_bowled += 1
+        self.deliveries_bowled += 1
 
         self.prev_delivery_was_extra = extra
 
@@ -5543,6 +5556,128 @@ class Match:
             "ball_data": ball_data_payload
         }
 
+    # ── FAST-FORWARD ───────────────────────────────────────────────────────────
+    # Server-side "sim to end of innings / sim to result": runs next_ball() in
+    # a tight loop instead of one request per delivery. Every stop condition
+    # a click-through would surface is honoured — manual-mode decisions,
+    # super overs (they need player selection), rain results — and rain
+    # interruptions that don't end the match are simply played through.
+
+    _FF_EXTRA_TYPES = {"Wide": "Wide", "NoBall": "No Ball", "Byes": "Byes", "LegBye": "Leg Bye"}
+
+    def _fast_forward_entry(self, pre, result):
+        """Compressed log entry for the delivery just bowled:
+        [innings, over, ball_in_over (0-based, pre-delivery), token, score, wickets]."""
+        innings, score_before, wickets_before, over, ball = pre[:5]
+        ball_data = result.get("ball_data")
+        if innings == 1 and self.innings == 2:
+            # First innings all out: the last wicket and the innings change share one call,
+            # and the live state has already been reset for the chase.
+            return [innings, over, ball, "W", self.first_innings_score, 10]
+        if ball_data:
+            runs = ball_data.get("runs", 0)
+            wicket = ball_data.get("batter_out", False)
+            extra = ball_data.get("is_extra", False)
+            token = self._ball_outcome_token(ball_data, wicket, runs, extra)
+        else:
+            # Final-ball payloads carry no ball_data; rebuild the token from
+            # the GSME event and the score delta.
+            event = self.ball_history[-1] if self.ball_history else {}
+            runs = self.score - score_before
+            extra_type = self._FF_EXTRA_TYPES.get(event.get("label"))
+            token = self._ball_outcome_token(
+                {"extra_type": extra_type,
+                 "bat_runs": event.get("runs") if extra_type == "No Ball" else None},
+                bool(event.get("is_wicket")) or self.wickets > wickets_before,
+                runs, bool(event.get("is_extra")),
+            )
+        return [innings, over, ball, token, self.score, self.wickets]
+
+    def fast_forward(self, until="result", max_deliveries=None):
+        """
+        Play the match on without per-ball requests.
+
+        until : "innings" — stop at the end of the current innings;
+                "result"  — carry on through the innings break to the result.
+
+        Stops early (and returns the triggering next_ball() payload as
+        `final`) on a manual-mode decision, a tie needing a super over, or
+        any error. Returns the compressed ball log, the per-delivery
+        commentary lines (for the resume replay log) and the final state.
+        """
+        if until not in ("innings", "result"):
+            raise ValueError("until must be 'innings' or 'result'")
+        if self.innings not in (1, 2):
+            return {"error": "match_not_in_progress", "innings": self.innings}
+
+        start_innings = self.innings
+        if max_deliveries is None:
+            # Two innings of wides-heavy cricket is well under 3x the legal balls.
+            max_deliveries = self.original_overs * 6 * 2 * 3
+
+        ball_log, commentary_lines, rain_events = [], [], []
+        result, stopped_on = {}, "limit"
+        idle_calls = 0
+        self._fast_forwarding = True
+        try:
+            while len(ball_log) < max_deliveries:
+                pre = (self.innings, self.score, self.wickets,
+                       self.current_over, self.current_ball, self.deliveries_bowled)
+                result = self.next_ball()
+
+                if result.get("commentary"):
+                    commentary_lines.append(result["commentary"])
+                if result.get("rain_interruption"):
+                    rain_events.append(result["rain_interruption"])
+                if self.deliveries_bowled > pre[5]:
+                    ball_log.append(self._fast_forward_entry(pre, result))
+                    idle_calls = 0
+                else:
+                    idle_calls += 1
+
+                if result.get("error"):
+                    stopped_on = "error"
+                    break
+                if result.get("match_over"):
+                    stopped_on = "match_over"
+                    break
+                if result.get("super_over_required"):
+                    stopped_on = "super_over"
+                    break
+                if result.get("decision_required"):
+                    stopped_on = "decision"
+                    break
+                if until == "innings" and (result.get("innings_end") or self.innings != start_innings):
+                    stopped_on = "innings_end"
+                    break
+                if idle_calls >= 3:
+                    # next_ball() keeps returning without bowling — hand back.
+                    stopped_on = "stalled"
+                    break
+        finally:
+            self._fast_forwarding = False
+
+        scorecard_data = result.get("scorecard_data")
+        if scorecard_data is None and self.innings in (1, 2):
+            scorecard_data = self._generate_detailed_scorecard()
+        return {
+            "fast_forward": True,
+            "until": until,
+            "stopped_on": stopped_on,
+            "deliveries": len(ball_log),
+            "ball_log": ball_log,
+            "rain_events": rain_events,
+            "commentary_lines": commentary_lines,
+            "innings_number": self.innings,
+            "score": result.get("final_score", self.score),
+            "wickets": result.get("wickets", self.wickets),
+            "target": getattr(self, "target", None),
+            "match_over": bool(result.get("match_over")),
+            "result": self.result if result.get("match_over") else None,
+            "scorecard_data": scorecard_data,
+            "final": result,
+        }
+
     def _generate_detailed_scorecard(self):
         """Generate detailed cricbuzz-style scorecard"""
         
@@ -5550,133 +5685,15 @@ class Match:
             team_name = self.data["team_home"].split("_")[0]
         else:
             team_name = self.data["team_away"].split("_")[0]
-        
-        players = []
 
-        # Loop through ALL players in batting order, not just those who batted
-        # from the _generate_detailed_scorecard function
-        for player in self.batting_team:
-            player_name = player["name"]
-            
-            if player_name in self.batsman_stats:
-                stats = self.batsman_stats[player_name]
-                
-                # PRODUCTION FIX: Display full stats if the player has a dismissal type OR has faced balls.
-                # This ensures 0-ball ducks are shown correctly.
-                if stats.get("wicket_type") or stats.get("balls", 0) > 0:
-                    strike_rate = (stats["runs"] * 100) / stats["balls"] if stats["balls"] > 0 else 0
-                    status_raw = stats.get("wicket_type") if stats.get("wicket_type") else "not out"
-                    status = status_raw
-                    
-                    if status_raw != "not out":
-                        if status_raw == "Caught":
-                            status = f"c. {stats.get('fielder_out', '?')} b. {stats.get('bowler_out', '?')}"
-                        elif status_raw == "Bowled":
-                            status = f"b. {stats.get('bowler_out', '?')}"
-                        elif status_raw == "LBW":
-                            status = f"lbw b. {stats.get('bowler_out', '?')}"
-                        elif status_raw == "Run Out":
-                            status = f"run out ({stats.get('fielder_out', '?')})"
-                        elif status_raw == "Stumped":
-                            status = f"st. {stats.get('fielder_out', '?')} b. {stats.get('bowler_out', '?')}"
-                        elif status_raw == "Hit Wicket":
-                             status = f"hit wicket b. {stats.get('bowler_out', '?')}"
-                    
-                    players.append({
-                        "name": player_name,
-                        "status": status,
-                        "wicket_type": stats.get("wicket_type", ""),
-                        "runs": stats["runs"],
-                        "balls": stats["balls"],
-                        "fours": stats["fours"],
-                        "sixes": stats["sixes"],
-                        "strike_rate": f"{strike_rate:.1f}",
-                        "bowler_out": stats["bowler_out"],
-                        "fielder_out": stats["fielder_out"]
-                    })
-                else:
-                    # Player didn't bat - show with empty stats
-                    players.append({
-                        "name": player_name,
-                        "status": "",
-                        "wicket_type": "",
-                        "runs": "",
-                        "balls": "",
-                        "fours": "",
-                        "sixes": "",
-                        "strike_rate": "",
-                        "bowler_out": "",
-                        "fielder_out": ""
-                    })
-            else:
-                # Player not in stats - did not bat
-                players.append({
-                    "name": player_name,
-                    "status": "",
-                    "wicket_type": "",
-                    "runs": "",
-                    "balls": "",
-                    "fours": "",
-                    "sixes": "",
-                    "strike_rate": "",
-                    "bowler_out": "",
-                    "fielder_out": ""
-                })
-
-        # Generate bowler stats - all players marked will_bowl
-        bowlers = []
-        for player in self.bowling_team:
-            if player.get("will_bowl", False):
-                player_name = player["name"]
-                
-                if player_name in self.bowler_stats:
-                    stats = self.bowler_stats[player_name]
-                    
-                    # Check if bowler actually bowled
-                    if stats["balls_bowled"] > 0 or stats["overs"] > 0:
-                        # Calculate economy rate
-                        total_balls = stats["overs"] * 6 + (stats["balls_bowled"] % 6)
-                        economy = (stats["runs"] * 6) / total_balls if total_balls > 0 else 0
-                        overs_display = f"{stats['overs']}.{stats['balls_bowled'] % 6}" if stats['balls_bowled'] % 6 > 0 else str(stats['overs'])
-                        
-                        bowlers.append({
-                            "name": player_name,
-                            "overs": overs_display,
-                            "maidens": stats["maidens"],
-                            "runs": stats["runs"],
-                            "wickets": stats["wickets"],
-                            "noballs": stats["noballs"],
-                            "wides": stats["wides"],
-                            "economy": f"{economy:.2f}"
-                        })
-                    else:
-                        # Bowler didn't bowl - empty stats
-                        bowlers.append({
-                            "name": player_name,
-                            "overs": "",
-                            "maidens": "",
-                            "runs": "",
-                            "wickets": "",
-                            "noballs": "",
-                            "wides": "",
-                            "economy": ""
-                        })
-                else:
-                    # Bowler not in stats - didn't bowl
-                    bowlers.append({
-                        "name": player_name,
-                        "overs": "",
-                        "maidens": "",
-                        "runs": "",
-                        "wickets": "",
-                        "noballs": "",
-                        "wides": "",
-                        "economy": ""
-                    })
+        # Batting rows cover ALL players in batting order (did-not-bat rows
+        # are blank); bowling rows cover every will_bowl player. Rendered from
+        # the incrementally synced scorecard model — see engine/scorecard.py.
+        model = self._live_scorecard()
+        players, bowlers = model.match_payload(self.batting_team, self.bowling_team)
 
         # Calculate extras
-        individual_runs = sum(stats["runs"] for stats in self.batsman_stats.values())
-        extras = self.score - individual_runs
+        extras = self.score - model.batting_runs_total()
         
         total_balls = self.current_over * 6 + self.current_ball
         overs_display = f"{self.current_over}.{self.current_ball}" if self.current_ball > 0 else str(self.current_over)
@@ -5692,7 +5709,7 @@ class Match:
             "team_name": team_name,
             "innings": "1st" if self.innings == 1 else "2nd",
             "players": players,
-            "bowlers": bowlers,  # ← ADD THIS LINE
+            "bowlers": bowlers,
             "total_score": self.score,
             "wickets": self.wickets,
             "overs": overs_display,
@@ -5905,16 +5922,8 @@ class Match:
         self.super_over_bowler_runs = 0
         self.super_over_bowler_wickets = 0
 
-        self.super_over_batsman_stats = {
-            p["name"]: {
-                "runs": 0, "balls": 0, "fours": 0, "sixes": 0,
-                "wicket_type": "", "out": False, "did_bat": False,
-            }
-            for p in self.super_over_batsmen
-        }
-        # Mark the two openers as having batted; the 3rd flips to True only if they come in.
-        self.super_over_batsman_stats[self.super_over_batsmen[0]["name"]]["did_bat"] = True
-        self.super_over_batsman_stats[self.super_over_batsmen[1]["name"]]["did_bat"] = True
+        # The two openers have batted; the 3rd flips to True only if they come in.
+        self.super_over_batsman_stats = new_batsman_stats(self.super_over_batsmen)
 
     def start_super_over_innings2(self, batsmen_names=None, bowler_name=None):
         """Start innings 2 of the current super over with user-chosen players"""
@@ -5970,17 +5979,11 @@ class Match:
 
     def _select_super_over_batsmen(self, team):
         """Auto-select top 3 batsmen by rating for the super over (2 openers + 1 reserve)."""
-        sorted_batsmen = sorted(team, key=lambda p: p["batting_rating"], reverse=True)
-        return sorted_batsmen[:3]
+        return select_super_over_batsmen(team)
 
     def _select_super_over_bowler(self, team):
         """Select best bowler by rating"""
-        bowlers = [p for p in team if p.get("will_bowl", False)]
-        if bowlers:
-            return max(bowlers, key=lambda p: p.get("bowling_rating", 0))
-        if team:
-            return max(team, key=lambda p: p.get("bowling_rating", 0))
-        raise ValueError("Cannot select super over bowler from an empty team")
+        return select_super_over_bowler(team)
 
     def _get_super_over_effective_bowler(self, bowler_dict: dict) -> dict:
         """
@@ -6033,6 +6036,32 @@ class Match:
         eff["batting_rating"] = eff["batting_rating"] * form
         return eff
 
+    def _super_over_state(self, team_key):
+        """The current Super Over innings as a SuperOverState (stats shared, not copied)."""
+        return SuperOverState(
+            batsmen=self.super_over_batsmen,
+            stats=self.super_over_batsman_stats,
+            striker=self.super_over_current_striker,
+            non_striker=self.super_over_current_non_striker,
+            next_idx=self.super_over_next_batter_idx,
+            score=self.super_over_scores[team_key],
+            wickets=self.super_over_wickets[team_key],
+            legal_balls=self.super_over_ball,
+            bowler_runs=self.super_over_bowler_runs,
+            bowler_wickets=self.super_over_bowler_wickets,
+        )
+
+    def _store_super_over_state(self, team_key, state):
+        """Write a SuperOverState back onto the resumable super_over_* attributes."""
+        self.super_over_current_striker = state.striker
+        self.super_over_current_non_striker = state.non_striker
+        self.super_over_next_batter_idx = state.next_idx
+        self.super_over_scores[team_key] = state.score
+        self.super_over_wickets[team_key] = state.wickets
+        self.super_over_ball = state.legal_balls
+        self.super_over_bowler_runs = state.bowler_runs
+        self.super_over_bowler_wickets = state.bowler_wickets
+
     def next_super_over_ball(self):
         """Process next ball in super over — returns rich data for modal UI"""
         # Re-entry guard: between innings the phase is "awaiting_*_selection"
@@ -6051,17 +6080,12 @@ class Match:
         team_key = "home" if self.super_over_batting_team is self.home_xi else "away"
         other_key = "away" if team_key == "home" else "home"
 
-        if self.super_over_ball >= 6 or self.super_over_wickets[team_key] >= 2:
+        # Innings 2 also ends as soon as the target is reached.
+        target = self.super_over_scores[other_key] + 1 if self.super_over_innings == 2 else None
+        state = self._super_over_state(team_key)
+        if state.innings_over(target):
             return self._end_super_over_innings()
 
-        # Innings 2: end immediately if target was already reached on a previous ball
-        runs_needed = None
-        if self.super_over_innings == 2:
-            target = self.super_over_scores[other_key] + 1
-            runs_needed = max(0, target - self.super_over_scores[team_key])
-            if runs_needed <= 0:
-                return self._end_super_over_innings()
-
         # Calculate outcome on the same rating/matchup/pressure/momentum
         # stack as a regular delivery, recalibrated for a 6-ball/2-wicket
         # contest — see engine/super_over_outcome.py.
@@ -6070,8 +6094,8 @@ class Match:
         # compute_weighted_prob's own ≥2-boundary streak penalty/boost) and
         # this over's own ball-by-ball history (drives the micro-GSME
         # momentum layer — NOT the main innings' ball_history).
-        striker_so_stats = self.super_over_batsman_stats[self.super_over_current_striker["name"]]
-        effective_batter = self._get_super_over_effective_batter(self.super_over_current_striker)
+        striker_so_stats = state.stats[state.striker["name"]]
+        effective_batter = self._get_super_over_effective_batter(state.striker)
         effective_bowler = self._get_super_over_effective_bowler(self.super_over_bowler)
         outcome = calculate_super_over_outcome(
             batter=effective_batter,
@@ -6081,10 +6105,10 @@ class Match:
             batter_runs=striker_so_stats["runs"],
             balls_faced=striker_so_stats["balls"],
             so_innings=self.super_over_innings,
-            wickets_down=self.super_over_wickets[team_key],
-            balls_remaining=6 - self.super_over_ball,
-            runs_needed=runs_needed,
-            score_so_far=self.super_over_scores[team_key],
+            wickets_down=state.wickets,
+            balls_remaining=6 - state.legal_balls,
+            runs_needed=state.runs_needed(target),
+            score_so_far=state.score,
             history=self.super_over_ball_history,
             pitch_wear=getattr(self, "super_over_pitch_wear", 0.0),
             fielding_team=self.super_over_bowling_team,
@@ -6133,134 +6157,11 @@ class Match:
         else:
             commentary_line = f"{commentary_prefix}{outcome.get('description', '')}"
 
-        if wicket:
-            self.super_over_wickets[team_key] += 1
-            wicket_type = outcome["wicket_type"]
-            # Run outs are not credited to the bowler (same rule as the main
-            # innings) — they still count against the batting side's 2-wicket
-            # limit above.
-            if wicket_type != "Run Out":
-                self.super_over_bowler_wickets += 1
-            so_crossed = False  # only meaningful for run-outs
-
-            if wicket_type == "Run Out":
-                # Completed runs before dismissal (0, 1, or 2)
-                completed = max(0, runs)
-                self.super_over_scores[team_key] += completed
-                self.super_over_bowler_runs += completed
-                self.super_over_batsman_stats[self.super_over_current_striker["name"]]["runs"] += completed
-                # Byes/Leg Byes/No Balls are faced deliveries — count the ball
-                so_ro_legal = not extra
-                if extra and extra_type in ("Byes", "Leg Bye", "No Ball"):
-                    so_ro_legal = True
-                if so_ro_legal:
-                    self.super_over_batsman_stats[self.super_over_current_striker["name"]]["balls"] += 1
-
-                so_dismissed_end = random.choice(["striker", "non_striker"])
-                so_dismissed_name = (self.super_over_current_striker["name"]
-                                     if so_dismissed_end == "striker"
-                                     else self.super_over_current_non_striker["name"])
-                self.super_over_batsman_stats[so_dismissed_name]["wicket_type"] = "Run Out"
-                self.super_over_batsman_stats[so_dismissed_name]["out"] = True
-                so_crossed = (completed % 2 == 1)
-            else:
-                so_dismissed_name = self.super_over_current_striker["name"]
-                so_dismissed_end = "striker"
-                self.super_over_batsman_stats[so_dismissed_name]["wicket_type"] = wicket_type
-                self.super_over_batsman_stats[so_dismissed_name]["out"] = True
-                # Byes/Leg Byes/No Balls are faced deliveries — count the ball
-                so_wk_legal = not extra
-                if extra and extra_type in ("Byes", "Leg Bye", "No Ball"):
-                    so_wk_legal = True
-                if so_wk_legal:
-                    self.super_over_batsman_stats[self.super_over_current_striker["name"]]["balls"] += 1
-
-            # Super over: 3 batsmen selected, max 2 wickets allowed.
-            # On the first wicket, bring the next batter in at the dismissed end.
-            # For run-outs, account for whether batters had crossed before the dismissal —
-            # crossing flips which physical end the surviving batter and the new batter occupy.
-            if self.super_over_wickets[team_key] < 2:
-                next_batter = None
-                if self.super_over_next_batter_idx < len(self.super_over_batsmen):
-                    next_batter = self.super_over_batsmen[self.super_over_next_batter_idx]
-                    self.super_over_next_batter_idx += 1
-                if next_batter is not None:
-                    self.super_over_batsman_stats[next_batter["name"]]["did_bat"] = True
-                    surviving = (self.super_over_current_non_striker
-                                 if so_dismissed_end == "striker"
-                                 else self.super_over_current_striker)
-                    if so_crossed:
-                        # Batters crossed during the runs — surviving batter has swapped ends.
-                        if so_dismissed_end == "striker":
-                            self.super_over_current_striker = surviving
-                            self.super_over_current_non_striker = next_batter
-                        else:
-                            self.super_over_current_striker = next_batter
-                            self.super_over_current_non_striker = surviving
-                    else:
-                        # No crossing — new batter takes the dismissed end.
-                        if so_dismissed_end == "striker":
-                            self.super_over_current_striker = next_batter
-                        else:
-                            self.super_over_current_non_striker = next_batter
-        else:
-            self.super_over_scores[team_key] += runs
-            # Byes and Leg Byes are not charged to the bowler (same rule as
-            # the main innings); Wides/No Balls are.
-            if not (extra and extra_type in ("Byes", "Leg Bye")):
-                self.super_over_bowler_runs += runs
-
-            if not extra:
-                # Legal delivery: credit runs, balls, boundaries to batsman
-                self.super_over_batsman_stats[self.super_over_current_striker["name"]]["runs"] += runs
-                self.super_over_batsman_stats[self.super_over_current_striker["name"]]["balls"] += 1
-
-                if runs == 4:
-                    self.super_over_batsman_stats[self.super_over_current_striker["name"]]["fours"] += 1
-                elif runs == 6:
-                    self.super_over_batsman_stats[self.super_over_current_striker["name"]]["sixes"] += 1
-            else:
-                # Fix #9: Byes, Leg Byes, No Balls — batsman faced the delivery
-                if extra_type in ("Byes", "Leg Bye", "No Ball"):
-                    self.super_over_batsman_stats[self.super_over_current_striker["name"]]["balls"] += 1
-                # Wide: batsman doesn't face — no stats
-
-            # Fix #8: Strike rotation applies to ALL delivery types
-            so_should_rotate = False
-            if not extra:
-                if runs % 2 == 1:
-                    so_should_rotate = True
-            else:
-                if extra_type in ("Leg Bye", "Byes") and runs % 2 == 1:
-                    so_should_rotate = True
-                elif extra_type == "No Ball":
-                    so_bat_runs = outcome.get("bat_runs", 0)
-                    if so_bat_runs % 2 == 1:
-                        so_should_rotate = True
-                elif extra_type == "Wide":
-                    so_additional = runs - 1
-                    if so_additional > 0 and so_additional % 2 == 1:
-                        so_should_rotate = True
-            if so_should_rotate:
-                self.super_over_current_striker, self.super_over_current_non_striker = \
-                    self.super_over_current_non_striker, self.super_over_current_striker
-
-        # Fix #7: Ball counter — Byes/Leg Byes ARE legal deliveries
-        is_so_legal = not extra
-        if extra and extra_type in ("Byes", "Leg Bye"):
-            is_so_legal = True
-        if is_so_legal:
-            self.super_over_ball += 1
-
-        over_complete = self.super_over_ball >= 6
-        # Innings 2: end immediately when target is reached or exceeded
-        target_reached = False
-        if self.super_over_innings == 2:
-            other_key = "away" if team_key == "home" else "home"
-            target = self.super_over_scores[other_key] + 1
-            if self.super_over_scores[team_key] >= target:
-                target_reached = True
-        is_innings_complete = over_complete or self.super_over_wickets[team_key] >= 2 or target_reached
+        # Score, figures, dismissals, strike and the legal-ball count follow
+        # the rules shared with the batch simulator (engine/super_over_sim.py).
+        apply_super_over_ball(state, outcome)
+        self._store_super_over_state(team_key, state)
+        is_innings_complete = state.innings_over(target)
 
         # Build rich response
         striker_name = self.super_over_current_striker["name"]
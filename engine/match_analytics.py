@@ -0,0 +1,340 @@
+"""
+match_analytics.py
+==================
+
+Post-match analytics stage, run once per archived match, persisted in
+MatchPlayerAnalytics.
+
+Impact Index scores, career milestones and Man of the Match candidates used
+to be computed on demand — StatsService.compute_match_impact_scores() and
+detect_milestones() per match / per player, and motm_service.select_match_motm()
+re-scoring the scorecards. analyze_match() now does all three in one pass
+over the match's scorecards:
+
+  impact      StatsService._impact_index() over the match's non-super-over
+              cards (runs from batting, wickets from bowling, fielding from
+              any card)
+  motm        motm_service.rank_candidates() over those scores; rank 1 is
+              written to Match.motm_player_id
+  milestones  crossed against the materialized career totals — Player.total_*
+              for runs and wickets (super overs included, as the archiver
+              accumulates them) and PlayerCareerStats for catches
+
+It is called from MatchArchiver._save_to_database after the career tables
+are updated, and discard_match() from reverse_player_aggregates(). Readers —
+impact_scores(), motm_for(), top_performances(), recent_milestones() — serve
+the stored rows. rebuild_match_analytics() backfills impact and MOTM ranks
+for matches archived before the stage existed (their milestones are not
+reconstructed).
+"""
+
+import json
+from collections import defaultdict
+
+from sqlalchemy import func
+
+from database import db
+from database.models import Match, MatchPlayerAnalytics, MatchScorecard, Player, PlayerCareerStats, Team
+
+RUN_MARKS = (500, 1000, 2000, 3000, 5000)
+WICKET_MARKS = (25, 50, 100, 150, 200)
+CATCH_MARKS = (10, 25, 50)
+
+_A = MatchPlayerAnalytics
+_BATCH = 500
+
+
+# ---------------------------------------------------------------------------
+# Milestones
+# ---------------------------------------------------------------------------
+
+
+def milestones_crossed(name, totals, deltas):
+    """
+    Milestone strings for career *totals* (after the match) that the match's
+    *deltas* took the player past. Both are {"runs", "wickets", "catches"}.
+    """
+    milestones = []
+    for key, marks in (("runs", RUN_MARKS), ("wickets", WICKET_MARKS), ("catches", CATCH_MARKS)):
+        total = totals.get(key) or 0
+        previous = total - (deltas.get(key) or 0)
+        for mark in marks:
+            if total >= mark and previous < mark:
+                milestones.append(f"{name} reached {mark} career {key}!")
+    return milestones
+
+
+def career_catches(player_ids):
+    """{player_id: career catches across formats} from PlayerCareerStats."""
+    player_ids = list(player_ids)
+    if not player_ids:
+        return {}
+    return dict(
+        db.session.query(PlayerCareerStats.player_id, func.sum(PlayerCareerStats.catches))
+        .filter(PlayerCareerStats.player_id.in_(player_ids))
+        .group_by(PlayerCareerStats.player_id)
+        .all()
+    )
+
+
+# ---------------------------------------------------------------------------
+# The stage
+# ---------------------------------------------------------------------------
+
+
+def _fold(cards):
+    """
+    One pass over a match's cards: Impact Index inputs per player (super-over
+    cards excluded) and the milestone deltas for the same players.
+    """
+    per_player = {}
+    for card in cards:
+        entry = per_player.setdefault(card.player_id, {
+            "team_id": card.team_id, "scored": False,
+            "runs": 0, "wickets": 0, "catches": 0, "run_outs": 0,
+            "delta": {"runs": 0, "wickets": 0, "catches": 0},
+        })
+        if card.record_type == "batting":
+            entry["delta"]["runs"] += card.runs or 0
+        elif card.record_type == "bowling":
+            entry["delta"]["wickets"] += card.wickets or 0
+        if card.is_super_over:
+            continue
+        entry["scored"] = True
+        entry["catches"] += card.catches or 0
+        entry["run_outs"] += card.run_outs or 0
+        entry["delta"]["catches"] += card.catches or 0
+        if card.record_type == "batting":
+            entry["runs"] += card.runs or 0
+        elif card.record_type == "bowling":
+            entry["wickets"] += card.wickets or 0
+    return per_player
+
+
+def _scores(per_player, players, teams):
+    """compute_match_impact_scores()-shaped entries, highest impact first."""
+    from engine.stats_service import StatsService
+
+    scores = []
+    for player_id, entry in per_player.items():
+        player, team = players.get(player_id), teams.get(entry["team_id"])
+        if not entry["scored"] or player is None or team is None:
+            continue
+        scores.append({
+            "player_id": player_id,
+            "player_name": player.name,
+            "team_id": team.id,
+            "team_name": team.name,
+            "runs": entry["runs"],
+            "wickets": entry["wickets"],
+            "catches": entry["catches"],
+            "run_outs": entry["run_outs"],
+            "impact_score": StatsService._impact_index(
+                entry["runs"], entry["wickets"], entry["catches"], entry["run_outs"]
+            ),
+        })
+    scores.sort(key=lambda x: x["impact_score"], reverse=True)
+    return scores
+
+
+def _by_id(model, ids):
+    ids = [i for i in set(ids) if i is not None]
+    if not ids:
+        return {}
+    return {row.id: row for row in model.query.filter(model.id.in_(ids))}
+
+
+def _write(match, scores, ranked, milestones=None, existing=None):
+    """Store one match's rows in place; *milestones* None keeps the stored ones."""
+    if existing is None:
+        existing = {row.player_id: row for row in _A.query.filter(_A.match_id == match.id)}
+    ranks = {entry["player_id"]: (i, entry["weighted_score"]) for i, entry in enumerate(ranked, 1)}
+    for entry in scores:
+        row = existing.pop(entry["player_id"], None)
+        if row is None:
+            row = _A(match_id=match.id, player_id=entry["player_id"], milestones="[]")
+            db.session.add(row)
+        row.user_id = match.user_id
+        row.tournament_id = match.tournament_id
+        row.match_format = match.match_format or "T20"
+        row.team_id = entry["team_id"]
+        for key in ("runs", "wickets", "catches", "run_outs", "impact_score"):
+            setattr(row, key, entry[key])
+        row.motm_rank, row.weighted_score = ranks.get(entry["player_id"], (None, None))
+        if milestones is not None:
+            row.milestones = json.dumps(milestones.get(entry["player_id"], []))
+    for row in existing.values():
+        db.session.delete(row)
+
+
+def analyze_match(match, cards):
+    """
+    Run the post-match stage for *match* (its cards and career totals
+    already updated) and persist it; sets match.motm_player_id. Returns
+    {"impact": [...], "motm": entry or None, "milestones": [str, ...]}.
+    Does not commit.
+    """
+    from engine.motm_service import rank_candidates
+
+    per_player = _fold(cards)
+    players = _by_id(Player, per_player)
+    teams = _by_id(Team, (entry["team_id"] for entry in per_player.values()))
+    scores = _scores(per_player, players, teams)
+    ranked = rank_candidates(scores, match.winner_team_id, match.match_status)
+
+    catches = career_catches(per_player)
+    milestones, flat = {}, []
+    for player_id, entry in per_player.items():
+        player = players.get(player_id)
+        if player is None:
+            continue
+        totals = {"runs": player.total_runs, "wickets": player.total_wickets,
+                  "catches": catches.get(player_id, 0)}
+        crossed = milestones_crossed(player.name, totals, entry["delta"])
+        if crossed:
+            milestones[player_id] = crossed
+            flat.extend(crossed)
+
+    _write(match, scores, ranked, milestones)
+    match.motm_player_id = ranked[0]["player_id"] if ranked else None
+    return {"impact": scores, "motm": ranked[0] if ranked else None, "milestones": flat}
+
+
+def discard_match(match_id):
+    """Drop a match's analytics. Call when its cards are reversed."""
+    _A.query.filter(_A.match_id == match_id).delete(synchronize_session="fetch")
+
+
+def rebuild_match_analytics(user_id=None):
+    """
+    Recompute impact and MOTM ranks for every archived match (or only
+    *user_id*'s). Stored milestones are kept and Match.motm_player_id is
+    left alone. Returns the number of matches analysed. Does not commit.
+    """
+    from engine.motm_service import rank_candidates
+
+    query = Match.query
+    if user_id is not None:
+        query = query.filter(Match.user_id == user_id)
+    matches = query.order_by(Match.date, Match.id).all()
+
+    for i in range(0, len(matches), _BATCH):
+        batch = matches[i:i + _BATCH]
+        match_ids = [m.id for m in batch]
+        cards_by_match, stored = defaultdict(list), defaultdict(dict)
+        for card in MatchScorecard.query.filter(MatchScorecard.match_id.in_(match_ids)):
+            cards_by_match[card.match_id].append(card)
+        for row in _A.query.filter(_A.match_id.in_(match_ids)):
+            stored[row.match_id][row.player_id] = row
+        all_cards = [c for cards in cards_by_match.values() for c in cards]
+        players = _by_id(Player, (c.player_id for c in all_cards))
+        teams = _by_id(Team, (c.team_id for c in all_cards))
+        for match in batch:
+            scores = _scores(_fold(cards_by_match.get(match.id, ())), players, teams)
+            _write(match, scores, rank_candidates(scores, match.winner_team_id, match.match_status),
+                   existing=stored[match.id])
+    return len(matches)
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+def _entry(row, player_name, team_name):
+    return {
+        "player_id": row.player_id,
+        "player_name": player_name,
+        "team_id": row.team_id,
+        "team_name": team_name,
+        "runs": row.runs,
+        "wickets": row.wickets,
+        "catches": row.catches,
+        "run_outs": row.run_outs,
+        "impact_score": row.impact_score,
+    }
+
+
+def _named(query):
+    return (
+        query.add_columns(Player.name, Team.name)
+        .join(Player, _A.player_id == Player.id)
+        .join(Team, _A.team_id == Team.id)
+    )
+
+
+def impact_scores(match_id):
+    """Stored compute_match_impact_scores() for *match_id*, or None if never analysed."""
+    rows = _named(db.session.query(_A).filter(_A.match_id == match_id)).all()
+    if not rows:
+        return None
+    scores = [_entry(*row) for row in rows]
+    scores.sort(key=lambda x: x["impact_score"], reverse=True)
+    return scores
+
+
+def motm_for(match_id):
+    """Stored select_match_motm() result for *match_id*, or None."""
+    row = (
+        _named(db.session.query(_A, Match.winner_team_id).join(Match, _A.match_id == Match.id))
+        .filter(_A.match_id == match_id, _A.motm_rank == 1)
+        .first()
+    )
+    if row is None:
+        return None
+    analytics, winner_team_id, player_name, team_name = row
+    return {
+        **_entry(analytics, player_name, team_name),
+        "weighted_score": analytics.weighted_score,
+        "is_winning_side": bool(winner_team_id) and analytics.team_id == winner_team_id,
+    }
+
+
+def _scoped(query, user_id, tournament_id=None, match_format=None):
+    query = query.filter(_A.user_id == user_id)
+    if tournament_id is not None:
+        query = query.filter(_A.tournament_id == tournament_id)
+    if match_format:
+        query = query.filter(_A.match_format == match_format)
+    return query
+
+
+def top_performances(user_id, tournament_id=None, match_format=None, limit=5):
+    """The highest single-match Impact Index performances in scope."""
+    query = _scoped(
+        _named(db.session.query(_A, Match.date).join(Match, _A.match_id == Match.id)),
+        user_id, tournament_id, match_format,
+    ).order_by(_A.impact_score.desc(), _A.id).limit(limit)
+    return [
+        {
+            "player_id": row.player_id,
+            "player": player_name,
+            "team": team_name,
+            "impact": row.impact_score,
+            "runs": row.runs,
+            "wickets": row.wickets,
+            "catches": row.catches,
+            "run_outs": row.run_outs,
+            "is_motm": row.motm_rank == 1,
+            "match_id": row.match_id,
+            "date": date.strftime("%Y-%m-%d") if date else "N/A",
+        }
+        for row, date, player_name, team_name in query.all()
+    ]
+
+
+def recent_milestones(user_id, tournament_id=None, match_format=None, limit=5):
+    """Career milestones reached in scope, newest match first."""
+    query = _scoped(
+        db.session.query(_A.milestones, _A.match_id, Match.date).join(Match, _A.match_id == Match.id),
+        user_id, tournament_id, match_format,
+    ).filter(_A.milestones.isnot(None), _A.milestones != "[]")
+    milestones = []
+    for stored, match_id, date in query.order_by(Match.date.desc(), _A.id).limit(limit).all():
+        for text in json.loads(stored):
+            milestones.append({
+                "text": text,
+                "match_id": match_id,
+                "date": date.strftime("%Y-%m-%d") if date else "N/A",
+            })
+    return milestones[:limit]
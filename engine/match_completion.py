@@ -0,0 +1,154 @@
+"""
+match_completion.py
+===================
+
+End-of-match pipeline for a live tournament match.
+
+A finished match used to be persisted in three commits — fixture link and
+standings first, then the archive (scorecards, career tables, analytics),
+then MOTM, then the dashboard — each behind its own error handling, so a
+failure between them left a fixture Completed with no scorecard, and the
+player stats cache was rebuilt before this match's cards existed. It now
+runs as one unit of work, each stage timed:
+
+  validate   tournament / fixture ids on the match, fixture with both teams
+  reverse    a re-simulated match: its previous result is taken out of the
+             fixture and standings (the archive stage reverses its career
+             aggregates and replaces its cards in place)
+  archive    MatchArchiver._save_to_database(commit=False): the Match row,
+             every scorecard and partnership (written in batched INSERTs
+             at flush), career tables, head-to-head, insights, analytics
+  standings  fixture linked, update_standings(commit=False): points / NRR,
+             the player stats cache for this match's players, progression
+  motm       Man of the Match recorded and its commentary block appended
+             to outcome['commentary'] (best-effort, in a savepoint)
+  dashboard  refresh_dashboard() (best-effort, in a savepoint)
+  commit     the single commit
+
+Any failure outside the two best-effort stages rolls the whole match back,
+so a retry starts from the same state. archive_result() and
+apply_to_fixture() are shared with the headless simulator
+(engine/tournament_autosim.py), which runs them per match inside its own
+batched transactions.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+from database import db
+from database.models import Match as DBMatch, TournamentFixture
+
+logger = logging.getLogger("SimCricketX.match_completion")
+
+STAGES = ("validate", "reverse", "archive", "standings", "motm", "dashboard", "commit")
+
+
+class StageTimer:
+    """Wall-clock milliseconds per pipeline stage, in run order."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    @property
+    def total(self):
+        return round(sum(self.timings.values()), 2)
+
+    def summary(self):
+        return " ".join(f"{name}={ms:.1f}ms" for name, ms in self.timings.items())
+
+
+def archive_result(match):
+    """Archive the finished engine *match* into the session. Raises on failure."""
+    from match_archiver import MatchArchiver
+
+    if not MatchArchiver(match.data, match)._save_to_database(commit=False):
+        raise ValueError(f"Match {match.data['match_id']} could not be archived")
+    return db.session.get(DBMatch, match.data["match_id"])
+
+
+def apply_to_fixture(db_match, fixture, tournament_engine):
+    """Link *db_match* to *fixture* and apply it to the standings. Does not commit."""
+    db_match.tournament_id = fixture.tournament_id
+    fixture.match_id = db_match.id
+    fixture.winner_team_id = db_match.winner_team_id
+    return tournament_engine.update_standings(db_match, commit=False)
+
+
+def _best_effort(name, match_id, fn):
+    nested = db.session.begin_nested()
+    try:
+        fn()
+        nested.commit()
+    except Exception as e:
+        from utils.exception_tracker import log_exception
+
+        log_exception(e)
+        nested.rollback()
+        logger.error(f"[Completion] {name} failed (non-fatal) for {match_id}: {e}", exc_info=True)
+
+
+def complete_tournament_match(match, match_id, outcome, tournament_engine):
+    """
+    Persist the finished tournament *match* in one transaction and set its
+    state to "completed" once committed. Returns {"db_match", "timings"};
+    raises (after rolling back) on failure.
+    """
+    from engine import motm_service
+    from engine.tournament_dashboard import refresh_dashboard
+
+    timer = StageTimer()
+    try:
+        with timer.stage("validate"):
+            tournament_id = match.data.get("tournament_id")
+            fixture_id = match.data.get("fixture_id")
+            if not tournament_id or not fixture_id:
+                raise ValueError(f"Match {match_id} is missing its tournament_id / fixture_id")
+            try:
+                tournament_id, fixture_id = int(tournament_id), int(fixture_id)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid tournament/fixture id on match {match_id}")
+            fixture = db.session.get(TournamentFixture, fixture_id)
+            if fixture is None or fixture.tournament_id != tournament_id:
+                raise ValueError(f"Tournament fixture {fixture_id} not found; cannot proceed safely.")
+            if not fixture.home_team_id or not fixture.away_team_id:
+                raise ValueError(f"Fixture {fixture_id} missing team assignments")
+            match.data["result_description"] = outcome.get("result") or match.result
+
+        with timer.stage("reverse"):
+            previous = db.session.get(DBMatch, match_id)
+            if previous is not None:
+                logger.info(f"[Completion] Match {match_id} re-simulated; reversing its previous standings")
+                tournament_engine.reverse_standings(previous, commit=False)
+
+        with timer.stage("archive"):
+            db_match = archive_result(match)
+
+        with timer.stage("standings"):
+            if not apply_to_fixture(db_match, fixture, tournament_engine):
+                logger.warning(f"[Completion] Standings update returned False for match {match_id}")
+
+        with timer.stage("motm"):
+            _best_effort("MOTM", match_id, lambda: motm_service.award_motm(db_match, outcome))
+
+        with timer.stage("dashboard"):
+            _best_effort("Dashboard rebuild", match_id, lambda: refresh_dashboard(tournament_id))
+
+        with timer.stage("commit"):
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Only once committed: setting it earlier would block a retry.
+    match.data["current_state"] = "completed"
+    logger.info(f"[Completion] Match {match_id} ({fixture.status}) in {timer.total:.1f}ms: {timer.summary()}")
+    return {"db_match": db_match, "timings": timer.timings}
@@ -0,0 +1,194 @@
+"""
+match_ledger.py
+===============
+
+Per-match change ledger for tournament results.
+
+TournamentEngine.update_standings() records, in one MatchLedger row per
+match, exactly what applying the result changed:
+
+  standings   per-team deltas of the TournamentTeam counters (league
+              fixtures only): played / won / lost / tied / no_result /
+              points and the runs + legal-ball NRR components
+  fixtures    before/after images of every other fixture progression
+              moved (playoff seeding, the next knockout round, Q2, Final)
+  tournament  status / current_stage before and after
+  players     the TournamentPlayerStatsCache rows rebuilt for this match
+
+reverse_standings() replays the ledger instead of rediscovering the
+match's effects: the standings deltas are subtracted from the two team rows
+(O(1), where it used to regroup every league result of the tournament) and
+only the ledger's players get their cache rows rebuilt. The fixtures and
+tournament go back to their before images when they still hold the after
+images, i.e. no later result has moved them since (restore_images()).
+Otherwise later matches built on this one, and the reset stays tree-driven
+(engine/bracket_tree.py), clearing those results too. Matches applied
+before ledgers existed have none and fall back to the discovery path.
+Player career aggregates are reversed from the match's own scorecard rows,
+which are already the per-match record of those.
+
+The ledger is dropped with its match (ON DELETE CASCADE) and replaced when
+the match is re-applied.
+"""
+
+import json
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from database import db
+from database.models import MatchLedger, Tournament, TournamentFixture
+
+STANDINGS_COLUMNS = (
+    "played", "won", "lost", "tied", "no_result", "points",
+    "runs_scored", "runs_conceded", "balls_faced", "balls_bowled",
+)
+FIXTURE_COLUMNS = (
+    "home_team_id", "away_team_id", "winner_team_id", "match_id", "status", "standings_applied",
+)
+TOURNAMENT_COLUMNS = ("status", "current_stage")
+
+
+def _image(obj, columns):
+    return {column: getattr(obj, column) for column in columns}
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+class LedgerRecorder:
+    """Collects one match's changes while update_standings() applies it."""
+
+    def __init__(self, match, fixture):
+        self.match = match
+        self.fixture = fixture
+        self.standings = {}
+        self.players = []
+        self._standings_before = {}
+        self._watched = []
+        tournament = db.session.get(Tournament, match.tournament_id)
+        self._tournament = tournament
+        self._tournament_before = _image(tournament, TOURNAMENT_COLUMNS) if tournament else {}
+
+    def before_standings(self, *team_stats):
+        for stats in team_stats:
+            self._standings_before[stats.team_id] = _image(stats, STANDINGS_COLUMNS)
+
+    def after_standings(self, *team_stats):
+        for stats in team_stats:
+            before = self._standings_before[stats.team_id]
+            self.standings[str(stats.team_id)] = {
+                column: (getattr(stats, column) or 0) - (before[column] or 0)
+                for column in STANDINGS_COLUMNS
+            }
+
+    def watch_fixtures(self):
+        """Snapshot the fixtures progression may move (everything not league)."""
+        self._watched = [
+            (f, _image(f, FIXTURE_COLUMNS))
+            for f in TournamentFixture.query.filter(
+                TournamentFixture.tournament_id == self.match.tournament_id,
+                TournamentFixture.stage != "league",
+                TournamentFixture.id != self.fixture.id,
+            ).order_by(TournamentFixture.id)
+        ]
+
+    def entries(self):
+        fixtures = []
+        for f, before in self._watched:
+            after = _image(f, FIXTURE_COLUMNS)
+            if after != before:
+                fixtures.append({"id": f.id, "before": before, "after": after})
+        tournament = {}
+        if self._tournament is not None:
+            tournament = {"before": self._tournament_before,
+                          "after": _image(self._tournament, TOURNAMENT_COLUMNS)}
+        return {
+            "stage": self.fixture.stage,
+            "standings": self.standings,
+            "fixtures": fixtures,
+            "tournament": tournament,
+            "players": sorted(self.players),
+        }
+
+    def save(self):
+        """Upsert the ledger row. Commits with the caller."""
+        table = MatchLedger.__table__
+        stmt = sqlite_insert(table).values(
+            match_id=self.match.id, tournament_id=self.match.tournament_id,
+            fixture_id=self.fixture.id, entries=json.dumps(self.entries()),
+            created_at=db.func.current_timestamp(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["match_id"],
+            set_={column: stmt.excluded[column]
+                  for column in ("tournament_id", "fixture_id", "entries", "created_at")},
+        )
+        db.session.execute(stmt)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+def load(match_id):
+    """The recorded entries for *match_id*, or None."""
+    # A column read, not session.get(): save() upserts behind the identity map.
+    entries = db.session.query(MatchLedger.entries).filter_by(match_id=match_id).scalar()
+    return json.loads(entries) if entries is not None else None
+
+
+def discard(match_id):
+    MatchLedger.query.filter_by(match_id=match_id).delete(synchronize_session=False)
+
+
+def discard_tournament(tournament_id):
+    MatchLedger.query.filter_by(tournament_id=tournament_id).delete(synchronize_session=False)
+
+
+def subtract_standings(entries, team_stats):
+    """Take the ledger's deltas back out of *team_stats* ({team_id: TournamentTeam})."""
+    for team_id, delta in entries["standings"].items():
+        stats = team_stats[int(team_id)]
+        for column, value in delta.items():
+            setattr(stats, column, (getattr(stats, column) or 0) - value)
+
+
+def restore_images(entries, tournament_id):
+    """
+    Put the fixtures and tournament state the ledger moved back to their
+    before images. Only when every one still holds its after image: returns
+    False, changing nothing, once a later result has moved any of them.
+    """
+    tournament = db.session.get(Tournament, tournament_id)
+    images = entries.get("tournament")
+    if tournament is None or not images or _image(tournament, TOURNAMENT_COLUMNS) != images["after"]:
+        return False
+    moved = entries["fixtures"]
+    fixtures = {
+        f.id: f for f in TournamentFixture.query.filter(
+            TournamentFixture.id.in_([entry["id"] for entry in moved])
+        )
+    } if moved else {}
+    for entry in moved:
+        fixture = fixtures.get(entry["id"])
+        if fixture is None or _image(fixture, FIXTURE_COLUMNS) != entry["after"]:
+            return False
+
+    for entry in moved:
+        for column, value in entry["before"].items():
+            setattr(fixtures[entry["id"]], column, value)
+    for column, value in images["before"].items():
+        setattr(tournament, column, value)
+    return True
+
+
+def tournament_ledgers(tournament_id):
+    """Every ledger of *tournament_id* as (match_id, fixture_id, entries), oldest first."""
+    rows = (
+        MatchLedger.query.filter_by(tournament_id=tournament_id)
+        .order_by(MatchLedger.created_at, MatchLedger.match_id)
+    )
+    return [(row.match_id, row.fixture_id, json.loads(row.entries)) for row in rows]
@@ -48,22 +48,15 @@ def _load_quotes():
     return _quotes_cache
 
 
-def select_match_motm(match_id, winner_team_id, match_status):
-    """Pick Man of the Match for a single match.
+def rank_candidates(scores, winner_team_id, match_status):
+    """Order one match's Impact Index entries as MOTM candidates, best first.
 
-    Returns a dict (player_id, player_name, team_id, team_name, runs,
-    wickets, catches, run_outs, impact_score, weighted_score,
-    is_winning_side) or None if no MOTM should be awarded — either the
-    match had insufficient play (no_result/aborted) or no scorecard rows
-    exist yet for it (scorecard save is best-effort/non-fatal upstream).
+    *scores* are compute_match_impact_scores()-shaped dicts. Each returned
+    entry gains weighted_score and is_winning_side. Empty when no MOTM
+    should be awarded (no_result / aborted, or no scores at all).
     """
-    if match_status in ("no_result", "aborted"):
-        return None
-
-    from engine.stats_service import StatsService
-    scores = StatsService().compute_match_impact_scores(match_id)
-    if not scores:
-        return None
+    if match_status in ("no_result", "aborted") or not scores:
+        return []
 
     is_tied = match_status == "tied"
 
@@ -75,16 +68,58 @@ def select_match_motm(match_id, winner_team_id, match_status):
 
     # Deterministic tie-break: highest weighted score, then highest raw
     # impact, then most runs, then lowest player_id.
-    best = max(
+    ranked = sorted(
         scores,
         key=lambda e: (_weighted(e), e["impact_score"], e["runs"], -e["player_id"]),
+        reverse=True,
     )
+    return [
+        {
+            **entry,
+            "weighted_score": _weighted(entry),
+            "is_winning_side": bool(winner_team_id) and entry["team_id"] == winner_team_id,
+        }
+        for entry in ranked
+    ]
 
-    return {
-        **best,
-        "weighted_score": _weighted(best),
-        "is_winning_side": bool(winner_team_id) and best["team_id"] == winner_team_id,
-    }
+
+def select_match_motm(match_id, winner_team_id, match_status):
+    """Pick Man of the Match for a single match.
+
+    Returns a dict (player_id, player_name, team_id, team_name, runs,
+    wickets, catches, run_outs, impact_score, weighted_score,
+    is_winning_side) or None if no MOTM should be awarded — either the
+    match had insufficient play (no_result/aborted) or no scorecard rows
+    exist yet for it (scorecard save is best-effort/non-fatal upstream).
+
+    The ranking stored by the archive-time analytics stage
+    (engine/match_analytics.py) is used when the match has one.
+    """
+    if match_status in ("no_result", "aborted"):
+        return None
+
+    from engine import match_analytics
+    stored = match_analytics.motm_for(match_id)
+    if stored is not None:
+        return stored
+
+    from engine.stats_service import StatsService
+    ranked = rank_candidates(
+        StatsService().compute_match_impact_scores(match_id), winner_team_id, match_status
+    )
+    return ranked[0] if ranked else None
+
+
+def award_motm(db_match, outcome):
+    """Select Man of the Match for an archived *db_match*, record it on the
+    row and append the "MOTM speaks" block to outcome['commentary'] in place.
+    Does not commit; returns the selection or None."""
+    result = select_match_motm(db_match.id, db_match.winner_team_id, db_match.match_status)
+    if not result:
+        return None
+    db_match.motm_player_id = result["player_id"]
+    outcome["commentary"] = outcome.get("commentary", "") + build_motm_commentary(result, db_match)
+    return result
 
 
 def _classify_archetype(motm_result):
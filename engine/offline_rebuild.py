@@ -0,0 +1,334 @@
+"""
+offline_rebuild.py
+==================
+
+Parallel, checkpointed rebuild of every tournament's derived rows, run
+against the SQLite file without the app (scripts/rebuild_tournaments.py).
+
+Per tournament it recomputes
+
+  standings     tournament_teams from the completed league matches, with the
+                grouped query TournamentEngine.recompute_standings() runs
+                (engine/standings_recompute.py)
+  player cache  tournament_player_stats_cache for every player with a card
+                or a cache row, with TournamentEngine.player_cache_rows()
+
+and bumps tournaments.version where anything changed, so the stored
+dashboard is rebuilt on its next view.
+
+  snapshots   worker processes (spawned, as in tournament_autosim) open the
+              file read-only and compute each tournament inside one read
+              transaction, so every tournament is rebuilt from a consistent
+              snapshot while the parent writes others
+  writes      the parent applies only the rows that differ, WRITE_BATCH
+              tournaments per transaction: one executemany UPDATE for the
+              standings and one INSERT .. ON CONFLICT DO UPDATE for the cache
+  checkpoint  after each committed batch the finished tournament ids and
+              their diffs go to a JSON file (written atomically); a rerun
+              with the same checkpoint skips them
+  diffs       per tournament, every standings and cache row whose stored
+              values differ from the rebuilt ones, column by column
+
+A dry run computes and reports the same diffs and writes nothing except its
+own checkpoint; after an applied run a dry run reports no changes.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import bindparam, create_engine, event, text as sa_text
+
+from engine import standings_recompute
+from engine.tournament_engine import TournamentEngine
+
+WRITE_BATCH = 25          # tournaments per write transaction
+FLOAT_TOLERANCE = 1e-6    # NRR / averages are stored rounded; ignore float noise
+
+STANDINGS_COLUMNS = standings_recompute.COLUMNS + ("overs_faced", "overs_bowled", "net_run_rate")
+_CACHE_KEYS = ("tournament_id", "player_id", "team_id")
+
+_STANDINGS_UPDATE = sa_text(
+    "UPDATE tournament_teams SET "
+    + ", ".join(f"{column} = :{column}" for column in STANDINGS_COLUMNS)
+    + " WHERE tournament_id = :tournament_id AND team_id = :team_id"
+)
+_BUMP_VERSIONS = sa_text(
+    "UPDATE tournaments SET version = COALESCE(version, 0) + 1 WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def sqlite_engine(db_path, readonly=False):
+    """
+    An engine on *db_path* whose transactions begin explicitly, so a read
+    transaction is a real snapshot (pysqlite otherwise defers BEGIN until
+    the first write).
+    """
+    if readonly:
+        url = f"sqlite:///file:{os.path.abspath(db_path)}?mode=ro&uri=true"
+    else:
+        url = f"sqlite:///{os.path.abspath(db_path)}"
+    engine = create_engine(url, connect_args={"timeout": 30})
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    return engine
+
+
+def _differs(before, after):
+    if isinstance(before, float) or isinstance(after, float):
+        if before is None or after is None:
+            return before is not after
+        return abs(before - after) > FLOAT_TOLERANCE
+    return before != after
+
+
+def _changes(before, after, columns):
+    """{column: [stored, rebuilt]} for the columns that differ."""
+    if before is None:
+        return {column: [None, after[column]] for column in columns}
+    return {
+        column: [before[column], after[column]]
+        for column in columns if _differs(before[column], after[column])
+    }
+
+
+# ---------------------------------------------------------------------------
+# Per-tournament rebuild (worker side)
+# ---------------------------------------------------------------------------
+
+
+def _standings(conn, tournament_id):
+    table = standings_recompute.table_from_rows(conn.execute(
+        sa_text(standings_recompute.standings_sql()),
+        standings_recompute.standings_params(tournament_id),
+    ).mappings())
+    stored = conn.execute(sa_text(
+        "SELECT team_id, " + ", ".join(STANDINGS_COLUMNS)
+        + " FROM tournament_teams WHERE tournament_id = :tid ORDER BY team_id"
+    ), {"tid": tournament_id}).mappings()
+
+    rows = []
+    for before in stored:
+        totals = table.get(before["team_id"]) or {**standings_recompute.empty_row(), "net_run_rate": 0.0}
+        after = {
+            **totals,
+            "overs_faced": TournamentEngine.balls_to_overs(totals["balls_faced"]),
+            "overs_bowled": TournamentEngine.balls_to_overs(totals["balls_bowled"]),
+            "tournament_id": tournament_id,
+            "team_id": before["team_id"],
+        }
+        changes = _changes(before, after, STANDINGS_COLUMNS)
+        if changes:
+            rows.append({"team_id": before["team_id"], "changes": changes, "row": after})
+    return rows
+
+
+def _player_cache(conn, tournament_id):
+    rebuilt = TournamentEngine.player_cache_rows(conn, tournament_id)
+    if not rebuilt:
+        return []
+    columns = [column for column in rebuilt[0] if column not in _CACHE_KEYS]
+    stored = {
+        row["player_id"]: row for row in conn.execute(sa_text(
+            "SELECT player_id, " + ", ".join(columns)
+            + " FROM tournament_player_stats_cache WHERE tournament_id = :tid"
+        ), {"tid": tournament_id}).mappings()
+    }
+    rows = []
+    for after in rebuilt:
+        changes = _changes(stored.get(after["player_id"]), after, columns)
+        if changes:
+            rows.append({"player_id": after["player_id"], "changes": changes, "row": after})
+    rows.sort(key=lambda r: r["player_id"])
+    return rows
+
+
+_worker_engines = {}
+
+
+def compute_tournament(db_path, tournament_id):
+    """
+    Rebuild one tournament from a read-only snapshot of *db_path*. Returns
+    {"tournament_id", "standings", "cache", "seconds"}, each list holding the
+    rows that differ as {"team_id" / "player_id", "changes", "row"}.
+    """
+    engine = _worker_engines.get(db_path)
+    if engine is None:
+        engine = _worker_engines[db_path] = sqlite_engine(db_path, readonly=True)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        standings = _standings(conn, tournament_id)
+        cache = _player_cache(conn, tournament_id)
+    return {
+        "tournament_id": tournament_id,
+        "standings": standings,
+        "cache": cache,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Writes (parent side)
+# ---------------------------------------------------------------------------
+
+
+def write_results(conn, results):
+    """Apply the differing rows of *results* in the caller's transaction."""
+    standings = [r["row"] for result in results for r in result["standings"]]
+    cache = [r["row"] for result in results for r in result["cache"]]
+    if standings:
+        conn.execute(_STANDINGS_UPDATE, standings)
+    if cache:
+        conn.execute(TournamentEngine.player_cache_upsert(), cache)
+    changed = [result["tournament_id"] for result in results if result["standings"] or result["cache"]]
+    if changed:
+        conn.execute(_BUMP_VERSIONS, {"ids": changed})
+
+
+def diff_only(result):
+    """*result* without the rebuilt rows, for checkpoints and reports."""
+    return {
+        **result,
+        "standings": [{k: v for k, v in r.items() if k != "row"} for r in result["standings"]],
+        "cache": [{k: v for k, v in r.items() if k != "row"} for r in result["cache"]],
+    }
+
+
+class Checkpoint:
+    """
+    Finished tournaments of one run, persisted as JSON after every batch:
+    {"db", "apply", "finished": {tournament_id: result}}. A checkpoint left
+    by a dry run is never resumed by an applying run, and vice versa.
+    """
+
+    def __init__(self, path, db_path, apply):
+        self.path = path
+        self.state = {"db": os.path.abspath(db_path), "apply": bool(apply), "finished": {}}
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("db") != self.state["db"] or state.get("apply") != self.state["apply"]:
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to another run "
+                f"(db={state.get('db')}, apply={state.get('apply')}); use a fresh one"
+            )
+        self.state = state
+        return self
+
+    @property
+    def finished(self):
+        return {int(tid): result for tid, result in self.state["finished"].items()}
+
+    def add(self, results):
+        for result in results:
+            self.state["finished"][str(result["tournament_id"])] = diff_only(result)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def tournament_ids(db_path, only=None):
+    engine = sqlite_engine(db_path, readonly=True)
+    try:
+        with engine.connect() as conn:
+            ids = [row[0] for row in conn.execute(sa_text("SELECT id FROM tournaments ORDER BY id"))]
+    finally:
+        engine.dispose()
+    if only:
+        ids = [tid for tid in ids if tid in set(only)]
+    return ids
+
+
+def rebuild(db_path, *, apply=False, only=None, workers=None, checkpoint=None,
+            on_result=None):
+    """
+    Rebuild every tournament of *db_path* (or those in *only*). Dry run
+    unless *apply*. *checkpoint* is a JSON path to resume from and update;
+    *on_result(result)* is called for each tournament as it finishes.
+
+    Returns {"results": [...], "skipped", "seconds"}: one result per
+    tournament processed in this run, in id order.
+    """
+    if workers is None:
+        workers = default_workers()
+    started = time.perf_counter()
+    state = Checkpoint(checkpoint, db_path, apply).load()
+    finished = state.finished
+    pending = [tid for tid in tournament_ids(db_path, only) if tid not in finished]
+
+    writer = sqlite_engine(db_path) if apply else None
+    pool = None
+    if workers > 1 and len(pending) > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    done = []
+    futures = []
+    try:
+        # Every tournament is queued up front; results arrive in id order
+        # and are written WRITE_BATCH at a time while the workers carry on.
+        if pool is not None:
+            futures = [pool.submit(compute_tournament, db_path, tid) for tid in pending]
+            computed = (future.result() for future in futures)
+        else:
+            computed = (compute_tournament(db_path, tid) for tid in pending)
+        while True:
+            results = list(itertools.islice(computed, WRITE_BATCH))
+            if not results:
+                break
+            if writer is not None:
+                with writer.begin() as conn:
+                    write_results(conn, results)
+            state.add(results)
+            state.save()
+            for result in results:
+                if on_result is not None:
+                    on_result(result)
+            done.extend(results)
+    finally:
+        if pool is not None:
+            # shutdown(cancel_futures=True) is Python 3.9+; CI runs 3.8.
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+        if writer is not None:
+            writer.dispose()
+        engine = _worker_engines.pop(db_path, None)
+        if engine is not None:
+            engine.dispose()
+
+    return {
+        "results": done,
+        "skipped": len(finished),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,250 @@
+"""
+partnership_index.py
+====================
+
+Partnership leaderboards and breakdowns served from match_partnerships alone.
+
+Each MatchPartnership row carries index columns copied from its match when
+MatchArchiver._save_partnerships_to_db writes it (see index_fields()):
+
+  user_id, tournament_id, match_format   scope, without a join to matches
+  batting_team_id                        the side that batted
+  player_a_id < player_b_id              canonical pair key; the same two
+                                         batsmen share a key whichever of
+                                         them was batsman1
+
+so every query here is a filter/ORDER BY or GROUP BY on those columns
+(ix_partnership_user_format_runs, ix_partnership_tournament_runs,
+ix_partnership_pair, ix_partnership_player_b) and names are joined onto the
+few rows that survive the LIMIT:
+
+  best_partnerships()    single stands, highest first
+  best_pairs()           pairs ranked by aggregate runs
+  best_by_wicket()       highest stand for each wicket (ROW_NUMBER window)
+  player_summary()       one batsman's partners, wickets and milestones
+  player_partnerships()  one batsman's stands, highest first
+
+Rows written before the columns existed are backfilled by
+migrations/add_partnership_index.py.
+"""
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import aliased
+
+from database import db
+from database.models import Match, MatchPartnership, Player, Team, Tournament
+
+_P = MatchPartnership
+MILESTONES = (50, 100, 150, 200)
+
+
+def index_fields(match, batsman1_id, batsman2_id, batting_team_id):
+    """Index column values for a partnership of *match*."""
+    return {
+        "user_id": match.user_id,
+        "tournament_id": match.tournament_id,
+        "match_format": match.match_format,
+        "batting_team_id": batting_team_id,
+        "player_a_id": min(batsman1_id, batsman2_id),
+        "player_b_id": max(batsman1_id, batsman2_id),
+    }
+
+
+def scoped(query, user_id, tournament_id=None, match_format=None):
+    """Restrict a MatchPartnership query to one user / tournament / format."""
+    query = query.filter(_P.user_id == user_id)
+    if tournament_id is not None:
+        query = query.filter(_P.tournament_id == tournament_id)
+    if match_format:
+        query = query.filter(_P.match_format == match_format)
+    return query
+
+
+def _milestone_columns(runs):
+    return [func.sum(case((runs >= m, 1), else_=0)).label(f"m{m}") for m in MILESTONES]
+
+
+def _stand(p, b1_name, b2_name, team, opponent, tournament, date):
+    return {
+        "batsman1": b1_name or "Unknown",
+        "batsman2": b2_name or "Unknown",
+        "team": team or "N/A",
+        "runs": p.runs,
+        "balls": p.balls,
+        "batsman1_contribution": p.batsman1_contribution,
+        "batsman2_contribution": p.batsman2_contribution,
+        "wicket": p.wicket_number,
+        "opponent": opponent or "N/A",
+        "tournament": tournament,
+        "match_id": p.match_id,
+        "date": date.strftime("%Y-%m-%d") if date else "N/A",
+    }
+
+
+def _stands(query):
+    """Attach names, teams, tournament and date to a MatchPartnership query."""
+    batsman_1 = aliased(Player, name="batsman1")
+    batsman_2 = aliased(Player, name="batsman2")
+    batting = aliased(Team, name="batting_team")
+    opponent = aliased(Team, name="opponent_team")
+    opponent_id = case(
+        (Match.home_team_id == _P.batting_team_id, Match.away_team_id),
+        else_=Match.home_team_id,
+    )
+    return (
+        query.add_columns(batsman_1.name, batsman_2.name, batting.name, opponent.name,
+                          Tournament.name, Match.date)
+        .join(Match, _P.match_id == Match.id)
+        .outerjoin(batsman_1, _P.batsman1_id == batsman_1.id)
+        .outerjoin(batsman_2, _P.batsman2_id == batsman_2.id)
+        .outerjoin(batting, _P.batting_team_id == batting.id)
+        .outerjoin(opponent, opponent.id == opponent_id)
+        .outerjoin(Tournament, _P.tournament_id == Tournament.id)
+    )
+
+
+def best_partnerships(user_id, tournament_id=None, match_format=None, limit=10):
+    """Highest single partnerships in scope, best first."""
+    query = scoped(db.session.query(_P), user_id, tournament_id, match_format)
+    query = _stands(query).order_by(_P.runs.desc(), _P.id).limit(limit)
+    return [_stand(*row) for row in query.all()]
+
+
+def best_pairs(user_id, tournament_id=None, match_format=None, limit=10):
+    """Batting pairs ranked by aggregate partnership runs."""
+    runs = func.coalesce(_P.runs, 0)
+    grouped = scoped(
+        db.session.query(
+            _P.player_a_id, _P.player_b_id,
+            func.count(_P.id).label("stands"),
+            func.sum(runs).label("runs"),
+            func.sum(func.coalesce(_P.balls, 0)).label("balls"),
+            func.max(runs).label("best"),
+            *_milestone_columns(runs),
+        ),
+        user_id, tournament_id, match_format,
+    ).group_by(_P.player_a_id, _P.player_b_id).subquery()
+
+    player_a = aliased(Player, name="player_a")
+    player_b = aliased(Player, name="player_b")
+    g = grouped.c
+    rows = (
+        db.session.query(grouped, player_a.name.label("a_name"), player_b.name.label("b_name"))
+        .outerjoin(player_a, g.player_a_id == player_a.id)
+        .outerjoin(player_b, g.player_b_id == player_b.id)
+        .order_by(g.runs.desc(), g.player_a_id, g.player_b_id)
+        .limit(limit)
+        .all()
+    )
+    return [{
+        "player_a_id": row.player_a_id,
+        "player_b_id": row.player_b_id,
+        "batsman1": row.a_name or "Unknown",
+        "batsman2": row.b_name or "Unknown",
+        "partnerships": row.stands,
+        "runs": row.runs,
+        "balls": row.balls,
+        "best": row.best,
+        "average": round(row.runs / row.stands, 1) if row.stands else 0,
+        "fifties": row.m50,
+        "hundreds": row.m100,
+    } for row in rows]
+
+
+def best_by_wicket(user_id, tournament_id=None, match_format=None):
+    """The highest partnership for each wicket, ordered by wicket number."""
+    ranked = scoped(
+        db.session.query(
+            _P.id.label("id"),
+            func.row_number().over(
+                partition_by=_P.wicket_number,
+                order_by=(_P.runs.desc(), _P.balls.asc(), _P.id),
+            ).label("rank"),
+        ),
+        user_id, tournament_id, match_format,
+    ).subquery()
+    query = (
+        db.session.query(_P)
+        .join(ranked, ranked.c.id == _P.id)
+        .filter(ranked.c.rank == 1)
+    )
+    return [_stand(*row) for row in _stands(query).order_by(_P.wicket_number).all()]
+
+
+def _player_scope(player_id, user_id, tournament_id, match_format, query):
+    return scoped(
+        query.filter(or_(_P.player_a_id == player_id, _P.player_b_id == player_id)),
+        user_id, tournament_id, match_format,
+    )
+
+
+def player_summary(player_id, user_id, tournament_id=None, match_format=None):
+    """
+    One batsman's partnership totals in two grouped queries: by wicket (with
+    milestone counts) and by partner. Partners are ordered by total runs.
+    """
+    runs = func.coalesce(_P.runs, 0)
+    by_wicket = _player_scope(player_id, user_id, tournament_id, match_format, db.session.query(
+        _P.wicket_number, func.count(_P.id), func.sum(runs), *_milestone_columns(runs),
+    )).group_by(_P.wicket_number).all()
+
+    summary = {
+        "total_partnerships": 0,
+        "total_runs": 0,
+        "by_position": {},
+        "milestones": {f"{m}+": 0 for m in MILESTONES},
+        "partners": [],
+    }
+    for wicket, count, total, *milestones in by_wicket:
+        summary["by_position"][wicket] = {"count": count, "runs": total}
+        summary["total_partnerships"] += count
+        summary["total_runs"] += total
+        for m, hit in zip(MILESTONES, milestones):
+            summary["milestones"][f"{m}+"] += hit
+
+    partner_id = case((_P.player_a_id == player_id, _P.player_b_id), else_=_P.player_a_id)
+    partners = _player_scope(player_id, user_id, tournament_id, match_format, db.session.query(
+        partner_id.label("partner_id"), func.count(_P.id).label("count"),
+        func.sum(runs).label("total_runs"), func.max(runs).label("best"),
+    )).group_by(partner_id).subquery()
+    rows = (
+        db.session.query(partners, Player.name)
+        .join(Player, Player.id == partners.c.partner_id)
+        .order_by(partners.c.total_runs.desc(), partners.c.partner_id)
+        .all()
+    )
+    summary["partners"] = [{
+        "player_id": row.partner_id,
+        "name": row.name,
+        "count": row.count,
+        "total_runs": row.total_runs,
+        "best": row.best,
+        "avg_runs": round(row.total_runs / row.count, 1),
+    } for row in rows]
+    return summary
+
+
+def player_partnerships(player_id, user_id, tournament_id=None, match_format=None, limit=None):
+    """One batsman's partnerships, highest first, from their point of view."""
+    query = _player_scope(player_id, user_id, tournament_id, match_format, db.session.query(_P))
+    query = _stands(query).order_by(_P.runs.desc(), _P.id)
+    if limit:
+        query = query.limit(limit)
+
+    stands = []
+    for row in query.all():
+        p, b1_name, b2_name = row[0], row[1], row[2]
+        stand = _stand(*row)
+        is_batsman1 = p.batsman1_id == player_id
+        stands.append({
+            "partner": b2_name if is_batsman1 else b1_name,
+            "runs": p.runs,
+            "balls": p.balls,
+            "player_contribution": p.batsman1_contribution if is_batsman1 else p.batsman2_contribution,
+            "partner_contribution": p.batsman2_contribution if is_batsman1 else p.batsman1_contribution,
+            "wicket": p.wicket_number,
+            "match_id": p.match_id,
+            "opponent": stand["opponent"],
+            "date": stand["date"],
+        })
+    return stands
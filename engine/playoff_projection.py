@@ -0,0 +1,353 @@
+"""
+playoff_projection.py
+=====================
+
+Monte Carlo playoff-qualification projections for league tournaments.
+
+The remaining league fixtures are played thousands of times with a fast
+ratings-based match model instead of the ball-by-ball engine, all
+simulations at once as numpy arrays:
+
+  match model   per format, fitted to headless engine matches
+                (scripts/calibrate_projection.py):
+                  first-innings score  Normal(mean + bat*(bat-70) + bowl*(bowl-70), sd)
+                  chase won            logistic in the target, the chasing
+                                       side's batting and the defending
+                                       side's bowling
+                  tie                  flat rate
+                  chase balls          fraction of the quota when the chase
+                                       is won, the full quota otherwise
+                Team batting strength is the mean of the top seven batting
+                ratings in the default XI, bowling the mean of its five
+                bowlers (engine/tournament_autosim.default_lineup).
+  standings     the rules of TournamentEngine.update_standings: POINTS_WIN /
+                POINTS_TIE, NRR from runs and balls with the full quota when
+                a side is bowled out, ranked by points, NRR, wins, runs
+                scored — the get_standings() order.
+  playoffs      IPL style: Q1 1v2, Eliminator 3v4, Q2 loser Q1 v winner
+                Eliminator, Final (_populate_ipl_playoffs); the league +
+                knockout modes: SF 1v4 and 2v3, Final
+                (_populate_semifinal_playoffs); plain round robins are won
+                by the table topper. Played playoff fixtures keep their
+                real winners.
+
+Pure knockouts and custom series have no table to project and return None.
+
+project_tournament() runs chunks of simulations until SIMULATIONS are done
+or TIME_BUDGET seconds have passed, and caches the result in the stats
+cache keyed by Tournament.version (bumped by every result and reversal, see
+engine/tournament_dashboard.py), so a cached projection costs no queries.
+The random seed is a fingerprint of the standings and remaining fixtures,
+so equal tables give equal odds.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from database.models import Team, TournamentFixture, TournamentTeam
+from engine.stats_cache import get_cache
+from engine.tournament_engine import TournamentEngine as TE
+
+SIMULATIONS = 10000
+CHUNK = 2000
+TIME_BUDGET = 0.5  # seconds
+
+
+@dataclass(frozen=True)
+class MatchModel:
+    """Fitted parameters of the fast match model for one format."""
+    quota_balls: int
+    first_mean: float      # expected first-innings score at batting = bowling = 70
+    first_bat: float
+    first_bowl: float
+    first_sd: float
+    first_min: int
+    chase_centre: float    # the target the chase logit is centred on (mean fitted target)
+    chase_logit: tuple     # (intercept, per run of target above chase_centre, bat, bowl)
+    tie_rate: float
+    chase_balls: tuple     # (mean, sd) fraction of the quota used in a won chase
+    loss_margin: tuple     # (mean, sd) runs a failed chase falls short by
+
+
+# Fitted by scripts/calibrate_projection.py (5000 engine matches per format).
+MODELS = {
+    "T20": MatchModel(
+        quota_balls=120, first_mean=182.8, first_bat=0.228, first_bowl=-0.287,
+        first_sd=59.0, first_min=30, chase_centre=181.5, chase_logit=(1.826, -0.043, 0.0151, -0.0126),
+        tie_rate=0.009, chase_balls=(0.852, 0.15), loss_margin=(37.7, 34.4),
+    ),
+    "ListA": MatchModel(
+        quota_balls=300, first_mean=301.0, first_bat=0.166, first_bowl=-0.297,
+        first_sd=67.6, first_min=130, chase_centre=300.0, chase_logit=(1.1907, -0.0455, 0.0127, -0.0103),
+        tie_rate=0.011, chase_balls=(0.905, 0.1), loss_margin=(33.8, 31.2),
+    ),
+}
+
+_LEAGUE_MODES = {
+    TE.MODE_ROUND_ROBIN, TE.MODE_DOUBLE_ROUND_ROBIN, TE.MODE_ROUND_ROBIN_KNOCKOUT,
+    TE.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT, TE.MODE_IPL_STYLE,
+}
+
+
+# ---------------------------------------------------------------------------
+# Team strength
+# ---------------------------------------------------------------------------
+
+
+def team_strength(team, match_format):
+    """(batting, bowling) strength of *team*'s default XI for *match_format*."""
+    from engine.tournament_autosim import default_lineup, format_squad
+
+    xi, _ = default_lineup(format_squad(team, match_format))
+    bats = sorted((p["batting_rating"] or 0 for p in xi), reverse=True)[:7]
+    bowls = [p["bowling_rating"] or 0 for p in xi if p["will_bowl"]]
+    return (
+        sum(bats) / len(bats) if bats else 50.0,
+        sum(bowls) / len(bowls) if bowls else 50.0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Vectorised match model
+# ---------------------------------------------------------------------------
+
+
+def first_innings_mean(model, batting, bowling):
+    """Expected first-innings score of *batting* strength against a *bowling* attack."""
+    return model.first_mean + model.first_bat * (batting - 70) + model.first_bowl * (bowling - 70)
+
+
+def simulate_matches(model, rng, bat, bowl, home, away, n):
+    """
+    Play fixtures (home[k] v away[k], team indices into *bat*/*bowl*) *n*
+    times. Returns per-(sim, fixture) arrays: home_runs, home_balls,
+    away_runs, away_balls and result (1 home win, -1 away win, 0 tie).
+    """
+    shape = (n, len(home))
+    home_first = rng.random(shape) < 0.5
+    first = np.where(home_first, home, away)
+    chaser = np.where(home_first, away, home)
+
+    target = rng.normal(first_innings_mean(model, bat[first], bowl[chaser]), model.first_sd)
+    target = np.maximum(np.rint(target), model.first_min).astype(np.int64)
+
+    a, per_run, c_bat, c_bowl = model.chase_logit
+    logit = a + per_run * (target - model.chase_centre) + c_bat * (bat[chaser] - 70) + c_bowl * (bowl[first] - 70)
+    roll = rng.random(shape)
+    tied = roll < model.tie_rate
+    chased = ~tied & (rng.random(shape) < 1.0 / (1.0 + np.exp(-logit)))
+
+    short = np.maximum(1, np.rint(np.abs(rng.normal(*model.loss_margin, shape)))).astype(np.int64)
+    chase_runs = np.where(chased, target + rng.integers(1, 5, shape), np.where(tied, target, target - short))
+    chase_runs = np.maximum(chase_runs, 0)
+    fraction = np.clip(rng.normal(*model.chase_balls, shape), 0.3, 1.0)
+    chase_balls = np.where(chased, np.rint(fraction * model.quota_balls), model.quota_balls).astype(np.int64)
+
+    home_runs = np.where(home_first, target, chase_runs)
+    away_runs = np.where(home_first, chase_runs, target)
+    home_balls = np.where(home_first, model.quota_balls, chase_balls)
+    away_balls = np.where(home_first, chase_balls, model.quota_balls)
+    first_won = ~tied & ~chased
+    home_won = np.where(home_first, first_won, chased)
+    result = np.where(tied, 0, np.where(home_won, 1, -1))
+    return home_runs, home_balls, away_runs, away_balls, result
+
+
+def head_to_head_probabilities(model, rng, bat, bowl, n=4000):
+    """P[i, j]: the chance team i beats team j in a decided knockout game."""
+    teams = len(bat)
+    home, away = np.triu_indices(teams, 1)
+    if not len(home):
+        return np.full((teams, teams), 0.5)
+    *_, result = simulate_matches(model, rng, bat, bowl, home, away, n)
+    decided = np.maximum((result != 0).sum(axis=0), 1)
+    p_home = (result == 1).sum(axis=0) / decided
+    probs = np.full((teams, teams), 0.5)
+    probs[home, away] = p_home
+    probs[away, home] = 1 - p_home
+    return probs
+
+
+def _knockout(rng, probs, a, b, fixed=None):
+    """Per-sim winners of a v b (team index arrays); *fixed* is a played result."""
+    if fixed is not None:
+        return np.full_like(a, fixed)
+    return np.where(rng.random(a.shape) < probs[a, b], a, b)
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+
+
+def _state(tournament_id):
+    rows = (
+        TournamentTeam.query.filter_by(tournament_id=tournament_id)
+        .order_by(TournamentTeam.team_id)
+        .all()
+    )
+    fixtures = (
+        TournamentFixture.query.filter_by(tournament_id=tournament_id)
+        .order_by(TournamentFixture.id)
+        .all()
+    )
+    return rows, fixtures
+
+
+def fingerprint(rows, fixtures):
+    """Changes whenever a result, a reversal or a pairing changes the table."""
+    parts = [
+        (r.team_id, r.played, r.points, r.won, r.runs_scored, r.runs_conceded,
+         r.balls_faced, r.balls_bowled)
+        for r in rows
+    ]
+    parts += [(f.id, f.status, f.home_team_id, f.away_team_id, f.winner_team_id) for f in fixtures]
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+
+
+def project_tournament(tournament, simulations=SIMULATIONS, time_budget=TIME_BUDGET):
+    """
+    Qualification odds for every team in *tournament*, or None when the mode
+    has no league table. Returns {"simulations", "remaining", "teams": [...]}
+    with one entry per team: team_id, team_name, top2, top4, title
+    (probabilities in [0, 1]) and expected_position, in standings order.
+    """
+    if tournament is None or tournament.mode not in _LEAGUE_MODES:
+        return None
+    key = ("playoff_projection", tournament.id, simulations, tournament.version)
+    cache = get_cache()
+    if cache is not None and cache.max_entries > 0:
+        hit, value = cache.get(key)
+        if hit:
+            return value
+
+    rows, fixtures = _state(tournament.id)
+    if len(rows) < 2:
+        return None
+    value = _project(tournament, rows, fixtures, simulations, time_budget, seed=fingerprint(rows, fixtures))
+    if cache is not None and cache.max_entries > 0:
+        cache.put(key, value)
+    return value
+
+
+def _project(tournament, rows, fixtures, simulations, time_budget, seed):
+    model = MODELS.get(tournament.format_type or "T20", MODELS["T20"])
+    rng = np.random.default_rng(int(seed, 16))
+    index = {r.team_id: i for i, r in enumerate(rows)}
+    teams = {t.id: t for t in Team.query.filter(Team.id.in_(list(index)))}
+    strengths = [team_strength(teams[r.team_id], tournament.format_type or "T20") for r in rows]
+    bat = np.array([s[0] for s in strengths])
+    bowl = np.array([s[1] for s in strengths])
+
+    remaining = [
+        f for f in fixtures
+        if f.stage == TE.STAGE_LEAGUE and f.status != "Completed"
+        and f.home_team_id in index and f.away_team_id in index
+    ]
+    home = np.array([index[f.home_team_id] for f in remaining], dtype=np.int64)
+    away = np.array([index[f.away_team_id] for f in remaining], dtype=np.int64)
+    playoffs = {f.stage: f for f in fixtures if f.stage != TE.STAGE_LEAGUE}
+    probs = head_to_head_probabilities(model, rng, bat, bowl)
+
+    base = {
+        "points": np.array([r.points for r in rows], dtype=np.int64),
+        "won": np.array([r.won for r in rows], dtype=np.int64),
+        "runs_for": np.array([r.runs_scored for r in rows], dtype=np.int64),
+        "runs_against": np.array([r.runs_conceded for r in rows], dtype=np.int64),
+        "balls_for": np.array([r.balls_faced for r in rows], dtype=np.int64),
+        "balls_against": np.array([r.balls_bowled for r in rows], dtype=np.int64),
+    }
+    n_teams = len(rows)
+    top2 = np.zeros(n_teams)
+    top4 = np.zeros(n_teams)
+    titles = np.zeros(n_teams)
+    position_sum = np.zeros(n_teams)
+
+    started = time.monotonic()
+    done = 0
+    while done < simulations:
+        n = min(CHUNK, simulations - done)
+        order = _league_order(model, rng, bat, bowl, home, away, base, n)
+        positions = np.empty_like(order)
+        positions[np.arange(n)[:, None], order] = np.arange(n_teams)
+        position_sum += positions.sum(axis=0)
+        top2 += (positions < 2).sum(axis=0)
+        top4 += (positions < 4).sum(axis=0)
+        champions = _champions(tournament.mode, rng, probs, order, playoffs, index)
+        titles += np.bincount(champions, minlength=n_teams)
+        done += n
+        if time.monotonic() - started > time_budget:
+            break
+
+    projected = [
+        {
+            "team_id": r.team_id,
+            "team_name": teams[r.team_id].name,
+            "top2": round(float(top2[i] / done), 4),
+            "top4": round(float(top4[i] / done), 4),
+            "title": round(float(titles[i] / done), 4),
+            "expected_position": round(float(position_sum[i] / done + 1), 2),
+        }
+        for i, r in enumerate(rows)
+    ]
+    projected.sort(key=lambda t: t["expected_position"])
+    return {"simulations": done, "remaining": len(remaining), "teams": projected}
+
+
+def _league_order(model, rng, bat, bowl, home, away, base, n):
+    """(n, teams) team indices in final table order for *n* simulations."""
+    n_teams = len(bat)
+    totals = {k: np.broadcast_to(v, (n, n_teams)).copy() for k, v in base.items()}
+    if len(home):
+        home_runs, home_balls, away_runs, away_balls, result = simulate_matches(
+            model, rng, bat, bowl, home, away, n
+        )
+        sims = np.repeat(np.arange(n), len(home))
+        h = np.tile(home, n)
+        a = np.tile(away, n)
+        result = result.ravel()
+        points_home = np.select([result == 1, result == 0], [TE.POINTS_WIN, TE.POINTS_TIE], TE.POINTS_LOSS)
+        points_away = np.select([result == -1, result == 0], [TE.POINTS_WIN, TE.POINTS_TIE], TE.POINTS_LOSS)
+        for team, points, won, runs_for, balls_for, runs_against, balls_against in (
+            (h, points_home, result == 1, home_runs, home_balls, away_runs, away_balls),
+            (a, points_away, result == -1, away_runs, away_balls, home_runs, home_balls),
+        ):
+            np.add.at(totals["points"], (sims, team), points)
+            np.add.at(totals["won"], (sims, team), won.astype(np.int64))
+            np.add.at(totals["runs_for"], (sims, team), runs_for.ravel())
+            np.add.at(totals["balls_for"], (sims, team), balls_for.ravel())
+            np.add.at(totals["runs_against"], (sims, team), runs_against.ravel())
+            np.add.at(totals["balls_against"], (sims, team), balls_against.ravel())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_for = np.where(totals["balls_for"] > 0, totals["runs_for"] * 6.0 / totals["balls_for"], 0.0)
+        rate_against = np.where(
+            totals["balls_against"] > 0, totals["runs_against"] * 6.0 / totals["balls_against"], 0.0
+        )
+    nrr = np.round(rate_for - rate_against, 6)
+    # get_standings(): points, NRR, wins, runs scored — all descending.
+    return np.lexsort((-totals["runs_for"], -totals["won"], -nrr, -totals["points"]), axis=1)
+
+
+def _champions(mode, rng, probs, order, playoffs, index):
+    def fixed(stage):
+        fixture = playoffs.get(stage)
+        if fixture is not None and fixture.status == "Completed" and fixture.winner_team_id in index:
+            return index[fixture.winner_team_id]
+        return None
+
+    seed = [order[:, i] for i in range(min(4, order.shape[1]))]
+    if mode == TE.MODE_IPL_STYLE and len(seed) == 4:
+        q1 = _knockout(rng, probs, seed[0], seed[1], fixed(TE.STAGE_QUALIFIER_1))
+        q1_loser = np.where(q1 == seed[0], seed[1], seed[0])
+        eliminator = _knockout(rng, probs, seed[2], seed[3], fixed(TE.STAGE_ELIMINATOR))
+        q2 = _knockout(rng, probs, q1_loser, eliminator, fixed(TE.STAGE_QUALIFIER_2))
+        return _knockout(rng, probs, q1, q2, fixed(TE.STAGE_FINAL))
+    if mode in (TE.MODE_ROUND_ROBIN_KNOCKOUT, TE.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT) and len(seed) == 4:
+        sf1 = _knockout(rng, probs, seed[0], seed[3], fixed(TE.STAGE_SEMIFINAL_1))
+        sf2 = _knockout(rng, probs, seed[1], seed[2], fixed(TE.STAGE_SEMIFINAL_2))
+        return _knockout(rng, probs, sf1, sf2, fixed(TE.STAGE_FINAL))
+    return seed[0]
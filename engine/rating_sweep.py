@@ -0,0 +1,259 @@
+"""
+rating_sweep.py
+===============
+
+Rating-sensitivity surfaces straight from the ball-outcome kernel.
+
+tests/test_scoring_calibration.py measures the engine with full matches,
+which is the truth but takes minutes and mixes every effect together.
+This module evaluates outcome_weights() — the exact pipeline
+calculate_outcome() draws from — over a grid of
+
+    batting rating x bowling rating x pitch x phase x balls faced
+
+and turns each cell's distribution into expected per-ball rates. There is
+no sampling: every cell is the exact expectation, so one pass over a few
+thousand cells replaces millions of simulated deliveries.
+
+Cells are evaluated one at a time through outcome_weights() itself rather
+than as numpy arrays. The kernel is scalar Python over per-pitch dicts with
+per-ball branching (matchups, phase boosts, wear, free hit); a vectorized
+copy would be a second implementation of it that could drift from what
+calculate_outcome() draws from. With no sampling to batch, the default grid
+(14,700 cells per format) already runs in about 1.5s.
+
+Per cell (all per ball faced, i.e. excluding Extras deliveries):
+
+  strike_rate     100 x expected bat runs, including run-out singles,
+                  runs off dropped chances and misfields
+  dismissal_rate  wicket chances that stick after catch/stumping drops
+  boundary_rate   Four + Six
+  extras_rate     share of all deliveries that are Extras
+
+The grid holds everything else fixed: a generic bowler of `bowling_type`,
+batting position 4, no GSME / pressure / streak, first innings, fresh
+pitch. batter_runs follows balls_faced at a run a ball, so the confidence
+curve moves together with the new-batter curve the way it does in play.
+
+Results are cached by (ground config, format, grid, kernel source) — in
+memory, and on disk as JSON when a cache_dir is given — so re-running after
+an unrelated edit is free, while editing the config, the grid,
+engine/ball_outcome.py or this module invalidates it.
+
+Usage:
+    from engine.rating_sweep import SweepGrid, run_sweep, write_csv
+    rows = run_sweep(SweepGrid(pitches=("Hard", "Flat")), format_name="ListA")
+    write_csv(rows, "sweep.csv")
+
+    python scripts/rating_sweep.py --format ListA --csv sweep.csv
+"""
+
+import csv
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+import engine.ball_outcome as _ball_outcome
+from engine.ball_outcome import (
+    DROP_RUNS,
+    _drop_probability,
+    _get_wicket_type_by_bowling,
+    _misfield_probability,
+    outcome_weights,
+)
+from engine.format_config import get_format
+from engine.ground_config import get_defaults, normalise_format
+
+RUNS = {"Dot": 0, "Single": 1, "Double": 2, "Three": 3, "Four": 4, "Six": 6}
+
+_DROP_RUNS_MEAN = (
+    sum(r * w for r, w in zip(*DROP_RUNS)) / sum(DROP_RUNS[1])
+)
+
+FIELDS = (
+    "format", "pitch", "phase", "over", "balls_faced", "batting", "bowling",
+    "strike_rate", "dismissal_rate", "boundary_rate", "extras_rate",
+)
+
+_memory_cache = {}
+
+
+@dataclass(frozen=True)
+class SweepGrid:
+    """Axes of the sweep. Pitches default to every pitch in the config."""
+    batting: tuple = tuple(range(30, 100, 5))
+    bowling: tuple = tuple(range(30, 100, 5))
+    pitches: tuple = ()
+    balls_faced: tuple = (0, 4, 10, 20, 35)
+    bowling_type: str = "Medium"
+    fielding: int = 70
+    batting_position: int = 4
+
+
+def phase_overs(fmt):
+    """{phase name: representative over} — the middle over of each phase."""
+    phases = list(fmt.powerplay_phases) + [fmt.middle_phase, fmt.death_phase]
+    return {p.name: (p.start + p.end) // 2 for p in phases}
+
+
+def _config_pitches(config):
+    return tuple((config.get("pitch_profiles") or {}).keys())
+
+
+@lru_cache(maxsize=1)
+def kernel_version():
+    """Hash of the kernel source (ball_outcome.py and this module's rate
+    maths), so an engine change invalidates cached sweeps."""
+    digest = hashlib.sha1()
+    for path in (_ball_outcome.__file__, __file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(config, format_name, grid):
+    """Stable hash of everything a sweep's numbers depend on."""
+    payload = json.dumps(
+        {"config": config, "format": format_name, "grid": asdict(grid),
+         "kernel": kernel_version()},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cell_rates(weights, bowling_type, fielding):
+    """Expected per-ball rates for one outcome_weights() distribution."""
+    total = sum(weights.values())
+    if total <= 0:
+        # calculate_outcome() treats an all-zero matrix as a dot ball
+        return {"strike_rate": 0.0, "dismissal_rate": 0.0,
+                "boundary_rate": 0.0, "extras_rate": 0.0}
+    p = {k: v / total for k, v in weights.items()}
+    extras = p.get("Extras", 0.0)
+    faced = 1.0 - extras
+
+    types, type_weights = _get_wicket_type_by_bowling(bowling_type)
+    type_total = float(sum(type_weights))
+    share = {t: w / type_total for t, w in zip(types, type_weights)}
+    drop = _drop_probability(fielding)
+    chance = p.get("Wicket", 0.0)
+    dropped = chance * (share.get("Caught", 0.0) + share.get("Stumped", 0.0)) * drop
+
+    runs = sum(p.get(o, 0.0) * r for o, r in RUNS.items())
+    runs += (p.get("Dot", 0.0) + p.get("Single", 0.0)) * _misfield_probability(fielding)
+    runs += dropped * _DROP_RUNS_MEAN
+    # A run-out completes one run first (even if the chance is later dropped,
+    # which only ever happens to Caught/Stumped).
+    runs += chance * share.get("Run Out", 0.0)
+
+    if faced <= 0:
+        return {"strike_rate": 0.0, "dismissal_rate": 0.0,
+                "boundary_rate": 0.0, "extras_rate": extras}
+    return {
+        "strike_rate": 100.0 * runs / faced,
+        "dismissal_rate": (chance - dropped) / faced,
+        "boundary_rate": (p.get("Four", 0.0) + p.get("Six", 0.0)) / faced,
+        "extras_rate": extras,
+    }
+
+
+def _sweep(grid, config, format_name):
+    fmt = get_format(format_name)
+    pitches = grid.pitches or _config_pitches(config)
+    overs = phase_overs(fmt)
+    batter = {"batting_rating": 0, "batting_hand": "Right"}
+    bowler = {"bowling_rating": 0, "fielding_rating": grid.fielding,
+              "bowling_hand": "Right", "bowling_type": grid.bowling_type}
+    streak = {}
+
+    rows = []
+    for pitch in pitches:
+        for phase, over in overs.items():
+            for balls in grid.balls_faced:
+                for bat in grid.batting:
+                    batter["batting_rating"] = bat
+                    for bowl in grid.bowling:
+                        bowler["bowling_rating"] = bowl
+                        weights = outcome_weights(
+                            batter, bowler, pitch, streak, over, balls,
+                            balls_faced=balls,
+                            batting_position=grid.batting_position,
+                            ground_config_override=config,
+                            format_config=fmt,
+                        )
+                        row = {
+                            "format": format_name, "pitch": pitch,
+                            "phase": phase, "over": over,
+                            "balls_faced": balls, "batting": bat, "bowling": bowl,
+                        }
+                        row.update(cell_rates(weights, grid.bowling_type, grid.fielding))
+                        rows.append(row)
+    return rows
+
+
+def run_sweep(grid=None, ground_config=None, format_name="T20", cache_dir=None):
+    """
+    Evaluate the grid and return one dict per cell (keys: FIELDS).
+
+    ground_config : a format block as stored in match JSON / UserGroundConfig
+                    (merged over defaults); None means the factory defaults.
+    cache_dir     : optional directory for the on-disk JSON cache.
+    """
+    grid = grid or SweepGrid()
+    format_name = normalise_format(format_name)
+    config = ground_config if ground_config is not None else get_defaults(format_name)
+    key = cache_key(config, format_name, grid)
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = os.path.join(cache_dir, f"sweep_{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)["rows"]
+    else:
+        rows = _sweep(grid, config, format_name)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "format": format_name,
+                           "grid": asdict(grid), "rows": rows}, f)
+
+    _memory_cache[key] = rows
+    return rows
+
+
+def rating_spread(rows, metric, **fixed):
+    """
+    How much `metric` moves across the rating axes with everything else
+    held at `fixed` (e.g. pitch="Hard", phase="Middle", balls_faced=10).
+
+    Returns {"batting": max-min over batting at median bowling,
+             "bowling": max-min over bowling at median batting}.
+    """
+    cells = [r for r in rows if all(r[k] == v for k, v in fixed.items())]
+    if not cells:
+        raise ValueError(f"no sweep cells match {fixed}")
+    bats = sorted({r["batting"] for r in cells})
+    bowls = sorted({r["bowling"] for r in cells})
+    mid_bat, mid_bowl = bats[len(bats) // 2], bowls[len(bowls) // 2]
+    by_bat = [r[metric] for r in cells if r["bowling"] == mid_bowl]
+    by_bowl = [r[metric] for r in cells if r["batting"] == mid_bat]
+    return {"batting": max(by_bat) - min(by_bat),
+            "bowling": max(by_bowl) - min(by_bowl)}
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: (round(v, 6) if isinstance(v, float) else v)
+                             for k, v in row.items()})
+
+
+def write_json(rows, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=1)
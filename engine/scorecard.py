@@ -0,0 +1,415 @@
+"""
+engine/scorecard.py
+===================
+
+Shared scorecard intermediate for one innings.
+
+The live match (Match._generate_detailed_scorecard / _format_scorecard_block)
+and the archiver (text tables, CSVs) used to re-walk the raw
+batsman_stats / bowler_stats dicts independently for every output format.
+InningsScorecard keeps one normalised copy of the fields those renderers
+read:
+
+  - the ball path calls mark_dirty() with the batters and bowler a delivery
+    touched, and refresh() re-copies just those rows, bumping `version` if
+    any of them changed. Nothing walks the whole innings per ball.
+  - sync() is the full rebuild, used when a model is first built and when
+    the stats dicts are replaced or gain/lose players (new innings, restored
+    state, lineup changes); refresh() falls back to it in those cases.
+  - every renderer caches its output against `version`, so rendering the
+    same innings again — at innings end, on resume, at archive time — is a
+    dict lookup until another ball changes a row.
+
+Rendered outputs are byte-for-byte what the pre-existing code produced; the
+formatting rules are unchanged, they just read from here now.
+"""
+
+from tabulate import tabulate
+
+from engine.cricket_math import balls_to_overs_str
+
+BATTING_FIELDS = (
+    "runs", "balls", "ones", "twos", "threes", "fours", "sixes", "dots",
+    "wicket_type", "bowler_out", "fielder_out",
+)
+BOWLING_FIELDS = (
+    "overs", "balls_bowled", "maidens", "runs", "wickets",
+    "wides", "noballs", "byes", "legbyes",
+)
+
+_TEXT_FIELDS = ("wicket_type", "bowler_out", "fielder_out")
+
+_EMPTY_BATTING_ROW = {
+    "status": "", "wicket_type": "", "runs": "", "balls": "", "fours": "",
+    "sixes": "", "strike_rate": "", "bowler_out": "", "fielder_out": "",
+}
+_EMPTY_BOWLING_ROW = {
+    "overs": "", "maidens": "", "runs": "", "wickets": "", "noballs": "",
+    "wides": "", "economy": "",
+}
+
+
+def _line(stats, fields):
+    # Text fields keep None for "missing" — the live payload renders a
+    # missing dismisser as "?" but an empty one as "".
+    line = {}
+    for f in fields:
+        value = stats.get(f)
+        if value is None and f not in _TEXT_FIELDS:
+            value = 0
+        line[f] = value
+    return line
+
+
+def _text(value):
+    return "" if value is None else value
+
+
+def _has_batted(line):
+    return bool(line["wicket_type"]) or line["balls"] > 0
+
+
+def _dismissal_status(line):
+    """Cricbuzz-style status used by the live scorecard payload."""
+    def q(field):
+        value = line[field]
+        return "?" if value is None else value
+
+    status_raw = line["wicket_type"] or "not out"
+    if status_raw == "Caught":
+        return f"c. {q('fielder_out')} b. {q('bowler_out')}"
+    if status_raw == "Bowled":
+        return f"b. {q('bowler_out')}"
+    if status_raw == "LBW":
+        return f"lbw b. {q('bowler_out')}"
+    if status_raw == "Run Out":
+        return f"run out ({q('fielder_out')})"
+    if status_raw == "Stumped":
+        return f"st. {q('fielder_out')} b. {q('bowler_out')}"
+    if status_raw == "Hit Wicket":
+        return f"hit wicket b. {q('bowler_out')}"
+    return status_raw
+
+
+class InningsScorecard:
+    """Incrementally maintained batting/bowling lines for one innings."""
+
+    def __init__(self):
+        self._batting = {}        # name -> normalised line (source dict order)
+        self._bowling = {}
+        self._bat_source = None   # stats dicts the lines were last synced from
+        self._bowl_source = None
+        self._dirty_batting = set()
+        self._dirty_bowling = set()
+        self.version = 0
+        self._cache = {}
+        self._cache_version = 0
+
+    @classmethod
+    def from_stats(cls, batting_stats, bowling_stats):
+        card = cls()
+        card.sync(batting_stats, bowling_stats)
+        return card
+
+    # ── incremental update ────────────────────────────────────────────────
+    @staticmethod
+    def _copy_rows(source, lines, names, fields):
+        changed = False
+        for name in names:
+            stats = source.get(name)
+            if stats is None:
+                continue
+            line = _line(stats, fields)
+            if lines.get(name) != line:
+                lines[name] = line
+                changed = True
+        return changed
+
+    @classmethod
+    def _sync_side(cls, source, lines, fields):
+        source = source or {}
+        changed = cls._copy_rows(source, lines, source, fields)
+        if len(lines) != len(source) or list(lines) != list(source):
+            # Players dropped or order changed (new innings / restored state):
+            # re-key in source order, keeping the already-normalised lines.
+            reordered = {name: lines[name] for name in source}
+            lines.clear()
+            lines.update(reordered)
+            changed = True
+        return changed
+
+    def mark_dirty(self, batters=(), bowlers=()):
+        """Record rows a delivery may have changed; refresh() re-copies them."""
+        self._dirty_batting.update(n for n in batters if n)
+        self._dirty_bowling.update(n for n in bowlers if n)
+
+    def sync(self, batting_stats, bowling_stats):
+        """Rebuild the model from the full stats dicts. Returns True if any
+        line changed; unchanged lines are kept as-is."""
+        changed = self._sync_side(batting_stats, self._batting, BATTING_FIELDS)
+        changed = self._sync_side(bowling_stats, self._bowling, BOWLING_FIELDS) or changed
+        self._bat_source = batting_stats
+        self._bowl_source = bowling_stats
+        self._dirty_batting.clear()
+        self._dirty_bowling.clear()
+        if changed:
+            self.version += 1
+        return changed
+
+    def refresh(self, batting_stats, bowling_stats):
+        """Re-copy only the rows marked dirty since the previous call. Falls
+        back to sync() when the stats dicts were replaced or resized."""
+        if (batting_stats is not self._bat_source
+                or bowling_stats is not self._bowl_source
+                or len(batting_stats or {}) != len(self._batting)
+                or len(bowling_stats or {}) != len(self._bowling)):
+            return self.sync(batting_stats, bowling_stats)
+        changed = self._copy_rows(batting_stats or {}, self._batting,
+                                  self._dirty_batting, BATTING_FIELDS)
+        changed = self._copy_rows(bowling_stats or {}, self._bowling,
+                                  self._dirty_bowling, BOWLING_FIELDS) or changed
+        self._dirty_batting.clear()
+        self._dirty_bowling.clear()
+        if changed:
+            self.version += 1
+        return changed
+
+    def _cached(self, key, build):
+        if self._cache_version != self.version:
+            self._cache.clear()
+            self._cache_version = self.version
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    # ── shared intermediate ───────────────────────────────────────────────
+    @property
+    def batting_lines(self):
+        return self._batting
+
+    @property
+    def bowling_lines(self):
+        return self._bowling
+
+    def batting_runs_total(self):
+        """Runs off the bat across every batting line (extras = total - this)."""
+        return self._cached(("bat_runs",), lambda: sum(l["runs"] for l in self._batting.values()))
+
+    # ── live match payload (Match._generate_detailed_scorecard) ───────────
+    def _player_rows(self, batting_order):
+        rows = []
+        for name in batting_order:
+            line = self._batting.get(name)
+            if line is not None and _has_batted(line):
+                balls = line["balls"]
+                strike_rate = (line["runs"] * 100) / balls if balls > 0 else 0
+                rows.append({
+                    "name": name,
+                    "status": _dismissal_status(line),
+                    "wicket_type": _text(line["wicket_type"]),
+                    "runs": line["runs"],
+                    "balls": balls,
+                    "fours": line["fours"],
+                    "sixes": line["sixes"],
+                    "strike_rate": f"{strike_rate:.1f}",
+                    "bowler_out": _text(line["bowler_out"]),
+                    "fielder_out": _text(line["fielder_out"]),
+                })
+            else:
+                rows.append({"name": name, **_EMPTY_BATTING_ROW})
+        return rows
+
+    def _bowler_rows(self, bowling_order):
+        rows = []
+        for name in bowling_order:
+            line = self._bowling.get(name)
+            if line is not None and (line["balls_bowled"] > 0 or line["overs"] > 0):
+                part = line["balls_bowled"] % 6
+                total_balls = line["overs"] * 6 + part
+                economy = (line["runs"] * 6) / total_balls if total_balls > 0 else 0
+                rows.append({
+                    "name": name,
+                    "overs": f"{line['overs']}.{part}" if part > 0 else str(line["overs"]),
+                    "maidens": line["maidens"],
+                    "runs": line["runs"],
+                    "wickets": line["wickets"],
+                    "noballs": line["noballs"],
+                    "wides": line["wides"],
+                    "economy": f"{economy:.2f}",
+                })
+            else:
+                rows.append({"name": name, **_EMPTY_BOWLING_ROW})
+        return rows
+
+    def match_payload(self, batting_xi, bowling_xi):
+        """Player and bowler rows for the live scorecard payload, in batting
+        order / bowling-XI order (will_bowl players only). Returns fresh
+        lists of fresh dicts — callers are free to mutate them."""
+        batting_order = tuple(p["name"] for p in batting_xi)
+        bowling_order = tuple(p["name"] for p in bowling_xi if p.get("will_bowl", False))
+        players, bowlers = self._cached(
+            ("payload", batting_order, bowling_order),
+            lambda: (self._player_rows(batting_order), self._bowler_rows(bowling_order)),
+        )
+        return [dict(r) for r in players], [dict(r) for r in bowlers]
+
+    # ── archive text tables (MatchArchiver._create_*_table) ───────────────
+    def batting_table_text(self):
+        def build():
+            if not self._batting:
+                return "No batting statistics available"
+            headers = ['Player', 'Runs', 'Balls', '1s', '2s', '3s', '4s', '6s', 'Dots', 'S/R', 'Status']
+            rows = []
+            for name, line in self._batting.items():
+                if not _has_batted(line):
+                    continue
+                balls = line["balls"]
+                strike_rate = f"{(line['runs'] * 100 / balls):.1f}" if balls > 0 else "0.0"
+                rows.append([
+                    name, line["runs"], balls, line["ones"], line["twos"], line["threes"],
+                    line["fours"], line["sixes"], line["dots"], strike_rate,
+                    line["wicket_type"] or "not out",
+                ])
+            if not rows:
+                return "No batting data available"
+            return tabulate(rows, headers=headers, tablefmt="grid")
+        return self._cached(("batting_text",), build)
+
+    def bowling_table_text(self):
+        def build():
+            if not self._bowling:
+                return "No bowling statistics available"
+            headers = ['Bowler', 'Overs', 'Maidens', 'Runs', 'Wickets', 'Economy', 'Wides', 'No Balls']
+            rows = []
+            for name, line in self._bowling.items():
+                total_balls = line["balls_bowled"]
+                if total_balls <= 0:
+                    continue
+                rows.append([
+                    name, balls_to_overs_str(total_balls), line["maidens"], line["runs"],
+                    line["wickets"], f"{(line['runs'] * 6 / total_balls):.2f}",
+                    line["wides"], line["noballs"],
+                ])
+            if not rows:
+                return "No bowling data available"
+            return tabulate(rows, headers=headers, tablefmt="grid")
+        return self._cached(("bowling_text",), build)
+
+    # ── archive CSV rows (MatchArchiver._create_*_csv) ────────────────────
+    def batting_csv_rows(self, lineup_names, team_name):
+        def build():
+            rows = []
+            for name in lineup_names:
+                line = self._batting.get(name)
+                if line is not None and _has_batted(line):
+                    balls = line["balls"]
+                    strike_rate = f"{(line['runs'] * 100 / balls):.2f}" if balls > 0 else "0.00"
+                    rows.append([
+                        name, team_name, line["runs"], balls, line["ones"], line["twos"],
+                        line["threes"], line["fours"], line["sixes"], line["dots"],
+                        strike_rate, line["wicket_type"] or "not out",
+                        _text(line["bowler_out"]), _text(line["fielder_out"]),
+                    ])
+                else:
+                    rows.append([name, team_name] + [''] * 12)
+            return rows
+        return self._cached(("batting_csv", tuple(lineup_names), team_name), build)
+
+    def bowling_csv_rows(self, team_name):
+        def build():
+            rows = []
+            for name, line in self._bowling.items():
+                total_balls = line["balls_bowled"]
+                if total_balls <= 0:
+                    continue
+                rows.append([
+                    name, team_name, balls_to_overs_str(total_balls), line["maidens"],
+                    line["runs"], line["wickets"], f"{(line['runs'] * 6 / total_balls):.2f}",
+                    line["wides"], line["noballs"], line["byes"], line["legbyes"],
+                ])
+            return rows
+        return self._cached(("bowling_csv", team_name), build)
+
+
+def _dismissal_text(player):
+    """Dismissal column for the HTML innings block, from a payload row."""
+    wicket_type = (player.get("wicket_type") or "").strip()
+    bowler_out = (player.get("bowler_out") or "").strip()
+    fielder_out = (player.get("fielder_out") or "").strip()
+    status = (player.get("status") or "").strip()
+    runs = player.get("runs", "")
+    balls = player.get("balls", "")
+
+    # Player has not batted.
+    if runs == "" and balls == "":
+        return "DNB"
+
+    # Not out batter at innings end.
+    if not wicket_type:
+        if status.lower() == "not out":
+            return "not out*"
+        return status if status else "not out*"
+
+    if wicket_type == "Caught":
+        if fielder_out and bowler_out:
+            return f"c {fielder_out} b {bowler_out}"
+        if bowler_out:
+            return f"c ? b {bowler_out}"
+        return "c ? b ?"
+    if wicket_type == "Bowled":
+        return f"b {bowler_out}" if bowler_out else "b ?"
+    if wicket_type == "LBW":
+        return f"lbw b {bowler_out}" if bowler_out else "lbw b ?"
+    if wicket_type == "Run Out":
+        return f"run out ({fielder_out})" if fielder_out else "run out"
+    if wicket_type == "Stumped":
+        if fielder_out and bowler_out:
+            return f"st {fielder_out} b {bowler_out}"
+        if bowler_out:
+            return f"st ? b {bowler_out}"
+        return "st ? b ?"
+    if wicket_type == "Hit Wicket":
+        return f"hit wicket b {bowler_out}" if bowler_out else "hit wicket"
+
+    # Fallback for any uncommon dismissal status.
+    return status if status else wicket_type
+
+
+def render_scorecard_block(scorecard, title):
+    """HTML innings block shown in the end-of-match commentary, rendered from
+    a live scorecard payload (Match._generate_detailed_scorecard shape)."""
+    if not scorecard:
+        return ""
+    total = scorecard.get("total_score", 0)
+    wkts = scorecard.get("wickets", 0)
+    overs = scorecard.get("overs", "0.0")
+
+    batting_rows = "".join(
+        f"<tr><td>{p.get('name','')}</td><td>{_dismissal_text(p)}</td><td>{p.get('runs',0)}</td><td>{p.get('balls',0)}</td><td>{p.get('fours',0)}</td><td>{p.get('sixes',0)}</td></tr>"
+        for p in scorecard.get("players", [])
+    )
+    bowling_rows = "".join(
+        f"<tr><td>{b.get('name','')}</td><td>{b.get('overs',0)}</td><td>{b.get('maidens',0)}</td><td>{b.get('runs',0)}</td><td>{b.get('wickets',0)}</td></tr>"
+        for b in scorecard.get("bowlers", [])
+    )
+    return (
+        f"<strong>{title}</strong><br>"
+        f"Total: {total}/{wkts} ({overs} ov)<br>"
+        f"<div style='margin-top:6px;font-weight:600;'>Batting</div>"
+        f"<table style='width:100%;border-collapse:collapse;font-size:0.85rem;'>"
+        f"<thead><tr><th style='text-align:left;border-bottom:1px solid #444;'>Batter</th>"
+        f"<th style='text-align:left;border-bottom:1px solid #444;'>Dismissal</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>R</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>B</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>4s</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>6s</th></tr></thead>"
+        f"<tbody>{batting_rows}</tbody></table>"
+        f"<div style='margin-top:8px;font-weight:600;'>Bowling</div>"
+        f"<table style='width:100%;border-collapse:collapse;font-size:0.85rem;'>"
+        f"<thead><tr><th style='text-align:left;border-bottom:1px solid #444;'>Bowler</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>O</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>M</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>R</th>"
+        f"<th style='text-align:right;border-bottom:1px solid #444;'>W</th></tr></thead>"
+        f"<tbody>{bowling_rows}</tbody></table>"
+    )
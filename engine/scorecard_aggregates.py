@@ -0,0 +1,162 @@
+"""
+scorecard_aggregates.py
+=======================
+
+Per-player scorecard totals computed by SQLite instead of Python.
+
+StatsService and app._compute_tournament_stats used to hydrate every
+(MatchScorecard, Match, Player, Team) tuple for the scope and fold them in
+dicts. aggregate_player_totals() issues one GROUP BY over match_scorecards
+and returns one lightweight row per player:
+
+    player_id, name, team, role, matches,
+    <every career_stats.COUNTERS column>,
+    best_bowling_wickets, best_bowling_runs
+
+Conditional counts (innings, not-outs, 30s/50s/100s, ducks) are SUM(CASE…)
+and best figures come from a ROW_NUMBER() window over each player's bowling
+cards. The rules are the ones in career_stats.add_card(), which stays the
+reference implementation — tests/test_scorecard_aggregates.py folds the
+same data through both and requires identical output.
+
+Super-over cards are always excluded.
+"""
+
+from sqlalchemy import and_, case, func, or_
+
+from database import db
+from database.models import Match, MatchScorecard, Player, Team
+from engine.career_stats import COUNTERS
+
+_C = MatchScorecard
+
+
+def _n(column):
+    return func.coalesce(column, 0)
+
+
+def _sum_if(condition, value=1):
+    return func.sum(case((condition, value), else_=0))
+
+
+def _counter_columns():
+    """{counter name: SQL expression}, mirroring career_stats.add_card()."""
+    batting = _C.record_type == "batting"
+    bowling = _C.record_type == "bowling"
+    out = _C.is_out == True  # noqa: E712 — NULL is not out
+    runs = _n(_C.runs)
+    faced = and_(batting, or_(_n(_C.balls) > 0, runs > 0, out))
+
+    exprs = {
+        "bat_innings": _sum_if(faced),
+        "bat_not_outs": _sum_if(and_(faced, or_(_C.is_out.is_(None), _C.is_out == False))),  # noqa: E712
+        "bat_zeros": _sum_if(and_(faced, runs == 0, out)),
+        "bat_thirties": _sum_if(and_(faced, runs >= 30, runs <= 49)),
+        "bat_fifties": _sum_if(and_(faced, runs >= 50, runs < 100)),
+        "bat_hundreds": _sum_if(and_(faced, runs >= 100)),
+        "bowl_innings": _sum_if(and_(bowling, _n(_C.balls_bowled) > 0)),
+    }
+    summed = {
+        "bat_runs": (batting, _C.runs),
+        "bat_balls": (batting, _C.balls),
+        "bat_fours": (batting, _C.fours),
+        "bat_sixes": (batting, _C.sixes),
+        "bat_ones": (batting, _C.ones),
+        "bat_twos": (batting, _C.twos),
+        "bat_threes": (batting, _C.threes),
+        "bat_dots": (batting, _C.dot_balls),
+        "bowl_balls": (bowling, _C.balls_bowled),
+        "bowl_runs": (bowling, _C.runs_conceded),
+        "bowl_wickets": (bowling, _C.wickets),
+        "bowl_maidens": (bowling, _C.maidens),
+        "bowl_dots": (bowling, _C.dot_balls_bowled),
+        "bowl_wides": (bowling, _C.wides),
+        "bowl_noballs": (bowling, _C.noballs),
+        "bowl_byes": (bowling, _C.byes),
+        "bowl_leg_byes": (bowling, _C.leg_byes),
+        "bowl_wickets_bowled": (bowling, _C.wickets_bowled),
+        "bowl_wickets_lbw": (bowling, _C.wickets_lbw),
+    }
+    for name, (condition, column) in summed.items():
+        exprs[name] = _sum_if(condition, _n(column))
+    # Fielding contributions can sit on any record_type.
+    for name in ("catches", "run_outs", "stumpings"):
+        exprs[name] = func.sum(_n(getattr(_C, name)))
+    return exprs
+
+
+def _scoped(query, user_id, tournament_id=None, match_format=None):
+    query = (
+        query.join(Match, _C.match_id == Match.id)
+        .join(Player, _C.player_id == Player.id)
+        .join(Team, Player.team_id == Team.id)
+        .filter(Team.user_id == user_id)
+        .filter(_C.is_super_over.isnot(True))
+    )
+    if tournament_id is not None:
+        query = query.filter(Match.tournament_id == tournament_id)
+    if match_format:
+        query = query.filter(Match.match_format == match_format)
+    return query
+
+
+def player_totals_subquery(user_id, tournament_id=None, match_format=None):
+    """The GROUP BY player_id subquery: player_id, matches and every counter."""
+    counters = _counter_columns()
+    return _scoped(
+        db.session.query(
+            _C.player_id.label("player_id"),
+            func.count(func.distinct(_C.match_id)).label("matches"),
+            *(counters[name].label(name) for name in COUNTERS),
+        ),
+        user_id, tournament_id, match_format,
+    ).group_by(_C.player_id).subquery()
+
+
+def player_totals_query(user_id, tournament_id=None, match_format=None):
+    """
+    The unexecuted query behind aggregate_player_totals(), for callers that
+    add an ORDER BY and stream it (statistics CSV exports).
+    """
+    best = _scoped(
+        db.session.query(
+            _C.player_id.label("player_id"),
+            _n(_C.wickets).label("wickets"),
+            _n(_C.runs_conceded).label("runs"),
+            func.row_number().over(
+                partition_by=_C.player_id,
+                order_by=(_n(_C.wickets).desc(), _n(_C.runs_conceded).asc()),
+            ).label("rn"),
+        ).filter(_C.record_type == "bowling"),
+        user_id, tournament_id, match_format,
+    ).subquery()
+
+    totals = player_totals_subquery(user_id, tournament_id, match_format)
+
+    query = (
+        db.session.query(
+            totals.c.player_id,
+            Player.name.label("name"),
+            Team.name.label("team"),
+            func.coalesce(Player.role, "").label("role"),
+            totals.c.matches,
+            *(totals.c[name] for name in COUNTERS),
+            func.coalesce(best.c.wickets, 0).label("best_bowling_wickets"),
+            best.c.runs.label("best_bowling_runs"),
+        )
+        .join(Player, Player.id == totals.c.player_id)
+        .join(Team, Team.id == Player.team_id)
+        .outerjoin(best, and_(best.c.player_id == totals.c.player_id, best.c.rn == 1))
+    )
+    return query
+
+
+def aggregate_player_totals(user_id, tournament_id=None, match_format=None):
+    """
+    One row per player with scorecards in scope, aggregated in SQL.
+
+    Rows expose the columns listed in the module docstring as attributes
+    (and via row._mapping). best_bowling_runs is None for players with no
+    bowling card.
+    """
+    return player_totals_query(user_id, tournament_id, match_format).all()
@@ -0,0 +1,160 @@
+"""
+standings_recompute.py
+======================
+
+Rebuild a tournament's points table from its match rows in one query.
+
+TournamentEngine.update_standings() applies each result incrementally; this
+module is the from-scratch path, used when the incremental totals cannot be
+trusted (a reversed result, legacy data) and by
+scripts/rebuild_all_standings.py. One GROUP BY over the tournament's
+completed league fixtures yields every team's row:
+
+  result      match_status when set, else the legacy no-result sniffing of
+              TournamentEngine._is_no_result (no winner + an abandonment
+              keyword or no balls bowled); a winner that is neither side
+              counts as a tie.
+  points      POINTS_WIN / POINTS_TIE / POINTS_NO_RESULT / POINTS_LOSS.
+  NRR balls   integer balls per innings, the full quota when a side is
+              bowled out or the stored overs exceed it
+              (TournamentEngine._get_nrr_balls); no-results add nothing.
+
+Matches whose home or away team is not in the tournament's roster are left
+out rather than credited to one side only.
+
+Only the standard library is imported: the rebuild script runs against the
+SQLite file directly, without Flask. The SQL uses named parameters, which
+sqlite3 and SQLAlchemy's text() both accept.
+"""
+
+POINTS_WIN = 2
+POINTS_TIE = 1
+POINTS_NO_RESULT = 1
+POINTS_LOSS = 0
+
+LEAGUE_STAGE = "league"
+
+NO_RESULT_KEYWORDS = (
+    "abandoned", "no result", "washed out", "called off",
+    "no play", "n/r",
+)
+
+COLUMNS = (
+    "played", "won", "lost", "tied", "no_result", "points",
+    "runs_scored", "balls_faced", "runs_conceded", "balls_bowled",
+)
+
+
+def overs_to_balls_sql(column):
+    """SQLite expression for TournamentEngine.overs_to_balls(*column*)."""
+    overs = f"CAST(COALESCE({column}, '0') AS REAL)"
+    whole = f"CAST({overs} AS INTEGER)"
+    return (
+        f"(CASE WHEN {overs} <= 0 THEN 0 "
+        f"ELSE {whole} * 6 + MIN(5, CAST(ROUND(({overs} - {whole}) * 10) AS INTEGER)) END)"
+    )
+
+
+def _nrr_balls_sql(balls, wickets):
+    return f"(CASE WHEN COALESCE({wickets}, 0) >= 10 OR {balls} > quota THEN quota ELSE {balls} END)"
+
+
+def standings_sql(has_match_status=True):
+    """
+    The recompute query; one row per team with COLUMNS. *has_match_status*
+    is False only for databases that predate the structured outcome column.
+    """
+    home_balls = overs_to_balls_sql("m.home_team_overs")
+    away_balls = overs_to_balls_sql("m.away_team_overs")
+    keywords = " OR ".join(
+        f"LOWER(COALESCE(m.result_description, '')) LIKE '%{kw}%'" for kw in NO_RESULT_KEYWORDS
+    )
+    status_case = "WHEN m.match_status IS NOT NULL THEN m.match_status = 'no_result'" if has_match_status else ""
+    roster = "SELECT team_id FROM tournament_teams WHERE tournament_id = :tournament_id"
+    return f"""
+        WITH league AS (
+            SELECT m.home_team_id, m.away_team_id, m.winner_team_id,
+                   COALESCE(m.home_team_score, 0) AS home_runs,
+                   COALESCE(m.away_team_score, 0) AS away_runs,
+                   m.home_team_wickets AS home_wickets,
+                   m.away_team_wickets AS away_wickets,
+                   {home_balls} AS home_balls,
+                   {away_balls} AS away_balls,
+                   COALESCE(NULLIF(m.overs_per_side, 0), 20) * 6 AS quota,
+                   CASE {status_case}
+                        WHEN COALESCE(m.winner_team_id, 0) != 0 THEN 0
+                        WHEN {keywords} THEN 1
+                        WHEN {home_balls} = 0 AND {away_balls} = 0 THEN 1
+                        ELSE 0 END AS no_result
+            FROM tournament_fixtures tf
+            JOIN matches m ON m.id = tf.match_id
+            WHERE tf.tournament_id = :tournament_id
+              AND tf.stage = :league_stage
+              AND tf.status = 'Completed'
+              AND m.home_team_id IN ({roster})
+              AND m.away_team_id IN ({roster})
+        ),
+        sides AS (
+            SELECT home_team_id AS team_id, away_team_id AS opponent_id, winner_team_id, no_result,
+                   home_runs AS runs_for, {_nrr_balls_sql("home_balls", "home_wickets")} AS balls_for,
+                   away_runs AS runs_against, {_nrr_balls_sql("away_balls", "away_wickets")} AS balls_against
+            FROM league
+            UNION ALL
+            SELECT away_team_id, home_team_id, winner_team_id, no_result,
+                   away_runs, {_nrr_balls_sql("away_balls", "away_wickets")},
+                   home_runs, {_nrr_balls_sql("home_balls", "home_wickets")}
+            FROM league
+        )
+        SELECT team_id,
+               COUNT(*) AS played,
+               SUM(no_result = 0 AND winner_team_id = team_id) AS won,
+               SUM(no_result = 0 AND winner_team_id = opponent_id) AS lost,
+               SUM(no_result = 0 AND (winner_team_id IS NULL
+                                      OR winner_team_id NOT IN (team_id, opponent_id))) AS tied,
+               SUM(no_result) AS no_result,
+               SUM(CASE WHEN no_result THEN :points_no_result
+                        WHEN winner_team_id = team_id THEN :points_win
+                        WHEN winner_team_id = opponent_id THEN :points_loss
+                        ELSE :points_tie END) AS points,
+               SUM(CASE WHEN no_result THEN 0 ELSE runs_for END) AS runs_scored,
+               SUM(CASE WHEN no_result THEN 0 ELSE balls_for END) AS balls_faced,
+               SUM(CASE WHEN no_result THEN 0 ELSE runs_against END) AS runs_conceded,
+               SUM(CASE WHEN no_result THEN 0 ELSE balls_against END) AS balls_bowled
+        FROM sides
+        GROUP BY team_id
+    """
+
+
+def standings_params(tournament_id):
+    return {
+        "tournament_id": tournament_id,
+        "league_stage": LEAGUE_STAGE,
+        "points_win": POINTS_WIN,
+        "points_tie": POINTS_TIE,
+        "points_no_result": POINTS_NO_RESULT,
+        "points_loss": POINTS_LOSS,
+    }
+
+
+def net_run_rate(runs_scored, balls_faced, runs_conceded, balls_bowled):
+    """Runs per over scored minus conceded, rounded as stored (6 places)."""
+    rate_for = (runs_scored or 0) / (balls_faced / 6.0) if balls_faced else 0.0
+    rate_against = (runs_conceded or 0) / (balls_bowled / 6.0) if balls_bowled else 0.0
+    return round(rate_for - rate_against, 6)
+
+
+def empty_row():
+    return dict.fromkeys(COLUMNS, 0)
+
+
+def table_from_rows(rows):
+    """{team_id: totals} from the query's rows, with net_run_rate added."""
+    table = {}
+    for row in rows:
+        totals = {column: int(row[column] or 0) for column in COLUMNS}
+        totals["net_run_rate"] = net_run_rate(
+            totals["runs_scored"], totals["balls_faced"],
+            totals["runs_conceded"], totals["balls_bowled"],
+        )
+        table[row["team_id"]] = totals
+    return table
@@ -0,0 +1,161 @@
+"""
+stats_cache.py
+==============
+
+Versioned result cache for StatsService read views.
+
+A user's statistics change when one of their matches is archived,
+re-simulated or deleted, or a tournament is reset, and the names and filter
+lists on the stats pages change when a team or its squad is created,
+edited or deleted, or a tournament is created, renamed or deleted. Each of
+those paths calls bump_stats_version(user_id), which increments
+users.stats_version inside the same transaction as the data change. Cached
+results are keyed by
+
+    (view, user_id, call arguments, stats_version)
+
+so a bump orphans every stale entry at once — no explicit invalidation,
+and other worker processes see the new version as soon as it commits.
+
+The cache itself is a bounded LRU with a TTL (the TTL only backs up
+writes outside the app, e.g. the maintenance scripts). One instance lives in
+app.extensions["stats_cache"]; outside an app context nothing is cached.
+
+    STATS_CACHE_SIZE  max entries (default 512; 0 disables caching)
+    STATS_CACHE_TTL   seconds (default 600)
+
+Routes use stats_etag() to answer conditional requests with a 304 before
+any StatsService work happens.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from database import db
+from database.models import User
+
+DEFAULT_SIZE = 512
+DEFAULT_TTL = 600
+
+
+class StatsCache:
+    """Thread-safe LRU + TTL map. Values are deep-copied in and out."""
+
+    def __init__(self, max_entries=DEFAULT_SIZE, ttl_seconds=DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return (True, value) on a live hit, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self._clock() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_cache():
+    """The current app's StatsCache, or None outside an app context."""
+    if not has_app_context():
+        return None
+    app = current_app._get_current_object()
+    cache = app.extensions.get("stats_cache")
+    if cache is None:
+        cache = app.extensions["stats_cache"] = StatsCache(
+            max_entries=app.config.get("STATS_CACHE_SIZE", DEFAULT_SIZE),
+            ttl_seconds=app.config.get("STATS_CACHE_TTL", DEFAULT_TTL),
+        )
+    return cache
+
+
+def get_stats_version(user_id):
+    return db.session.query(User.stats_version).filter(User.id == user_id).scalar() or 0
+
+
+def bump_stats_version(user_id):
+    """Invalidate every cached view for user_id. Commits with the caller."""
+    if not user_id:
+        return
+    User.query.filter(User.id == user_id).update(
+        {User.stats_version: User.stats_version + 1}, synchronize_session=False
+    )
+
+
+def stats_etag(user_id, *parts):
+    """
+    Weak-ETag value for a response built from user_id's stats.
+
+    Also rolls over every STATS_CACHE_TTL seconds, so a write that doesn't
+    bump (a maintenance script) goes stale no longer in the browser than it
+    does in the server cache.
+    """
+    ttl = current_app.config.get("STATS_CACHE_TTL", DEFAULT_TTL) if has_app_context() else DEFAULT_TTL
+    window = int(time.time() // max(1, ttl))
+    raw = "|".join(str(p) for p in (user_id, get_stats_version(user_id), window, *parts))
+    return "stats-" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def cached_view(view):
+    """
+    Cache a StatsService method's result per (view, arguments, stats version).
+
+    The method must take a `user_id` argument. Results that are dicts with
+    an "error" key are returned but never stored.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = get_cache()
+            if cache is None or cache.max_entries <= 0:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            call = tuple((k, v) for k, v in bound.arguments.items() if k != "self")
+            user_id = bound.arguments["user_id"]
+            key = (view, call, get_stats_version(user_id))
+
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = method(self, *args, **kwargs)
+            if not (isinstance(value, dict) and "error" in value):
+                cache.put(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -4,18 +4,47 @@ Statistics Service Module
 Handles all statistics calculations and queries for the SimCricketX application.
 """
 
-from sqlalchemy import func
-from sqlalchemy.orm import aliased
+from sqlalchemy import case, func
+from sqlalchemy.exc import OperationalError
 from datetime import datetime
-from database.models import Match, MatchScorecard, Tournament, Player, Team, TeamProfile, TournamentPlayerStatsCache
+from database.models import Match, MatchScorecard, Tournament, Player, PlayerCareerStats, Team, TeamPairSummary, TeamProfile, TournamentPlayerStatsCache
 from database import db
 from collections import defaultdict
 import csv
+import heapq
 import io
 from tabulate import tabulate
 
 from utils.exception_tracker import log_exception
 from engine.cricket_math import balls_to_overs_float
+from engine.career_stats import add_card, merge_totals, new_totals
+from engine.scorecard_aggregates import aggregate_player_totals, player_totals_query
+from engine import insights_store, match_analytics, partnership_index
+from engine.head_to_head import merge_summaries, pair_of, top_performers
+from engine.leaderboards import compute_leaderboards
+from engine.stats_cache import cached_view
+
+
+# Stats-page orderings. Ties fall back to player id so the page and the
+# SQL-ordered export stream (StatsService.iter_export_rows) list the same
+# rows in the same order.
+def _batting_order(row):
+    return (-row['runs'], row['player_id'])
+
+
+def _bowling_order(row):
+    return (-row['wickets'], row['economy'], row['player_id'])
+
+
+def _fielding_order(row):
+    dismissals = row['catches'] + row['run_outs'] + row.get('stumpings', 0)
+    return (-dismissals, -row['matches'], row['player_id'])
+
+
+def _match_count(data):
+    """Matches played: a set of match ids (scorecard fold) or a stored count."""
+    matches = data['matches']
+    return matches if isinstance(matches, int) else len(matches)
 
 
 class StatsService:
@@ -34,6 +63,7 @@ class StatsService:
             else:
                 self.logger.info(message)
     
+    @cached_view("overall")
     def get_overall_stats(self, user_id, match_format=None):
         """
         Get overall statistics for a user (all tournaments + individual matches).
@@ -47,28 +77,75 @@ class StatsService:
         """
         self._log(f"Fetching overall stats for user {user_id}, format={match_format}")
 
-        # Query all match scorecards for this user's teams.
-        # Super-over career-stat rows are not real innings — exclude them.
+        career = self._try_career_stats(user_id, match_format)
+        if career:
+            return career
+
+        # Aggregate this user's scorecards in SQL (super-over rows excluded).
+        rows = aggregate_player_totals(user_id, match_format=match_format)
+        self._log(f"Aggregated scorecards for {len(rows)} players for user {user_id}")
+        
+        if not rows:
+            return self._empty_stats()
+        
+        return self._build_stats(self._player_data_from_rows(rows))
+    
+    def _try_career_stats(self, user_id, match_format=None):
+        """
+        Overall stats from the materialized PlayerCareerStats table — one row
+        per player per format, so this is O(players) rather than O(scorecards).
+
+        Returns None when the user has no career rows (table not backfilled
+        yet — see scripts/rebuild_career_stats.py), so the caller falls back
+        to the scorecard fold.
+        """
         query = (
-            db.session.query(MatchScorecard, Match, Player, Team)
-            .join(Match, MatchScorecard.match_id == Match.id)
-            .join(Player, MatchScorecard.player_id == Player.id)
+            db.session.query(PlayerCareerStats, Player, Team)
+            .join(Player, PlayerCareerStats.player_id == Player.id)
             .join(Team, Player.team_id == Team.id)
             .filter(Team.user_id == user_id)
-            .filter(MatchScorecard.is_super_over.isnot(True))
         )
+        try:
+            rows = (
+                query.filter(PlayerCareerStats.match_format == match_format).all()
+                if match_format else query.all()
+            )
+            # No rows in this format: the table may still hold the user's
+            # other formats, in which case the answer is "no stats", not
+            # "not backfilled".
+            if not rows and (not match_format or query.first() is None):
+                return None
+        except OperationalError as e:
+            # Table missing: the migration has not run on this database yet.
+            db.session.rollback()
+            self._log(f"Career stats table unavailable, falling back: {e}", 'warning')
+            return None
 
-        if match_format:
-            query = query.filter(Match.match_format == match_format)
+        player_data = {}
+        for row, player, team in rows:
+            data = player_data.get(player.id)
+            if data is None:
+                data = player_data[player.id] = self._career_entry(player, team)
+            data['matches'] += row.matches or 0
+            merge_totals(data, row)
 
-        records = query.all()
-        self._log(f"Found {len(records)} scorecard records for user {user_id}")
-        
-        if not records:
+        self._log(f"Career table: {len(rows)} rows for user {user_id}")
+        if not player_data:
             return self._empty_stats()
-        
-        return self._calculate_stats_from_records(records)
-    
+        return self._build_stats(player_data)
+
+    def _career_entry(self, player, team):
+        """Empty per-player totals for folding PlayerCareerStats rows into."""
+        return {
+            'name': player.name,
+            'team': team.name,
+            'role': player.role or '',
+            'player_id': player.id,
+            'matches': 0,
+            **new_totals(),
+        }
+
+    @cached_view("tournament")
     def get_tournament_stats(self, user_id, tournament_id, match_format=None):
         """
         Get statistics for a specific tournament.
@@ -103,27 +180,15 @@ class StatsService:
         if cached:
             return cached
 
-        # Full computation fallback (super-over rows are not real innings)
-        query = (
-            db.session.query(MatchScorecard, Match, Player, Team)
-            .join(Match, MatchScorecard.match_id == Match.id)
-            .join(Player, MatchScorecard.player_id == Player.id)
-            .join(Team, Player.team_id == Team.id)
-            .filter(Match.tournament_id == tournament_id)
-            .filter(Team.user_id == user_id)
-            .filter(MatchScorecard.is_super_over.isnot(True))
-        )
-
-        if match_format:
-            query = query.filter(Match.match_format == match_format)
-
-        records = query.all()
-        self._log(f"Found {len(records)} scorecard records for tournament {tournament_id}")
+        # Full computation fallback, aggregated in SQL (super-over rows are
+        # not real innings)
+        rows = aggregate_player_totals(user_id, tournament_id=tournament_id, match_format=match_format)
+        self._log(f"Aggregated scorecards for {len(rows)} players for tournament {tournament_id}")
 
-        if not records:
+        if not rows:
             return self._empty_stats()
 
-        return self._calculate_stats_from_records(records)
+        return self._build_stats(self._player_data_from_rows(rows))
 
     def _try_cache_tournament_stats(self, tournament_id, user_id):
         """Attempt to serve tournament stats from TournamentPlayerStatsCache.
@@ -150,63 +215,18 @@ class StatsService:
         fielding_stats = []
 
         for cache, player, team in cached:
-            matches = cache.matches_played or 0
-            if matches == 0:
+            entries = self._cache_stat_rows(cache, player, team)
+            if entries is None:
                 continue
+            if entries['batting']:
+                batting_stats.append(entries['batting'])
+            if entries['bowling']:
+                bowling_stats.append(entries['bowling'])
+            fielding_stats.append(entries['fielding'])
 
-            # Batting
-            innings = cache.innings_batted or 0
-            if innings > 0:
-                batting_stats.append({
-                    'player': player.name, 'team': team.name,
-                    'matches': matches, 'innings': innings,
-                    'runs': cache.runs_scored or 0,
-                    'balls': cache.balls_faced or 0,
-                    'not_outs': cache.not_outs or 0,
-                    'strike_rate': cache.batting_strike_rate,
-                    'average': cache.batting_average,
-                    'zeros': 0, 'ones': 0, 'twos': 0, 'threes': 0,
-                    'fours': cache.fours or 0,
-                    'sixes': cache.sixes or 0,
-                    'thirties': 0,
-                    'fifties': cache.fifties or 0,
-                    'hundreds': cache.centuries or 0,
-                })
-
-            # Bowling
-            bowl_innings = cache.innings_bowled or 0
-            if bowl_innings > 0 or (cache.wickets_taken or 0) > 0:
-                best_w = cache.best_bowling_wickets or 0
-                best_r = cache.best_bowling_runs or 0
-                bowling_stats.append({
-                    'team': team.name, 'player': player.name,
-                    'matches': matches, 'innings': bowl_innings,
-                    'overs': cache.overs_bowled or '0.0',
-                    'runs': cache.runs_conceded or 0,
-                    'wickets': cache.wickets_taken or 0,
-                    'best': f"{best_w}/{best_r}" if best_w > 0 else '-',
-                    'average': cache.bowling_average,
-                    'economy': cache.bowling_economy or 0.0,
-                    'dots': 0, 'bowled': 0, 'lbw': 0,
-                    'byes': 0, 'leg_byes': 0,
-                    'wides': 0, 'no_balls': 0,
-                })
-
-            # Fielding
-            fielding_stats.append({
-                'player': player.name, 'team': team.name,
-                'matches': matches,
-                'catches': cache.catches or 0,
-                'run_outs': cache.run_outs or 0,
-                'stumpings': cache.stumpings or 0,
-            })
-
-        batting_stats.sort(key=lambda x: x['runs'], reverse=True)
-        bowling_stats.sort(key=lambda x: (-x['wickets'], x['economy']))
-        fielding_stats.sort(
-            key=lambda x: (x['catches'] + x['run_outs'] + x.get('stumpings', 0), x['matches']),
-            reverse=True
-        )
+        batting_stats.sort(key=_batting_order)
+        bowling_stats.sort(key=_bowling_order)
+        fielding_stats.sort(key=_fielding_order)
 
         leaderboards = self._calculate_leaderboards(batting_stats, bowling_stats)
         return {
@@ -216,6 +236,64 @@ class StatsService:
             'leaderboards': leaderboards,
         }
 
+    def _cache_stat_rows(self, cache, player, team):
+        """
+        One TournamentPlayerStatsCache row as {'batting', 'bowling',
+        'fielding'} stats entries (None where the player did not bat or
+        bowl), or None when the player has no matches.
+        """
+        matches = cache.matches_played or 0
+        if matches == 0:
+            return None
+
+        batting = None
+        innings = cache.innings_batted or 0
+        if innings > 0:
+            batting = {
+                'player': player.name, 'team': team.name, 'player_id': player.id,
+                'matches': matches, 'innings': innings,
+                'runs': cache.runs_scored or 0,
+                'balls': cache.balls_faced or 0,
+                'not_outs': cache.not_outs or 0,
+                'strike_rate': cache.batting_strike_rate,
+                'average': cache.batting_average,
+                'zeros': 0, 'ones': 0, 'twos': 0, 'threes': 0,
+                'fours': cache.fours or 0,
+                'sixes': cache.sixes or 0,
+                'thirties': 0,
+                'fifties': cache.fifties or 0,
+                'hundreds': cache.centuries or 0,
+            }
+
+        bowling = None
+        bowl_innings = cache.innings_bowled or 0
+        if bowl_innings > 0 or (cache.wickets_taken or 0) > 0:
+            best_w = cache.best_bowling_wickets or 0
+            best_r = cache.best_bowling_runs or 0
+            bowling = {
+                'team': team.name, 'player': player.name, 'player_id': player.id,
+                'matches': matches, 'innings': bowl_innings,
+                'overs': cache.overs_bowled or '0.0',
+                'runs': cache.runs_conceded or 0,
+                'wickets': cache.wickets_taken or 0,
+                'best': f"{best_w}/{best_r}" if best_w > 0 else '-',
+                'average': cache.bowling_average,
+                'economy': cache.bowling_economy or 0.0,
+                'dots': 0, 'bowled': 0, 'lbw': 0,
+                'byes': 0, 'leg_byes': 0,
+                'wides': 0, 'no_balls': 0,
+            }
+
+        fielding = {
+            'player': player.name, 'team': team.name, 'player_id': player.id,
+            'matches': matches,
+            'catches': cache.catches or 0,
+            'run_outs': cache.run_outs or 0,
+            'stumpings': cache.stumpings or 0,
+        }
+        return {'batting': batting, 'bowling': bowling, 'fielding': fielding}
+
+    @cached_view("insights")
     def get_insights(self, user_id, tournament_id=None, match_format=None):
         """
         Build advanced insights for the Statistics Hub.
@@ -225,42 +303,26 @@ class StatsService:
                 "impact": [ {player, team, impact, runs, wickets, catches, run_outs} ],
                 "form": { "batting": [ {player, team, series} ], "bowling": [ ... ] },
                 "conditions": { "venues": [ {label, avg_runs, avg_wkts, matches} ],
-                                "pitches": [ {label, avg_runs, avg_wkts, matches} ] }
+                                "pitches": [ {label, avg_runs, avg_wkts, matches} ] },
+                "performances": [ {player, team, impact, runs, wickets, is_motm, match_id, date} ],
+                "milestones": [ {text, match_id, date} ]
             }
         """
         insights = {
             "impact": [],
             "form": {"batting": [], "bowling": []},
-            "conditions": {"venues": [], "pitches": []}
+            "conditions": {"venues": [], "pitches": []},
+            "performances": [],
+            "milestones": [],
         }
 
-        # Match-level conditions (venue, pitch)
-        match_query = Match.query.filter(Match.user_id == user_id)
+        # Venue/pitch accumulators and per-player impact + form series are
+        # maintained per archived match (engine/insights_store.py); a
+        # tournament's bounded history is folded on the fly instead.
         if tournament_id:
-            match_query = match_query.filter(Match.tournament_id == tournament_id)
-        if match_format:
-            match_query = match_query.filter(Match.match_format == match_format)
-
-        venue_agg = {}
-        pitch_agg = {}
-
-        for match in match_query.all():
-            if match.home_team_score is None or match.away_team_score is None:
-                continue
-            total_runs = (match.home_team_score or 0) + (match.away_team_score or 0)
-            total_wkts = (match.home_team_wickets or 0) + (match.away_team_wickets or 0)
-
-            venue_key = (match.venue or "Unknown Venue").strip()
-            venue_stats = venue_agg.setdefault(venue_key, {"runs": 0, "wkts": 0, "matches": 0})
-            venue_stats["runs"] += total_runs
-            venue_stats["wkts"] += total_wkts
-            venue_stats["matches"] += 1
-
-            pitch_key = (match.pitch_type or "Unknown Pitch").strip()
-            pitch_stats = pitch_agg.setdefault(pitch_key, {"runs": 0, "wkts": 0, "matches": 0})
-            pitch_stats["runs"] += total_runs
-            pitch_stats["wkts"] += total_wkts
-            pitch_stats["matches"] += 1
+            conditions, forms = insights_store.fold_insights(user_id, tournament_id, match_format)
+        else:
+            conditions, forms = insights_store.stored_insights(user_id, match_format)
 
         def _top_conditions(agg_map, limit=4):
             items = []
@@ -275,65 +337,12 @@ class StatsService:
             items.sort(key=lambda x: (x["avg_runs"], x["matches"]), reverse=True)
             return items[:limit]
 
-        insights["conditions"]["venues"] = _top_conditions(venue_agg, limit=4)
-        insights["conditions"]["pitches"] = _top_conditions(pitch_agg, limit=4)
-
-        # Player-level data for impact + form (excluding super-over rows)
-        record_query = (
-            db.session.query(MatchScorecard, Match, Player, Team)
-            .join(Match, MatchScorecard.match_id == Match.id)
-            .join(Player, MatchScorecard.player_id == Player.id)
-            .join(Team, Player.team_id == Team.id)
-            .filter(Team.user_id == user_id)
-            .filter(MatchScorecard.is_super_over.isnot(True))
-        )
-        if tournament_id:
-            record_query = record_query.filter(Match.tournament_id == tournament_id)
-        if match_format:
-            record_query = record_query.filter(Match.match_format == match_format)
-
-        impact = {}
-        batting_forms = {}
-        bowling_forms = {}
-
-        for card, match, player, team in record_query.all():
-            pid = player.id
-            match_date = match.date or datetime.min
-            entry = impact.setdefault(pid, {
-                "player": player.name,
-                "team": team.name,
-                "runs": 0,
-                "wickets": 0,
-                "catches": 0,
-                "run_outs": 0
-            })
-
-            entry["catches"] += card.catches or 0
-            entry["run_outs"] += card.run_outs or 0
-
-            if card.record_type == "batting":
-                faced = (card.balls or 0) > 0 or (card.runs or 0) > 0 or bool(card.is_out)
-                if faced:
-                    entry["runs"] += card.runs or 0
-                    batting_forms.setdefault(pid, {
-                        "player": player.name,
-                        "team": team.name,
-                        "series": []
-                    })["series"].append((match_date, card.runs or 0))
-
-            if card.record_type == "bowling":
-                balls = card.balls_bowled or 0
-                if balls > 0:
-                    entry["wickets"] += card.wickets or 0
-                    bowling_forms.setdefault(pid, {
-                        "player": player.name,
-                        "team": team.name,
-                        "series": []
-                    })["series"].append((match_date, card.wickets or 0))
+        insights["conditions"]["venues"] = _top_conditions(conditions["venues"], limit=4)
+        insights["conditions"]["pitches"] = _top_conditions(conditions["pitches"], limit=4)
 
         # Impact Index
         impact_list = []
-        for data in impact.values():
+        for data in forms.values():
             impact_score = self._impact_index(
                 data["runs"], data["wickets"], data["catches"], data["run_outs"]
             )
@@ -368,29 +377,35 @@ class StatsService:
                 return "down"
             return "stable"
 
-        def _top_form(form_map, key, limit=3):
+        def _top_form(series_key, total_key, innings_key, limit=3):
             items = []
-            for pid, data in form_map.items():
-                if not data["series"]:
+            for data in forms.values():
+                if not data[innings_key]:
                     continue
-                total = sum(v for _, v in data["series"])
-                series_sorted = sorted(data["series"], key=lambda x: x[0], reverse=True)[:5]
-                series_sorted.reverse()
-                values = [v for _, v in series_sorted]
+                # Stored oldest-first and already capped to the last few.
+                values = [v for _, _, v in data[series_key]]
                 trend = _calc_trend(values)
                 items.append({
                     "player": data["player"],
                     "team": data["team"],
                     "series": values,
-                    "total": total,
+                    "total": data[total_key],
                     "trend": trend,
                     "recent_avg": round(sum(values[-3:]) / min(3, len(values)), 1) if values else 0,
                 })
             items.sort(key=lambda x: x["total"], reverse=True)
             return items[:limit]
 
-        insights["form"]["batting"] = _top_form(batting_forms, "runs", limit=3)
-        insights["form"]["bowling"] = _top_form(bowling_forms, "wickets", limit=3)
+        insights["form"]["batting"] = _top_form("batting", "runs", "bat_innings", limit=3)
+        insights["form"]["bowling"] = _top_form("bowling", "wickets", "bowl_innings", limit=3)
+
+        # Single-match performances and milestones, as stored at archive time.
+        insights["performances"] = match_analytics.top_performances(
+            user_id, tournament_id=tournament_id, match_format=match_format, limit=5
+        )
+        insights["milestones"] = match_analytics.recent_milestones(
+            user_id, tournament_id=tournament_id, match_format=match_format, limit=5
+        )
 
         return insights
 
@@ -411,7 +426,14 @@ class StatsService:
         match instead of a user's full history. Used by engine/motm_service.py
         to select Man of the Match. Returns a list of dicts sorted by impact
         descending; each entry also carries team_id/team_name so callers can
-        apply winning-side weighting."""
+        apply winning-side weighting.
+
+        Served from the post-match analytics stage (engine/match_analytics.py)
+        when the match has been through it; otherwise folded from its cards."""
+        stored = match_analytics.impact_scores(match_id)
+        if stored is not None:
+            return stored
+
         record_query = (
             db.session.query(MatchScorecard, Player, Team)
             .join(Player, MatchScorecard.player_id == Player.id)
@@ -464,9 +486,17 @@ class StatsService:
             }
         }
     
+    def _player_data_from_rows(self, rows):
+        """Per-player totals keyed by id from aggregate_player_totals() rows."""
+        return {row.player_id: dict(row._mapping) for row in rows}
+
     def _calculate_stats_from_records(self, records):
         """
         Calculate statistics from scorecard records.
+
+        Reference implementation of the SQL aggregation in
+        engine/scorecard_aggregates.py — the request paths use that;
+        tests/test_scorecard_aggregates.py keeps the two equivalent.
         
         Args:
             records: List of tuples (MatchScorecard, Match, Player, Team)
@@ -474,39 +504,16 @@ class StatsService:
         Returns:
             dict: Statistics dictionary
         """
-        # Aggregate data by player
+        # Aggregate data by player. Per-card rules live in
+        # career_stats.add_card() so this fold and the materialized
+        # PlayerCareerStats table can never disagree.
         player_data = defaultdict(lambda: {
             'name': '',
             'team': '',
             'role': '',
             'player_id': 0,
-            'bat_innings_data': [],  # List of individual innings
-            'bat_runs': 0,
-            'bat_balls': 0,
-            'bat_not_outs': 0,
-            'bat_fours': 0,
-            'bat_sixes': 0,
-            'bat_ones': 0,
-            'bat_twos': 0,
-            'bat_threes': 0,
-            'bat_dots': 0,
-            'bowl_innings': 0,
-            'bowl_balls': 0,
-            'bowl_runs': 0,
-            'bowl_wickets': 0,
-            'bowl_maidens': 0,
-            'bowl_dots': 0,
-            'bowl_wides': 0,
-            'bowl_noballs': 0,
-            'bowl_byes': 0,
-            'bowl_leg_byes': 0,
-            'bowl_wickets_bowled': 0,
-            'bowl_wickets_lbw': 0,
-            'bowl_best': (0, 9999),  # (wickets, runs)
-            'catches': 0,
-            'run_outs': 0,
-            'stumpings': 0,
-            'matches': set()  # Track unique match IDs
+            'matches': set(),  # Track unique match IDs
+            **new_totals(),
         })
         
         # Process each record
@@ -517,59 +524,12 @@ class StatsService:
             player_data[pid]['role'] = player.role or ''
             player_data[pid]['player_id'] = player.id
             player_data[pid]['matches'].add(match.id)
-            
-            # Batting stats
-            if card.record_type == 'batting':
-                # Check if player actually faced balls
-                faced = (card.balls or 0) > 0 or (card.runs or 0) > 0 or bool(card.is_out)
-                
-                if faced:
-                    # Store individual innings data for milestone calculations
-                    player_data[pid]['bat_innings_data'].append({
-                        'runs': card.runs or 0,
-                        'balls': card.balls or 0,
-                        'is_out': card.is_out
-                    })
-                    
-                    if not card.is_out:
-                        player_data[pid]['bat_not_outs'] += 1
-                
-                # Aggregate stats
-                player_data[pid]['bat_runs'] += card.runs or 0
-                player_data[pid]['bat_balls'] += card.balls or 0
-                player_data[pid]['bat_fours'] += card.fours or 0
-                player_data[pid]['bat_sixes'] += card.sixes or 0
-                player_data[pid]['bat_ones'] += card.ones or 0
-                player_data[pid]['bat_twos'] += card.twos or 0
-                player_data[pid]['bat_threes'] += card.threes or 0
-                player_data[pid]['bat_dots'] += card.dot_balls or 0
-            
-            # Bowling stats
-            if card.record_type == 'bowling':
-                balls = card.balls_bowled or 0
-                if balls > 0:
-                    player_data[pid]['bowl_innings'] += 1
-
-                player_data[pid]['bowl_balls'] += balls
-                player_data[pid]['bowl_runs'] += card.runs_conceded or 0
-                player_data[pid]['bowl_wickets'] += card.wickets or 0
-                player_data[pid]['bowl_maidens'] += card.maidens or 0
-                player_data[pid]['bowl_dots'] += card.dot_balls_bowled or 0
-                player_data[pid]['bowl_wides'] += card.wides or 0
-                player_data[pid]['bowl_noballs'] += card.noballs or 0
-                player_data[pid]['bowl_byes'] += card.byes or 0
-                player_data[pid]['bowl_leg_byes'] += card.leg_byes or 0
-                player_data[pid]['bowl_wickets_bowled'] += card.wickets_bowled or 0
-                player_data[pid]['bowl_wickets_lbw'] += card.wickets_lbw or 0
-                best_w, best_r = player_data[pid]['bowl_best']
-                if (card.wickets or 0) > best_w or ((card.wickets or 0) == best_w and (card.runs_conceded or 0) < best_r):
-                    player_data[pid]['bowl_best'] = (card.wickets or 0, card.runs_conceded or 0)
-            
-            # Fielding stats (recorded in all record types)
-            player_data[pid]['catches'] += card.catches or 0
-            player_data[pid]['run_outs'] += card.run_outs or 0
-            player_data[pid]['stumpings'] += card.stumpings or 0
+            add_card(player_data[pid], card)
         
+        return self._build_stats(player_data)
+
+    def _build_stats(self, player_data):
+        """Turn per-player totals (see career_stats.new_totals) into the stats dict."""
         # Calculate final statistics
         batting_stats = self._calculate_batting_stats(player_data)
         bowling_stats = self._calculate_bowling_stats(player_data)
@@ -588,13 +548,12 @@ class StatsService:
         batting_stats = []
         
         for pid, data in player_data.items():
-            innings_data = data['bat_innings_data']
-            innings = len(innings_data)
+            innings = data['bat_innings']
             
             if innings == 0:
                 continue  # Skip players who haven't batted
             
-            matches = len(data['matches'])
+            matches = _match_count(data)
             runs = data['bat_runs']
             balls = data['bat_balls']
             not_outs = data['bat_not_outs']
@@ -607,12 +566,6 @@ class StatsService:
             # Calculate strike rate — undefined when player faced no balls.
             strike_rate = round(runs * 100 / balls, 2) if balls > 0 else None
             
-            # Calculate milestones
-            zeros = sum(1 for inn in innings_data if inn['runs'] == 0 and inn['is_out'])
-            thirties = sum(1 for inn in innings_data if 30 <= inn['runs'] <= 49)
-            fifties = sum(1 for inn in innings_data if 50 <= inn['runs'] < 100)
-            hundreds = sum(1 for inn in innings_data if inn['runs'] >= 100)
-            
             batting_stats.append({
                 'player': data['name'],
                 'team': data['team'],
@@ -625,19 +578,19 @@ class StatsService:
                 'not_outs': not_outs,
                 'strike_rate': strike_rate,
                 'average': average,
-                'zeros': zeros,
+                'zeros': data['bat_zeros'],
                 'ones': data['bat_ones'],
                 'twos': data['bat_twos'],
                 'threes': data['bat_threes'],
                 'fours': data['bat_fours'],
                 'sixes': data['bat_sixes'],
-                'thirties': thirties,
-                'fifties': fifties,
-                'hundreds': hundreds
+                'thirties': data['bat_thirties'],
+                'fifties': data['bat_fifties'],
+                'hundreds': data['bat_hundreds']
             })
         
         # Sort by runs (descending)
-        batting_stats.sort(key=lambda x: x['runs'], reverse=True)
+        batting_stats.sort(key=_batting_order)
         return batting_stats
     
     def _calculate_bowling_stats(self, player_data):
@@ -648,7 +601,7 @@ class StatsService:
             if data['bowl_balls'] == 0 and data['bowl_wickets'] == 0:
                 continue  # Skip players who haven't bowled
             
-            matches = len(data['matches'])
+            matches = _match_count(data)
             innings = data['bowl_innings']
             balls = data['bowl_balls']
             runs = data['bowl_runs']
@@ -674,7 +627,7 @@ class StatsService:
                 'overs': round(overs, 1),
                 'runs': runs,
                 'wickets': wickets,
-                'best': f"{data['bowl_best'][0]}/{data['bowl_best'][1]}" if data['bowl_best'][0] > 0 else '-',
+                'best': f"{data['best_bowling_wickets']}/{data['best_bowling_runs']}" if data['best_bowling_wickets'] > 0 else '-',
                 'average': average,
                 'economy': round(economy, 2),
                 'dots': data['bowl_dots'],
@@ -687,7 +640,7 @@ class StatsService:
             })
         
         # Sort by wickets (descending), then by economy (ascending)
-        bowling_stats.sort(key=lambda x: (-x['wickets'], x['economy']))
+        bowling_stats.sort(key=_bowling_order)
         return bowling_stats
     
     def _calculate_fielding_stats(self, player_data):
@@ -697,7 +650,7 @@ class StatsService:
         self._log(f"Processing fielding stats for {len(player_data)} players")
         
         for pid, data in player_data.items():
-            matches = len(data['matches'])
+            matches = _match_count(data)
             catches = data['catches']
             run_outs = data['run_outs']
             stumpings = data['stumpings']
@@ -721,10 +674,7 @@ class StatsService:
         self._log(f"Generated {len(fielding_stats)} fielding stat entries")
         
         # Sort by total dismissals (descending), then by matches
-        fielding_stats.sort(
-            key=lambda x: (x['catches'] + x['run_outs'] + x.get('stumpings', 0), x['matches']),
-            reverse=True
-        )
+        fielding_stats.sort(key=_fielding_order)
         return fielding_stats
     
     def _calculate_leaderboards(self, batting_stats, bowling_stats):
@@ -769,10 +719,9 @@ class StatsService:
             b for b in batting_stats
             if b['balls'] >= min_balls and b['strike_rate'] is not None
         ]
-        sr_sorted = sorted(sr_qualified, key=lambda x: x['strike_rate'], reverse=True)
         leaderboards['highest_sr'] = [
             {'player': b['player'], 'team': b['team'], 'sr': b['strike_rate']}
-            for b in sr_sorted[:5]
+            for b in heapq.nlargest(5, sr_qualified, key=lambda x: x['strike_rate'])
         ]
 
         # Dynamic average threshold
@@ -787,14 +736,215 @@ class StatsService:
             b for b in batting_stats
             if b['innings'] >= min_innings and b['average'] is not None
         ]
-        avg_sorted = sorted(avg_qualified, key=lambda x: x['average'], reverse=True)
         leaderboards['best_average'] = [
             {'player': b['player'], 'team': b['team'], 'average': b['average']}
-            for b in avg_sorted[:5]
+            for b in heapq.nlargest(5, avg_qualified, key=lambda x: x['average'])
         ]
 
         return leaderboards
     
+    # Export column layouts: (CSV field, TXT header) per stat type.
+    EXPORT_COLUMNS = {
+        'batting': [
+            ('player', 'Player'), ('team', 'Team'), ('matches', 'Mat'), ('innings', 'Inn'),
+            ('runs', 'Runs'), ('balls', 'Balls'), ('not_outs', 'NO'), ('strike_rate', 'SR'),
+            ('average', 'Avg'), ('zeros', '0s'), ('ones', '1s'), ('twos', '2s'),
+            ('threes', '3s'), ('fours', '4s'), ('sixes', '6s'), ('thirties', '30s'),
+            ('fifties', '50s'), ('hundreds', '100s'),
+        ],
+        'bowling': [
+            ('team', 'Team'), ('player', 'Player'), ('matches', 'Mat'), ('innings', 'Inn'),
+            ('overs', 'Overs'), ('runs', 'Runs'), ('wickets', 'Wkts'), ('best', 'Best'),
+            ('average', 'Avg'), ('economy', 'Econ'), ('dots', 'Dots'), ('bowled', 'Bwld'),
+            ('lbw', 'LBW'), ('byes', 'Byes'), ('leg_byes', 'LB'), ('wides', 'Wd'),
+            ('no_balls', 'NB'),
+        ],
+        'fielding': [
+            ('player', 'Player'), ('team', 'Team'), ('matches', 'Matches'),
+            ('catches', 'Catches'), ('run_outs', 'Run Outs'),
+        ],
+    }
+
+    def _export_columns(self, stat_type):
+        return self.EXPORT_COLUMNS.get(stat_type, self.EXPORT_COLUMNS['fielding'])
+
+    # Rows fetched per round trip while streaming an export.
+    EXPORT_BATCH_SIZE = 500
+
+    def iter_export_rows(self, user_id, stat_type, tournament_id=None, match_format=None):
+        """
+        Yield the rows of one statistics table one at a time, in page order.
+
+        Reads the source the page reads (the career table or the tournament
+        cache when populated, else the scorecard aggregation) with the page's
+        ordering in SQL and yield_per(), so an export never builds the whole
+        table in memory.
+
+        Args:
+            user_id (str): User ID
+            stat_type (str): 'batting', 'bowling', or 'fielding'
+            tournament_id (int, optional): Tournament view instead of overall
+            match_format (str, optional): Filter by format — 'T20', 'ListA'
+
+        Yields:
+            dict: Rows shaped like get_overall_stats()[stat_type]
+        """
+        if tournament_id is not None:
+            tournament = db.session.get(Tournament, tournament_id)
+            if tournament and match_format and tournament.format_type != match_format:
+                return
+            source = self._cache_export_source(user_id, tournament_id)
+        else:
+            source = self._career_export_source(user_id, match_format)
+        if source is None:
+            source = self._aggregate_export_source(user_id, tournament_id, match_format)
+
+        query, keys, to_row = source
+        if stat_type == 'batting':
+            order = (keys['runs'].desc(), keys['player_id'])
+        elif stat_type == 'bowling':
+            order = (keys['wickets'].desc(), keys['economy'], keys['player_id'])
+        else:
+            order = (keys['dismissals'].desc(), keys['matches'].desc(), keys['player_id'])
+
+        for record in query.order_by(*order).yield_per(self.EXPORT_BATCH_SIZE):
+            row = to_row(record, stat_type)
+            if row is not None:
+                yield row
+
+    def _export_row(self, data, stat_type):
+        """The stats entry for one player's totals, or None if filtered out."""
+        calculate = {
+            'batting': self._calculate_batting_stats,
+            'bowling': self._calculate_bowling_stats,
+        }.get(stat_type, self._calculate_fielding_stats)
+        rows = calculate({data['player_id']: data})
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _economy_key(runs, balls):
+        # Same value the stats rows sort on: round(runs / (balls / 6), 2).
+        return case((balls > 0, func.round(runs / (balls / 6.0), 2)), else_=0)
+
+    def _career_export_source(self, user_id, match_format):
+        """(query, sort keys, row builder) over PlayerCareerStats, or None."""
+        if not match_format:
+            # Unfiltered career rows are one per format; the aggregation
+            # source sums them per player instead.
+            return None
+        query = (
+            db.session.query(PlayerCareerStats, Player, Team)
+            .join(Player, PlayerCareerStats.player_id == Player.id)
+            .join(Team, Player.team_id == Team.id)
+            .filter(Team.user_id == user_id)
+        )
+        try:
+            if query.first() is None:
+                return None
+        except OperationalError as e:
+            db.session.rollback()
+            self._log(f"Career stats table unavailable, falling back: {e}", 'warning')
+            return None
+
+        c = PlayerCareerStats
+
+        def to_row(record, stat_type):
+            row, player, team = record
+            data = self._career_entry(player, team)
+            data['matches'] = row.matches or 0
+            merge_totals(data, row)
+            return self._export_row(data, stat_type)
+
+        keys = {
+            'player_id': c.player_id,
+            'runs': func.coalesce(c.bat_runs, 0),
+            'wickets': func.coalesce(c.bowl_wickets, 0),
+            'economy': self._economy_key(func.coalesce(c.bowl_runs, 0), func.coalesce(c.bowl_balls, 0)),
+            'dismissals': func.coalesce(c.catches, 0) + func.coalesce(c.run_outs, 0) + func.coalesce(c.stumpings, 0),
+            'matches': func.coalesce(c.matches, 0),
+        }
+        return query.filter(c.match_format == match_format), keys, to_row
+
+    def _cache_export_source(self, user_id, tournament_id):
+        """(query, sort keys, row builder) over TournamentPlayerStatsCache, or None."""
+        query = (
+            db.session.query(TournamentPlayerStatsCache, Player, Team)
+            .join(Player, TournamentPlayerStatsCache.player_id == Player.id)
+            .join(Team, TournamentPlayerStatsCache.team_id == Team.id)
+            .filter(TournamentPlayerStatsCache.tournament_id == tournament_id)
+            .filter(Team.user_id == user_id)
+        )
+        if query.first() is None:
+            return None
+
+        c = TournamentPlayerStatsCache
+
+        def to_row(record, stat_type):
+            entries = self._cache_stat_rows(*record)
+            return entries[stat_type] if entries else None
+
+        keys = {
+            'player_id': c.player_id,
+            'runs': func.coalesce(c.runs_scored, 0),
+            'wickets': func.coalesce(c.wickets_taken, 0),
+            'economy': func.coalesce(c.bowling_economy, 0.0),
+            'dismissals': func.coalesce(c.catches, 0) + func.coalesce(c.run_outs, 0) + func.coalesce(c.stumpings, 0),
+            'matches': func.coalesce(c.matches_played, 0),
+        }
+        return query, keys, to_row
+
+    def _aggregate_export_source(self, user_id, tournament_id, match_format):
+        """(query, sort keys, row builder) over the scorecard aggregation."""
+        totals = player_totals_query(user_id, tournament_id=tournament_id, match_format=match_format).subquery()
+        t = totals.c
+
+        def to_row(record, stat_type):
+            return self._export_row(dict(record._mapping), stat_type)
+
+        keys = {
+            'player_id': t.player_id,
+            'runs': t.bat_runs,
+            'wickets': t.bowl_wickets,
+            'economy': self._economy_key(t.bowl_runs, t.bowl_balls),
+            'dismissals': t.catches + t.run_outs + t.stumpings,
+            'matches': t.matches,
+        }
+        return db.session.query(totals), keys, to_row
+
+    def iter_csv(self, data, stat_type):
+        """
+        Stream statistics as CSV, one chunk per row.
+
+        Args:
+            data (iterable): Statistics dictionaries
+            stat_type (str): 'batting', 'bowling', or 'fielding'
+
+        Yields:
+            str: The header line, then one line per row
+        """
+        fieldnames = [field for field, _ in self._export_columns(stat_type)]
+        buffer = io.StringIO()
+        # Stats rows include extra internal keys (e.g. role/player_id). Ignore
+        # unknown keys so exports remain stable across response-shape evolution.
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+
+        def _drain():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            return
+        writer.writeheader()
+        writer.writerow(first)
+        yield _drain()
+        for row in rows:
+            writer.writerow(row)
+            yield _drain()
+
     def export_to_csv(self, data, stat_type):
         """
         Export statistics to CSV format.
@@ -806,30 +956,8 @@ class StatsService:
         Returns:
             str: CSV content as string
         """
-        if not data:
-            return ""
-        
-        output = io.StringIO()
-        
-        if stat_type == 'batting':
-            fieldnames = ['player', 'team', 'matches', 'innings', 'runs', 'balls', 
-                         'not_outs', 'strike_rate', 'average', 'zeros', 'ones', 
-                         'twos', 'threes', 'fours', 'sixes', 'thirties', 'fifties', 'hundreds']
-        elif stat_type == 'bowling':
-            fieldnames = ['team', 'player', 'matches', 'innings', 'overs', 'runs', 
-                         'wickets', 'best', 'average', 'economy', 'dots', 'bowled', 'lbw', 
-                         'byes', 'leg_byes', 'wides', 'no_balls']
-        else:  # fielding
-            fieldnames = ['player', 'team', 'matches', 'catches', 'run_outs']
-        
-        # Stats rows include extra internal keys (e.g. role/player_id). Ignore
-        # unknown keys so exports remain stable across response-shape evolution.
-        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(data)
-        
-        return output.getvalue()
-    
+        return "".join(self.iter_csv(data, stat_type))
+
     def export_to_txt(self, data, stat_type):
         """
         Export statistics to formatted text table.
@@ -843,43 +971,15 @@ class StatsService:
         """
         if not data:
             return "No data available"
-        
-        if stat_type == 'batting':
-            headers = ['Player', 'Team', 'Mat', 'Inn', 'Runs', 'Balls', 'NO', 
-                      'SR', 'Avg', '0s', '1s', '2s', '3s', '4s', '6s', '30s', '50s', '100s']
-            rows = [
-                [
-                    d['player'], d['team'], d['matches'], d['innings'], d['runs'],
-                    d['balls'], d['not_outs'], d['strike_rate'], d['average'],
-                    d['zeros'], d['ones'], d['twos'], d['threes'], d['fours'],
-                    d['sixes'], d['thirties'], d['fifties'], d['hundreds']
-                ]
-                for d in data
-            ]
-        elif stat_type == 'bowling':
-            headers = ['Team', 'Player', 'Mat', 'Inn', 'Overs', 'Runs', 'Wkts', 
-                      'Best', 'Avg', 'Econ', 'Dots', 'Bwld', 'LBW', 'Byes', 'LB', 'Wd', 'NB']
-            rows = [
-                [
-                    d['team'], d['player'], d['matches'], d['innings'], d['overs'],
-                    d['runs'], d['wickets'], d['best'], d['average'], d['economy'], d['dots'],
-                    d['bowled'], d['lbw'], d['byes'], d['leg_byes'], d['wides'], d['no_balls']
-                ]
-                for d in data
-            ]
-        else:  # fielding
-            headers = ['Player', 'Team', 'Matches', 'Catches', 'Run Outs']
-            rows = [
-                [d['player'], d['team'], d['matches'], d['catches'], d['run_outs']]
-                for d in data
-            ]
-        
-        return tabulate(rows, headers=headers, tablefmt='grid')
+        columns = self._export_columns(stat_type)
+        rows = [[d.get(field) for field, _ in columns] for d in data]
+        return tabulate(rows, headers=[header for _, header in columns], tablefmt='grid')
     
     # ============================================================================
     # NEW FEATURE: Best Bowling Figures Tracking
     # ============================================================================
     
+    @cached_view("bowling_figures")
     def get_bowling_figures_leaderboard(self, user_id, tournament_id=None, limit=10, match_format=None):
         """
         Get best bowling figures (wickets/runs) leaderboard.
@@ -913,7 +1013,17 @@ class StatsService:
             if match_format:
                 query = query.filter(Match.match_format == match_format)
 
-            records = query.all()
+            # Best figures first: more wickets, then fewer runs. Ties keep
+            # scorecard order. Only the top `limit` rows leave SQLite.
+            records = (
+                query.order_by(
+                    MatchScorecard.wickets.desc(),
+                    func.coalesce(MatchScorecard.runs_conceded, 0).asc(),
+                    MatchScorecard.id,
+                )
+                .limit(limit)
+                .all()
+            )
             self._log(f"Found {len(records)} bowling records with wickets")
             
             if not records:
@@ -948,18 +1058,45 @@ class StatsService:
                     'caught': card.wickets_caught or 0,
                     'lbw': card.wickets_lbw or 0
                 })
-            
-            # Sort: higher wickets first, then lower runs (better figures)
-            bowling_figures.sort(key=lambda x: (-x['wickets'], x['runs']))
-            
-            # Return top N
-            return bowling_figures[:limit]
+
+            return bowling_figures
             
         except Exception as e:
             log_exception(e)
             self._log(f"Error fetching bowling figures: {e}", level='error')
             return []
-    
+
+    @cached_view("leaderboards")
+    def get_leaderboards(self, user_id, tournament_id=None, match_format=None, limit=5,
+                         min_balls=None, min_overs=None):
+        """
+        Every top-N leaderboard for one scope, computed in SQL.
+
+        Args:
+            user_id (str): User ID
+            tournament_id (int, optional): Restrict to one tournament
+            match_format (str, optional): Restrict to one format
+            limit (int): Entries per category
+            min_balls (int, optional): Balls faced to qualify for strike rate
+            min_overs (int, optional): Overs bowled to qualify for economy
+
+        Returns:
+            dict: {category: [entries]} for engine.leaderboards.CATEGORIES,
+            or {'error': ...} on failure
+        """
+        self._log(f"Computing leaderboards for user {user_id}, tournament {tournament_id}, format {match_format}")
+        try:
+            kwargs = {}
+            if min_balls is not None:
+                kwargs['min_balls'] = min_balls
+            if min_overs is not None:
+                kwargs['min_overs'] = min_overs
+            return compute_leaderboards(user_id, tournament_id, match_format, k=limit, **kwargs)
+        except Exception as e:
+            log_exception(e)
+            self._log(f"Error computing leaderboards: {e}", level='error')
+            return {'error': str(e)}
+
     def _get_opponent_name(self, match, team_id):
         """
         Helper to get opponent team name from a match.
@@ -1011,10 +1148,10 @@ class StatsService:
         }
         
         try:
+            detailed = self._get_players_detailed_stats(player_ids, user_id, tournament_id, match_format)
             for player_id in player_ids:
-                player_stats = self._get_player_detailed_stats(player_id, user_id, tournament_id, match_format)
-                if player_stats:
-                    comparison['players'].append(player_stats)
+                if player_id in detailed:
+                    comparison['players'].append(detailed[player_id])
             
             # Build comparison tables
             if comparison['players']:
@@ -1029,54 +1166,95 @@ class StatsService:
             self._log(f"Error in player comparison: {e}", level='error')
             return {'error': str(e)}
     
-    def _get_player_detailed_stats(self, player_id, user_id, tournament_id=None, match_format=None):
+    def _load_players(self, player_ids):
         """
-        Get comprehensive stats for a single player.
-        
+        Player, owning Team and profile format for each id, in one query.
+
+        Returns {player_id: (player, team, profile_format)}; ids that don't
+        exist are absent, and team is None for an orphaned player. Ownership
+        is left to the caller so it can tell "not found" from "unauthorized".
+        """
+        ids = list(dict.fromkeys(player_ids))
+        if not ids:
+            return {}
+        rows = (
+            db.session.query(Player, Team, TeamProfile.format_type)
+            .outerjoin(Team, Player.team_id == Team.id)
+            .outerjoin(TeamProfile, Player.profile_id == TeamProfile.id)
+            .filter(Player.id.in_(ids))
+            .all()
+        )
+        return {player.id: (player, team, profile_format) for player, team, profile_format in rows}
+
+    def _scorecards_for_players(self, formats, user_id, tournament_id=None):
+        """
+        Non-super-over (MatchScorecard, Match) rows for several players in one
+        query, grouped by player id.
+
+        *formats* maps player_id -> the format that player's view is scoped
+        to (None for no format filter), so players from different profiles
+        can still share a single round trip.
+        """
+        by_format = defaultdict(list)
+        for player_id, fmt in formats.items():
+            by_format[fmt].append(player_id)
+        if not by_format:
+            return {}
+
+        scopes = []
+        for fmt, ids in by_format.items():
+            clause = MatchScorecard.player_id.in_(ids)
+            if fmt:
+                clause = db.and_(clause, Match.match_format == fmt)
+            scopes.append(clause)
+
+        query = (
+            db.session.query(MatchScorecard, Match)
+            .join(Match, MatchScorecard.match_id == Match.id)
+            .filter(Match.user_id == user_id)  # Ensure we only get current user's matches
+            .filter(MatchScorecard.is_super_over.isnot(True))
+            .filter(db.or_(*scopes))
+        )
+        if tournament_id:
+            query = query.filter(Match.tournament_id == tournament_id)
+
+        records = defaultdict(list)
+        for card, match in query.all():
+            records[card.player_id].append((card, match))
+        return records
+
+    def _get_players_detailed_stats(self, player_ids, user_id, tournament_id=None, match_format=None):
+        """
+        Get comprehensive stats for several players in a constant number of
+        queries (players + scorecards), however many ids are asked for.
+
         Args:
-            player_id (int): Player ID
+            player_ids (list): Player IDs
             user_id (str): User ID
             tournament_id (int, optional): Filter by tournament
-            
+            match_format (str, optional): Filter by format; defaults to each
+                player's own profile format
+
         Returns:
-            dict: Detailed player statistics
+            dict: player_id -> detailed player statistics, for the ids that
+            exist and belong to the user
         """
-        try:
-            # Get player info
-            player = Player.query.get(player_id)
-            if not player:
-                return None
-            
-            team = Team.query.get(player.team_id)
-            if not team or team.user_id != user_id:
-                return None
-            
-            # A Player row is bound to a single TeamProfile (one format). Scope
-            # scorecard queries to that format so any stray cross-format records
-            # cannot bleed into a single-profile player view.
-            profile_format = None
-            if player.profile_id:
-                profile = TeamProfile.query.get(player.profile_id)
-                if profile:
-                    profile_format = profile.format_type
-            effective_format = match_format or profile_format
-
-            # Query scorecard records (super-over rows are not real innings)
-            query = (
-                db.session.query(MatchScorecard, Match)
-                .join(Match, MatchScorecard.match_id == Match.id)
-                .filter(MatchScorecard.player_id == player_id)
-                .filter(Match.user_id == user_id)  # Ensure we only get current user's matches
-                .filter(MatchScorecard.is_super_over.isnot(True))
-            )
-
-            if tournament_id:
-                query = query.filter(Match.tournament_id == tournament_id)
-            if effective_format:
-                query = query.filter(Match.match_format == effective_format)
+        players = {
+            pid: entry for pid, entry in self._load_players(player_ids).items()
+            if entry[1] is not None and entry[1].user_id == user_id
+        }
 
-            records = query.all()
+        # A Player row is bound to a single TeamProfile (one format). Scope
+        # scorecard queries to that format so any stray cross-format records
+        # cannot bleed into a single-profile player view.
+        formats = {
+            pid: match_format or profile_format
+            for pid, (_, _, profile_format) in players.items()
+        }
+        records = self._scorecards_for_players(formats, user_id, tournament_id)
 
+        results = {}
+        for player_id, (player, team, _) in players.items():
             # Aggregate stats
             batting_data = []
             bowling_data = []
@@ -1084,10 +1262,10 @@ class StatsService:
             run_outs = 0
             stumpings = 0
             matches = set()
-            
-            for card, match in records:
+
+            for card, match in records.get(player_id, ()):
                 matches.add(match.id)
-                
+
                 if card.record_type == 'batting' and ((card.balls or 0) > 0 or (card.runs or 0) > 0 or bool(card.is_out)):
                     batting_data.append({
                         'runs': card.runs or 0,
@@ -1096,29 +1274,25 @@ class StatsService:
                         'fours': card.fours or 0,
                         'sixes': card.sixes or 0
                     })
-                
+
                 if card.record_type == 'bowling' and (card.balls_bowled or 0) > 0:
                     bowling_data.append({
                         'wickets': card.wickets or 0,
                         'runs': card.runs_conceded or 0,
                         'balls': card.balls_bowled or 0
                     })
-                
+
                 catches += card.catches or 0
                 run_outs += card.run_outs or 0
                 stumpings += card.stumpings or 0
 
-            # Calculate batting stats
-            batting_stats = self._calculate_batting_metrics(batting_data)
-            bowling_stats = self._calculate_bowling_metrics(bowling_data)
-
-            return {
+            results[player_id] = {
                 'player_id': player_id,
                 'player_name': player.name,
                 'team_name': team.name,
                 'matches': len(matches),
-                'batting': batting_stats,
-                'bowling': bowling_stats,
+                'batting': self._calculate_batting_metrics(batting_data),
+                'bowling': self._calculate_bowling_metrics(bowling_data),
                 'fielding': {
                     'catches': catches,
                     'run_outs': run_outs,
@@ -1126,7 +1300,24 @@ class StatsService:
                     'total_dismissals': catches + run_outs + stumpings,
                 }
             }
+        return results
+
+    def _get_player_detailed_stats(self, player_id, user_id, tournament_id=None, match_format=None):
+        """
+        Get comprehensive stats for a single player.
+        
+        Args:
+            player_id (int): Player ID
+            user_id (str): User ID
+            tournament_id (int, optional): Filter by tournament
             
+        Returns:
+            dict: Detailed player statistics
+        """
+        try:
+            return self._get_players_detailed_stats(
+                [player_id], user_id, tournament_id, match_format
+            ).get(player_id)
         except Exception as e:
             log_exception(e)
             self._log(f"Error getting player stats for {player_id}: {e}", level='error')
@@ -1232,6 +1423,7 @@ class StatsService:
     # NEW FEATURE: Partnership Statistics
     # ============================================================================
     
+    @cached_view("player_partnerships")
     def get_player_partnership_stats(self, player_id, user_id, tournament_id=None, match_format=None):
         """
         Get comprehensive partnership statistics for a specific player.
@@ -1247,35 +1439,18 @@ class StatsService:
         self._log(f"Fetching partnership stats for player {player_id}")
         
         try:
-            from database.models import MatchPartnership
-            
             # Verify player belongs to user
-            player = Player.query.get(player_id)
+            player, team, _ = self._load_players([player_id]).get(player_id, (None, None, None))
             if not player:
                 return {'error': 'Player not found'}
             
-            team = Team.query.get(player.team_id)
             if not team or team.user_id != user_id:
                 return {'error': 'Unauthorized'}
             
-            # Query partnerships where this player is involved
-            query = (
-                db.session.query(MatchPartnership, Match)
-                .join(Match, MatchPartnership.match_id == Match.id)
-                .filter(
-                    (MatchPartnership.batsman1_id == player_id) | 
-                    (MatchPartnership.batsman2_id == player_id)
-                )
-            )
-            
-            if tournament_id:
-                query = query.filter(Match.tournament_id == tournament_id)
-            if match_format:
-                query = query.filter(Match.match_format == match_format)
-
-            partnerships = query.all()
+            # Grouped totals from the partnership index (by wicket, by partner)
+            summary = partnership_index.player_summary(player_id, user_id, tournament_id, match_format)
             
-            if not partnerships:
+            if not summary['total_partnerships']:
                 return {
                     'player_name': player.name,
                     'total_partnerships': 0,
@@ -1284,127 +1459,26 @@ class StatsService:
                     'milestones': {'50+': 0, '100+': 0, '150+': 0}
                 }
             
-            return self._analyze_partnerships(player_id, player.name, partnerships)
+            total = summary['total_partnerships']
+            return {
+                'player_name': player.name,
+                'total_partnerships': total,
+                'best_partnerships': partnership_index.player_partnerships(
+                    player_id, user_id, tournament_id, match_format
+                ),
+                'partners': summary['partners'],
+                'by_position': summary['by_position'],
+                'milestones': summary['milestones'],
+                'total_runs': summary['total_runs'],
+                'average_partnership': round(summary['total_runs'] / total, 1),
+            }
             
         except Exception as e:
             log_exception(e)
             self._log(f"Error fetching partnership stats: {e}", level='error')
             return {'error': str(e)}
     
-    def _analyze_partnerships(self, player_id, player_name, partnerships):
-        """
-        Analyze partnership data for insights.
-        
-        Args:
-            player_id (int): Player ID
-            player_name (str): Player name
-            partnerships (list): List of (MatchPartnership, Match) tuples
-            
-        Returns:
-            dict: Analyzed partnership statistics
-        """
-        stats = {
-            'player_name': player_name,
-            'total_partnerships': len(partnerships),
-            'best_partnerships': [],
-            'partners': {},
-            'by_position': {},
-            'milestones': {'50+': 0, '100+': 0, '150+': 0, '200+': 0},
-            'total_runs': 0,
-            'average_partnership': 0
-        }
-        
-        total_runs = 0
-        
-        for partnership, match in partnerships:
-            # Determine partner
-            is_batsman1 = (partnership.batsman1_id == player_id)
-            partner_id = partnership.batsman2_id if is_batsman1 else partnership.batsman1_id
-            
-            # Get partner info
-            partner = Player.query.get(partner_id)
-            if not partner:
-                continue
-            
-            partner_name = partner.name
-            player_contribution = (partnership.batsman1_contribution if is_batsman1 
-                                 else partnership.batsman2_contribution)
-            
-            # Track by partner
-            if partner_id not in stats['partners']:
-                stats['partners'][partner_id] = {
-                    'name': partner_name,
-                    'count': 0,
-                    'total_runs': 0,
-                    'best': 0,
-                    'avg_runs': 0
-                }
-            
-            stats['partners'][partner_id]['count'] += 1
-            stats['partners'][partner_id]['total_runs'] += partnership.runs
-            stats['partners'][partner_id]['best'] = max(
-                stats['partners'][partner_id]['best'], 
-                partnership.runs
-            )
-            
-            # Track by wicket position
-            wicket = partnership.wicket_number
-            if wicket not in stats['by_position']:
-                stats['by_position'][wicket] = {'count': 0, 'runs': 0}
-            stats['by_position'][wicket]['count'] += 1
-            stats['by_position'][wicket]['runs'] += partnership.runs
-            
-            # Track milestones
-            if partnership.runs >= 50:
-                stats['milestones']['50+'] += 1
-            if partnership.runs >= 100:
-                stats['milestones']['100+'] += 1
-            if partnership.runs >= 150:
-                stats['milestones']['150+'] += 1
-            if partnership.runs >= 200:
-                stats['milestones']['200+'] += 1
-            
-            total_runs += partnership.runs
-            
-            # Determine opponent
-            opponent = self._get_opponent_name(match, partner.team_id)
-            
-            # Add to best partnerships list
-            stats['best_partnerships'].append({
-                'partner': partner_name,
-                'runs': partnership.runs,
-                'balls': partnership.balls,
-                'player_contribution': player_contribution,
-                'partner_contribution': (partnership.batsman2_contribution if is_batsman1 
-                                        else partnership.batsman1_contribution),
-                'wicket': wicket,
-                'match_id': match.id,
-                'opponent': opponent,
-                'date': match.date.strftime('%Y-%m-%d') if match.date else 'N/A'
-            })
-        
-        # Calculate averages
-        for partner_stats in stats['partners'].values():
-            partner_stats['avg_runs'] = round(
-                partner_stats['total_runs'] / partner_stats['count'], 1
-            )
-        
-        # Sort best partnerships
-        stats['best_partnerships'].sort(key=lambda x: x['runs'], reverse=True)
-        
-        # Calculate overall averages
-        stats['total_runs'] = total_runs
-        stats['average_partnership'] = round(total_runs / len(partnerships), 1) if partnerships else 0
-        
-        # Convert partners dict to sorted list
-        stats['partners'] = sorted(
-            stats['partners'].values(), 
-            key=lambda x: x['total_runs'], 
-            reverse=True
-        )
-        
-        return stats
-    
+    @cached_view("tournament_partnerships")
     def get_tournament_partnership_leaderboard(self, user_id, tournament_id, limit=10, match_format=None):
         """
         Get best partnerships in a tournament.
@@ -1420,57 +1494,77 @@ class StatsService:
         self._log(f"Fetching tournament partnership leaderboard for tournament {tournament_id}")
         
         try:
-            from database.models import MatchPartnership
-            
-            # Query partnerships from tournament matches with both batsmen joined
-            Batsman2 = aliased(Player)
-            partnerships = (
-                db.session.query(MatchPartnership, Match, Player, Batsman2, Team)
-                .join(Match, MatchPartnership.match_id == Match.id)
-                .join(Player, MatchPartnership.batsman1_id == Player.id)
-                .join(Batsman2, MatchPartnership.batsman2_id == Batsman2.id)
-                .join(Team, Player.team_id == Team.id)
-                .filter(Match.tournament_id == tournament_id)
-                .filter(Team.user_id == user_id)
-            )
-            if match_format:
-                partnerships = partnerships.filter(Match.match_format == match_format)
-            partnerships = (
-                partnerships
-                .order_by(MatchPartnership.runs.desc())
-                .limit(limit)
-                .all()
-            )
-
-            leaderboard = []
-            for partnership, match, batsman1, batsman2, team in partnerships:
-                
-                opponent = self._get_opponent_name(match, team.id)
-                
-                leaderboard.append({
-                    'batsman1': batsman1.name,
-                    'batsman2': batsman2.name,
-                    'team': team.name,
-                    'runs': partnership.runs,
-                    'balls': partnership.balls,
-                    'batsman1_contribution': partnership.batsman1_contribution,
-                    'batsman2_contribution': partnership.batsman2_contribution,
-                    'wicket': partnership.wicket_number,
-                    'opponent': opponent,
-                    'match_id': match.id
-                })
-            
-            return leaderboard
+            return [
+                {key: stand[key] for key in (
+                    'batsman1', 'batsman2', 'team', 'runs', 'balls',
+                    'batsman1_contribution', 'batsman2_contribution',
+                    'wicket', 'opponent', 'match_id',
+                )}
+                for stand in partnership_index.best_partnerships(
+                    user_id, tournament_id=tournament_id, match_format=match_format, limit=limit
+                )
+            ]
             
         except Exception as e:
             log_exception(e)
             self._log(f"Error fetching partnership leaderboard: {e}", level='error')
             return []
 
+    @cached_view("overall_partnerships")
+    def get_overall_partnership_leaderboard(self, user_id, limit=10, match_format=None):
+        """
+        Get best partnerships across all of a user's matches.
+
+        Args:
+            user_id (str): User ID
+            limit (int): Maximum number of entries
+            match_format (str, optional): Filter by format
+
+        Returns:
+            list: Top partnerships sorted by runs
+        """
+        partnerships = partnership_index.best_partnerships(user_id, match_format=match_format, limit=limit)
+
+        self._log(f"Found {len(partnerships)} overall partnership rows (limit={limit}) for user {user_id}")
+
+        return [
+            {key: stand[key] for key in (
+                "batsman1", "batsman2", "runs", "balls", "wicket",
+                "batsman1_contribution", "batsman2_contribution", "tournament", "match_id",
+            )}
+            for stand in partnerships
+        ]
+
+    @cached_view("partnership_records")
+    def get_partnership_records(self, user_id, tournament_id=None, match_format=None, limit=10):
+        """
+        Partnership records for one scope: the most prolific batting pairs
+        and the highest stand for each wicket.
+
+        Args:
+            user_id (str): User ID
+            tournament_id (int, optional): Filter by tournament
+            match_format (str, optional): Filter by format
+            limit (int): Maximum number of pairs
+
+        Returns:
+            dict: {'pairs': [...], 'by_wicket': [...]}
+        """
+        try:
+            return {
+                "pairs": partnership_index.best_pairs(user_id, tournament_id, match_format, limit),
+                "by_wicket": partnership_index.best_by_wicket(user_id, tournament_id, match_format),
+            }
+        except Exception as e:
+            log_exception(e)
+            self._log(f"Error fetching partnership records: {e}", level='error')
+            return {"error": str(e)}
+
     # ========================================================================
     # Head-to-Head Team Comparison
     # ========================================================================
 
+    @cached_view("head_to_head")
     def get_head_to_head(self, user_id, team1_id, team2_id, match_format=None):
         """Compare two teams' records against each other."""
         try:
@@ -1481,78 +1575,64 @@ class StatsService:
             if team1.user_id != user_id or team2.user_id != user_id:
                 return {"error": "Unauthorized"}
 
-            query = Match.query.filter(
-                Match.user_id == user_id,
-                db.or_(
-                    db.and_(Match.home_team_id == team1_id, Match.away_team_id == team2_id),
-                    db.and_(Match.home_team_id == team2_id, Match.away_team_id == team1_id),
-                ),
-            )
+            # Precomputed per (pair, format) by engine/head_to_head.py; one
+            # row for a single format, one per format otherwise.
+            team_a, team_b = pair_of(team1_id, team2_id)
+            query = TeamPairSummary.query.filter_by(user_id=user_id, team_a_id=team_a, team_b_id=team_b)
             if match_format:
-                query = query.filter(Match.match_format == match_format)
+                query = query.filter(TeamPairSummary.match_format == match_format)
+            summary = merge_summaries(query.all())
 
-            matches = query.order_by(Match.date.desc()).all()
-            if not matches:
+            if not summary["played"]:
                 return {
                     "team1": team1.name, "team2": team2.name,
                     "matches": [], "summary": {"played": 0, "team1_wins": 0, "team2_wins": 0, "ties": 0},
                     "top_performers": {"team1": [], "team2": []},
                 }
 
-            t1_wins = t2_wins = ties = 0
-            match_list = []
-            match_ids = []
-            for m in matches:
-                match_ids.append(m.id)
-                if m.winner_team_id == team1_id:
-                    t1_wins += 1
-                elif m.winner_team_id == team2_id:
-                    t2_wins += 1
-                else:
-                    ties += 1
-                match_list.append({
-                    "match_id": m.id,
-                    "date": m.date.strftime("%Y-%m-%d") if m.date else "",
-                    "venue": m.venue or "",
-                    "home": team1.name if m.home_team_id == team1_id else team2.name,
-                    "away": team2.name if m.home_team_id == team1_id else team1.name,
-                    "result": m.result_description or "",
-                    "home_score": f"{m.home_team_score or 0}/{m.home_team_wickets or 0}",
-                    "away_score": f"{m.away_team_score or 0}/{m.away_team_wickets or 0}",
-                    "format": m.match_format or "T20",
-                })
-
-            # Top performers in these H2H matches
-            def _top_performers(team_id):
-                cards = (
-                    db.session.query(
-                        Player.name,
-                        func.sum(db.case((MatchScorecard.record_type == "batting", MatchScorecard.runs), else_=0)).label("runs"),
-                        func.sum(db.case((MatchScorecard.record_type == "bowling", MatchScorecard.wickets), else_=0)).label("wkts"),
-                        func.count(func.distinct(MatchScorecard.match_id)).label("mat"),
-                    )
-                    .join(Player, MatchScorecard.player_id == Player.id)
-                    .filter(
-                        MatchScorecard.match_id.in_(match_ids),
-                        MatchScorecard.team_id == team_id,
-                        MatchScorecard.is_super_over.isnot(True),
-                    )
-                    .group_by(Player.name)
-                    .all()
-                )
-                perfs = []
-                for name, runs, wkts, mat in cards:
-                    impact = (runs or 0) + (wkts or 0) * 20
-                    perfs.append({"name": name, "runs": runs or 0, "wickets": wkts or 0, "matches": mat, "impact": impact})
-                perfs.sort(key=lambda x: x["impact"], reverse=True)
-                return perfs[:5]
+            names = {team1_id: team1.name, team2_id: team2.name}
+            side = {team_a: "team_a", team_b: "team_b"}
+
+            def _total(total):
+                if total is None:
+                    return None
+                runs, team_id, match_id = total
+                return {"runs": runs, "team": names.get(team_id, ""), "match_id": match_id}
+
+            match_list = [
+                {
+                    "match_id": r["match_id"],
+                    "date": r["date"],
+                    "venue": r["venue"],
+                    "home": names.get(r["home_team_id"], ""),
+                    "away": names.get(r["away_team_id"], ""),
+                    "result": r["result"],
+                    "home_score": r["home_score"],
+                    "away_score": r["away_score"],
+                    "format": r["format"],
+                }
+                for r in summary["recent"]
+            ]
 
             return {
                 "team1": team1.name, "team2": team2.name,
                 "team1_id": team1_id, "team2_id": team2_id,
                 "matches": match_list,
-                "summary": {"played": len(matches), "team1_wins": t1_wins, "team2_wins": t2_wins, "ties": ties},
-                "top_performers": {"team1": _top_performers(team1_id), "team2": _top_performers(team2_id)},
+                "summary": {
+                    "played": summary["played"],
+                    "team1_wins": summary[f"{side[team1_id]}_wins"],
+                    "team2_wins": summary[f"{side[team2_id]}_wins"],
+                    "ties": summary["ties"],
+                    "no_results": summary["no_results"],
+                    "team1_runs": summary[f"{side[team1_id]}_runs"],
+                    "team2_runs": summary[f"{side[team2_id]}_runs"],
+                    "highest_total": _total(summary["highest"]),
+                    "lowest_total": _total(summary["lowest"]),
+                },
+                "top_performers": {
+                    "team1": top_performers(summary["performers"], team1_id),
+                    "team2": top_performers(summary["performers"], team2_id),
+                },
             }
         except Exception as e:
             log_exception(e)
@@ -1563,37 +1643,23 @@ class StatsService:
     # Player Profile
     # ========================================================================
 
+    @cached_view("player_profile")
     def get_player_profile(self, player_id, user_id, match_format=None):
         """Get full career stats + match log for a single player."""
         try:
-            player = Player.query.get(player_id)
+            player, team, profile_format = self._load_players([player_id]).get(player_id, (None, None, None))
             if not player:
                 return {"error": "Player not found"}
-            team = Team.query.get(player.team_id)
             if not team or team.user_id != user_id:
                 return {"error": "Unauthorized"}
 
             # A Player row is bound to a TeamProfile (one format). Constrain the
             # scorecard query to that profile's format so legacy or mis-archived
             # cross-format records cannot bleed into a single-profile player view.
-            profile_format = None
-            if player.profile_id:
-                profile = TeamProfile.query.get(player.profile_id)
-                if profile:
-                    profile_format = profile.format_type
-
             effective_format = match_format or profile_format
 
-            query = (
-                db.session.query(MatchScorecard, Match)
-                .join(Match, MatchScorecard.match_id == Match.id)
-                .filter(MatchScorecard.player_id == player_id, Match.user_id == user_id)
-                .filter(MatchScorecard.is_super_over.isnot(True))
-            )
-            if effective_format:
-                query = query.filter(Match.match_format == effective_format)
-
-            records = query.order_by(Match.date.desc()).all()
+            records = self._scorecards_for_players({player_id: effective_format}, user_id).get(player_id, [])
+            records.sort(key=lambda r: r[1].date or datetime.min, reverse=True)
 
             batting_innings = []
             bowling_innings = []
@@ -1686,6 +1752,7 @@ class StatsService:
     # Team Statistics Dashboard
     # ========================================================================
 
+    @cached_view("team_stats")
     def get_team_stats(self, user_id, team_id, match_format=None):
         """Get aggregate team-level statistics."""
         try:
@@ -1806,35 +1873,20 @@ class StatsService:
                 heuristic that may miss multi-event matches.
 
         Returns a list of milestone strings (empty if none reached).
-        Called after aggregates are updated during match archival.
+        Archival detects milestones for a whole match at once in the
+        post-match analytics stage (engine/match_analytics.py), which
+        shares the thresholds and career totals used here.
         """
         player = Player.query.get(player_id)
         if not player:
             return []
 
         d = deltas or {}
-        runs_delta = max(int(d.get("runs", 1) or 0), 1)
-        wickets_delta = max(int(d.get("wickets", 1) or 0), 1)
-        catches_delta = max(int(d.get("catches", 1) or 0), 1)
-
-        milestones = []
-        run_marks = [500, 1000, 2000, 3000, 5000]
-        for mark in run_marks:
-            if player.total_runs >= mark and (player.total_runs - runs_delta) < mark:
-                milestones.append(f"{player.name} reached {mark} career runs!")
-
-        wkt_marks = [25, 50, 100, 150, 200]
-        for mark in wkt_marks:
-            if player.total_wickets >= mark and (player.total_wickets - wickets_delta) < mark:
-                milestones.append(f"{player.name} reached {mark} career wickets!")
-
-        catch_total = (
-            db.session.query(func.coalesce(func.sum(MatchScorecard.catches), 0))
-            .filter(MatchScorecard.player_id == player_id)
-            .scalar()
-        ) or 0
-        for mark in [10, 25, 50]:
-            if catch_total >= mark and (catch_total - catches_delta) < mark:
-                milestones.append(f"{player.name} reached {mark} career catches!")
-
-        return milestones
+        totals = {
+            "runs": player.total_runs,
+            "wickets": player.total_wickets,
+            "catches": match_analytics.career_catches([player_id]).get(player_id, 0),
+        }
+        return match_analytics.milestones_crossed(
+            player.name, totals, {key: d.get(key, 1) for key in ("runs", "wickets", "catches")}
+        )
@@ -0,0 +1,393 @@
+"""
+super_over_sim.py
+=================
+
+Standalone batch Super Over simulator for tie-break calibration.
+
+Match.next_super_over_ball() can only be reached through a full match that
+ends in a tie (start_super_over -> next_super_over_ball -> ...), so studying
+six-ball distributions used to mean building whole matches. This module
+drives calculate_super_over_outcome() directly in a tight loop.
+
+The per-ball bookkeeping is shared with next_super_over_ball(): both keep a
+SuperOverState and hand every outcome to apply_super_over_ball(), so the
+simulator measures the live rules rather than a copy of them:
+
+  - legal-ball counting (Wides/No Balls re-bowled, Byes/Leg Byes legal)
+  - striker-side ball/run/boundary credit feeding `streak`, batter_runs
+    and balls_faced
+  - run-out end selection, crossing, and the 3rd batter coming in
+  - the 6-ball / 2-wicket limits and innings 2 stopping as soon as the
+    target is reached (SuperOverState.innings_over)
+
+The Super Over's own make_ball_event() history for micro-GSME momentum is
+kept here as in the live path.
+
+It does NOT replay commentary, career-stat accumulation or the multi-round
+/ boundary count-back decision — each simulated Super Over is one round,
+and a level score is reported as a tie.
+
+Fatigue/form carry-over from the main match (Match._get_super_over_effective_*)
+is the caller's job: pass already-adjusted player dicts if you want it.
+
+Usage:
+    from engine.super_over_sim import simulate_super_overs
+    summary = simulate_super_overs(home_xi, away_xi, pitch="Hard",
+                                   n=20000, seed=7, workers=4)
+    summary["tie_rate"], summary["innings1"]["mean_runs"]
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from engine.format_config import get_format
+from engine.game_state_engine import make_ball_event
+from engine.pressure_engine import PressureEngine
+from engine.super_over_outcome import calculate_super_over_outcome
+
+# Super Overs per seeded chunk. Fixed (not derived from `workers`) so a given
+# seed produces identical results however many processes run the batch.
+CHUNK_SIZE = 500
+
+
+def select_super_over_batsmen(team):
+    """Top 3 batters by rating: two openers and the reserve. Match uses this too."""
+    return sorted(team, key=lambda p: p["batting_rating"], reverse=True)[:3]
+
+
+def select_super_over_bowler(team):
+    """Best-rated of the side's bowlers, else of the whole side. Match uses this too."""
+    bowlers = [p for p in team if p.get("will_bowl", False)]
+    if bowlers:
+        return max(bowlers, key=lambda p: p.get("bowling_rating", 0))
+    if team:
+        return max(team, key=lambda p: p.get("bowling_rating", 0))
+    raise ValueError("Cannot select super over bowler from an empty team")
+
+
+def new_batsman_stats(batsmen):
+    """Per-batter Super Over figures keyed by name; the two openers have batted."""
+    stats = {
+        p["name"]: {
+            "runs": 0, "balls": 0, "fours": 0, "sixes": 0,
+            "wicket_type": "", "out": False, "did_bat": False,
+        }
+        for p in batsmen
+    }
+    for p in batsmen[:2]:
+        stats[p["name"]]["did_bat"] = True
+    return stats
+
+
+@dataclass
+class SuperOverState:
+    """One Super Over innings in progress: the crease and the running totals."""
+    batsmen: list           # the three selected batters; the first two open
+    stats: dict             # new_batsman_stats(batsmen), updated in place
+    striker: dict
+    non_striker: dict
+    next_idx: int = 2       # index into batsmen of the next batter in
+    score: int = 0
+    wickets: int = 0
+    legal_balls: int = 0
+    bowler_runs: int = 0
+    bowler_wickets: int = 0
+
+    def runs_needed(self, target):
+        """Runs still needed to reach *target* (None outside a chase)."""
+        return None if target is None else max(0, target - self.score)
+
+    def innings_over(self, target=None):
+        """Six legal balls bowled, two wickets down, or *target* reached."""
+        return (self.legal_balls >= 6 or self.wickets >= 2
+                or (target is not None and self.score >= target))
+
+
+def apply_super_over_ball(state, outcome):
+    """
+    Apply one calculate_super_over_outcome() result to *state*: the score,
+    the bowler's figures, the striker's ball/run/boundary credit, dismissals
+    (run-out end, crossing, the 3rd batter coming in), strike rotation and
+    the legal-ball count.
+    """
+    runs, extra = outcome["runs"], outcome["is_extra"]
+    extra_type = outcome.get("extra_type", "")
+    striker_stats = state.stats[state.striker["name"]]
+    # Byes, Leg Byes and No Balls are faced deliveries; Wides are not.
+    faced = (not extra) or extra_type in ("Byes", "Leg Bye", "No Ball")
+
+    if outcome["batter_out"]:
+        state.wickets += 1
+        wicket_type = outcome["wicket_type"]
+        crossed = False  # only meaningful for run-outs
+        if wicket_type == "Run Out":
+            # Run outs are not credited to the bowler (same rule as the main
+            # innings); the completed runs (0, 1 or 2) still count.
+            completed = max(0, runs)
+            state.score += completed
+            state.bowler_runs += completed
+            striker_stats["runs"] += completed
+            if faced:
+                striker_stats["balls"] += 1
+            dismissed_end = random.choice(["striker", "non_striker"])
+            crossed = completed % 2 == 1
+        else:
+            state.bowler_wickets += 1
+            if faced:
+                striker_stats["balls"] += 1
+            dismissed_end = "striker"
+        dismissed = state.striker if dismissed_end == "striker" else state.non_striker
+        state.stats[dismissed["name"]]["wicket_type"] = wicket_type
+        state.stats[dismissed["name"]]["out"] = True
+
+        # Three batters, two wickets: after the first, the reserve comes in at
+        # the dismissed end — or the other one if the batters had crossed.
+        if state.wickets < 2 and state.next_idx < len(state.batsmen):
+            incoming = state.batsmen[state.next_idx]
+            state.next_idx += 1
+            state.stats[incoming["name"]]["did_bat"] = True
+            surviving = state.non_striker if dismissed_end == "striker" else state.striker
+            if crossed:
+                if dismissed_end == "striker":
+                    state.striker, state.non_striker = surviving, incoming
+                else:
+                    state.striker, state.non_striker = incoming, surviving
+            elif dismissed_end == "striker":
+                state.striker = incoming
+            else:
+                state.non_striker = incoming
+    else:
+        state.score += runs
+        # Byes and Leg Byes are not charged to the bowler; Wides/No Balls are.
+        if not (extra and extra_type in ("Byes", "Leg Bye")):
+            state.bowler_runs += runs
+        if not extra:
+            striker_stats["runs"] += runs
+            if runs == 4:
+                striker_stats["fours"] += 1
+            elif runs == 6:
+                striker_stats["sixes"] += 1
+        if faced:
+            striker_stats["balls"] += 1
+
+        # Strike rotation applies to every delivery type.
+        if not extra or extra_type in ("Leg Bye", "Byes"):
+            rotate = runs % 2 == 1
+        elif extra_type == "No Ball":
+            rotate = outcome.get("bat_runs", 0) % 2 == 1
+        elif extra_type == "Wide":
+            rotate = runs - 1 > 0 and (runs - 1) % 2 == 1
+        else:
+            rotate = False
+        if rotate:
+            state.striker, state.non_striker = state.non_striker, state.striker
+
+    # Byes and Leg Byes are legal deliveries.
+    if (not extra) or extra_type in ("Byes", "Leg Bye"):
+        state.legal_balls += 1
+
+
+def simulate_super_over_innings(batsmen, bowler, fielding_team, pitch, *,
+                                so_innings=1, target=None, pitch_wear=0.0,
+                                pressure_engine=None, ground_config=None):
+    """
+    Simulate one Super Over innings (max 6 legal balls / 2 wickets).
+
+    batsmen : three player dicts — two openers and the reserve.
+    target  : innings 2 only — the score needed to win.
+
+    Returns {"runs", "wickets", "balls", "deliveries", "boundaries"}.
+    """
+    if len(batsmen) < 3:
+        raise ValueError("Super over needs three batsmen")
+    if so_innings != 2:
+        target = None
+    state = SuperOverState(batsmen=batsmen, stats=new_batsman_stats(batsmen),
+                           striker=batsmen[0], non_striker=batsmen[1])
+    deliveries = 0
+    history = []
+
+    while not state.innings_over(target):
+        s = state.stats[state.striker["name"]]
+        outcome = calculate_super_over_outcome(
+            batter=state.striker,
+            bowler=bowler,
+            pitch=pitch,
+            streak={"boundaries": s["fours"] + s["sixes"]},
+            batter_runs=s["runs"],
+            balls_faced=s["balls"],
+            so_innings=so_innings,
+            wickets_down=state.wickets,
+            balls_remaining=6 - state.legal_balls,
+            runs_needed=state.runs_needed(target),
+            score_so_far=state.score,
+            history=history,
+            pitch_wear=pitch_wear,
+            fielding_team=fielding_team,
+            pressure_engine=pressure_engine,
+            ground_config_override=ground_config,
+        )
+        history.append(make_ball_event(outcome))
+        deliveries += 1
+        apply_super_over_ball(state, outcome)
+
+    return {
+        "runs": state.score,
+        "wickets": state.wickets,
+        "balls": state.legal_balls,
+        "deliveries": deliveries,
+        "boundaries": sum(s["fours"] + s["sixes"] for s in state.stats.values()),
+    }
+
+
+def simulate_super_over(first_batsmen, first_bowler, second_batsmen, second_bowler,
+                        first_xi, second_xi, pitch, *, pitch_wear=0.0,
+                        pressure_engine=None, ground_config=None):
+    """
+    One full Super Over round. `first_*` is the side batting first;
+    `first_bowler` must come from `second_xi` (it bowls at the first side)
+    and vice versa. Returns {"innings1", "innings2", "result"} where
+    result is "first", "second" or "tie".
+    """
+    inn1 = simulate_super_over_innings(
+        first_batsmen, first_bowler, second_xi, pitch,
+        so_innings=1, pitch_wear=pitch_wear,
+        pressure_engine=pressure_engine, ground_config=ground_config,
+    )
+    inn2 = simulate_super_over_innings(
+        second_batsmen, second_bowler, first_xi, pitch,
+        so_innings=2, target=inn1["runs"] + 1, pitch_wear=pitch_wear,
+        pressure_engine=pressure_engine, ground_config=ground_config,
+    )
+    if inn1["runs"] > inn2["runs"]:
+        result = "first"
+    elif inn2["runs"] > inn1["runs"]:
+        result = "second"
+    else:
+        result = "tie"
+    return {"innings1": inn1, "innings2": inn2, "result": result}
+
+
+def _run_chunk(args):
+    """Worker entry point: simulate `count` Super Overs under one seed and
+    return raw counters (picklable, merged by the caller)."""
+    (count, seed, first_batsmen, first_bowler, second_batsmen, second_bowler,
+     first_xi, second_xi, pitch, pitch_wear, format_name, ground_config) = args
+
+    saved_state = random.getstate()
+    random.seed(seed)
+    try:
+        pressure_engine = PressureEngine(format_config=get_format(format_name))
+        tally = {
+            "inn1_runs": Counter(), "inn1_wickets": Counter(),
+            "inn2_runs": Counter(), "inn2_wickets": Counter(),
+            "results": Counter(), "tie_boundaries": Counter(),
+        }
+        for _ in range(count):
+            so = simulate_super_over(
+                first_batsmen, first_bowler, second_batsmen, second_bowler,
+                first_xi, second_xi, pitch, pitch_wear=pitch_wear,
+                pressure_engine=pressure_engine, ground_config=ground_config,
+            )
+            tally["inn1_runs"][so["innings1"]["runs"]] += 1
+            tally["inn1_wickets"][so["innings1"]["wickets"]] += 1
+            tally["inn2_runs"][so["innings2"]["runs"]] += 1
+            tally["inn2_wickets"][so["innings2"]["wickets"]] += 1
+            tally["results"][so["result"]] += 1
+            if so["result"] == "tie":
+                # Boundary count-back: who would win a still-level shootout.
+                b1, b2 = so["innings1"]["boundaries"], so["innings2"]["boundaries"]
+                tally["tie_boundaries"]["first" if b1 > b2 else "second" if b2 > b1 else "level"] += 1
+        return tally
+    finally:
+        random.setstate(saved_state)
+
+
+def _summarise_innings(runs, wickets, n):
+    total_runs = sum(r * c for r, c in runs.items())
+    return {
+        "runs_distribution": {r: runs[r] / n for r in sorted(runs)},
+        "wickets_distribution": {w: wickets[w] / n for w in sorted(wickets)},
+        "mean_runs": round(total_runs / n, 3) if n else 0.0,
+        "all_out_rate": wickets[2] / n if n else 0.0,
+    }
+
+
+def simulate_super_overs(home_xi, away_xi, *, home_batsmen=None, home_bowler=None,
+                         away_batsmen=None, away_bowler=None, first_batting="home",
+                         pitch="Hard", pitch_wear=0.0, format_name="T20",
+                         ground_config=None, n=1000, seed=None, workers=1):
+    """
+    Run `n` independent Super Overs between two XIs and summarise them.
+
+    home_batsmen / away_batsmen : three player dicts each (auto-selected by
+                                  batting rating when omitted).
+    home_bowler / away_bowler   : the bowler each side USES (auto-selected
+                                  from that side's XI when omitted).
+    first_batting               : "home" or "away".
+    seed                        : base seed; chunk i uses seed + i. None
+                                  draws a base seed from the global RNG.
+    workers                     : >1 fans chunks out over a process pool.
+                                  Results are identical for any worker count.
+
+    Returns a dict with per-innings run/wicket distributions (as rates),
+    mean runs, and tie / first-batting / chasing win rates.
+    """
+    if first_batting not in ("home", "away"):
+        raise ValueError("first_batting must be 'home' or 'away'")
+    if n <= 0:
+        raise ValueError("n must be positive")
+
+    home_batsmen = home_batsmen or select_super_over_batsmen(home_xi)
+    away_batsmen = away_batsmen or select_super_over_batsmen(away_xi)
+    home_bowler = home_bowler or select_super_over_bowler(home_xi)
+    away_bowler = away_bowler or select_super_over_bowler(away_xi)
+
+    if first_batting == "home":
+        first = (home_batsmen, away_bowler, home_xi)
+        second = (away_batsmen, home_bowler, away_xi)
+    else:
+        first = (away_batsmen, home_bowler, away_xi)
+        second = (home_batsmen, away_bowler, home_xi)
+
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+
+    jobs = []
+    remaining, idx = n, 0
+    while remaining > 0:
+        count = min(CHUNK_SIZE, remaining)
+        jobs.append((count, seed + idx, first[0], first[1], second[0], second[1],
+                     first[2], second[2], pitch, pitch_wear, format_name, ground_config))
+        remaining -= count
+        idx += 1
+
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            tallies = list(pool.map(_run_chunk, jobs))
+    else:
+        tallies = [_run_chunk(job) for job in jobs]
+
+    merged = {key: Counter() for key in tallies[0]}
+    for tally in tallies:
+        for key, counter in tally.items():
+            merged[key].update(counter)
+
+    results = merged["results"]
+    ties = results["tie"]
+    return {
+        "n": n,
+        "seed": seed,
+        "first_batting": first_batting,
+        "innings1": _summarise_innings(merged["inn1_runs"], merged["inn1_wickets"], n),
+        "innings2": _summarise_innings(merged["inn2_runs"], merged["inn2_wickets"], n),
+        "tie_rate": ties / n,
+        "first_batting_win_rate": results["first"] / n,
+        "chasing_win_rate": results["second"] / n,
+        "tie_countback": {
+            k: (merged["tie_boundaries"][k] / ties if ties else 0.0)
+            for k in ("first", "second", "level")
+        },
+    }
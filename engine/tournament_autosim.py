@@ -0,0 +1,341 @@
+"""
+tournament_autosim.py
+=====================
+
+Headless "simulate remaining fixtures" for a tournament.
+
+Every fixture that is still to be played goes through the ball-by-ball
+engine with no requests, no commentary replay and no match JSON on disk,
+in dependency order:
+
+  waves       each wave is the set of fixtures that are playable right now —
+              'Scheduled', both teams assigned, no match linked yet, and
+              TournamentEngine.feeders_decided() — in (round_number, id)
+              order. Fixtures in one wave never depend on each other, so
+              they are simulated concurrently in a process pool (spawned
+              workers; only the engine runs there, never the database).
+  results     applied in the parent in batched transactions: each match is
+              archived and applied to its fixture and the standings with the
+              live pipeline's archive_result() / apply_to_fixture()
+              (engine/match_completion.py) inside its own savepoint, with one
+              commit per APPLY_BATCH matches.
+  progression update_standings() populates playoffs / next knockout rounds
+              as stages complete, so the next wave is just the next query.
+              The loop ends when a wave finds nothing playable.
+
+Knockout and playoff fixtures must produce a winner; a tie goes to super
+overs (auto-selected sides, as the live page does on "auto") and a
+rain-abandoned knockout is re-rolled up to KNOCKOUT_ATTEMPTS times before
+it is left 'Scheduled' for the normal resimulate flow.
+
+Fixtures that already have a match linked (an unresolved knockout from a
+live game) are skipped — they need the resimulate flow, which reverses the
+earlier result first.
+"""
+
+import logging
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger("SimCricketX.tournament_autosim")
+
+APPLY_BATCH = 16          # matches per commit
+KNOCKOUT_ATTEMPTS = 3     # re-rolls for a knockout that ends without a winner
+MAX_SUPER_OVERS = 10      # Match caps rounds itself; this only guards the loop
+MAX_WAVES = 64
+
+
+# ---------------------------------------------------------------------------
+# Match setup (mirrors /match/setup's defaults for a fixture)
+# ---------------------------------------------------------------------------
+
+
+def format_squad(team, match_format):
+    """Players of *team* for *match_format*: the format profile, else legacy rows."""
+    profile = next((p for p in team.profiles if p.format_type == match_format), None)
+    if profile:
+        return list(profile.players)
+    return [p for p in team.players if p.profile_id is None]
+
+
+def _player_payload(player):
+    return {
+        "id": player.id,
+        "name": player.name,
+        "role": player.role,
+        "batting_rating": player.batting_rating,
+        "bowling_rating": player.bowling_rating,
+        "fielding_rating": player.fielding_rating,
+        "batting_hand": player.batting_hand,
+        "bowling_type": player.bowling_type,
+        "bowling_hand": player.bowling_hand,
+        "is_captain": player.is_captain,
+        "will_bowl": False,
+    }
+
+
+def default_lineup(players):
+    """(playing XI, substitutes) with five bowlers marked, bowlers first."""
+    payload = [_player_payload(p) for p in players]
+    xi, subs = payload[:11], payload[11:]
+    bowlers = sorted(
+        xi,
+        key=lambda p: (str(p["role"] or "").lower() not in {"bowler", "all-rounder"},
+                       -(p["bowling_rating"] or 0)),
+    )
+    for p in bowlers[:5]:
+        p["will_bowl"] = True
+    return xi, subs
+
+
+def fixture_match_data(fixture, user_id, rng=None):
+    """
+    The match JSON /match/setup would write for *fixture* with default XIs,
+    plus a tossed coin. Raises ValueError when a side has fewer than 11
+    players for the tournament's format.
+    """
+    from engine.format_config import get_format
+    from engine.ground_config import get_effective_config
+    from engine.weather import DEFAULT_FORECAST, generate_weather_script
+    from utils.helpers import load_config
+
+    rng = rng or random.Random()
+    tournament = fixture.tournament
+    fmt = get_format(tournament.format_type or "T20")
+    home, away = fixture.home_team, fixture.away_team
+
+    home_players, away_players = format_squad(home, fmt.name), format_squad(away, fmt.name)
+    if len(home_players) < 11 or len(away_players) < 11:
+        raise ValueError(f"Fixture {fixture.id}: each side needs 11 {fmt.name} players")
+    home_xi, home_subs = default_lineup(home_players)
+    away_xi, away_subs = default_lineup(away_players)
+
+    return {
+        "match_id": str(uuid.uuid4()),
+        "created_by": user_id,
+        "tournament_id": tournament.id,
+        "fixture_id": fixture.id,
+        "created_at": time.time(),
+        "timestamp": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "team_home": f"{home.short_code}_{home.user_id}",
+        "team_away": f"{away.short_code}_{away.user_id}",
+        "stadium": home.home_ground,
+        "pitch": home.pitch_preference or "Flat",
+        "toss": rng.choice(["Heads", "Tails"]),
+        "toss_winner": rng.choice([home.short_code, away.short_code]),
+        "toss_decision": rng.choice(["Bat", "Bowl"]),
+        "simulation_mode": "auto",
+        "match_format": fmt.name,
+        "is_day_night": False,
+        "playing_xi": {"home": home_xi, "away": away_xi},
+        "substitutes": {"home": home_subs, "away": away_subs},
+        "ground_config": get_effective_config(user_id, fmt.name),
+        "weather_forecast": DEFAULT_FORECAST,
+        "weather_script": generate_weather_script(DEFAULT_FORECAST, fmt.overs, fmt.name, rng=rng),
+        "rain_probability": load_config().get("rain_probability", 0.0),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Headless play (runs in pool workers — engine only, no database)
+# ---------------------------------------------------------------------------
+
+
+def _play_super_overs(match):
+    """Auto-select and bowl super overs until the match is decided."""
+    for _ in range(MAX_SUPER_OVERS):
+        first = getattr(match, "_super_over_next_first_batting", None) or "home"
+        if match.start_super_over(first).get("error"):
+            return
+        while match.super_over_phase == "innings_in_progress":
+            match.next_super_over_ball()
+        if match.super_over_phase == "awaiting_innings2_selection":
+            if match.start_super_over_innings2().get("error"):
+                return
+            while match.super_over_phase == "innings_in_progress":
+                match.next_super_over_ball()
+        if match.super_over_phase != "awaiting_innings1_selection":
+            return
+
+
+def play_fixture(data, needs_winner=False):
+    """
+    Play one match from its setup *data* to the result and return the
+    finished engine Match (picklable, so pool workers can hand it back).
+    With *needs_winner*, a match that ends without one is replayed. The
+    engine's per-ball console output is suppressed.
+    """
+    from engine.match import Match, quiet_output
+
+    attempts = KNOCKOUT_ATTEMPTS if needs_winner else 1
+    with quiet_output():
+        for _ in range(attempts):
+            match = Match(dict(data))
+            summary = match.fast_forward(until="result")
+            if summary["stopped_on"] == "super_over":
+                _play_super_overs(match)
+            if getattr(match, "winner_is_home", None) is not None or not needs_winner:
+                break
+    return match
+
+
+# ---------------------------------------------------------------------------
+# The run
+# ---------------------------------------------------------------------------
+
+
+def playable_fixtures(tournament, tournament_engine):
+    """The fixtures of *tournament* that can be simulated right now."""
+    from database.models import TournamentFixture
+
+    fixtures = (
+        TournamentFixture.query
+        .filter(
+            TournamentFixture.tournament_id == tournament.id,
+            TournamentFixture.status == "Scheduled",
+            TournamentFixture.match_id.is_(None),
+            TournamentFixture.home_team_id.isnot(None),
+            TournamentFixture.away_team_id.isnot(None),
+        )
+        .order_by(TournamentFixture.round_number, TournamentFixture.id)
+        .all()
+    )
+    return [f for f in fixtures if tournament_engine.feeders_decided(tournament, f)]
+
+
+def remaining_fixtures(tournament_id):
+    """Fixtures not yet decided (an upper bound for progress reporting)."""
+    from database.models import TournamentFixture
+
+    return TournamentFixture.query.filter(
+        TournamentFixture.tournament_id == tournament_id,
+        TournamentFixture.status.in_(("Scheduled", "Locked")),
+    ).count()
+
+
+def default_workers():
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def _simulate_wave(jobs, workers):
+    """[(fixture_id, Match)] for [(fixture_id, data, needs_winner)]."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [(fixture_id, play_fixture(data, needs_winner)) for fixture_id, data, needs_winner in jobs]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(jobs)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        matches = pool.map(play_fixture, [j[1] for j in jobs], [j[2] for j in jobs])
+        return list(zip([j[0] for j in jobs], matches))
+
+
+def record_result(match, fixture, tournament_engine):
+    """
+    Archive one finished match and apply it to its fixture and standings.
+    Does not commit; raises on failure.
+    """
+    from engine.match_completion import apply_to_fixture, archive_result
+
+    match.data["current_state"] = "completed"
+    match.data["result_description"] = match.result
+    try:
+        db_match = archive_result(match)
+    except ValueError as e:
+        raise ValueError(f"Fixture {fixture.id}: {e}") from e
+    apply_to_fixture(db_match, fixture, tournament_engine)
+    return db_match
+
+
+def _count_simulated(n):
+    from database import db
+    from database.models import SiteCounter
+
+    row = db.session.get(SiteCounter, "matches_simulated")
+    if row:
+        row.value += n
+    else:
+        db.session.add(SiteCounter(key="matches_simulated", value=n))
+
+
+def simulate_remaining(tournament, user_id, tournament_engine, *, workers=None,
+                       progress=None, rng=None):
+    """
+    Simulate every remaining fixture of *tournament*. *progress* is called
+    with one dict per event ("start", "wave", "match", "done"). Returns the
+    final summary: {"simulated", "failed", "waves", "seconds", "status"}.
+    """
+    from database import db
+    from database.models import TournamentFixture
+
+    workers = default_workers() if workers is None else workers
+    emit = progress or (lambda event: None)
+    started = time.monotonic()
+    total = remaining_fixtures(tournament.id)
+    simulated, failed, waves = 0, [], 0
+    emit({"event": "start", "total": total})
+
+    while waves < MAX_WAVES:
+        fixtures = [f for f in playable_fixtures(tournament, tournament_engine) if f.id not in failed]
+        if not fixtures:
+            break
+        waves += 1
+        jobs = []
+        for fixture in fixtures:
+            try:
+                jobs.append((fixture.id, fixture_match_data(fixture, user_id, rng),
+                             fixture.stage != tournament_engine.STAGE_LEAGUE))
+            except ValueError as e:
+                logger.warning(f"[Autosim] {e}")
+                failed.append(fixture.id)
+        if not jobs:
+            continue
+        emit({"event": "wave", "wave": waves, "fixtures": len(jobs)})
+        results = _simulate_wave(jobs, workers)
+
+        for i in range(0, len(results), APPLY_BATCH):
+            applied = []
+            for fixture_id, match in results[i:i + APPLY_BATCH]:
+                fixture = db.session.get(TournamentFixture, fixture_id)
+                nested = db.session.begin_nested()
+                try:
+                    record_result(match, fixture, tournament_engine)
+                    nested.commit()
+                    applied.append((fixture, match))
+                except Exception as e:
+                    nested.rollback()
+                    logger.error(f"[Autosim] Fixture {fixture_id} failed: {e}", exc_info=True)
+                    failed.append(fixture_id)
+            if applied:
+                _count_simulated(len(applied))
+            db.session.commit()
+            for fixture, match in applied:
+                simulated += 1
+                emit({
+                    "event": "match",
+                    "fixture_id": fixture.id,
+                    "match_id": fixture.match_id,
+                    "result": match.result,
+                    "completed": simulated,
+                    "total": total,
+                })
+
+    if simulated:
+        from engine.tournament_dashboard import refresh_dashboard
+
+        refresh_dashboard(tournament.id)
+        db.session.commit()
+    db.session.refresh(tournament)
+    summary = {
+        "simulated": simulated,
+        "failed": failed,
+        "waves": waves,
+        "seconds": round(time.monotonic() - started, 2),
+        "status": tournament.status,
+    }
+    emit({"event": "done", **summary})
+    return summary
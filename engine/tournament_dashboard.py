@@ -0,0 +1,243 @@
+"""
+tournament_dashboard.py
+=======================
+
+Materialized read model behind the tournament dashboard.
+
+The dashboard used to run the standings query, the full fixture list and
+every leader aggregate live on each page view. They now come from one
+TournamentDashboard row per tournament, a JSON payload of
+
+  standings    TournamentTeam rows in table order, with team name / colour
+  stages       fixtures grouped by stage (first-appearance order), each with
+               its teams and, once played, the match scores
+  next_fixture the first Scheduled fixture, or None
+  leaders      MOTM awards, most runs, most wickets, best Impact Index
+               performances and milestones (top 5 each)
+  team_count / fixture_count / completed_count
+
+built at Tournament.version. Every change that can alter the payload bumps
+the version in the same transaction:
+
+  bump_tournament_version()  — TournamentEngine.update_standings() and
+                               reverse_standings()
+  bump_team_tournaments()    — a team (or its players) being edited
+  refresh_dashboard()        — bumps and rebuilds; called at the end of the
+                               match-completion pipeline once scorecards and
+                               MOTM are persisted, on re-simulate, on admin
+                               reset and after a headless autosim run
+
+dashboard_for() serves the payload from the StatsCache keyed by
+(tournament id, version), so a cached view costs only the Tournament read
+the route makes anyway. A miss loads the stored row, or rebuilds it when it
+was built at an older version. The upsert never replaces a newer row with
+an older one.
+"""
+
+import json
+from collections import OrderedDict
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload
+
+from database import db
+from database.models import Tournament, TournamentDashboard, TournamentFixture, TournamentTeam
+from engine.leaderboards import compute_leaderboards
+from engine.match_analytics import recent_milestones, top_performances
+from engine.stats_cache import get_cache
+from utils.exception_tracker import log_exception
+
+LEADERS = 5
+
+
+# ---------------------------------------------------------------------------
+# Versioning
+# ---------------------------------------------------------------------------
+
+
+def bump_tournament_version(tournament_id):
+    """Mark tournament_id's stored dashboard stale. Commits with the caller."""
+    if not tournament_id:
+        return
+    Tournament.query.filter(Tournament.id == tournament_id).update(
+        {Tournament.version: Tournament.version + 1}, synchronize_session="evaluate"
+    )
+
+
+def bump_team_tournaments(team_id):
+    """Mark every tournament team_id plays in stale (names and colours are stored)."""
+    roster = db.session.query(TournamentTeam.tournament_id).filter(TournamentTeam.team_id == team_id)
+    Tournament.query.filter(Tournament.id.in_(roster.scalar_subquery())).update(
+        {Tournament.version: Tournament.version + 1}, synchronize_session=False
+    )
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+
+def _team(team):
+    if team is None:
+        return None
+    return {"id": team.id, "name": team.name, "short_code": team.short_code, "team_color": team.team_color}
+
+
+def _fixture(f):
+    m = f.match
+    return {
+        "id": f.id,
+        "status": f.status,
+        "stage": f.stage,
+        "stage_description": f.stage_description,
+        "round_number": f.round_number,
+        "series_match_number": f.series_match_number,
+        "match_id": f.match_id,
+        "home_team": _team(f.home_team),
+        "away_team": _team(f.away_team),
+        "match": m and {
+            "home_team_score": m.home_team_score,
+            "home_team_wickets": m.home_team_wickets,
+            "home_team_overs": m.home_team_overs,
+            "away_team_score": m.away_team_score,
+            "away_team_wickets": m.away_team_wickets,
+            "away_team_overs": m.away_team_overs,
+            "result_description": m.result_description,
+        },
+    }
+
+
+def _leaders(tournament):
+    board = compute_leaderboards(tournament.user_id, tournament_id=tournament.id, k=LEADERS)
+    return {
+        "motm": [
+            {"player_name": e["player"], "team_name": e["team"] or "", "awards": e["awards"]}
+            for e in board["motm"]
+        ],
+        "runs": [
+            {"player_id": e["player_id"], "player_name": e["player"],
+             "team_name": e["team"] or "", "runs": e["runs"]}
+            for e in board["most_runs"]
+        ],
+        "wickets": [
+            {"player_id": e["player_id"], "player_name": e["player"],
+             "team_name": e["team"] or "", "wickets": e["wickets"]}
+            for e in board["most_wickets"]
+        ],
+        "performances": top_performances(tournament.user_id, tournament_id=tournament.id, limit=LEADERS),
+        "milestones": recent_milestones(tournament.user_id, tournament_id=tournament.id, limit=LEADERS),
+    }
+
+
+def build_dashboard(tournament):
+    """The dashboard payload for *tournament*, from live data."""
+    standings = (
+        TournamentTeam.query.options(joinedload(TournamentTeam.team))
+        .filter_by(tournament_id=tournament.id)
+        .order_by(
+            TournamentTeam.points.desc(),
+            TournamentTeam.net_run_rate.desc(),
+            TournamentTeam.won.desc(),
+            TournamentTeam.runs_scored.desc(),
+        )
+        .all()
+    )
+    fixtures = (
+        TournamentFixture.query.options(
+            joinedload(TournamentFixture.home_team),
+            joinedload(TournamentFixture.away_team),
+            joinedload(TournamentFixture.match),
+        )
+        .filter_by(tournament_id=tournament.id)
+        .order_by(TournamentFixture.round_number, TournamentFixture.id)
+        .all()
+    )
+
+    stages = OrderedDict()
+    for f in fixtures:
+        stages.setdefault(f.stage, []).append(_fixture(f))
+    next_fixture = next((_fixture(f) for f in fixtures if f.status == "Scheduled"), None)
+
+    return {
+        "standings": [
+            {
+                "team_id": tt.team_id,
+                "team": _team(tt.team),
+                "played": tt.played,
+                "won": tt.won,
+                "lost": tt.lost,
+                "tied": tt.tied,
+                "no_result": tt.no_result,
+                "points": tt.points,
+                "net_run_rate": tt.net_run_rate or 0.0,
+            }
+            for tt in standings
+        ],
+        "stages": [{"stage": stage, "fixtures": rows} for stage, rows in stages.items()],
+        "next_fixture": next_fixture,
+        "leaders": _leaders(tournament),
+        "team_count": len(standings),
+        "fixture_count": len(fixtures),
+        "completed_count": sum(1 for f in fixtures if f.status == "Completed"),
+    }
+
+
+def _store(tournament_id, version, payload):
+    table = TournamentDashboard.__table__
+    stmt = sqlite_insert(table).values(
+        tournament_id=tournament_id, version=version, payload=json.dumps(payload),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tournament_id"],
+        set_={"version": stmt.excluded.version, "payload": stmt.excluded.payload,
+              "built_at": db.func.current_timestamp()},
+        where=table.c.version <= stmt.excluded.version,
+    )
+    db.session.execute(stmt)
+
+
+def refresh_dashboard(tournament_id):
+    """
+    Bump tournament_id's version and store a freshly built dashboard at it.
+    Does not commit; returns the payload, or None if the tournament is gone.
+    """
+    bump_tournament_version(tournament_id)
+    tournament = db.session.get(Tournament, tournament_id)
+    if tournament is None:
+        return None
+    payload = build_dashboard(tournament)
+    _store(tournament_id, tournament.version, payload)
+    return payload
+
+
+# ---------------------------------------------------------------------------
+# Read
+# ---------------------------------------------------------------------------
+
+
+def dashboard_for(tournament):
+    """The dashboard payload for *tournament* at its current version."""
+    cache = get_cache()
+    key = ("tournament_dashboard", tournament.id, tournament.version)
+    if cache is not None:
+        hit, value = cache.get(key)
+        if hit:
+            return value
+
+    stored = db.session.get(TournamentDashboard, tournament.id)
+    if stored is not None and stored.version == tournament.version:
+        payload = json.loads(stored.payload)
+    else:
+        # Never built, or built before the last bump (a path that only marks
+        # the row stale, or a refresh that failed after its data committed).
+        payload = build_dashboard(tournament)
+        try:
+            _store(tournament.id, tournament.version, payload)
+            db.session.commit()
+        except Exception as e:
+            log_exception(e)
+            db.session.rollback()
+
+    if cache is not None:
+        cache.put(key, payload)
+    return payload
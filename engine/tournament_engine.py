@@ -4,17 +4,34 @@ from database.models import (
     MatchScorecard, MatchPartnership, TournamentPlayerStatsCache,
     Player,
 )
-from sqlalchemy import func as sa_func, or_ as sa_or
+from sqlalchemy import and_ as sa_and, case as sa_case, func as sa_func, insert as sa_insert, or_ as sa_or, select as sa_select, text as sa_text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 import itertools
 import logging
 import json
 import math
 
+from engine import bracket_tree, match_ledger, standings_recompute
+from engine.stats_cache import bump_stats_version
+from engine.tournament_dashboard import bump_tournament_version
 from utils.exception_tracker import log_exception
 
 logger = logging.getLogger(__name__)
 
+# Summed per player by TournamentEngine._player_cache_totals().
+_PLAYER_CACHE_TOTALS = (
+    "matches_played", "innings_batted", "runs_scored", "balls_faced", "fours", "sixes",
+    "not_outs", "highest_score", "fifties", "centuries",
+    "innings_bowled", "balls_bowled", "runs_conceded", "wickets_taken", "maidens",
+    "five_wicket_hauls", "catches", "run_outs", "stumpings",
+)
+# Written by rebuild_player_stats_cache(); team_id is only set on insert.
+_PLAYER_CACHE_COLUMNS = tuple(c for c in _PLAYER_CACHE_TOTALS if c != "balls_bowled") + (
+    "batting_average", "batting_strike_rate", "overs_bowled", "bowling_average",
+    "bowling_economy", "bowling_strike_rate", "best_bowling_wickets", "best_bowling_runs",
+)
+
 
 class TournamentEngine:
     """
@@ -31,11 +48,11 @@ class TournamentEngine:
     - custom_series: User-defined series of matches between 2 teams
     """
 
-    # Points system configuration
-    POINTS_WIN = 2
-    POINTS_TIE = 1
-    POINTS_NO_RESULT = 1
-    POINTS_LOSS = 0
+    # Points system configuration (shared with the from-scratch recompute)
+    POINTS_WIN = standings_recompute.POINTS_WIN
+    POINTS_TIE = standings_recompute.POINTS_TIE
+    POINTS_NO_RESULT = standings_recompute.POINTS_NO_RESULT
+    POINTS_LOSS = standings_recompute.POINTS_LOSS
 
     # Tournament mode constants
     MODE_ROUND_ROBIN = 'round_robin'
@@ -59,20 +76,6 @@ class TournamentEngine:
     STAGE_KNOCKOUT_QF = 'knockout_qf'
     STAGE_KNOCKOUT_SF = 'knockout_sf'
 
-    # IPL-style playoff dependency graph (direct edges only — transitive
-    # closure is computed at use time). Unlike a knockout bracket, this
-    # is NOT a binary tree: Q1 has two direct downstream dependents
-    # (Q2 as its loser, Final as its winner), so it can't be modeled by
-    # halving bracket_position the way _get_downstream_positions does for
-    # actual elimination brackets. Mirrors the rules documented in
-    # _generate_ipl_playoff_placeholders.
-    IPL_PLAYOFF_EDGES = {
-        STAGE_QUALIFIER_1: {STAGE_QUALIFIER_2, STAGE_FINAL},  # loser -> Q2, winner -> Final
-        STAGE_ELIMINATOR: {STAGE_QUALIFIER_2},                # winner -> Q2
-        STAGE_QUALIFIER_2: {STAGE_FINAL},                     # winner -> Final
-        STAGE_FINAL: set(),
-    }
-
     # Minimum teams required for each mode
     MIN_TEAMS = {
         MODE_ROUND_ROBIN: 2,
@@ -258,6 +261,8 @@ class TournamentEngine:
             # 3. Generate Fixtures based on mode
             self._generate_fixtures_for_mode(tournament, team_ids, mode, series_config)
 
+            # Cached stats views list the user's tournaments as filters.
+            bump_stats_version(user_id)
             db.session.commit()
             logger.info(f"Tournament '{name}' created with mode '{mode}' and {len(team_ids)} teams")
             return tournament
@@ -272,39 +277,75 @@ class TournamentEngine:
                                     mode: str, series_config: dict = None):
         """
         Generate fixtures based on tournament mode.
-        """
-        if mode == self.MODE_ROUND_ROBIN:
-            self._generate_round_robin(tournament.id, team_ids, double=False)
-
-        elif mode == self.MODE_DOUBLE_ROUND_ROBIN:
-            self._generate_round_robin(tournament.id, team_ids, double=True)
-
-        elif mode == self.MODE_KNOCKOUT:
-            self._generate_knockout(tournament.id, team_ids)
 
-        elif mode == self.MODE_ROUND_ROBIN_KNOCKOUT:
-            self._generate_round_robin(tournament.id, team_ids, double=False)
-            self._generate_semifinal_final_placeholders(tournament.id)
-
-        elif mode == self.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT:
-            self._generate_round_robin(tournament.id, team_ids, double=True)
-            self._generate_semifinal_final_placeholders(tournament.id)
+        The whole schedule is planned in memory (_fixture_plan) and written
+        with one bulk INSERT; the caller's transaction keeps it atomic.
+        """
+        plan = self._fixture_plan(tournament, team_ids, mode, series_config)
+        if plan:
+            db.session.execute(sa_insert(TournamentFixture), plan)
+        if mode == self.MODE_KNOCKOUT:
+            self._advance_bye_winners(tournament.id)
+
+    def _fixture_plan(self, tournament: Tournament, team_ids: list,
+                      mode: str, series_config: dict = None) -> list:
+        """
+        Every fixture *mode* creates up front, as TournamentFixture column
+        dicts in insertion order.
+        """
+        if mode == self.MODE_KNOCKOUT:
+            placeholders = self._get_placeholder_team_ids(tournament.id, ("BYE", "TBD"))
+            return self._plan_knockout(tournament.id, team_ids, placeholders["BYE"])
 
+        if mode == self.MODE_CUSTOM_SERIES:
+            return self._plan_custom_series(tournament.id, team_ids, series_config)
+
+        double = mode in (self.MODE_DOUBLE_ROUND_ROBIN, self.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT,
+                          self.MODE_IPL_STYLE)  # A8: IPL uses double round-robin
+        plan = self._plan_round_robin(tournament.id, team_ids, double=double)
+        last_league_round = max((f["round_number"] for f in plan), default=0)
+
+        if mode in (self.MODE_ROUND_ROBIN_KNOCKOUT, self.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT):
+            # Placeholder teams are filled in when the league completes; the
+            # TBD team must already exist for bracket resets.
+            self._get_placeholder_team_ids(tournament.id, ("TBD",))
+            plan += self._plan_semifinal_final_placeholders(tournament.id, last_league_round)
         elif mode == self.MODE_IPL_STYLE:
-            self._generate_round_robin(tournament.id, team_ids, double=True)  # A8: IPL uses double round-robin
-            self._generate_ipl_playoff_placeholders(tournament.id)
+            self._get_placeholder_team_ids(tournament.id, ("TBD",))
+            plan += self._plan_ipl_playoff_placeholders(tournament.id, last_league_round)
+        return plan
 
-        elif mode == self.MODE_CUSTOM_SERIES:
-            self._generate_custom_series(tournament.id, team_ids, series_config)
+    @staticmethod
+    def _fixture_row(tournament_id: int, **columns) -> dict:
+        """
+        One planned fixture. Every row carries the same keys so the bulk
+        INSERT runs as a single executemany.
+        """
+        row = {
+            "tournament_id": tournament_id,
+            "home_team_id": None,
+            "away_team_id": None,
+            "round_number": 1,
+            "status": 'Scheduled',
+            "stage": TournamentEngine.STAGE_LEAGUE,
+            "stage_description": None,
+            "bracket_position": None,
+            "match_id": None,
+            "winner_team_id": None,
+            "series_match_number": None,
+            "standings_applied": False,
+        }
+        row.update(columns)
+        return row
 
-    def _generate_round_robin(self, tournament_id: int, team_ids: list, double: bool = False):
+    def _plan_round_robin(self, tournament_id: int, team_ids: list, double: bool = False) -> list:
         """
-        Generate Round Robin fixtures using Circle Method.
+        Plan Round Robin fixtures using Circle Method.
 
         Args:
             tournament_id: Tournament ID
             team_ids: List of team IDs
-            double: If True, generates double round robin (home & away)
+            double: If True, plans a double round robin (home & away)
         """
         teams = team_ids[:]
         if len(teams) % 2 != 0:
@@ -315,14 +356,13 @@ class TournamentEngine:
         half = n // 2
         round_offset = 0
         series_match_number = 1
+        plan = []
 
         # Number of passes (1 for single, 2 for double)
         passes = 2 if double else 1
 
         for pass_num in range(passes):
-            teams_copy = team_ids[:]
-            if len(teams_copy) % 2 != 0:
-                teams_copy.append(None)
+            teams_copy = teams[:]
 
             for r in range(rounds):
                 for i in range(half):
@@ -330,152 +370,98 @@ class TournamentEngine:
                     t2 = teams_copy[n - 1 - i]
 
                     if t1 is not None and t2 is not None:
-                        # For double round robin: flip home/away in second pass
-                        if pass_num == 0:
-                            if r % 2 == 0:
-                                home, away = t1, t2
-                            else:
-                                home, away = t2, t1
+                        # Alternate home/away by round; the second pass of a
+                        # double round robin reverses every pairing.
+                        if (r % 2 == 0) == (pass_num == 0):
+                            home, away = t1, t2
                         else:
-                            # Second pass: reverse home/away
-                            if r % 2 == 0:
-                                home, away = t2, t1
-                            else:
-                                home, away = t1, t2
-
-                        fixture = TournamentFixture(
-                            tournament_id=tournament_id,
+                            home, away = t2, t1
+
+                        plan.append(self._fixture_row(
+                            tournament_id,
                             home_team_id=home,
                             away_team_id=away,
                             round_number=round_offset + r + 1,
                             series_match_number=series_match_number,
-                            stage=self.STAGE_LEAGUE,
-                            status='Scheduled'
-                        )
-                        db.session.add(fixture)
+                        ))
                         series_match_number += 1
 
                 # Rotate list (Circle method)
                 teams_copy = [teams_copy[0]] + [teams_copy[-1]] + teams_copy[1:-1]
 
             round_offset += rounds
+        return plan
 
-    def _generate_knockout(self, tournament_id: int, team_ids: list):
+    def _plan_knockout(self, tournament_id: int, team_ids: list, bye_id: int) -> list:
         """
-        Generate Pure Knockout/Elimination tournament fixtures.
+        Plan Pure Knockout/Elimination tournament fixtures.
         Handles non-power-of-2 teams with byes.
+
+        The tournament is modelled as the slots of a power-of-2 tree; for
+        8 slots round 1 is bracket positions 0-3, round 2 is 4-5 and the
+        final is 6. Bye and phantom slots are planned as Completed so
+        _advance_bye_winners can move their winners on.
         """
-        bye_id = self._get_placeholder_team_id(tournament_id, "BYE")
-        tbd_id = self._get_placeholder_team_id(tournament_id, "TBD")
+        import random
+
         n = len(team_ids)
         next_power = self._next_power_of_two(n)
-        
-        # We model the tournament as a set of slots in a power-of-2 tree
-        # For a tournament of 8 slots:
-        # Round 1: slots 0-3 (matches 0, 1, 2, 3)
-        # Round 2: slots 4-5 (matches 4, 5)
-        # Round 3: slot 6 (match 6)
-        
+
         # Randomize teams and distribute byes
-        import random
-        padded_teams = team_ids[:]
-        num_byes = next_power - n
-        padded_teams += [None] * num_byes
+        padded_teams = team_ids[:] + [None] * (next_power - n)
         random.shuffle(padded_teams)
-        
-        bracket_position = 0
+
+        plan = []
         current_round = 1
         num_matches_current_round = next_power // 2
-        round_matches = [] # List of (home, away) for the current round
-        
+
         # Round 1
         round_name = self._get_knockout_round_name(next_power, current_round)
         for i in range(num_matches_current_round):
             t1 = padded_teams[2*i]
             t2 = padded_teams[2*i + 1]
-            
-            # If one is None, it's a bye. The team advances automatically.
-            # We still create the fixture but mark it as Completed if it's a bye?
-            # Actually, standard way is to create Scheduled for real matches,
-            # and for byes, we can just populate the next round.
-            
+            fixture = self._fixture_row(
+                tournament_id, round_number=current_round, stage=round_name, bracket_position=len(plan),
+            )
+
             if t1 is not None and t2 is not None:
-                fixture = TournamentFixture(
-                    tournament_id=tournament_id,
+                fixture.update(
                     home_team_id=t1,
                     away_team_id=t2,
-                    round_number=current_round,
-                    stage=round_name,
                     stage_description=f"Winner advances to {self._get_knockout_round_name(next_power, current_round + 1)}",
-                    bracket_position=bracket_position,
-                    status='Scheduled'
                 )
-                db.session.add(fixture)
-                db.session.flush()
             elif t1 is not None or t2 is not None:
-                # Bye match. Create it as completed.
-                winner = t1 if t1 is not None else t2
-
-                home_id = t1 if t1 is not None else bye_id
-                away_id = t2 if t2 is not None else bye_id
-
-                fixture = TournamentFixture(
-                    tournament_id=tournament_id,
-                    home_team_id=home_id,
-                    away_team_id=away_id,
-                    round_number=current_round,
-                    stage=round_name,
+                # Bye match: the present team advances automatically.
+                fixture.update(
+                    home_team_id=t1 if t1 is not None else bye_id,
+                    away_team_id=t2 if t2 is not None else bye_id,
                     status='Completed',
-                    winner_team_id=winner,
-                    bracket_position=bracket_position,
-                    stage_description="Bye - Advances to next round"
+                    winner_team_id=t1 if t1 is not None else t2,
+                    stage_description="Bye - Advances to next round",
                 )
-                db.session.add(fixture)
-                db.session.flush()
             else:
-                # Both are None (Phantom match)
-                fixture = TournamentFixture(
-                    tournament_id=tournament_id,
-                    home_team_id=None,
-                    away_team_id=None,
-                    round_number=current_round,
-                    stage=round_name,
-                    status='Completed',
-                    winner_team_id=None,
-                    bracket_position=bracket_position,
-                    stage_description="Phantom Match"
-                )
-                db.session.add(fixture)
-                db.session.flush()
-            
-            bracket_position += 1
-            
+                fixture.update(status='Completed', stage_description="Phantom Match")
+            plan.append(fixture)
+
         # Subsequent rounds (Placeholders)
         current_round += 1
         num_matches_current_round //= 2
-        
+
         while num_matches_current_round >= 1:
             round_name = self._get_knockout_round_name(next_power, current_round)
             for i in range(num_matches_current_round):
-                fixture = TournamentFixture(
-                    tournament_id=tournament_id,
-                    home_team_id=None,
-                    away_team_id=None,
+                plan.append(self._fixture_row(
+                    tournament_id,
                     round_number=current_round,
                     stage=round_name,
                     stage_description="Winner advances" if round_name != self.STAGE_FINAL else "Tournament Winner",
-                    bracket_position=bracket_position,
-                    status='Locked'
-                )
-                db.session.add(fixture)
-                db.session.flush()
-                bracket_position += 1
-                
+                    bracket_position=len(plan),
+                    status='Locked',
+                ))
+
             num_matches_current_round //= 2
             current_round += 1
-            
-        # After generating all fixtures, we might need to auto-advance byes
-        self._advance_bye_winners(tournament_id)
+        return plan
 
     def _get_knockout_round_name(self, total_teams: int, round_num: int) -> str:
         """Get the name of a knockout round based on remaining teams."""
@@ -493,128 +479,87 @@ class TournamentEngine:
         else:
             return f'round_{round_num}'
 
-    def _generate_semifinal_final_placeholders(self, tournament_id: int):
+    def _plan_semifinal_final_placeholders(self, tournament_id: int, last_league_round: int) -> list:
         """
-        Generate placeholder fixtures for Semi-finals and Final.
+        Plan placeholder fixtures for Semi-finals and Final.
         Teams will be populated after league stage completes.
         """
-        # Get the last round number from league fixtures
-        last_league_round = db.session.query(db.func.max(TournamentFixture.round_number)).filter_by(
-            tournament_id=tournament_id,
-            stage=self.STAGE_LEAGUE
-        ).scalar() or 0
-
-        tbd_id = self._get_placeholder_team_id(tournament_id, "TBD")
-
-        # Semi-final 1: 1st vs 4th
-        sf1 = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 1,
-            stage=self.STAGE_SEMIFINAL_1,
-            stage_description="1st vs 4th - Winner to Final",
-            bracket_position=1,
-            status='Locked'
-        )
-        db.session.add(sf1)
-
-        # Semi-final 2: 2nd vs 3rd
-        sf2 = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 1,
-            stage=self.STAGE_SEMIFINAL_2,
-            stage_description="2nd vs 3rd - Winner to Final",
-            bracket_position=2,
-            status='Locked'
-        )
-        db.session.add(sf2)
-
-        # Final
-        final = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 2,
-            stage=self.STAGE_FINAL,
-            stage_description="Tournament Final",
-            bracket_position=3,
-            status='Locked'
-        )
-        db.session.add(final)
+        return [
+            # Semi-final 1: 1st vs 4th
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 1,
+                stage=self.STAGE_SEMIFINAL_1,
+                stage_description="1st vs 4th - Winner to Final",
+                bracket_position=1,
+                status='Locked',
+            ),
+            # Semi-final 2: 2nd vs 3rd
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 1,
+                stage=self.STAGE_SEMIFINAL_2,
+                stage_description="2nd vs 3rd - Winner to Final",
+                bracket_position=2,
+                status='Locked',
+            ),
+            # Final
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 2,
+                stage=self.STAGE_FINAL,
+                stage_description="Tournament Final",
+                bracket_position=3,
+                status='Locked',
+            ),
+        ]
 
-    def _generate_ipl_playoff_placeholders(self, tournament_id: int):
+    def _plan_ipl_playoff_placeholders(self, tournament_id: int, last_league_round: int) -> list:
         """
-        Generate IPL-style playoff fixtures:
+        Plan IPL-style playoff fixtures:
         - Qualifier 1: 1st vs 2nd (Winner to Final)
         - Eliminator: 3rd vs 4th (Loser out)
         - Qualifier 2: Loser of Q1 vs Winner of Eliminator (Winner to Final)
         - Final: Winner of Q1 vs Winner of Q2
         """
-        last_league_round = db.session.query(db.func.max(TournamentFixture.round_number)).filter_by(
-            tournament_id=tournament_id,
-            stage=self.STAGE_LEAGUE
-        ).scalar() or 0
-
-        tbd_id = self._get_placeholder_team_id(tournament_id, "TBD")
-
-        # Qualifier 1: 1st vs 2nd
-        q1 = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 1,
-            stage=self.STAGE_QUALIFIER_1,
-            stage_description="1st vs 2nd - Winner to Final, Loser to Qualifier 2",
-            bracket_position=1,
-            status='Locked'
-        )
-        db.session.add(q1)
-
-        # Eliminator: 3rd vs 4th
-        elim = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 1,
-            stage=self.STAGE_ELIMINATOR,
-            stage_description="3rd vs 4th - Winner to Qualifier 2, Loser Eliminated",
-            bracket_position=2,
-            status='Locked'
-        )
-        db.session.add(elim)
-
-        # Qualifier 2: Loser Q1 vs Winner Eliminator
-        q2 = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 2,
-            stage=self.STAGE_QUALIFIER_2,
-            stage_description="Loser Q1 vs Winner Eliminator - Winner to Final",
-            bracket_position=3,
-            status='Locked'
-        )
-        db.session.add(q2)
-
-        # Final
-        final = TournamentFixture(
-            tournament_id=tournament_id,
-            home_team_id=None,
-            away_team_id=None,
-            round_number=last_league_round + 3,
-            stage=self.STAGE_FINAL,
-            stage_description="Winner Q1 vs Winner Q2 - Tournament Champion",
-            bracket_position=4,
-            status='Locked'
-        )
-        db.session.add(final)
+        return [
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 1,
+                stage=self.STAGE_QUALIFIER_1,
+                stage_description="1st vs 2nd - Winner to Final, Loser to Qualifier 2",
+                bracket_position=1,
+                status='Locked',
+            ),
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 1,
+                stage=self.STAGE_ELIMINATOR,
+                stage_description="3rd vs 4th - Winner to Qualifier 2, Loser Eliminated",
+                bracket_position=2,
+                status='Locked',
+            ),
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 2,
+                stage=self.STAGE_QUALIFIER_2,
+                stage_description="Loser Q1 vs Winner Eliminator - Winner to Final",
+                bracket_position=3,
+                status='Locked',
+            ),
+            self._fixture_row(
+                tournament_id,
+                round_number=last_league_round + 3,
+                stage=self.STAGE_FINAL,
+                stage_description="Winner Q1 vs Winner Q2 - Tournament Champion",
+                bracket_position=4,
+                status='Locked',
+            ),
+        ]
 
-    def _generate_custom_series(self, tournament_id: int, team_ids: list, series_config: dict):
+    def _plan_custom_series(self, tournament_id: int, team_ids: list, series_config: dict) -> list:
         """
-        Generate fixtures for a custom series.
+        Plan fixtures for a custom series.
 
         series_config format:
         {
@@ -635,30 +580,25 @@ class TournamentEngine:
         if not matches:
             raise ValueError("Custom series requires at least one match")
 
+        plan = []
         for i, match_def in enumerate(matches):
             home_idx = match_def.get('home', 0)
-            
+
             if home_idx not in [0, 1]:
                 raise ValueError(
                     f"Custom series match {i + 1}: 'home' must be 0 or 1, got {home_idx}."
                 )
 
             match_num = match_def.get('match_num', i + 1)
-
-            home_team = team_ids[home_idx]
-            away_team = team_ids[1 - home_idx]
-
-            fixture = TournamentFixture(
-                tournament_id=tournament_id,
-                home_team_id=home_team,
-                away_team_id=away_team,
+            plan.append(self._fixture_row(
+                tournament_id,
+                home_team_id=team_ids[home_idx],
+                away_team_id=team_ids[1 - home_idx],
                 round_number=match_num,
-                stage=self.STAGE_LEAGUE,
                 stage_description=match_def.get('venue_name', f'Match {match_num}'),
                 series_match_number=match_num,
-                status='Scheduled'
-            )
-            db.session.add(fixture)
+            ))
+        return plan
 
     def check_and_progress_tournament(self, tournament_id: int) -> bool:
         """
@@ -911,64 +851,58 @@ class TournamentEngine:
     def bracket_rounds(self, next_power: int):
         """[(start_bracket_pos, match_count), ...] describing a knockout bracket.
 
-        The canonical description of the bracket's shape. Anything that needs
-        to know which fixtures feed which — _advance_bye_winners, the repair
-        migration — derives it from here so the geometry cannot drift between
-        copies.
+        The canonical description of the bracket's shape
+        (engine/bracket_tree.py); the repair migration walks it round by
+        round.
         """
-        rounds = []
-        start = 0
-        count = next_power // 2
-        while count >= 1:
-            rounds.append((start, count))
-            start += count
-            count //= 2
-        return rounds
+        return bracket_tree.knockout_rounds(next_power)
+
+    def bracket_tree(self, tournament):
+        """The tournament's BracketTree (engine/bracket_tree.py), or None for league-only modes."""
+        if not tournament:
+            return None
+        next_power = 0
+        if tournament.mode == self.MODE_KNOCKOUT:
+            next_power = self._next_power_of_two(len(tournament.participating_teams))
+        return bracket_tree.tree_for(tournament.mode, next_power)
+
+    def _bracket_fixtures(self, tournament_id: int, positions=None) -> dict:
+        """{bracket_position: fixture} for the tournament, in one query."""
+        query = TournamentFixture.query.filter(
+            TournamentFixture.tournament_id == tournament_id,
+            TournamentFixture.bracket_position.isnot(None),
+        )
+        if positions is not None:
+            query = query.filter(TournamentFixture.bracket_position.in_(list(positions)))
+        fixtures = {}
+        for f in query.order_by(TournamentFixture.id):
+            fixtures.setdefault(f.bracket_position, f)
+        return fixtures
 
     def get_feeder_fixtures(self, tournament, fixture):
-        """The two fixtures whose winners feed `fixture`, else (None, None).
+        """The two fixtures whose results feed `fixture`, else (None, None).
 
         (None, None) means the question doesn't apply: `fixture` is in the
-        first round, isn't in a bracket, or belongs to a mode whose
-        bracket_positions aren't a knockout tree. Only MODE_KNOCKOUT lays
-        its positions out as the power-of-two tree this math assumes — the
-        playoff placeholder modes reuse positions 1/2/3 for a completely
-        different shape, so reading them through this geometry would return
-        confident nonsense.
+        first round, isn't in a bracket, or belongs to a mode without one.
+        The feeders come from the tournament's BracketTree, so the IPL shape
+        (Q2 is fed by Q1's loser) is read the same way as a knockout tree.
         """
         if fixture is None or fixture.bracket_position is None:
             return None, None
-        if not tournament or tournament.mode != self.MODE_KNOCKOUT:
+        tree = self.bracket_tree(tournament)
+        feeders = tree.feeders(fixture.bracket_position) if tree else ()
+        if not feeders:
             return None, None
-
-        next_power = self._next_power_of_two(len(tournament.participating_teams))
-        rounds = self.bracket_rounds(next_power)
-
-        for r_idx in range(1, len(rounds)):
-            nr_start, nr_count = rounds[r_idx]
-            if not (nr_start <= fixture.bracket_position < nr_start + nr_count):
-                continue
-            prev_start, _ = rounds[r_idx - 1]
-            i = (fixture.bracket_position - nr_start) * 2
-            wanted = [prev_start + i, prev_start + i + 1]
-            found = {
-                f.bracket_position: f
-                for f in TournamentFixture.query.filter(
-                    TournamentFixture.tournament_id == tournament.id,
-                    TournamentFixture.bracket_position.in_(wanted),
-                ).all()
-            }
-            return found.get(wanted[0]), found.get(wanted[1])
-
-        return None, None
+        found = self._bracket_fixtures(tournament.id, feeders)
+        return found.get(feeders[0]), found.get(feeders[1])
 
     def feeders_decided(self, tournament, fixture) -> bool:
         """Whether `fixture`'s current pairing was legitimately earned.
 
-        A round-2+ knockout fixture's teams can only ever be written by
-        _resolve_round_pair, which callers must invoke only once both feeders
-        are 'Completed'. So feeders that are *not* both Completed prove the
-        pairing was never earned by play.
+        A later-round fixture's teams can only ever be written once both
+        feeders are 'Completed' (_resolve_round_pair for knockouts, the
+        playoff progressions otherwise). So feeders that are *not* both
+        Completed prove the pairing was never earned by play.
 
         This is a structural check, not a corruption detector: it trusts a
         feeder's 'Completed' status at face value, so it does not by itself
@@ -980,8 +914,8 @@ class TournamentEngine:
         qualified into a real result.
 
         Fails open (returns True) whenever the question doesn't apply, so a
-        first-round fixture, a non-knockout mode, or a bracket shape this
-        math can't read is never wrongly blocked.
+        first-round fixture, a league-only mode, or a position outside the
+        mode's bracket is never wrongly blocked.
         """
         m1, m2 = self.get_feeder_fixtures(tournament, fixture)
         if m1 is None or m2 is None:
@@ -1063,52 +997,22 @@ class TournamentEngine:
         """Advance the tournament's current knockout round by one step, if ready."""
         current_stage = tournament.current_stage
 
-        # Check if all matches in current stage are completed
-        pending = TournamentFixture.query.filter(
-            TournamentFixture.tournament_id == tournament.id,
-            TournamentFixture.stage == current_stage,
-            TournamentFixture.status != 'Completed'
-        ).count()
-
-        if pending > 0:
-            return False
-
-        # All matches in current stage done. Advance winners.
-        # Logic: winner of bracket_position X and X+1 move to next round's bracket_position Y
-        # where Y = offset + (X // 2)
-        matches = TournamentFixture.query.filter_by(
-            tournament_id=tournament.id,
-            stage=current_stage
-        ).order_by(TournamentFixture.bracket_position).all()
-
-        if not matches:
-            return False
-
         # If this was the final, we are done
         if current_stage == self.STAGE_FINAL:
             return False # _check_tournament_completion will handle status
 
-        # Identify next round fixtures
-        num_teams = len(tournament.participating_teams)
-        next_power = self._next_power_of_two(num_teams)
-
-        # Find the first match of the next round
-        # Bracket positions for round R (starting R=1):
-        # R1: 0 to (N/2 - 1)
-        # R2: N/2 to (N/2 + N/4 - 1)
-        # ... and so on
-
-        # Determine current round's start position and size by walking
-        # round boundaries until we reach the round containing this match.
-        temp_start = 0
-        temp_mpr = next_power // 2
-        while temp_start < matches[0].bracket_position:
-            temp_start += temp_mpr
-            temp_mpr //= 2
+        tree = self.bracket_tree(tournament)
+        if tree is None:
+            return False
+        fixtures = self._bracket_fixtures(tournament.id)
+        matches = sorted(
+            (f for f in fixtures.values() if f.stage == current_stage),
+            key=lambda f: f.bracket_position,
+        )
 
-        current_round_start = temp_start
-        matches_per_round = temp_mpr
-        next_round_start = current_round_start + matches_per_round
+        # Every match in the current stage must be done before winners move on.
+        if not matches or any(m.status != 'Completed' for m in matches):
+            return False
 
         # Block only on a genuine anomaly: a real match (both slots were
         # actual, non-placeholder teams) that completed without recording a
@@ -1133,27 +1037,17 @@ class TournamentEngine:
 
         # Advance winners into the next round, resolving any byes/phantoms
         # created by this advance the same way _advance_bye_winners does.
-        for i in range(0, len(matches), 2):
-            if i + 1 >= len(matches):
-                # Should not happen in a power-of-2 tree unless it's the final
-                break
-
-            m1 = matches[i]
-            m2 = matches[i + 1]
-
-            next_bp = next_round_start + (i // 2)
-            next_fixture = TournamentFixture.query.filter_by(
-                tournament_id=tournament.id,
-                bracket_position=next_bp
-            ).first()
-            self._resolve_round_pair(m1, m2, next_fixture)
+        next_positions = list(dict.fromkeys(
+            tree.advances_to(m.bracket_position) for m in matches
+            if tree.advances_to(m.bracket_position) is not None
+        ))
+        for position in next_positions:
+            home, away = tree.feeders(position)
+            if home in fixtures and away in fixtures:
+                self._resolve_round_pair(fixtures[home], fixtures[away], fixtures.get(position))
 
         # Update tournament current stage
-        next_round_fixture = TournamentFixture.query.filter_by(
-            tournament_id=tournament.id,
-            bracket_position=next_round_start
-        ).first()
-
+        next_round_fixture = fixtures.get(next_positions[0]) if next_positions else None
         if next_round_fixture:
             tournament.current_stage = next_round_fixture.stage
             db.session.flush()
@@ -1177,26 +1071,16 @@ class TournamentEngine:
         would misjudge that slot before the real match is even simulated.
         """
         tournament = db.session.get(Tournament, tournament_id)
-        if not tournament:
+        tree = self.bracket_tree(tournament)
+        if tree is None:
             return
 
-        num_teams = len(tournament.participating_teams)
-        next_power = self._next_power_of_two(num_teams)
-
-        rounds = self.bracket_rounds(next_power)
-
-        # Process each round except the last (final is resolved, not advanced)
-        for r_idx in range(len(rounds) - 1):
-            r_start, r_count = rounds[r_idx]
-            nr_start, _ = rounds[r_idx + 1]
+        fixtures = self._bracket_fixtures(tournament_id)
 
-            for i in range(0, r_count, 2):
-                m1 = TournamentFixture.query.filter_by(
-                    tournament_id=tournament_id, bracket_position=r_start + i
-                ).first()
-                m2 = TournamentFixture.query.filter_by(
-                    tournament_id=tournament_id, bracket_position=r_start + i + 1
-                ).first()
+        # Every round after the first is fed by the one before it.
+        for positions in tree.rounds[1:]:
+            for position in positions:
+                m1, m2 = (fixtures.get(p) for p in tree.feeders(position))
                 if not m1 or not m2:
                     continue
 
@@ -1205,12 +1089,7 @@ class TournamentEngine:
                 if m1.status != 'Completed' or m2.status != 'Completed':
                     continue
 
-                next_bp = nr_start + (i // 2)
-                next_fixture = TournamentFixture.query.filter_by(
-                    tournament_id=tournament_id,
-                    bracket_position=next_bp
-                ).first()
-                self._resolve_round_pair(m1, m2, next_fixture)
+                self._resolve_round_pair(m1, m2, fixtures.get(position))
 
         db.session.flush()
 
@@ -1251,10 +1130,36 @@ class TournamentEngine:
             runs_conceded=0,
             overs_faced='0.0',
             overs_bowled='0.0',
+            balls_faced=0,
+            balls_bowled=0,
         )
         db.session.add(stats)
         return stats
 
+    def recompute_standings(self, tournament_id: int) -> int:
+        """
+        Rebuild every TournamentTeam row of a tournament from its completed
+        league matches in one grouped query (engine/standings_recompute.py)
+        instead of replaying results one by one. Does not commit; returns
+        the number of rows written.
+        """
+        rows = db.session.execute(
+            sa_text(standings_recompute.standings_sql()),
+            standings_recompute.standings_params(tournament_id),
+        ).mappings()
+        table = standings_recompute.table_from_rows(rows)
+
+        written = 0
+        for stats in TournamentTeam.query.filter_by(tournament_id=tournament_id):
+            totals = table.get(stats.team_id) or {
+                **standings_recompute.empty_row(), 'net_run_rate': 0.0,
+            }
+            for column, value in totals.items():
+                setattr(stats, column, value)
+            self._sync_overs(stats)
+            written += 1
+        return written
+
     def update_standings(self, match, commit=True):
         """
         Updates the standings table based on a completed match.
@@ -1326,6 +1231,10 @@ class TournamentEngine:
                     f"winner_team_id={match.winner_team_id}, standings_applied=True"
                 )
 
+        # Everything below is recorded in the match's ledger, which
+        # reverse_standings() replays (engine/match_ledger.py).
+        ledger = match_ledger.LedgerRecorder(match, fixture)
+
         # Get team stats records
         home_team_stats = self._ensure_team_stats(match.tournament_id, match.home_team_id)
         away_team_stats = self._ensure_team_stats(match.tournament_id, match.away_team_id)
@@ -1344,6 +1253,7 @@ class TournamentEngine:
         # Only update league standings (not knockout stats)
         if fixture and fixture.stage == self.STAGE_LEAGUE:
             logger.info(f"[Standings] Updating league standings for fixture {fixture.id}")
+            ledger.before_standings(home_team_stats, away_team_stats)
             # Update Played count
             home_team_stats.played += 1
             away_team_stats.played += 1
@@ -1385,12 +1295,13 @@ class TournamentEngine:
                 f"W={away_team_stats.won}, L={away_team_stats.lost}, Pts={away_team_stats.points}, "
                 f"NRR={away_team_stats.net_run_rate:.3f}"
             )
+            ledger.after_standings(home_team_stats, away_team_stats)
         else:
             logger.info(f"[Standings] Skipping league standings update (stage={fixture.stage if fixture else 'unknown'})")
 
         # Update per-player tournament stats cache
         try:
-            self._update_player_stats_cache(match)
+            ledger.players = self._update_player_stats_cache(match)
         except Exception as psc_err:
             log_exception(psc_err)
             logger.warning(f"[Standings] Failed to update player stats cache: {psc_err}")
@@ -1405,6 +1316,7 @@ class TournamentEngine:
         # Completed left over from a bug. Checking completion first would
         # freeze current_stage on that placeholder before progression ever
         # got a chance to run (or self-heal) against the real stage.
+        ledger.watch_fixtures()
         try:
             logger.info(f"[Standings] Checking tournament progression for tournament {match.tournament_id}")
             self.check_and_progress_tournament(match.tournament_id)
@@ -1426,6 +1338,9 @@ class TournamentEngine:
 
         # Note: fixture.standings_applied already set above, no need to set again
 
+        ledger.save()
+        bump_tournament_version(match.tournament_id)
+
         if commit:
             logger.info(f"[Standings] Committing standings changes for match {match.id}")
             db.session.commit()
@@ -1435,7 +1350,8 @@ class TournamentEngine:
 
         return True
 
-    def _is_no_result(self, match) -> bool:
+    @staticmethod
+    def _is_no_result(match) -> bool:
         """Determine if a match is a No Result (as opposed to a Tie).
 
         Prefers the structured match_status the engine sets directly
@@ -1460,8 +1376,8 @@ class TournamentEngine:
 
         # Check whether any cricket was actually played.
         # overs can be a string like '0.0' or numeric 0; normalise via overs_to_balls
-        home_balls = self.overs_to_balls(match.home_team_overs)
-        away_balls = self.overs_to_balls(match.away_team_overs)
+        home_balls = TournamentEngine.overs_to_balls(match.home_team_overs)
+        away_balls = TournamentEngine.overs_to_balls(match.away_team_overs)
         if home_balls == 0 and away_balls == 0:
             return True
 
@@ -1480,13 +1396,17 @@ class TournamentEngine:
         upstream simulation accounting bug). Letting those through inflates
         balls-faced/bowled and skews NRR by ~1% per affected match.
         """
-        max_overs = getattr(match, 'overs_per_side', 20) or 20
+        return TournamentEngine.balls_to_overs(
+            TournamentEngine._get_nrr_balls(actual_overs, wickets, match)
+        )
+
+    @staticmethod
+    def _get_nrr_balls(actual_overs, wickets, match) -> int:
+        """_get_nrr_overs() as a ball count."""
+        quota = (getattr(match, 'overs_per_side', 20) or 20) * 6
         if wickets is not None and wickets >= 10:
-            return f"{max_overs}.0"
-        actual = actual_overs or '0.0'
-        if TournamentEngine.overs_to_balls(actual) > max_overs * 6:
-            return f"{max_overs}.0"
-        return actual
+            return quota
+        return min(TournamentEngine.overs_to_balls(actual_overs or '0.0'), quota)
 
     def _update_nrr_components(self, home_stats, away_stats, match):
         """Update Net Run Rate components for both teams."""
@@ -1494,24 +1414,27 @@ class TournamentEngine:
         away_score = match.away_team_score or 0
 
         # ICC NRR rule: use max overs when a team is all out
-        home_overs = self._get_nrr_overs(
+        home_balls = self._get_nrr_balls(
             match.home_team_overs, match.home_team_wickets, match
         )
-        away_overs = self._get_nrr_overs(
+        away_balls = self._get_nrr_balls(
             match.away_team_overs, match.away_team_wickets, match
         )
 
         # Home Batting / Away Bowling
         home_stats.runs_scored += home_score
-        home_stats.overs_faced = self._add_overs(home_stats.overs_faced, home_overs)
+        home_stats.balls_faced = (home_stats.balls_faced or 0) + home_balls
         away_stats.runs_conceded += home_score
-        away_stats.overs_bowled = self._add_overs(away_stats.overs_bowled, home_overs)
+        away_stats.balls_bowled = (away_stats.balls_bowled or 0) + home_balls
 
         # Away Batting / Home Bowling
         away_stats.runs_scored += away_score
-        away_stats.overs_faced = self._add_overs(away_stats.overs_faced, away_overs)
+        away_stats.balls_faced = (away_stats.balls_faced or 0) + away_balls
         home_stats.runs_conceded += away_score
-        home_stats.overs_bowled = self._add_overs(home_stats.overs_bowled, away_overs)
+        home_stats.balls_bowled = (home_stats.balls_bowled or 0) + away_balls
+
+        self._sync_overs(home_stats)
+        self._sync_overs(away_stats)
 
         # Recalculate NRR
         self._calculate_nrr(home_stats)
@@ -1531,43 +1454,26 @@ class TournamentEngine:
                 tournament.current_stage = 'completed'
                 logger.info(f"Tournament {tournament_id} marked as Completed")
 
-    def _add_overs(self, o1, o2):
-        """Add two cricket overs values."""
-        balls1 = self.overs_to_balls(o1 or '0.0')
-        balls2 = self.overs_to_balls(o2 or '0.0')
-        return self.balls_to_overs(balls1 + balls2)
-
-    def _subtract_overs(self, total, sub):
-        """Subtract cricket overs values."""
-        total_balls = self.overs_to_balls(total or '0.0')
-        sub_balls = self.overs_to_balls(sub or '0.0')
-        result_balls = max(0, total_balls - sub_balls)
-        return self.balls_to_overs(result_balls)
+    def _sync_overs(self, team_stats):
+        """Rewrite the legacy overs strings from the ball counters."""
+        team_stats.overs_faced = self.balls_to_overs(team_stats.balls_faced or 0)
+        team_stats.overs_bowled = self.balls_to_overs(team_stats.balls_bowled or 0)
 
     def _calculate_nrr(self, team_stats):
         """Calculate and update the net run rate for a team."""
-        balls_faced = self.overs_to_balls(team_stats.overs_faced or '0.0')
-        balls_bowled = self.overs_to_balls(team_stats.overs_bowled or '0.0')
-
-        if balls_faced > 0:
-            run_rate_for = (team_stats.runs_scored or 0) / (balls_faced / 6.0)
-        else:
-            run_rate_for = 0.0
-
-        if balls_bowled > 0:
-            run_rate_against = (team_stats.runs_conceded or 0) / (balls_bowled / 6.0)
-        else:
-            run_rate_against = 0.0
-
-        team_stats.net_run_rate = round(run_rate_for - run_rate_against, 6)
+        team_stats.net_run_rate = standings_recompute.net_run_rate(
+            team_stats.runs_scored, team_stats.balls_faced or 0,
+            team_stats.runs_conceded, team_stats.balls_bowled or 0,
+        )
 
     def _update_player_stats_cache(self, match):
         """
-        Rebuild tournament player stats cache rows for players involved in this match.
+        Rebuild tournament player stats cache rows for players involved in
+        this match. Returns their ids.
         """
         tournament_id = match.tournament_id
         if not tournament_id:
-            return
+            return []
 
         # Get all player IDs from this match's scorecards
         player_ids = {
@@ -1578,15 +1484,17 @@ class TournamentEngine:
             .all()
         }
         if not player_ids:
-            return
+            return []
 
         self.rebuild_player_stats_cache(tournament_id, player_ids)
+        return list(player_ids)
 
-    def rebuild_player_stats_cache(self, tournament_id, player_ids):
+    def rebuild_player_stats_cache(self, tournament_id, player_ids=None):
         """
         Rebuild TournamentPlayerStatsCache rows for the given players from
         scratch, using DB-level aggregation across the tournament's
-        currently-linked matches for accuracy.
+        currently-linked matches for accuracy. With *player_ids* None every
+        player with a scorecard or a cache row in the tournament is rebuilt.
 
         Public (not `_`-prefixed) because it's also called after reversing
         a match — resimulate or tournament delete — where the affected
@@ -1597,204 +1505,175 @@ class TournamentEngine:
         Deliberately does NOT bail out early when the tournament has zero
         remaining linked matches (e.g. the reversed match was the only one
         played so far): that's exactly the case where the cache needs to
-        be zeroed out, not left showing the deleted match's numbers.
-        `MatchScorecard.match_id.in_(set())` below correctly yields zero
-        rows, so every aggregate naturally resolves to its coalesced
-        default (0 / None) instead of skipping the player entirely.
+        be zeroed out, not left showing the deleted match's numbers. A
+        player with no cards left simply aggregates to the coalesced
+        defaults (0 / None).
+
+        Runs as one round of queries however many players are affected:
+        one GROUP BY player_id over the tournament's MatchScorecard rows
+        for every counter, one ROW_NUMBER() window for best bowling, and a
+        single INSERT .. ON CONFLICT DO UPDATE for all the cache rows.
         """
-        if not player_ids:
+        if player_ids is not None and not player_ids:
             return
 
-        tournament_match_ids = {
-            row[0]
-            for row in db.session.query(TournamentFixture.match_id)
-            .filter(
-                TournamentFixture.tournament_id == tournament_id,
-                TournamentFixture.match_id.isnot(None),
-            )
-            .all()
-        }
+        rows = self.player_cache_rows(db.session, tournament_id, player_ids)
+        if rows:
+            # Pending ORM changes must reach the DB first, and cache rows
+            # already in the session must not keep their pre-upsert values.
+            db.session.flush()
+            db.session.execute(self.player_cache_upsert(), rows)
+            for obj in list(db.session.identity_map.values()):
+                if isinstance(obj, TournamentPlayerStatsCache) and obj.tournament_id == tournament_id:
+                    db.session.expire(obj)
 
-        for player_id in player_ids:
-            player = db.session.get(Player, player_id)
-            if not player:
-                continue
+        logger.info(
+            f"[PlayerStatsCache] Rebuilt cache for {len(rows)} players "
+            f"in tournament {tournament_id}"
+        )
 
-            cache = TournamentPlayerStatsCache.query.filter_by(
-                tournament_id=tournament_id, player_id=player_id
-            ).first()
-            if not cache:
-                cache = TournamentPlayerStatsCache(
-                    tournament_id=tournament_id,
-                    player_id=player_id,
-                    team_id=player.team_id,
-                )
-                db.session.add(cache)
-
-            # Batting aggregation. The "valid innings" filter (balls > 0 OR
-            # runs > 0 OR is_out) matches what `get_player_profile` uses, so
-            # cache and per-player views agree on innings_batted. Without it,
-            # a non-striker scorecard (balls=0, runs>0, not out) inflates the
-            # innings count but is excluded from `not_outs` below, so
-            # `dismissals = innings_batted - not_outs` over-counts.
-            valid_innings = sa_or(
-                MatchScorecard.balls > 0,
-                MatchScorecard.runs > 0,
-                MatchScorecard.is_out == True,
-            )
-            bat = db.session.query(
-                sa_func.count(MatchScorecard.id),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.runs), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.balls), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.fours), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.sixes), 0),
-                sa_func.coalesce(sa_func.max(MatchScorecard.runs), 0),
-            ).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "batting",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.is_super_over.isnot(True),
-                valid_innings,
-            ).first()
+    @classmethod
+    def player_cache_rows(cls, executor, tournament_id, player_ids=None):
+        """
+        The TournamentPlayerStatsCache rows of *tournament_id*, aggregated
+        in SQL (see rebuild_player_stats_cache()), without writing them.
+        *executor* is db.session, or a Connection for the offline rebuild
+        (engine/offline_rebuild.py).
+        """
+        match_ids = sa_select(TournamentFixture.match_id).where(
+            TournamentFixture.tournament_id == tournament_id,
+            TournamentFixture.match_id.isnot(None),
+        ).scalar_subquery()
+        cards = MatchScorecard.match_id.in_(match_ids)
+        if player_ids is not None:
+            player_ids = set(player_ids)
+            cards = sa_and(cards, MatchScorecard.player_id.in_(player_ids))
+        else:
+            player_ids = {
+                row[0] for row in
+                executor.execute(sa_select(MatchScorecard.player_id).where(cards).distinct())
+            } | {
+                row[0] for row in
+                executor.execute(sa_select(TournamentPlayerStatsCache.player_id)
+                                 .where(TournamentPlayerStatsCache.tournament_id == tournament_id))
+            }
 
-            if bat:
-                cache.innings_batted = bat[0]
-                cache.runs_scored = bat[1]
-                cache.balls_faced = bat[2]
-                cache.fours = bat[3]
-                cache.sixes = bat[4]
-                cache.highest_score = bat[5]
-                cache.batting_strike_rate = round(
-                    (bat[1] / bat[2]) * 100, 2
-                ) if bat[2] > 0 else None
-
-            # Count not-outs over the SAME valid-innings universe as above
-            # so `dismissals = innings_batted - not_outs` is internally
-            # consistent and matches the per-player profile path.
-            not_outs = db.session.query(sa_func.count()).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "batting",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.is_out == False,
-                MatchScorecard.is_super_over.isnot(True),
-                sa_or(MatchScorecard.balls > 0, MatchScorecard.runs > 0),
-            ).scalar() or 0
-            cache.not_outs = not_outs
-
-            fifties = db.session.query(sa_func.count()).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "batting",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.runs >= 50,
-                MatchScorecard.runs < 100,
-                MatchScorecard.is_super_over.isnot(True),
-            ).scalar() or 0
-            cache.fifties = fifties
-
-            centuries = db.session.query(sa_func.count()).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "batting",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.runs >= 100,
-                MatchScorecard.is_super_over.isnot(True),
-            ).scalar() or 0
-            cache.centuries = centuries
-
-            dismissals = (cache.innings_batted or 0) - not_outs
-            cache.batting_average = round(
-                cache.runs_scored / dismissals, 2
-            ) if dismissals > 0 else None
-
-            # Bowling aggregation
-            bowl = db.session.query(
-                sa_func.count(MatchScorecard.id),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.balls_bowled), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.runs_conceded), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.wickets), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.maidens), 0),
-                sa_func.coalesce(sa_func.max(MatchScorecard.wickets), 0),
-            ).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "bowling",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.is_super_over.isnot(True),
-            ).first()
+        teams = dict(executor.execute(
+            sa_select(Player.id, Player.team_id).where(Player.id.in_(player_ids))
+        ).all())
+        totals = {row.player_id: row for row in executor.execute(cls._player_cache_totals(cards))}
+        best = {row.player_id: row for row in executor.execute(cls._player_cache_best_bowling(cards))}
 
-            if bowl:
-                cache.innings_bowled = bowl[0]
-                total_balls = bowl[1]
-                cache.overs_bowled = f"{total_balls // 6}.{total_balls % 6}"
-                cache.runs_conceded = bowl[2]
-                cache.wickets_taken = bowl[3]
-                cache.maidens = bowl[4]
-                cache.bowling_average = round(
-                    bowl[2] / bowl[3], 2
-                ) if bowl[3] > 0 else None
-                cache.bowling_economy = round(
-                    (bowl[2] / (total_balls / 6.0)), 2
-                ) if total_balls > 0 else 0.0
-                cache.bowling_strike_rate = round(
-                    total_balls / bowl[3], 2
-                ) if bowl[3] > 0 else None
-
-            # Best bowling
-            best_bowl = db.session.query(
-                MatchScorecard.wickets, MatchScorecard.runs_conceded
-            ).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "bowling",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.is_super_over.isnot(True),
-            ).order_by(
-                MatchScorecard.wickets.desc(),
-                MatchScorecard.runs_conceded.asc(),
-            ).first()
-            if best_bowl:
-                cache.best_bowling_wickets = best_bowl.wickets or 0
-                cache.best_bowling_runs = best_bowl.runs_conceded or 0
-
-            five_wkt = db.session.query(sa_func.count()).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.record_type == "bowling",
-                MatchScorecard.match_id.in_(tournament_match_ids),
-                MatchScorecard.wickets >= 5,
-                MatchScorecard.is_super_over.isnot(True),
-            ).scalar() or 0
-            cache.five_wicket_hauls = five_wkt
-
-            # Fielding aggregation
-            fielding = db.session.query(
-                sa_func.coalesce(sa_func.sum(MatchScorecard.catches), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.run_outs), 0),
-                sa_func.coalesce(sa_func.sum(MatchScorecard.stumpings), 0),
-            ).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.match_id.in_(tournament_match_ids),
-            ).first()
-            if fielding:
-                cache.catches = fielding[0]
-                cache.run_outs = fielding[1]
-                cache.stumpings = fielding[2]
-
-            # Matches played = distinct match IDs. Deliberately NOT filtered on
-            # is_super_over: a player whose only card is a super-over row still
-            # played that match (mirrors DBPlayer.matches_played).
-            matches_played = db.session.query(
-                sa_func.count(sa_func.distinct(MatchScorecard.match_id))
-            ).filter(
-                MatchScorecard.player_id == player_id,
-                MatchScorecard.match_id.in_(tournament_match_ids),
-            ).scalar() or 0
-            cache.matches_played = matches_played
+        return [
+            cls._player_cache_row(tournament_id, player_id, team_id,
+                                  totals.get(player_id), best.get(player_id))
+            for player_id, team_id in teams.items()
+        ]
 
-        logger.info(
-            f"[PlayerStatsCache] Rebuilt cache for {len(player_ids)} players "
-            f"in tournament {tournament_id}"
+    @staticmethod
+    def player_cache_upsert():
+        """INSERT .. ON CONFLICT DO UPDATE for rows from player_cache_rows()."""
+        stmt = sqlite_insert(TournamentPlayerStatsCache.__table__)
+        return stmt.on_conflict_do_update(
+            index_elements=["tournament_id", "player_id"],
+            set_={column: stmt.excluded[column] for column in _PLAYER_CACHE_COLUMNS},
         )
 
+    @staticmethod
+    def _player_cache_totals(cards):
+        """Every summed counter per player, one GROUP BY over *cards*."""
+        C = MatchScorecard
+        regular = C.is_super_over.isnot(True)
+        batting = sa_and(C.record_type == "batting", regular)
+        bowling = sa_and(C.record_type == "bowling", regular)
+        # The "valid innings" filter (balls > 0 OR runs > 0 OR is_out)
+        # matches what `get_player_profile` uses, so cache and per-player
+        # views agree on innings_batted. Without it, a non-striker scorecard
+        # (balls=0, runs>0, not out) inflates the innings count but is
+        # excluded from `not_outs`, so `dismissals = innings_batted -
+        # not_outs` over-counts. Not-outs use the SAME universe.
+        innings = sa_and(batting, sa_or(C.balls > 0, C.runs > 0, C.is_out == True))  # noqa: E712
+        not_out = sa_and(batting, C.is_out == False, sa_or(C.balls > 0, C.runs > 0))  # noqa: E712
+
+        def sum_if(condition, value=1):
+            return sa_func.coalesce(sa_func.sum(sa_case((condition, value), else_=0)), 0)
+
+        return sa_select(
+            C.player_id.label("player_id"),
+            sum_if(innings).label("innings_batted"),
+            sum_if(innings, C.runs).label("runs_scored"),
+            sum_if(innings, C.balls).label("balls_faced"),
+            sum_if(innings, C.fours).label("fours"),
+            sum_if(innings, C.sixes).label("sixes"),
+            sa_func.coalesce(sa_func.max(sa_case((innings, C.runs))), 0).label("highest_score"),
+            sum_if(not_out).label("not_outs"),
+            sum_if(sa_and(batting, C.runs >= 50, C.runs < 100)).label("fifties"),
+            sum_if(sa_and(batting, C.runs >= 100)).label("centuries"),
+            sum_if(bowling).label("innings_bowled"),
+            sum_if(bowling, C.balls_bowled).label("balls_bowled"),
+            sum_if(bowling, C.runs_conceded).label("runs_conceded"),
+            sum_if(bowling, C.wickets).label("wickets_taken"),
+            sum_if(bowling, C.maidens).label("maidens"),
+            sum_if(sa_and(bowling, C.wickets >= 5)).label("five_wicket_hauls"),
+            # Fielding can sit on any card, super overs included; matches
+            # played likewise counts a super-over-only appearance (mirrors
+            # DBPlayer.matches_played).
+            sa_func.coalesce(sa_func.sum(C.catches), 0).label("catches"),
+            sa_func.coalesce(sa_func.sum(C.run_outs), 0).label("run_outs"),
+            sa_func.coalesce(sa_func.sum(C.stumpings), 0).label("stumpings"),
+            sa_func.count(sa_func.distinct(C.match_id)).label("matches_played"),
+        ).where(cards).group_by(C.player_id)
+
+    @staticmethod
+    def _player_cache_best_bowling(cards):
+        """Each player's best figures: most wickets, then fewest runs."""
+        C = MatchScorecard
+        ranked = sa_select(
+            C.player_id.label("player_id"),
+            C.wickets.label("wickets"),
+            C.runs_conceded.label("runs"),
+            sa_func.row_number().over(
+                partition_by=C.player_id,
+                order_by=(C.wickets.desc(), C.runs_conceded.asc()),
+            ).label("rn"),
+        ).where(
+            cards, C.record_type == "bowling", C.is_super_over.isnot(True),
+        ).subquery()
+        return sa_select(ranked).where(ranked.c.rn == 1)
+
+    @staticmethod
+    def _player_cache_row(tournament_id, player_id, team_id, totals, best):
+        """The cache row for one player from its aggregates (None = no cards)."""
+        t = {name: (getattr(totals, name) if totals is not None else 0) or 0
+             for name in _PLAYER_CACHE_TOTALS}
+        dismissals = t["innings_batted"] - t["not_outs"]
+        balls, runs, wickets = t["balls_bowled"], t["runs_conceded"], t["wickets_taken"]
+        return {
+            "tournament_id": tournament_id,
+            "player_id": player_id,
+            "team_id": team_id,
+            **{name: t[name] for name in _PLAYER_CACHE_TOTALS if name != "balls_bowled"},
+            "batting_average": round(t["runs_scored"] / dismissals, 2) if dismissals > 0 else None,
+            "batting_strike_rate": (
+                round(t["runs_scored"] / t["balls_faced"] * 100, 2) if t["balls_faced"] > 0 else None
+            ),
+            "overs_bowled": f"{balls // 6}.{balls % 6}",
+            "bowling_average": round(runs / wickets, 2) if wickets > 0 else None,
+            "bowling_economy": round(runs / (balls / 6.0), 2) if balls > 0 else 0.0,
+            "bowling_strike_rate": round(balls / wickets, 2) if wickets > 0 else None,
+            "best_bowling_wickets": (best.wickets or 0) if best is not None else 0,
+            "best_bowling_runs": (best.runs or 0) if best is not None else 0,
+        }
+
     def reverse_standings(self, match, commit=False):
         """
         Reverses the stats update for a match (used for re-simulation).
+
+        Replays the match's ledger when it has one: its standings deltas are
+        subtracted, the fixtures and tournament state it moved restored (see
+        match_ledger.restore_images) and only its players' cache rows
+        rebuilt. Matches applied before ledgers existed are reversed by
+        recomputing the table and resetting progression from the tree.
         """
         if not match.tournament_id:
             return False
@@ -1805,72 +1684,68 @@ class TournamentEngine:
             logger.error("No fixture found for match %s; cannot reverse standings.", match.id)
             return False
 
-        home_team_stats = self._ensure_team_stats(match.tournament_id, match.home_team_id)
-        away_team_stats = self._ensure_team_stats(match.tournament_id, match.away_team_id)
-
-        # Only reverse league standings
-        if fixture and fixture.stage == self.STAGE_LEAGUE:
-            home_team_stats.played = max(0, home_team_stats.played - 1)
-            away_team_stats.played = max(0, away_team_stats.played - 1)
-
-            winner_id = match.winner_team_id
-            was_no_result = self._is_no_result(match)
-
-            if was_no_result:
-                home_team_stats.no_result = max(0, home_team_stats.no_result - 1)
-                away_team_stats.no_result = max(0, away_team_stats.no_result - 1)
-                home_team_stats.points = max(0, home_team_stats.points - self.POINTS_NO_RESULT)
-                away_team_stats.points = max(0, away_team_stats.points - self.POINTS_NO_RESULT)
-            elif winner_id == match.home_team_id:
-                home_team_stats.won = max(0, home_team_stats.won - 1)
-                home_team_stats.points = max(0, home_team_stats.points - self.POINTS_WIN)
-                away_team_stats.lost = max(0, away_team_stats.lost - 1)
-            elif winner_id == match.away_team_id:
-                away_team_stats.won = max(0, away_team_stats.won - 1)
-                away_team_stats.points = max(0, away_team_stats.points - self.POINTS_WIN)
-                home_team_stats.lost = max(0, home_team_stats.lost - 1)
+        # Reset fixture winner and standings state
+        fixture.winner_team_id = None
+        fixture.status = 'Scheduled'
+        fixture.standings_applied = False
+        fixture.match_id = None
+
+        entries = match_ledger.load(match.id)
+        if fixture.stage == self.STAGE_LEAGUE:
+            home_stats = self._ensure_team_stats(match.tournament_id, match.home_team_id)
+            away_stats = self._ensure_team_stats(match.tournament_id, match.away_team_id)
+            if entries is not None and entries["standings"]:
+                match_ledger.subtract_standings(
+                    entries, {home_stats.team_id: home_stats, away_stats.team_id: away_stats}
+                )
+                for stats in (home_stats, away_stats):
+                    self._sync_overs(stats)
+                    self._calculate_nrr(stats)
             else:
-                home_team_stats.tied = max(0, home_team_stats.tied - 1)
-                away_team_stats.tied = max(0, away_team_stats.tied - 1)
-                home_team_stats.points = max(0, home_team_stats.points - self.POINTS_TIE)
-                away_team_stats.points = max(0, away_team_stats.points - self.POINTS_TIE)
-
-            if not was_no_result:
-                self._reverse_nrr_components(home_team_stats, away_team_stats, match)
+                # No ledger: rebuild the table from the league results that
+                # remain instead of subtracting this one.
+                db.session.flush()
+                self.recompute_standings(match.tournament_id)
+
+        # Progression this result caused: replay the ledger's images while
+        # nothing has moved those fixtures since, else reset from the tree.
+        if entries is None or not match_ledger.restore_images(entries, match.tournament_id):
+            self._reset_progression(match.tournament_id, fixture)
+        if entries is not None:
+            # The fixture no longer links the match, so its cards drop out.
+            self.rebuild_player_stats_cache(match.tournament_id, entries["players"])
+            match_ledger.discard(match.id)
+        bump_tournament_version(match.tournament_id)
 
-            self._calculate_nrr(home_team_stats)
-            self._calculate_nrr(away_team_stats)
+        if commit:
+            db.session.commit()
 
-        # Reset fixture winner and standings state
-        if fixture:
-            fixture.winner_team_id = None
-            fixture.status = 'Scheduled'
-            fixture.standings_applied = False
-            fixture.match_id = None
+        logger.info(f"Reversed standings for match {match.id}")
+        return True
 
-            if fixture.stage != self.STAGE_LEAGUE:
-                self._reset_knockout_bracket(match.tournament_id, fixture.bracket_position)
+    def _reset_progression(self, tournament_id, fixture):
+        """
+        Undo what progression built on *fixture*'s result from the bracket
+        tree: reset the bracket below a knockout fixture, or the playoffs
+        after a league one, and put the tournament back to that stage.
+        """
+        if fixture.stage != self.STAGE_LEAGUE:
+            self._reset_knockout_bracket(tournament_id, fixture.bracket_position)
 
         # Reset tournament status if it was completed
-        tournament = db.session.get(Tournament, match.tournament_id)
+        tournament = db.session.get(Tournament, tournament_id)
         if tournament and tournament.status == 'Completed':
             tournament.status = 'Active'
-        if tournament and fixture:
+        if tournament:
             if fixture.stage != self.STAGE_LEAGUE:
                 tournament.current_stage = fixture.stage
             elif tournament.mode in [self.MODE_ROUND_ROBIN_KNOCKOUT,
                                      self.MODE_DOUBLE_ROUND_ROBIN_KNOCKOUT,
                                      self.MODE_IPL_STYLE]:
                 if tournament.current_stage != self.STAGE_LEAGUE:
-                    self._reset_post_league_fixtures(match.tournament_id)
+                    self._reset_post_league_fixtures(tournament_id)
                     tournament.current_stage = self.STAGE_LEAGUE
 
-        if commit:
-            db.session.commit()
-
-        logger.info(f"Reversed standings for match {match.id}")
-        return True
-
     def _cleanup_fixture_match_data(self, fixture):
         """
         Delete the DBMatch, scorecards, partnerships, and reverse player
@@ -1891,8 +1766,7 @@ class TournamentEngine:
 
         scorecards = MatchScorecard.query.filter_by(match_id=match_id).all()
         player_ids = {c.player_id for c in scorecards}
-        if scorecards:
-            reverse_player_aggregates(scorecards, logger=logger)
+        reverse_player_aggregates(scorecards, logger=logger, match_id=match_id)
 
         MatchPartnership.query.filter_by(match_id=match_id).delete(synchronize_session=False)
         MatchScorecard.query.filter_by(match_id=match_id).delete(synchronize_session=False)
@@ -1906,65 +1780,24 @@ class TournamentEngine:
             self.rebuild_player_stats_cache(db_match.tournament_id, player_ids)
         logger.info(f"Cleaned up match data for fixture {fixture.id} (match {match_id})")
 
-    def _ipl_downstream_stages(self, from_stage: str) -> set:
-        """
-        Transitive closure of IPL_PLAYOFF_EDGES starting from from_stage.
-
-        IPL-style playoffs are a fixed 4-node dependency graph, not a
-        binary tree (Q1 feeds both Q2 and Final directly), so this walks
-        the explicit edge map rather than inferring structure from
-        bracket_position arithmetic.
-        """
-        downstream = set()
-        frontier = [from_stage]
-        while frontier:
-            stage = frontier.pop()
-            for nxt in self.IPL_PLAYOFF_EDGES.get(stage, ()):
-                if nxt not in downstream:
-                    downstream.add(nxt)
-                    frontier.append(nxt)
-        return downstream
-
     def _reset_knockout_bracket(self, tournament_id: int, from_bracket_position: int):
         """
         Reset downstream fixtures when a completed playoff/knockout fixture
         is re-simulated. Also cleans up any associated match/scorecard/
         career data.
 
-        IPL-style playoffs are resolved via their explicit stage
-        dependency graph (IPL_PLAYOFF_EDGES) rather than bracket-position
-        tree math: their Q1/Eliminator/Q2/Final shape isn't a binary tree
-        (Q1 has two direct downstream dependents), so _get_downstream_positions'
-        round-halving inference can't represent it and silently under-resets.
-        Pure knockout brackets and the SF1/SF2/Final shape (round_robin_knockout,
-        double_round_robin_knockout) genuinely are binary trees of varying
-        depth, so they keep using the generic bracket-position walk.
+        The fixtures to reset are the position's descendants in the
+        tournament's BracketTree, which records the IPL shape (Q1 feeds both
+        Q2 and the Final) as explicitly as a knockout or semifinal tree.
         """
         tournament = db.session.get(Tournament, tournament_id)
+        tree = self.bracket_tree(tournament)
+        descendant_positions = tree.descendants(from_bracket_position) if tree else set()
+        if not descendant_positions:
+            return
         tbd_id = self._get_placeholder_team_id(tournament_id, "TBD")
 
-        if tournament and tournament.mode == self.MODE_IPL_STYLE:
-            from_fixture = TournamentFixture.query.filter_by(
-                tournament_id=tournament_id, bracket_position=from_bracket_position
-            ).first()
-            if not from_fixture:
-                return
-            downstream_stages = self._ipl_downstream_stages(from_fixture.stage)
-            if not downstream_stages:
-                return
-            downstream = TournamentFixture.query.filter(
-                TournamentFixture.tournament_id == tournament_id,
-                TournamentFixture.stage.in_(downstream_stages),
-            ).all()
-        else:
-            descendant_positions = self._get_downstream_positions(tournament_id, from_bracket_position)
-            if not descendant_positions:
-                return
-            downstream = TournamentFixture.query.filter(
-                TournamentFixture.tournament_id == tournament_id,
-                TournamentFixture.bracket_position.in_(descendant_positions)
-            ).all()
-
+        downstream = self._bracket_fixtures(tournament_id, descendant_positions).values()
         for fixture in downstream:
             self._cleanup_fixture_match_data(fixture)
             fixture.home_team_id = tbd_id
@@ -1974,66 +1807,6 @@ class TournamentEngine:
             fixture.status = 'Locked'
             fixture.standings_applied = False
 
-    def _get_downstream_positions(self, tournament_id, from_bracket_position):
-        """
-        Compute all bracket positions that are descendants of a given position
-        in the binary tournament bracket tree.
-        """
-        all_fixtures = TournamentFixture.query.filter(
-            TournamentFixture.tournament_id == tournament_id,
-            TournamentFixture.bracket_position != None
-        ).order_by(TournamentFixture.bracket_position).all()
-
-        if not all_fixtures:
-            return set()
-
-        positions = [f.bracket_position for f in all_fixtures]
-        total = len(positions)
-        min_pos = positions[0]
-
-        # Compute round sizes (first round largest, halving each time)
-        # total fixtures = n/2 + n/4 + ... + 1 = n - 1 where n = first_round * 2
-        first_round_size = (total + 1) // 2
-        round_sizes = []
-        size = first_round_size
-        while size >= 1:
-            round_sizes.append(size)
-            size //= 2
-
-        # Build round start positions
-        round_starts = []
-        start = min_pos
-        for rs in round_sizes:
-            round_starts.append(start)
-            start += rs
-
-        # Find which round the from_position is in
-        from_round = -1
-        from_idx = -1
-        for r, (rs, rsize) in enumerate(zip(round_starts, round_sizes)):
-            if rs <= from_bracket_position < rs + rsize:
-                from_round = r
-                from_idx = from_bracket_position - rs
-                break
-
-        if from_round == -1:
-            return set()
-
-        # Walk downstream through the tree
-        descendants = set()
-        current_indices = {from_idx}
-
-        for r in range(from_round + 1, len(round_sizes)):
-            next_indices = set()
-            for idx in current_indices:
-                next_idx = idx // 2
-                next_pos = round_starts[r] + next_idx
-                descendants.add(next_pos)
-                next_indices.add(next_idx)
-            current_indices = next_indices
-
-        return descendants
-
     def _reset_post_league_fixtures(self, tournament_id: int):
         """
         Reset playoff fixtures after a league-stage resimulation.
@@ -2058,8 +1831,13 @@ class TournamentEngine:
             fixture.standings_applied = False
 
     def _get_placeholder_team_id(self, tournament_id: int, label: str) -> int:
+        """Ensure a per-user placeholder team (BYE/TBD) exists and return its ID."""
+        return self._get_placeholder_team_ids(tournament_id, (label,))[label]
+
+    def _get_placeholder_team_ids(self, tournament_id: int, labels) -> dict:
         """
-        Ensure a per-user placeholder team (BYE/TBD) exists and return its ID.
+        Ensure the tournament owner's placeholder teams for *labels* exist
+        and return {label: team_id}, with one lookup and at most one flush.
         Filters on ``is_placeholder=True`` so a real team that happens to be
         named "BYE" or "TBD" is never mistakenly reused.
         """
@@ -2067,41 +1845,18 @@ class TournamentEngine:
         if not tournament:
             raise ValueError(f"Tournament {tournament_id} not found.")
 
-        placeholder = Team.query.filter_by(
-            user_id=tournament.user_id, name=label, is_placeholder=True
-        ).first()
-        if placeholder:
-            return placeholder.id
-
-        placeholder = Team(
-            user_id=tournament.user_id,
-            name=label,
-            short_code=f"__{label}__",
-            is_placeholder=True
-        )
-        db.session.add(placeholder)
-        db.session.flush()
-        return placeholder.id
-
-    def _reverse_nrr_components(self, home_stats, away_stats, match):
-        """Reverse the NRR component updates from a match."""
-        home_score = match.home_team_score or 0
-        away_score = match.away_team_score or 0
+        ids = {}
+        for team in Team.query.filter(
+            Team.user_id == tournament.user_id, Team.name.in_(labels), Team.is_placeholder.is_(True)
+        ).order_by(Team.id):
+            ids.setdefault(team.name, team.id)
 
-        # Must use the same adjusted overs that were used when adding
-        home_overs = self._get_nrr_overs(
-            match.home_team_overs, match.home_team_wickets, match
-        )
-        away_overs = self._get_nrr_overs(
-            match.away_team_overs, match.away_team_wickets, match
-        )
-
-        home_stats.runs_scored = max(0, (home_stats.runs_scored or 0) - home_score)
-        home_stats.overs_faced = self._subtract_overs(home_stats.overs_faced, home_overs)
-        away_stats.runs_conceded = max(0, (away_stats.runs_conceded or 0) - home_score)
-        away_stats.overs_bowled = self._subtract_overs(away_stats.overs_bowled, home_overs)
-
-        away_stats.runs_scored = max(0, (away_stats.runs_scored or 0) - away_score)
-        away_stats.overs_faced = self._subtract_overs(away_stats.overs_faced, away_overs)
-        home_stats.runs_conceded = max(0, (home_stats.runs_conceded or 0) - away_score)
-        home_stats.overs_bowled = self._subtract_overs(home_stats.overs_bowled, away_overs)
+        missing = [
+            Team(user_id=tournament.user_id, name=label, short_code=f"__{label}__", is_placeholder=True)
+            for label in labels if label not in ids
+        ]
+        if missing:
+            db.session.add_all(missing)
+            db.session.flush()
+            ids.update((team.name, team.id) for team in missing)
+        return ids
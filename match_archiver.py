@@ -27,17 +27,22 @@ import tempfile
 import logging
 from datetime import datetime
 from pathlib import Path
-from tabulate import tabulate
-from tabulate import tabulate
 from typing import Dict, List, Any, Optional, Union
 import zipfile
 
-from sqlalchemy import func as sa_func
+from sqlalchemy import func as sa_func, or_
 
 from database import db
 from database.models import Match as DBMatch, MatchScorecard, Team as DBTeam, Player as DBPlayer, TeamProfile as DBTeamProfile, Tournament, MatchPartnership
 from utils.exception_tracker import log_exception, log_data_anomaly
 from engine.cricket_math import balls_to_overs_str
+from engine.scorecard import InningsScorecard
+from engine.career_stats import apply_match_cards, reverse_match_cards
+from engine.head_to_head import apply_match as apply_head_to_head, reverse_match as reverse_head_to_head
+from engine.insights_store import apply_match as apply_insights, reverse_match as reverse_insights
+from engine.match_analytics import analyze_match, discard_match as discard_match_analytics
+from engine.partnership_index import index_fields as partnership_index_fields
+from engine.stats_cache import bump_stats_version
 
 # ─── Define PROJECT_ROOT so that we can write to /<project_root>/data/… ─────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -48,9 +53,10 @@ class MatchArchiverError(Exception):
     pass
 
 
-def reverse_player_aggregates(scorecards, logger=None):
+def reverse_player_aggregates(scorecards, logger=None, match_format=None, match_id=None):
     """
-    Reverse player aggregate (career) stats from old scorecards.
+    Reverse player aggregate (career) stats from old scorecards, and take
+    the match out of its head-to-head, insights and analytics summaries.
 
     This must be called BEFORE the scorecards are deleted from the DB,
     otherwise the old stats are lost and career totals become inflated
@@ -59,8 +65,17 @@ def reverse_player_aggregates(scorecards, logger=None):
     Args:
         scorecards: List of MatchScorecard objects to reverse
         logger: Optional logger instance
+        match_format: Format the scorecards were archived under, for the
+            PlayerCareerStats row to subtract from. Defaults to the
+            Match row's current format — pass it explicitly when the
+            match has already been re-labelled (re-sim).
+        match_id: The match being reversed. Required when it has no
+            scorecards (an abandoned / no-result match): it still counts
+            in its head-to-head row and venue conditions.
     """
-    if not scorecards:
+    if scorecards:
+        match_id = scorecards[0].match_id
+    if match_id is None:
         return
 
     updated_players = set()
@@ -104,8 +119,7 @@ def reverse_player_aggregates(scorecards, logger=None):
                 player.five_wicket_hauls = max(0, player.five_wicket_hauls - 1)
 
     # Recalculate high-water-mark stats using DB-level aggregation (O(1) per player).
-    match_id = scorecards[0].match_id if scorecards else None
-    if match_id:
+    if updated_players:
         for player_id in updated_players:
             player = DBPlayer.query.get(player_id)
             if not player:
@@ -142,10 +156,70 @@ def reverse_player_aggregates(scorecards, logger=None):
                 player.best_bowling_wickets = 0
                 player.best_bowling_runs = 0
 
+    reverse_match_cards(scorecards, match_format=match_format)
+    reverse_head_to_head(match_id, match_format=match_format)
+    reverse_insights(match_id, match_format=match_format, cards=scorecards)
+    discard_match_analytics(match_id)
+    bump_stats_version(
+        db.session.query(DBMatch.user_id).filter(DBMatch.id == match_id).scalar()
+    )
+
     if logger:
         logger.info(f"Reversed aggregate stats for {len(updated_players)} players")
 
 
+class _ArchiveRoster:
+    """
+    The players one archive can attach stats to, loaded once per team.
+
+    Resolves a scorecard/fielding/partnership name the same way the
+    per-row queries it replaces did: the engine-supplied player id when it
+    belongs to the team, else the name within the team's profile for the
+    match format, else an unassigned (pre-migration, profile_id IS NULL)
+    row of the team. Each team costs two queries however many names are
+    looked up, and the loaded rows stay in the session's identity map for
+    the aggregate pass that follows.
+    """
+
+    def __init__(self, match_format):
+        self.match_format = match_format
+        self._teams = {}
+
+    def _team(self, team_id):
+        entry = self._teams.get(team_id)
+        if entry is not None:
+            return entry
+        profile = DBTeamProfile.query.filter_by(
+            team_id=team_id, format_type=self.match_format
+        ).order_by(DBTeamProfile.id).first()
+        scope = DBPlayer.team_id == team_id
+        if profile:
+            scope = or_(scope, DBPlayer.profile_id == profile.id)
+        by_id, in_profile, legacy = {}, {}, {}
+        for player in DBPlayer.query.filter(scope).order_by(DBPlayer.id):
+            if player.team_id == team_id:
+                by_id[player.id] = player
+                if player.profile_id is None:
+                    legacy.setdefault(player.name, player)
+            if profile and player.profile_id == profile.id:
+                in_profile.setdefault(player.name, player)
+        entry = self._teams[team_id] = (by_id, in_profile, legacy)
+        return entry
+
+    def player(self, name, team_id, player_id=None):
+        by_id, in_profile, legacy = self._team(team_id)
+        if player_id:
+            try:
+                player = by_id.get(int(player_id))
+            except (TypeError, ValueError):
+                player = None
+            if player:
+                return player
+            # id present but stale/mismatched (e.g. player moved teams,
+            # or a spoofed/garbage value) — fall through to name lookup.
+        return in_profile.get(name) or legacy.get(name)
+
+
 class MatchArchiver:
     """
     Production-level cricket match archiver with comprehensive error handling,
@@ -200,6 +274,7 @@ class MatchArchiver:
         self.created_files = []
         self.temp_files = []
         self._milestones = []  # Populated after save_to_database
+        self._scorecard_models = {}  # innings -> InningsScorecard (fallback only)
         
         self.logger.info(f"MatchArchiver initialized for {self.team_home} vs {self.team_away} (ID: {self.match_id})")
 
@@ -465,33 +540,23 @@ class MatchArchiver:
         
         # Save to database - update existing batting/bowling records or create new fielding records
         _fmt = self.match_data.get('match_format', 'T20')
+        roster = self._roster_for(_fmt)
+        cards = self._scorecard_index()
         for fielder_name, contributions in fielding_contributions.items():
-            # Find the fielder via format profile; fall back to team-wide lookup
-            fielder = None
-            _fld_profile = DBTeamProfile.query.filter_by(
-                team_id=fielding_team_id, format_type=_fmt
-            ).first()
-            if _fld_profile:
-                fielder = DBPlayer.query.filter_by(
-                    name=fielder_name, profile_id=_fld_profile.id
-                ).first()
-            if not fielder:
-                # Legacy fallback: only accept unassigned (pre-migration) rows.
-                # Falling back to any team-wide match would bind this match's
-                # fielding stats to a Player row in a *different* format profile.
-                fielder = DBPlayer.query.filter_by(
-                    name=fielder_name, team_id=fielding_team_id, profile_id=None
-                ).first()
+            # Find the fielder via format profile; the legacy fallback only
+            # accepts unassigned (pre-migration) rows, never a Player row in
+            # a *different* format profile.
+            fielder = roster.player(fielder_name, fielding_team_id)
             if not fielder:
                 self.logger.warning(f"Fielder {fielder_name} not found in team {fielding_team_id} for format {_fmt}")
                 continue
             
             # Try to find existing scorecard entry (batting or bowling) for this player
-            existing_card = MatchScorecard.query.filter_by(
-                match_id=self.match_id,
-                player_id=fielder.id,
-                innings_number=innings_number
-            ).first()
+            existing_card = next(
+                (card for (player_id, innings, _), card in cards.items()
+                 if player_id == fielder.id and innings == innings_number),
+                None,
+            )
             
             if existing_card:
                 # Update existing record with fielding stats
@@ -512,10 +577,17 @@ class MatchArchiver:
                     stumpings=contributions['stumpings'],
                 )
                 db.session.add(fielding_card)
+                cards[(fielder.id, innings_number, "fielding")] = fielding_card
                 self.logger.debug(f"Created fielding record for {fielder_name}: {contributions}")
 
-    def _save_to_database(self) -> bool:
-        """Save match results and stats to SQLite database"""
+    def _save_to_database(self, commit: bool = True) -> bool:
+        """
+        Save match results and stats to SQLite database.
+
+        With commit=False the work is left in the caller's transaction (the
+        headless tournament simulator batches many matches per commit) and
+        a failure is raised instead of rolling the whole session back.
+        """
         try:
             home_team = None
             away_team = None
@@ -571,6 +643,33 @@ class MatchArchiver:
             
             if db_match:
                 self.logger.info(f"Match {self.match_id} already exists in DB. Updating record.")
+                # Bug Fix B4: Reverse old aggregate stats before deletion to prevent double-counting.
+                # This runs before the row is updated, so the summaries subtract
+                # the teams, venue and scores the match was archived with; the
+                # archived format is passed explicitly rather than re-read.
+                # Wrap in a savepoint so reversal + deletion is atomic — if a player
+                # was deleted between saves the partial reversal is rolled back cleanly.
+                nested = db.session.begin_nested()
+                try:
+                    old_scorecards = MatchScorecard.query.filter_by(match_id=self.match_id).all()
+                    self._reverse_player_aggregates(
+                        old_scorecards, match_format=db_match.match_format or "T20")
+                    # Clear existing scorecards to avoid duplication/stale data
+                    MatchScorecard.query.filter_by(match_id=self.match_id).delete()
+                    # Clear existing partnerships
+                    MatchPartnership.query.filter_by(match_id=self.match_id).delete()
+                    nested.commit()
+                except Exception as rev_err:
+                    log_exception(rev_err)
+                    nested.rollback()
+                    self.logger.warning(
+                        f"Aggregate reversal failed (match {self.match_id}), "
+                        f"falling back to full delete: {rev_err}"
+                    )
+                    # Scorecards may not have been deleted yet — ensure cleanup
+                    MatchScorecard.query.filter_by(match_id=self.match_id).delete()
+                    MatchPartnership.query.filter_by(match_id=self.match_id).delete()
+
                 # Update existing fields
                 db_match.user_id = self.username
                 db_match.home_team_id = home_team.id
@@ -596,28 +695,6 @@ class MatchArchiver:
                 db_match.overs_per_side = self.match_data.get('overs', 20)
                 db_match.is_day_night = bool(self.match_data.get('is_day_night', False))
                 
-                # Bug Fix B4: Reverse old aggregate stats before deletion to prevent double-counting
-                # Wrap in a savepoint so reversal + deletion is atomic — if a player
-                # was deleted between saves the partial reversal is rolled back cleanly.
-                nested = db.session.begin_nested()
-                try:
-                    old_scorecards = MatchScorecard.query.filter_by(match_id=self.match_id).all()
-                    self._reverse_player_aggregates(old_scorecards)
-                    # Clear existing scorecards to avoid duplication/stale data
-                    MatchScorecard.query.filter_by(match_id=self.match_id).delete()
-                    # Clear existing partnerships
-                    MatchPartnership.query.filter_by(match_id=self.match_id).delete()
-                    nested.commit()
-                except Exception as rev_err:
-                    log_exception(rev_err)
-                    nested.rollback()
-                    self.logger.warning(
-                        f"Aggregate reversal failed (match {self.match_id}), "
-                        f"falling back to full delete: {rev_err}"
-                    )
-                    # Scorecards may not have been deleted yet — ensure cleanup
-                    MatchScorecard.query.filter_by(match_id=self.match_id).delete()
-                    MatchPartnership.query.filter_by(match_id=self.match_id).delete()
             else:
                 self.logger.info(f"Creating new DB record for Match {self.match_id}")
                 db_match = DBMatch(
@@ -743,39 +820,25 @@ class MatchArchiver:
             # 4. Save Scorecards
             _match_format = self.match_data.get('match_format', 'T20')
 
+            # Players and this match's cards are resolved in memory: both
+            # teams' rosters are loaded once (_ArchiveRoster) and the cards
+            # written so far are indexed by (player, innings, record type),
+            # so nothing below queries per player and every new card goes
+            # out in the flush before the aggregate pass.
+            self._roster = _ArchiveRoster(_match_format)
+            self._cards = None
+            cards = self._scorecard_index()
+
             def _lookup_player(p_name, team_id, player_id=None):
                 """Resolve player, preferring the id carried through the engine's
                 player dicts (set at match-setup time from DBPlayer.id) when
                 present, since it can't collide the way a name can. Falls back
-                to the name/profile lookup for older matches or hand-built
-                fixtures that never had an id attached.
+                to the name lookup within the team's format profile — and only
+                then to a legacy (profile_id IS NULL) row, never another
+                profile's — for older matches or hand-built fixtures that never
+                had an id attached.
                 """
-                if player_id:
-                    player = DBPlayer.query.get(player_id)
-                    if player and player.team_id == team_id:
-                        return player
-                    # id present but stale/mismatched (e.g. player moved teams,
-                    # or a spoofed/garbage value) — fall through to name lookup.
-
-                # Resolve player via format profile; only fall back to team-wide
-                # lookup for genuinely legacy (profile_id IS NULL) rows.
-                #
-                # Post-migration, every player belongs to a profile. Falling back
-                # to any team-wide match would risk attaching this match's stats
-                # to a player row in a *different* format profile.
-                profile = DBTeamProfile.query.filter_by(
-                    team_id=team_id, format_type=_match_format
-                ).first()
-                if profile:
-                    player = DBPlayer.query.filter_by(
-                        name=p_name, profile_id=profile.id
-                    ).first()
-                    if player:
-                        return player
-                # Legacy fallback: only accept an unassigned (pre-migration) row.
-                return DBPlayer.query.filter_by(
-                    name=p_name, team_id=team_id, profile_id=None
-                ).first()
+                return self._roster.player(p_name, team_id, player_id)
 
             def save_stats(stats_dict, team_id, innings_number, record_type, batting_stats=None):
                 if not stats_dict:
@@ -804,12 +867,7 @@ class MatchArchiver:
                         self._stats_incomplete = True
                         continue
 
-                    card = MatchScorecard.query.filter_by(
-                        match_id=self.match_id,
-                        player_id=player.id,
-                        innings_number=innings_number,
-                        record_type=record_type
-                    ).first()
+                    card = cards.get((player.id, innings_number, record_type))
                     if not card:
                         card = MatchScorecard(
                             match_id=self.match_id,
@@ -819,6 +877,7 @@ class MatchArchiver:
                             record_type=record_type
                         )
                         db.session.add(card)
+                        cards[(player.id, innings_number, record_type)] = card
                     else:
                         card.team_id = team_id
                         card.innings_number = innings_number
@@ -944,24 +1003,18 @@ class MatchArchiver:
                     _card.maidens = _s.get("maidens", 0)
                 db.session.add(_card)
 
-            # Update Player Aggregates. Track per-player deltas so milestone
-            # detection knows the exact "before" total (multi-wicket / multi-
-            # catch matches that straddle a milestone need the precise jump).
+            # Update Player Aggregates.
             #
             # Aggregate from this match's PERSISTED scorecard rows, not from
-            # db.session.new. The session runs with autoflush=True (Flask-
-            # SQLAlchemy default), and every save_stats() call issues a
-            # MatchScorecard lookup query that autoflushes previously-added
-            # cards out of db.session.new — so by the time this loop runs only
-            # the last-added card(s) would still be pending. Flushing then
-            # re-querying by match_id gives us every batting/bowling card
-            # (innings 1, 2, and super-over innings 3) exactly once. Old rows
-            # for this match were already reversed + deleted above, so this
-            # set contains only the cards just written for this archive.
+            # db.session.new: flushing (one batched INSERT per card shape)
+            # then re-querying by match_id gives us every batting/bowling
+            # card (innings 1, 2, and super-over innings 3) exactly once,
+            # whatever an earlier autoflush already wrote. Old rows for this
+            # match were already reversed + deleted above, so this set
+            # contains only the cards just written for this archive.
             db.session.flush()
             match_cards = MatchScorecard.query.filter_by(match_id=self.match_id).all()
             updated_players = set()
-            player_deltas = {}
             for card in match_cards:
                 # relationship loading fallback
                 p = DBPlayer.query.get(card.player_id)
@@ -970,7 +1023,6 @@ class MatchArchiver:
                 if card.player_id not in updated_players:
                     p.matches_played += 1
                     updated_players.add(card.player_id)
-                d = player_deltas.setdefault(card.player_id, {"runs": 0, "wickets": 0, "catches": 0})
 
                 if card.record_type == "batting":
                     p.total_runs += card.runs
@@ -990,7 +1042,6 @@ class MatchArchiver:
                             p.highest_score = card.runs
                         if not card.is_out and card.balls > 0:
                             p.not_outs += 1
-                    d["runs"] += card.runs or 0
 
                 if card.record_type == "bowling":
                     p.total_wickets += card.wickets
@@ -1009,46 +1060,53 @@ class MatchArchiver:
                         elif card.wickets == p.best_bowling_wickets:
                             if card.runs_conceded < p.best_bowling_runs:
                                 p.best_bowling_runs = card.runs_conceded
-                    d["wickets"] += card.wickets or 0
 
-                # Fielding contributions live on any record_type — they can
-                # appear on batting/bowling/fielding-only cards.
-                d["catches"] += card.catches or 0
+            # Materialized /statistics totals (excludes super-over cards).
+            apply_match_cards(match_cards, match_format=_match_format)
+            apply_head_to_head(db_match, match_cards)
+            apply_insights(db_match, match_cards)
+            bump_stats_version(db_match.user_id)
 
             # Save Partnerships
             # Determine which team batted first/second
             first_bat_team_id = innings_plan[0][1] # batting_team_id of 1st innings
             second_bat_team_id = innings_plan[1][1] # batting_team_id of 2nd innings
             
-            self._save_partnerships_to_db(self.match.first_innings_partnerships, 1, first_bat_team_id)
-            self._save_partnerships_to_db(self.match.second_innings_partnerships, 2, second_bat_team_id)
+            self._save_partnerships_to_db(self.match.first_innings_partnerships, 1, first_bat_team_id, db_match)
+            self._save_partnerships_to_db(self.match.second_innings_partnerships, 2, second_bat_team_id, db_match)
 
-            # Detect career milestones after aggregate updates
+            # Post-match analytics (impact, MOTM ranking, career milestones)
+            # in one pass, after the career totals above are up to date.
             all_milestones = []
+            nested = db.session.begin_nested()
             try:
-                from engine.stats_service import StatsService
-                for pid in updated_players:
-                    ms = StatsService.detect_milestones(pid, deltas=player_deltas.get(pid))
-                    all_milestones.extend(ms)
+                analysis = analyze_match(db_match, match_cards)
+                nested.commit()
+                all_milestones = analysis["milestones"]
                 if all_milestones:
                     self.logger.info(f"Milestones reached: {all_milestones}")
             except Exception as ms_err:
                 log_exception(ms_err)
-                self.logger.warning(f"Milestone detection failed (non-fatal): {ms_err}")
+                nested.rollback()
+                self.logger.warning(f"Post-match analytics failed (non-fatal): {ms_err}")
             self._milestones = all_milestones
 
             db_match.stats_incomplete = getattr(self, '_stats_incomplete', False)
 
-            db.session.commit()
+            if commit:
+                db.session.commit()
             return True
             
         except Exception as e:
             log_exception(e)
             self.logger.error(f"DB Save Error: {e}", exc_info=True)
+            if not commit:
+                raise
             db.session.rollback()
             return False
 
-    def _save_partnerships_to_db(self, partnerships: List[Dict], innings_number: int, batting_team_id: int) -> None:
+    def _save_partnerships_to_db(self, partnerships: List[Dict], innings_number: int, batting_team_id: int,
+                                 db_match: Optional[DBMatch] = None) -> None:
         """
         Save partnerships for an innings to the database.
         
@@ -1056,27 +1114,19 @@ class MatchArchiver:
             partnerships: List of partnership dictionaries from Match engine
             innings_number: 1 or 2
             batting_team_id: ID of the batting team
+            db_match: The archived Match row, source of the partnership index columns
         """
         if not partnerships:
             return
+        if db_match is None:
+            db_match = DBMatch.query.get(self.match_id)
 
-        _pfmt = self.match_data.get('match_format', 'T20')
-        _bat_profile = DBTeamProfile.query.filter_by(
-            team_id=batting_team_id, format_type=_pfmt
-        ).first()
+        # Profile-aware; the legacy fallback only accepts unassigned rows so
+        # partnerships are never attached to a different-format Player row.
+        roster = self._roster_for(self.match_data.get('match_format', 'T20'))
 
         def _lookup_batsman(name):
-            if _bat_profile:
-                p = DBPlayer.query.filter_by(
-                    name=name, profile_id=_bat_profile.id
-                ).first()
-                if p:
-                    return p
-            # Legacy fallback: only accept unassigned (pre-migration) rows so
-            # partnerships are never attached to a different-format Player row.
-            return DBPlayer.query.filter_by(
-                name=name, team_id=batting_team_id, profile_id=None
-            ).first()
+            return roster.player(name, batting_team_id)
 
         for p_data in partnerships:
              # Resolve player IDs (profile-aware)
@@ -1103,13 +1153,34 @@ class MatchArchiver:
                  batsman1_contribution=p_data.get('batsman1_contribution', 0),
                  batsman2_contribution=p_data.get('batsman2_contribution', 0),
                  start_over=p_data['start_over'],
-                 end_over=p_data['end_over']
+                 end_over=p_data['end_over'],
+                 **partnership_index_fields(db_match, b1.id, b2.id, batting_team_id)
              )
              db.session.add(mp)
 
-    def _reverse_player_aggregates(self, scorecards: List[MatchScorecard]) -> None:
+    def _roster_for(self, match_format: str) -> "_ArchiveRoster":
+        """The roster of the archive in progress, or a fresh one when a
+        helper is called on its own."""
+        roster = getattr(self, "_roster", None)
+        if roster is None or roster.match_format != match_format:
+            roster = self._roster = _ArchiveRoster(match_format)
+        return roster
+
+    def _scorecard_index(self) -> Dict[tuple, MatchScorecard]:
+        """This match's cards keyed by (player_id, innings_number,
+        record_type), loaded once and kept current as cards are added."""
+        index = getattr(self, "_cards", None)
+        if index is None:
+            index = self._cards = {}
+            for card in MatchScorecard.query.filter_by(match_id=self.match_id).order_by(MatchScorecard.id):
+                index.setdefault((card.player_id, card.innings_number, card.record_type), card)
+        return index
+
+    def _reverse_player_aggregates(self, scorecards: List[MatchScorecard],
+                                   match_format: Optional[str] = None) -> None:
         """Delegate to module-level function (kept for backwards compatibility)."""
-        reverse_player_aggregates(scorecards, logger=self.logger)
+        reverse_player_aggregates(scorecards, logger=self.logger, match_format=match_format,
+                                  match_id=self.match_id)
 
     def _copy_json_file(self, original_path: str) -> None:
         """Copy original JSON file to archive with validation"""
@@ -1241,7 +1312,7 @@ class MatchArchiver:
         return "\n".join(lines)
 
     def _format_detailed_scorecards(self) -> str:
-        """Format comprehensive scorecards using tabulate"""
+        """Format comprehensive scorecards (engine/scorecard.py tables)"""
         lines = [
             "=" * 80,
             "DETAILED MATCH SCORECARDS",
@@ -1306,17 +1377,31 @@ class MatchArchiver:
             'second_bowling': first_batting
         }
 
+    def _innings_model(self, innings_num: int, batting_stats: Dict, bowling_stats: Dict):
+        """Shared scorecard model for one innings. Reuses the match's own
+        model when it has one (already synced during play), otherwise builds
+        one from the stats dicts handed in."""
+        getter = getattr(self.match, 'innings_scorecard', None)
+        if callable(getter):
+            return getter(innings_num)
+        model = self._scorecard_models.get(innings_num)
+        if model is None:
+            model = self._scorecard_models[innings_num] = InningsScorecard()
+        model.sync(batting_stats, bowling_stats)
+        return model
+
     def _format_innings_scorecard(self, innings_num: int, batting_team: str, 
                                 bowling_team: str, batting_stats: Dict, 
                                 bowling_stats: Dict) -> List[str]:
         """Format a single innings scorecard"""
+        model = self._innings_model(innings_num, batting_stats, bowling_stats)
         lines = [
             f"{innings_num}{'ST' if innings_num == 1 else 'ND'} INNINGS - {batting_team} BATTING",
             "-" * 60
         ]
         
         # Batting table
-        lines.append(self._create_batting_table(batting_stats))
+        lines.append(model.batting_table_text())
         lines.extend([
             "",
             f"{innings_num}{'ST' if innings_num == 1 else 'ND'} INNINGS - {bowling_team} BOWLING",
@@ -1324,73 +1409,11 @@ class MatchArchiver:
         ])
         
         # Bowling table
-        lines.append(self._create_bowling_table(bowling_stats))
+        lines.append(model.bowling_table_text())
         lines.extend(["", ""])
         
         return lines
 
-    def _create_batting_table(self, batting_stats: Dict) -> str:
-        """Create formatted batting statistics table"""
-        if not batting_stats:
-            return "No batting statistics available"
-        
-        headers = ['Player', 'Runs', 'Balls', '1s', '2s', '3s', '4s', '6s', 'Dots', 'S/R', 'Status']
-        rows = []
-        
-        for player_name, stats in batting_stats.items():
-            if stats.get('balls', 0) > 0 or stats.get('wicket_type'):
-                strike_rate = f"{(stats['runs'] * 100 / stats['balls']):.1f}" if stats['balls'] > 0 else "0.0"
-                status = stats.get('wicket_type', '') or "not out"
-                
-                rows.append([
-                    player_name,
-                    stats.get('runs', 0),
-                    stats.get('balls', 0),
-                    stats.get('ones', 0),
-                    stats.get('twos', 0),
-                    stats.get('threes', 0),
-                    stats.get('fours', 0),
-                    stats.get('sixes', 0),
-                    stats.get('dots', 0),
-                    strike_rate,
-                    status
-                ])
-        
-        if not rows:
-            return "No batting data available"
-        
-        return tabulate(rows, headers=headers, tablefmt="grid")
-
-    def _create_bowling_table(self, bowling_stats: Dict) -> str:
-        """Create formatted bowling statistics table"""
-        if not bowling_stats:
-            return "No bowling statistics available"
-        
-        headers = ['Bowler', 'Overs', 'Maidens', 'Runs', 'Wickets', 'Economy', 'Wides', 'No Balls']
-        rows = []
-        
-        for bowler_name, stats in bowling_stats.items():
-            if stats.get('balls_bowled', 0) > 0:
-                total_balls = stats['balls_bowled']
-                overs_display = balls_to_overs_str(total_balls)
-                economy = f"{(stats['runs'] * 6 / total_balls):.2f}" if total_balls > 0 else "0.00"
-                
-                rows.append([
-                    bowler_name,
-                    overs_display,
-                    stats.get('maidens', 0),
-                    stats.get('runs', 0),
-                    stats.get('wickets', 0),
-                    economy,
-                    stats.get('wides', 0),
-                    stats.get('noballs', 0)
-                ])
-        
-        if not rows:
-            return "No bowling data available"
-        
-        return tabulate(rows, headers=headers, tablefmt="grid")
-
     def _format_match_summary(self) -> str:
         """Generate match summary statistics"""
         lines = [
@@ -1474,27 +1497,30 @@ class MatchArchiver:
                 first_bowling_lineup = away_xi
                 second_bowling_lineup = home_xi
             
+            first_model = self._innings_model(
+                1, getattr(self.match, 'first_innings_batting_stats', {}),
+                getattr(self.match, 'first_innings_bowling_stats', {}))
+            second_model = self._innings_model(
+                2, getattr(self.match, 'second_innings_batting_stats', {}),
+                getattr(self.match, 'second_innings_bowling_stats', {}))
+
             # Create CSV files for both innings with team names and full lineups
             csv_files = [
                 (f"{self.match_id}_{self.username}_{team_order['first_batting']}_batting.csv", 
-                getattr(self.match, 'first_innings_batting_stats', {}),
-                team_order['first_batting'], 'batting', first_batting_lineup),
+                first_model, team_order['first_batting'], 'batting', first_batting_lineup),
                 (f"{self.match_id}_{self.username}_{team_order['first_bowling']}_bowling.csv", 
-                getattr(self.match, 'first_innings_bowling_stats', {}),
-                team_order['first_bowling'], 'bowling', first_bowling_lineup),
+                first_model, team_order['first_bowling'], 'bowling', first_bowling_lineup),
                 (f"{self.match_id}_{self.username}_{team_order['second_batting']}_batting.csv", 
-                getattr(self.match, 'second_innings_batting_stats', {}),
-                team_order['second_batting'], 'batting', second_batting_lineup),
+                second_model, team_order['second_batting'], 'batting', second_batting_lineup),
                 (f"{self.match_id}_{self.username}_{team_order['second_bowling']}_bowling.csv", 
-                getattr(self.match, 'second_innings_bowling_stats', {}),
-                team_order['second_bowling'], 'bowling', second_bowling_lineup)
+                second_model, team_order['second_bowling'], 'bowling', second_bowling_lineup)
             ]
             
-            for filename, stats, team_name, file_type, lineup in csv_files:
+            for filename, model, team_name, file_type, lineup in csv_files:
                 if file_type == 'batting':
-                    self._create_batting_csv(filename, stats, team_name, lineup)
+                    self._create_batting_csv(filename, model, team_name, lineup)
                 else:
-                    self._create_bowling_csv(filename, stats, team_name)
+                    self._create_bowling_csv(filename, model, team_name)
             
             self.logger.debug("All CSV files created successfully")
             
@@ -1502,7 +1528,7 @@ class MatchArchiver:
             log_exception(e)
             raise MatchArchiverError(f"Failed to create CSV files: {e}")
 
-    def _create_batting_csv(self, filename: str, stats: Dict, team_name: str, full_lineup: List) -> None:
+    def _create_batting_csv(self, filename: str, model: InningsScorecard, team_name: str, full_lineup: List) -> None:
         """Create batting statistics CSV file with comprehensive data including all players"""
         csv_path = self.archive_path / filename
         
@@ -1517,53 +1543,10 @@ class MatchArchiver:
                 ]
                 writer.writerow(headers)
                 
-                # Write data for ALL players in the lineup
-                for player in full_lineup:
-                    player_name = player.get('name', 'Unknown')
-                    
-                    # Check if player actually batted (has balls faced > 0 OR has a wicket type)
-                    if (player_name in stats and 
-                        (stats[player_name].get('balls', 0) > 0 or stats[player_name].get('wicket_type'))):
-                        
-                        # Player has stats (actually batted)
-                        player_stats = stats[player_name]
-                        strike_rate = f"{(player_stats['runs'] * 100 / player_stats['balls']):.2f}" if player_stats['balls'] > 0 else "0.00"
-                        status = player_stats.get('wicket_type', '') or "not out"
-                        
-                        writer.writerow([
-                            player_name,
-                            team_name,
-                            player_stats.get('runs', 0),
-                            player_stats.get('balls', 0),
-                            player_stats.get('ones', 0),
-                            player_stats.get('twos', 0),
-                            player_stats.get('threes', 0),
-                            player_stats.get('fours', 0),
-                            player_stats.get('sixes', 0),
-                            player_stats.get('dots', 0),
-                            strike_rate,
-                            status,
-                            player_stats.get('bowler_out', ''),
-                            player_stats.get('fielder_out', '')
-                        ])
-                    else:
-                        # Player didn't bat - include only name and team, rest empty
-                        writer.writerow([
-                            player_name,
-                            team_name,
-                            '',  # Empty runs
-                            '',  # Empty balls
-                            '',  # Empty 1s
-                            '',  # Empty 2s
-                            '',  # Empty 3s
-                            '',  # Empty 4s
-                            '',  # Empty 6s
-                            '',  # Empty dots
-                            '',  # Empty strike rate
-                            '',  # Empty status
-                            '',  # Empty bowler out
-                            ''   # Empty fielder out
-                        ])
+                # ALL players in the lineup; those who didn't bat get name and
+                # team only, rest empty.
+                lineup_names = [player.get('name', 'Unknown') for player in full_lineup]
+                writer.writerows(model.batting_csv_rows(lineup_names, team_name))
             
             self.created_files.append(csv_path)
             self.logger.debug(f"Batting CSV created: {filename}")
@@ -1572,7 +1555,7 @@ class MatchArchiver:
             log_exception(e)
             raise MatchArchiverError(f"Failed to create batting CSV {filename}: {e}")
 
-    def _create_bowling_csv(self, filename: str, stats: Dict, team_name: str) -> None:
+    def _create_bowling_csv(self, filename: str, model: InningsScorecard, team_name: str) -> None:
         """Create bowling statistics CSV file with comprehensive data including team name"""
         csv_path = self.archive_path / filename
         
@@ -1586,27 +1569,7 @@ class MatchArchiver:
                     'Economy', 'Wides', 'No Balls', 'Byes', 'Leg Byes'
                 ]
                 writer.writerow(headers)
-                
-                # Write bowler data
-                for bowler_name, bowler_stats in stats.items():
-                    if bowler_stats.get('balls_bowled', 0) > 0:
-                        total_balls = bowler_stats['balls_bowled']
-                        overs_display = balls_to_overs_str(total_balls)
-                        economy = f"{(bowler_stats['runs'] * 6 / total_balls):.2f}" if total_balls > 0 else "0.00"
-                        
-                        writer.writerow([
-                            bowler_name,
-                            team_name,  # Added team name
-                            overs_display,
-                            bowler_stats.get('maidens', 0),
-                            bowler_stats.get('runs', 0),
-                            bowler_stats.get('wickets', 0),
-                            economy,
-                            bowler_stats.get('wides', 0),
-                            bowler_stats.get('noballs', 0),
-                            bowler_stats.get('byes', 0),
-                            bowler_stats.get('legbyes', 0)
-                        ])
+                writer.writerows(model.bowling_csv_rows(team_name))
             
             self.created_files.append(csv_path)
             self.logger.debug(f"Bowling CSV created: {filename}")
@@ -46,7 +46,8 @@ def _import_all_models():
     from database.models import (  # noqa: F401
         Team, Player, Match, MatchScorecard,
         Tournament, TournamentTeam, TournamentFixture,
-        MatchPartnership, TournamentPlayerStatsCache,
+        MatchPartnership, TournamentPlayerStatsCache, PlayerCareerStats, TeamPairSummary,
+        ConditionsSummary, PlayerFormSummary, MatchPlayerAnalytics,
         AdminAuditLog, FailedLoginAttempt, BlockedIP,
         ActiveSession, SiteCounter, LoginHistory, IPWhitelistEntry,
         UserGroundConfig, AnnouncementBanner, UserBannerDismissal,
@@ -0,0 +1,112 @@
+"""
+Insights Store Migration
+========================
+
+Creates the tables behind the Statistics Hub insights panel (see
+engine/insights_store.py):
+
+  conditions_summaries   per-(user, format) venue and pitch accumulators
+  player_form_summaries  per-(user, format, player) impact totals and the
+                         last few batting / bowling values
+
+and backfills them from matches the first time they are created.
+
+Idempotent: tables are detected via sqlite_master and only backfilled when
+both are empty, so re-runs are no-ops. A skipped backfill shows an empty
+insights panel until scripts/rebuild_insights.py is run.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+TABLES = {
+    "conditions_summaries": """
+        CREATE TABLE conditions_summaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id VARCHAR(120) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            match_format VARCHAR(20) NOT NULL DEFAULT 'T20',
+            kind VARCHAR(10) NOT NULL,
+            label VARCHAR(200) NOT NULL,
+            matches INTEGER DEFAULT 0,
+            runs INTEGER DEFAULT 0,
+            wickets INTEGER DEFAULT 0,
+            updated_at DATETIME,
+            CONSTRAINT uq_conditions_label UNIQUE (user_id, match_format, kind, label)
+        )
+    """,
+    "player_form_summaries": """
+        CREATE TABLE player_form_summaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id VARCHAR(120) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            match_format VARCHAR(20) NOT NULL DEFAULT 'T20',
+            player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+            runs INTEGER DEFAULT 0,
+            wickets INTEGER DEFAULT 0,
+            catches INTEGER DEFAULT 0,
+            run_outs INTEGER DEFAULT 0,
+            bat_innings INTEGER DEFAULT 0,
+            bowl_innings INTEGER DEFAULT 0,
+            batting_series TEXT DEFAULT '[]',
+            bowling_series TEXT DEFAULT '[]',
+            updated_at DATETIME,
+            CONSTRAINT uq_player_form_format UNIQUE (user_id, match_format, player_id)
+        )
+    """,
+}
+
+
+def run_migration(db, app):
+    """Apply the insights store migration within the given app context."""
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            for table, ddl in TABLES.items():
+                result = conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name=:name"
+                ), {"name": table}).fetchone()
+                if result is None:
+                    conn.execute(text(ddl))
+                    print(f"[Migration] add_insights_store: created {table} table.")
+                else:
+                    print(f"[Migration] add_insights_store: {table} already exists, skipping.")
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_insights_store"})
+            trans.rollback()
+            print(f"[Migration] add_insights_store: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+        # Backfill through the ORM so it shares engine/insights_store.py's fold.
+        from database.models import ConditionsSummary, PlayerFormSummary
+        from engine.insights_store import rebuild_insights
+
+        try:
+            if ConditionsSummary.query.first() is None and PlayerFormSummary.query.first() is None:
+                rows = rebuild_insights()
+                db.session.commit()
+                print(f"[Migration] add_insights_store: backfilled {rows} rows.")
+            print("[Migration] add_insights_store: completed successfully.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_insights_store"})
+            db.session.rollback()
+            print(f"[Migration] add_insights_store: backfill FAILED — {exc}")
+            raise
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
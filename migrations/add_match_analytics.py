@@ -0,0 +1,103 @@
+"""
+Match Analytics Migration
+=========================
+
+Creates the match_player_analytics table written by the post-match
+analytics stage (engine/match_analytics.py): per-player Impact Index, MOTM
+ranking and career milestones for every archived match.
+
+The first time it is created, impact scores and MOTM ranks are backfilled
+for existing matches; their milestones cannot be reconstructed and stay
+empty, and Match.motm_player_id is left as it was.
+
+Idempotent: the table is detected via sqlite_master and only backfilled
+when it is empty, so re-runs are no-ops.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+def run_migration(db, app):
+    """Apply the match_player_analytics migration within the given app context."""
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            result = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='match_player_analytics'"
+            )).fetchone()
+
+            if result is None:
+                conn.execute(text("""
+                    CREATE TABLE match_player_analytics (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        match_id VARCHAR(36) NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+                        user_id VARCHAR(120),
+                        tournament_id INTEGER,
+                        match_format VARCHAR(20),
+                        player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+                        team_id INTEGER,
+                        runs INTEGER DEFAULT 0,
+                        wickets INTEGER DEFAULT 0,
+                        catches INTEGER DEFAULT 0,
+                        run_outs INTEGER DEFAULT 0,
+                        impact_score INTEGER DEFAULT 0,
+                        weighted_score FLOAT,
+                        motm_rank INTEGER,
+                        milestones TEXT DEFAULT '[]',
+                        CONSTRAINT uq_match_player_analytics UNIQUE (match_id, player_id)
+                    )
+                """))
+                print("[Migration] add_match_analytics: created match_player_analytics table.")
+            else:
+                print("[Migration] add_match_analytics: table already exists, skipping.")
+
+            for statement in (
+                "CREATE INDEX IF NOT EXISTS ix_match_player_analytics_match_id "
+                "ON match_player_analytics (match_id)",
+                "CREATE INDEX IF NOT EXISTS ix_match_analytics_user_impact "
+                "ON match_player_analytics (user_id, impact_score)",
+                "CREATE INDEX IF NOT EXISTS ix_match_analytics_tournament_impact "
+                "ON match_player_analytics (tournament_id, impact_score)",
+            ):
+                conn.execute(text(statement))
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_match_analytics"})
+            trans.rollback()
+            print(f"[Migration] add_match_analytics: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+        # Backfill through the ORM so it shares engine/match_analytics.py's scoring.
+        from database.models import MatchPlayerAnalytics
+        from engine.match_analytics import rebuild_match_analytics
+
+        try:
+            if MatchPlayerAnalytics.query.first() is None:
+                matches = rebuild_match_analytics()
+                db.session.commit()
+                print(f"[Migration] add_match_analytics: analysed {matches} matches.")
+            print("[Migration] add_match_analytics: completed successfully.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_match_analytics"})
+            db.session.rollback()
+            print(f"[Migration] add_match_analytics: backfill FAILED — {exc}")
+            raise
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
@@ -0,0 +1,76 @@
+"""
+Match Ledger Migration
+======================
+
+Adds the per-match change ledger (see engine/match_ledger.py):
+
+  match_ledgers   one JSON record per applied tournament match of what
+                  TournamentEngine.update_standings() changed
+
+Nothing is backfilled: a match applied before this migration has no
+ledger and is reversed by recomputing the standings, as before.
+
+Idempotent: the table is detected via sqlite_master.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+LEDGER_DDL = """
+    CREATE TABLE match_ledgers (
+        match_id VARCHAR(36) NOT NULL PRIMARY KEY REFERENCES matches(id) ON DELETE CASCADE,
+        tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+        fixture_id INTEGER NOT NULL,
+        entries TEXT NOT NULL,
+        created_at DATETIME
+    )
+"""
+LEDGER_INDEX = "CREATE INDEX IF NOT EXISTS ix_match_ledgers_tournament_id ON match_ledgers (tournament_id)"
+
+
+def run_migration(db, app):
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            exists = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='matches'"
+            )).fetchone()
+            if not exists:
+                trans.rollback()
+                print("[Migration] add_match_ledger: matches absent — skipping.")
+                return
+
+            table = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='match_ledgers'"
+            )).fetchone()
+            if table is None:
+                conn.execute(text(LEDGER_DDL))
+                print("[Migration] add_match_ledger: created match_ledgers table.")
+            else:
+                print("[Migration] add_match_ledger: match_ledgers already exists, skipping.")
+            conn.execute(text(LEDGER_INDEX))
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_match_ledger"})
+            trans.rollback()
+            print(f"[Migration] add_match_ledger: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
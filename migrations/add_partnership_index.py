@@ -0,0 +1,125 @@
+"""
+Partnership Index Columns Migration
+===================================
+
+Adds the partnership index columns read by engine/partnership_index.py:
+
+  match_partnerships.user_id          VARCHAR(120) — Match.user_id
+  match_partnerships.tournament_id    INTEGER      — Match.tournament_id
+  match_partnerships.match_format     VARCHAR(20)  — Match.match_format
+  match_partnerships.batting_team_id  INTEGER      — batsman1's team
+  match_partnerships.player_a_id      INTEGER      — MIN(batsman1_id, batsman2_id)
+  match_partnerships.player_b_id      INTEGER      — MAX(batsman1_id, batsman2_id)
+
+plus the indexes behind the leaderboards and per-player breakdowns, then
+backfills every row whose user_id is still NULL from its match. New rows
+get the columns from MatchArchiver._save_partnerships_to_db.
+
+Idempotent: detects each column via PRAGMA, uses CREATE INDEX IF NOT EXISTS,
+and only backfills rows that have not been indexed yet.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+COLUMNS = (
+    ("user_id", "user_id VARCHAR(120)"),
+    ("tournament_id", "tournament_id INTEGER"),
+    ("match_format", "match_format VARCHAR(20)"),
+    ("batting_team_id", "batting_team_id INTEGER"),
+    ("player_a_id", "player_a_id INTEGER"),
+    ("player_b_id", "player_b_id INTEGER"),
+)
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_partnership_user_format_runs "
+    "ON match_partnerships (user_id, match_format, runs)",
+    "CREATE INDEX IF NOT EXISTS ix_partnership_tournament_runs "
+    "ON match_partnerships (tournament_id, runs)",
+    "CREATE INDEX IF NOT EXISTS ix_partnership_pair "
+    "ON match_partnerships (user_id, player_a_id, player_b_id)",
+    "CREATE INDEX IF NOT EXISTS ix_partnership_player_b "
+    "ON match_partnerships (user_id, player_b_id)",
+)
+
+BACKFILL = """
+UPDATE match_partnerships SET
+    user_id         = (SELECT m.user_id FROM matches m WHERE m.id = match_partnerships.match_id),
+    tournament_id   = (SELECT m.tournament_id FROM matches m WHERE m.id = match_partnerships.match_id),
+    match_format    = (SELECT m.match_format FROM matches m WHERE m.id = match_partnerships.match_id),
+    batting_team_id = (SELECT p.team_id FROM players p WHERE p.id = match_partnerships.batsman1_id),
+    player_a_id     = MIN(batsman1_id, batsman2_id),
+    player_b_id     = MAX(batsman1_id, batsman2_id)
+WHERE user_id IS NULL
+"""
+
+
+def _column_exists(conn, table, column):
+    rows = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
+    # row: (cid, name, type, notnull, dflt_value, pk)
+    return any(row[1] == column for row in rows)
+
+
+def run_migration(db, app):
+    with app.app_context():
+        conn = db.engine.connect()
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+        try:
+            exists = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='match_partnerships'"
+            )).fetchone()
+            if not exists:
+                print("[Migration] add_partnership_index: match_partnerships absent — skipping.")
+                return
+
+            added = []
+            for column, ddl in COLUMNS:
+                if not _column_exists(conn, "match_partnerships", column):
+                    conn.execute(text(f"ALTER TABLE match_partnerships ADD COLUMN {ddl}"))
+                    added.append(column)
+            for statement in INDEXES:
+                conn.execute(text(statement))
+            filled = conn.execute(text(BACKFILL)).rowcount
+            conn.commit()
+
+            if added or filled:
+                print(f"[Migration] add_partnership_index: added {len(added)} column(s), "
+                      f"indexed {filled} partnership row(s).")
+            else:
+                print("[Migration] add_partnership_index: already applied.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_partnership_index"})
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            print(f"[Migration] add_partnership_index: FAILED — {exc}")
+            raise
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Partnership Index Columns - Database Migration")
+    print("=" * 60)
+
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
@@ -0,0 +1,97 @@
+"""
+Player Career Stats Migration
+=============================
+
+Creates the player_career_stats table (materialized per-player, per-format
+totals behind /statistics — see engine/career_stats.py) and backfills it
+from match_scorecards the first time it is created.
+
+Idempotent: the table is detected via sqlite_master and only backfilled
+when it is empty, so re-runs are no-ops. StatsService falls back to the
+scorecard fold for users without career rows, so a skipped backfill is
+slow rather than wrong; scripts/rebuild_career_stats.py repairs it.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+_COUNTER_COLUMNS = (
+    "bat_innings", "bat_runs", "bat_balls", "bat_not_outs", "bat_fours",
+    "bat_sixes", "bat_ones", "bat_twos", "bat_threes", "bat_dots",
+    "bat_zeros", "bat_thirties", "bat_fifties", "bat_hundreds",
+    "bowl_innings", "bowl_balls", "bowl_runs", "bowl_wickets", "bowl_maidens",
+    "bowl_dots", "bowl_wides", "bowl_noballs", "bowl_byes", "bowl_leg_byes",
+    "bowl_wickets_bowled", "bowl_wickets_lbw",
+    "catches", "run_outs", "stumpings",
+)
+
+
+def run_migration(db, app):
+    """Apply player_career_stats migration within the given app context."""
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            result = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='player_career_stats'"
+            )).fetchone()
+
+            if result is None:
+                counters = ",\n".join(
+                    f"                        {col} INTEGER DEFAULT 0" for col in _COUNTER_COLUMNS
+                )
+                conn.execute(text(f"""
+                    CREATE TABLE player_career_stats (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+                        match_format VARCHAR(20) NOT NULL DEFAULT 'T20',
+                        matches INTEGER DEFAULT 0,
+{counters},
+                        best_bowling_wickets INTEGER DEFAULT 0,
+                        best_bowling_runs INTEGER,
+                        updated_at DATETIME,
+                        CONSTRAINT uq_player_career_format UNIQUE (player_id, match_format)
+                    )
+                """))
+                print("[Migration] add_player_career_stats: created player_career_stats table.")
+            else:
+                print("[Migration] add_player_career_stats: table already exists, skipping.")
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_player_career_stats"})
+            trans.rollback()
+            print(f"[Migration] add_player_career_stats: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+        # Backfill through the ORM so it shares engine/career_stats.py's rules.
+        from database.models import PlayerCareerStats
+        from engine.career_stats import rebuild_career_stats
+
+        try:
+            if PlayerCareerStats.query.first() is None:
+                rows = rebuild_career_stats()
+                db.session.commit()
+                print(f"[Migration] add_player_career_stats: backfilled {rows} rows.")
+            print("[Migration] add_player_career_stats: completed successfully.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_player_career_stats"})
+            db.session.rollback()
+            print(f"[Migration] add_player_career_stats: backfill FAILED — {exc}")
+            raise
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
@@ -0,0 +1,99 @@
+"""
+Standings Ball Counters Migration
+=================================
+
+Adds integer ball counters next to the legacy overs strings on
+tournament_teams:
+
+  tournament_teams.balls_faced    INTEGER NOT NULL DEFAULT 0
+  tournament_teams.balls_bowled   INTEGER NOT NULL DEFAULT 0
+
+and backfills them from overs_faced / overs_bowled ("19.5" -> 119) with the
+same conversion as TournamentEngine.overs_to_balls. From then on
+TournamentEngine keeps the counters authoritative and rewrites the strings
+from them.
+
+Idempotent: detects each column via PRAGMA and only backfills when a
+column was just added.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from engine.standings_recompute import overs_to_balls_sql
+from utils.exception_tracker import log_exception
+
+
+COLUMNS = (
+    ("balls_faced", "overs_faced"),
+    ("balls_bowled", "overs_bowled"),
+)
+
+
+def _column_exists(conn, table, column):
+    rows = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
+    # row: (cid, name, type, notnull, dflt_value, pk)
+    return any(row[1] == column for row in rows)
+
+
+def run_migration(db, app):
+    with app.app_context():
+        conn = db.engine.connect()
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+        try:
+            exists = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='tournament_teams'"
+            )).fetchone()
+            if not exists:
+                print("[Migration] add_standings_ball_counters: tournament_teams absent — skipping.")
+                return
+
+            filled = 0
+            for column, legacy in COLUMNS:
+                if _column_exists(conn, "tournament_teams", column):
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE tournament_teams ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                ))
+                filled = conn.execute(text(
+                    f"UPDATE tournament_teams SET {column} = {overs_to_balls_sql(legacy)}"
+                )).rowcount
+            conn.commit()
+
+            if filled:
+                print(f"[Migration] add_standings_ball_counters: backfilled {filled} standings row(s).")
+            else:
+                print("[Migration] add_standings_ball_counters: already applied.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_standings_ball_counters"})
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            print(f"[Migration] add_standings_ball_counters: FAILED — {exc}")
+            raise
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Standings Ball Counters - Database Migration")
+    print("=" * 60)
+
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
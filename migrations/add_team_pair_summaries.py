@@ -0,0 +1,97 @@
+"""
+Team Pair Summaries Migration
+=============================
+
+Creates the team_pair_summaries table (materialized per-team-pair,
+per-format head-to-head records behind /api/head-to-head — see
+engine/head_to_head.py) and backfills it from matches the first time it is
+created.
+
+Idempotent: the table is detected via sqlite_master and only backfilled
+when it is empty, so re-runs are no-ops. A skipped backfill shows existing
+pairs as never having met until scripts/rebuild_head_to_head.py is run.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+def run_migration(db, app):
+    """Apply team_pair_summaries migration within the given app context."""
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            result = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='team_pair_summaries'"
+            )).fetchone()
+
+            if result is None:
+                conn.execute(text("""
+                    CREATE TABLE team_pair_summaries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id VARCHAR(120) NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                        team_a_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+                        team_b_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+                        match_format VARCHAR(20) NOT NULL DEFAULT 'T20',
+                        played INTEGER DEFAULT 0,
+                        team_a_wins INTEGER DEFAULT 0,
+                        team_b_wins INTEGER DEFAULT 0,
+                        ties INTEGER DEFAULT 0,
+                        no_results INTEGER DEFAULT 0,
+                        team_a_runs INTEGER DEFAULT 0,
+                        team_b_runs INTEGER DEFAULT 0,
+                        highest_total INTEGER,
+                        highest_total_team_id INTEGER,
+                        highest_total_match_id VARCHAR(36),
+                        lowest_total INTEGER,
+                        lowest_total_team_id INTEGER,
+                        lowest_total_match_id VARCHAR(36),
+                        recent_results TEXT DEFAULT '[]',
+                        performers TEXT DEFAULT '{}',
+                        updated_at DATETIME,
+                        CONSTRAINT uq_team_pair_format UNIQUE (user_id, team_a_id, team_b_id, match_format)
+                    )
+                """))
+                print("[Migration] add_team_pair_summaries: created team_pair_summaries table.")
+            else:
+                print("[Migration] add_team_pair_summaries: table already exists, skipping.")
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_team_pair_summaries"})
+            trans.rollback()
+            print(f"[Migration] add_team_pair_summaries: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+        # Backfill through the ORM so it shares engine/head_to_head.py's fold.
+        from database.models import TeamPairSummary
+        from engine.head_to_head import rebuild_head_to_head
+
+        try:
+            if TeamPairSummary.query.first() is None:
+                rows = rebuild_head_to_head()
+                db.session.commit()
+                print(f"[Migration] add_team_pair_summaries: backfilled {rows} rows.")
+            print("[Migration] add_team_pair_summaries: completed successfully.")
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_team_pair_summaries"})
+            db.session.rollback()
+            print(f"[Migration] add_team_pair_summaries: backfill FAILED — {exc}")
+            raise
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
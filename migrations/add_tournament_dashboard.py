@@ -0,0 +1,87 @@
+"""
+Tournament Dashboard Migration
+==============================
+
+Adds the stored tournament dashboard (see engine/tournament_dashboard.py):
+
+  tournaments.version     INTEGER NOT NULL DEFAULT 0
+  tournament_dashboards   one JSON payload per tournament, built at a
+                          tournament version
+
+Nothing is backfilled: a tournament without a stored dashboard has it
+built on its first dashboard view.
+
+Idempotent: the column is detected via PRAGMA and the table via
+sqlite_master.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from utils.exception_tracker import log_exception
+
+
+DASHBOARD_DDL = """
+    CREATE TABLE tournament_dashboards (
+        tournament_id INTEGER NOT NULL PRIMARY KEY REFERENCES tournaments(id) ON DELETE CASCADE,
+        version INTEGER NOT NULL DEFAULT 0,
+        payload TEXT NOT NULL,
+        built_at DATETIME
+    )
+"""
+
+
+def _column_exists(conn, table, column):
+    rows = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
+    # row: (cid, name, type, notnull, dflt_value, pk)
+    return any(row[1] == column for row in rows)
+
+
+def run_migration(db, app):
+    with app.app_context():
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            exists = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='tournaments'"
+            )).fetchone()
+            if not exists:
+                trans.rollback()
+                print("[Migration] add_tournament_dashboard: tournaments absent — skipping.")
+                return
+
+            if _column_exists(conn, "tournaments", "version"):
+                print("[Migration] add_tournament_dashboard: tournaments.version already exists, skipping.")
+            else:
+                conn.execute(text("ALTER TABLE tournaments ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+                print("[Migration] add_tournament_dashboard: added tournaments.version.")
+
+            table = conn.execute(text(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='tournament_dashboards'"
+            )).fetchone()
+            if table is None:
+                conn.execute(text(DASHBOARD_DDL))
+                print("[Migration] add_tournament_dashboard: created tournament_dashboards table.")
+            else:
+                print("[Migration] add_tournament_dashboard: tournament_dashboards already exists, skipping.")
+
+            trans.commit()
+        except Exception as exc:
+            log_exception(exc, source="sqlite", context={"migration": "add_tournament_dashboard"})
+            trans.rollback()
+            print(f"[Migration] add_tournament_dashboard: FAILED — {exc}")
+            raise
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    from database import db as _db
+    from app import create_app
+
+    _app = create_app()
+    run_migration(_db, _app)
+    print("Done.")
@@ -114,6 +114,30 @@ MIGRATIONS: List[Tuple[str, Callable]] = [
     # matrices. Strip the copies that match the old shipped values verbatim.
     ("reset_stale_t20_pitch_tuning",
      _loader("migrations.reset_stale_t20_pitch_tuning")),
+    # Materialized per-player, per-format career totals for /statistics,
+    # backfilled from match_scorecards on first run.
+    ("add_player_career_stats",  _loader("migrations.add_player_career_stats")),
+    # Materialized per-team-pair, per-format head-to-head records for
+    # /api/head-to-head, backfilled from matches on first run.
+    ("add_team_pair_summaries",  _loader("migrations.add_team_pair_summaries")),
+    # Scope, batting side and canonical player pair copied onto each
+    # match_partnerships row so partnership leaderboards are index scans.
+    ("add_partnership_index",    _loader("migrations.add_partnership_index")),
+    # Venue/pitch accumulators and per-player impact + recent form for the
+    # Statistics Hub insights panel, backfilled from matches on first run.
+    ("add_insights_store",       _loader("migrations.add_insights_store")),
+    # Per-match impact, MOTM ranking and milestones from the post-match
+    # analytics stage; impact/ranks backfilled for existing matches.
+    ("add_match_analytics",      _loader("migrations.add_match_analytics")),
+    # Integer balls faced/bowled on tournament_teams, backfilled from the
+    # legacy overs strings; the engine's NRR arithmetic runs on these.
+    ("add_standings_ball_counters", _loader("migrations.add_standings_ball_counters")),
+    # Tournament version counter and the stored dashboard read model built
+    # at it; dashboards are built on first view, so nothing is backfilled.
+    ("add_tournament_dashboard", _loader("migrations.add_tournament_dashboard")),
+    # Per-match change ledger replayed by reverse_standings(); matches
+    # applied before it have none and reverse by recomputing, as before.
+    ("add_match_ledger",         _loader("migrations.add_match_ledger")),
 ]
 
 
@@ -31,7 +31,7 @@ fixture *statuses*, not whether those statuses are trustworthy.
 
 This script walks each knockout tournament's bracket round by round and:
   1. Resets any fixture whose true feeders are NOT both actually decided
-     back to the 'Locked' placeholder `_generate_knockout` would have
+     back to the 'Locked' placeholder `_plan_knockout` would have
      created (undoing the premature marking) — never touching one that
      already has a real match linked.
   2. Re-resolves (via the same `TournamentEngine._resolve_round_pair` the
@@ -117,7 +117,7 @@ def _in_flight_fixture_ids():
 
 
 def _virgin_stage_description(fixture, final_stage):
-    """The stage_description _generate_knockout gives a fresh placeholder.
+    """The stage_description _plan_knockout gives a fresh placeholder.
 
     Resetting has to land on the state the generator would have produced,
     not merely a blank one — the dashboard renders this label, and a None
@@ -170,7 +170,7 @@ def _diagnose_and_repair(engine, tournament, fixtures_by_bp, rounds,
     final_stage = engine.STAGE_FINAL
 
     def _reset(next_fixture, note):
-        """Return next_fixture to the state _generate_knockout would create."""
+        """Return next_fixture to the state _plan_knockout would create."""
         before = (
             next_fixture.status, next_fixture.home_team_id,
             next_fixture.away_team_id, next_fixture.winner_team_id,
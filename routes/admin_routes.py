@@ -13,6 +13,9 @@ from flask import Response, after_this_request, flash, jsonify, redirect, render
 from flask_login import current_user, login_user
 from sqlalchemy import func, or_
 from match_archiver import reverse_player_aggregates
+from engine import match_ledger
+from engine.stats_cache import bump_stats_version
+from engine.tournament_dashboard import refresh_dashboard
 from utils.exception_tracker import log_exception
 from werkzeug.utils import secure_filename
 
@@ -1965,18 +1968,35 @@ def register_admin_routes(
         if not tourn:
             return jsonify({"error": "Tournament not found"}), 404
         try:
+            # The ledgers describe results on fixtures that are about to go;
+            # what each recorded is written into the audit entry instead.
+            undone = match_ledger.tournament_ledgers(tournament_id)
+            match_ledger.discard_tournament(tournament_id)
             TournamentFixture.query.filter_by(tournament_id=tournament_id).delete()
             TournamentPlayerStatsCache.query.filter_by(tournament_id=tournament_id).delete()
             # Reset team standings
             TournamentTeam.query.filter_by(tournament_id=tournament_id).update({
                 'played': 0, 'won': 0, 'lost': 0, 'tied': 0, 'no_result': 0,
                 'points': 0, 'runs_scored': 0, 'runs_conceded': 0,
-                'overs_faced': '0.0', 'overs_bowled': '0.0', 'net_run_rate': 0.0
+                'overs_faced': '0.0', 'overs_bowled': '0.0', 'balls_faced': 0, 'balls_bowled': 0,
+                'net_run_rate': 0.0
             })
             tourn.status = 'Active'
             tourn.current_stage = 'league'
+            bump_stats_version(tourn.user_id)
+            refresh_dashboard(tournament_id)
             db.session.commit()
-            log_admin_action(current_user.id, 'reset_tournament', tourn.name, 'All fixtures and standings cleared', get_client_ip())
+            log_admin_action(
+                current_user.id, 'reset_tournament', tourn.name,
+                json.dumps({
+                    "message": "All fixtures and standings cleared",
+                    "undone": [
+                        {"match_id": match_id, "fixture_id": fixture_id, **entries}
+                        for match_id, fixture_id, entries in undone
+                    ],
+                }),
+                get_client_ip(),
+            )
             return jsonify({"message": f"Tournament '{tourn.name}' reset to initial state"}), 200
         except Exception as e:
             log_exception(e)
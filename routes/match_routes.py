@@ -9,6 +9,7 @@ import uuid
 import zipfile
 from datetime import datetime, timedelta
 
+from engine import match_analytics
 from engine.toss import home_bats_first
 from flask import flash, jsonify, redirect, render_template, request, send_file, url_for
 from flask_login import current_user, login_required
@@ -725,18 +726,30 @@ def register_match_routes(
 
         motm_player_name = motm_team_name = motm_stat_line = None
         if db_match.motm_player_id:
-            motm_cards = [
-                c for c in scorecards
-                if c.player_id == db_match.motm_player_id and not c.is_super_over
-            ]
-            if motm_cards:
-                motm_player_name = motm_cards[0].player_ref.name if motm_cards[0].player_ref else None
-                motm_team = teams.get(motm_cards[0].team_id)
-                motm_team_name = motm_team.name if motm_team else None
-                m_runs = sum(c.runs or 0 for c in motm_cards if c.record_type == "batting")
-                m_wkts = sum(c.wickets or 0 for c in motm_cards if c.record_type == "bowling")
-                m_catches = sum(c.catches or 0 for c in motm_cards)
-                m_run_outs = sum(c.run_outs or 0 for c in motm_cards)
+            # Stored by the post-match analytics stage; matches archived
+            # before it existed fall back to the MOTM's own cards.
+            motm = match_analytics.motm_for(match_id)
+            if motm is None or motm["player_id"] != db_match.motm_player_id:
+                motm_cards = [
+                    c for c in scorecards
+                    if c.player_id == db_match.motm_player_id and not c.is_super_over
+                ]
+                motm = None
+                if motm_cards:
+                    motm_team = teams.get(motm_cards[0].team_id)
+                    motm = {
+                        "player_name": motm_cards[0].player_ref.name if motm_cards[0].player_ref else None,
+                        "team_name": motm_team.name if motm_team else None,
+                        "runs": sum(c.runs or 0 for c in motm_cards if c.record_type == "batting"),
+                        "wickets": sum(c.wickets or 0 for c in motm_cards if c.record_type == "bowling"),
+                        "catches": sum(c.catches or 0 for c in motm_cards),
+                        "run_outs": sum(c.run_outs or 0 for c in motm_cards),
+                    }
+            if motm:
+                motm_player_name = motm["player_name"]
+                motm_team_name = motm["team_name"]
+                m_runs, m_wkts = motm["runs"], motm["wickets"]
+                m_catches, m_run_outs = motm["catches"], motm["run_outs"]
                 parts = []
                 if m_runs:
                     parts.append(f"{m_runs} runs")
@@ -1191,6 +1204,59 @@ def register_match_routes(
                 "match_id": match_id
             }), 500
 
+    @app.route("/match/<match_id>/fast-forward", methods=["POST"])
+    @login_required
+    @rate_limit(max_requests=10, window_seconds=10)
+    def fast_forward(match_id):
+        """Sim to the end of the innings ("until": "innings") or to the result
+        ("until": "result") in one request. Stops early on a manual-mode
+        decision or a super over, exactly where next-ball would."""
+        data = request.get_json(silent=True) or {}
+        until = str(data.get("until", "result")).lower()
+        if until not in {"innings", "result"}:
+            return jsonify({"error": "until must be innings or result"}), 400
+        try:
+            match, err = _get_or_restore_match_instance(match_id)
+            if err:
+                return err
+            if match.data.get("created_by") != current_user.id:
+                return jsonify({"error": "Unauthorized"}), 403
+
+            summary = match.fast_forward(until=until)
+            if summary.get("error"):
+                return jsonify(summary), 409
+
+            # Per-ball commentary goes to the resume replay log only — the
+            # response carries the compact ball log instead.
+            lines = summary.pop("commentary_lines")
+            if lines:
+                if not hasattr(match, "commentary_replay_log"):
+                    match.commentary_replay_log = []
+                match.commentary_replay_log.extend(lines)
+
+            final = summary.pop("final")
+            if summary["stopped_on"] == "super_over":
+                _persist_super_over_snapshot(match, match_id)
+            elif summary["stopped_on"] == "match_over":
+                _finalize_completed_match(match, match_id, final)
+            elif summary["stopped_on"] == "decision":
+                for key in ("decision_required", "decision_type", "decision_context", "decision_options"):
+                    summary[key] = final.get(key)
+            if final.get("super_over_required"):
+                summary["super_over_required"] = True
+            # Closing commentary (innings summary / result / decision prompt)
+            summary["commentary"] = lines[-1] if lines else ""
+
+            return jsonify(summary)
+        except Exception as e:
+            log_exception(e)
+            app.logger.error(f"[FastForward] Error simulating match {match_id}: {e}", exc_info=True)
+            return jsonify({
+                "error": "An error occurred while fast-forwarding the match",
+                "details": str(e),
+                "match_id": match_id
+            }), 500
+
     @app.route("/match/<match_id>/set-simulation-mode", methods=["POST"])
     @login_required
     def set_simulation_mode(match_id):
@@ -1833,14 +1899,13 @@ def register_match_routes(
                     # 1. Get scorecards to reverse stats
                     scorecards = MatchScorecard.query.filter_by(match_id=match_id).all()
                     
-                    # 2. Reverse aggregates
-                    if scorecards:
-                        try:
-                            # Import here or rely on global scope? assuming global scope based on view_file earlier
-                            reverse_player_aggregates(scorecards, logger=app.logger)
-                        except Exception as rev_err:
-                            log_exception(rev_err)
-                            app.logger.error(f"Error reversing stats for match {match_id}: {rev_err}", exc_info=True)
+                    # 2. Reverse aggregates (and the head-to-head / insights
+                    # summaries, which count a match even without cards)
+                    try:
+                        reverse_player_aggregates(scorecards, logger=app.logger, match_id=match_id)
+                    except Exception as rev_err:
+                        log_exception(rev_err)
+                        app.logger.error(f"Error reversing stats for match {match_id}: {rev_err}", exc_info=True)
                     
                     # 3. Delete dependent records explicitly
                     MatchPartnership.query.filter_by(match_id=match_id).delete()
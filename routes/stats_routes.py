@@ -1,8 +1,15 @@
 """Statistics and player-comparison route registration."""
 
-from flask import Response, flash, jsonify, redirect, render_template, request, url_for
+import functools
+import itertools
+
+from flask import (
+    Response, flash, jsonify, make_response, redirect, render_template, request, send_file, session,
+    stream_with_context, url_for,
+)
 from flask_login import current_user, login_required
-from markupsafe import escape
+from engine.stats_cache import get_stats_version, stats_etag
+from services import stats_exports
 from utils.exception_tracker import log_exception
 
 
@@ -21,9 +28,31 @@ def register_stats_routes(
     StatsService,
     aliased,
     func,
+    _get_app_version,
 ):
+    def conditional_stats(view):
+        """
+        Weak-ETag a stats view and answer If-None-Match with 304 while the
+        user's stats version (engine/stats_cache.py) is unchanged.
+        """
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = stats_etag(current_user.id, _get_app_version(), request.full_path)
+            # A pending flash must be rendered, so never short-circuit then.
+            if request.if_none_match.contains_weak(etag) and not session.get("_flashes"):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+
     @app.route("/statistics")
     @login_required
+    @conditional_stats
     def statistics():
         """Display statistics dashboard with overall or tournament-specific stats."""
         try:
@@ -151,39 +180,44 @@ def register_stats_routes(
             # the caller doesn't supply a format (e.g. bookmarked URL).
             match_format = request.args.get("match_format") or "T20"
 
-            if view_type == "overall":
-                stats_data = stats_service.get_overall_stats(current_user.id, match_format)
-            elif tournament_id:
-                stats_data = stats_service.get_tournament_stats(current_user.id, tournament_id, match_format)
-            else:
+            if view_type != "overall" and not tournament_id:
                 return jsonify({"error": "Please select a tournament"}), 400
+            if stat_type not in ("batting", "bowling", "fielding"):
+                return jsonify({"error": "Invalid stat type"}), 400
+            if view_type == "overall":
+                tournament_id = None
 
-            if stat_type == "batting":
-                data = stats_data["batting"]
-            elif stat_type == "bowling":
-                data = stats_data["bowling"]
-            elif stat_type == "fielding":
-                data = stats_data["fielding"]
+            # CSV is streamed off the database cursor one row at a time; the
+            # TXT grid needs every row's width first, so it is rendered from
+            # the page's stats in one tabulate() call.
+            if format_type == "csv":
+                rows = stats_service.iter_export_rows(
+                    current_user.id, stat_type, tournament_id=tournament_id, match_format=match_format)
+                first = next(rows, None)
+                data = [] if first is None else itertools.chain([first], rows)
+                mimetype = "text/csv"
+            elif format_type == "txt":
+                if tournament_id is None:
+                    stats_data = stats_service.get_overall_stats(current_user.id, match_format)
+                else:
+                    stats_data = stats_service.get_tournament_stats(current_user.id, tournament_id, match_format)
+                data = stats_data[stat_type]
+                mimetype = "text/plain"
             else:
-                return jsonify({"error": "Invalid stat type"}), 400
+                return jsonify({"error": "Invalid format type"}), 400
 
             if not data:
                 return jsonify({"error": f"No {stat_type} data available"}), 404
 
             view_label = f"tournament_{tournament_id}" if view_type == "tournament" else "overall"
             filename = f"{view_label}_{stat_type}_stats.{format_type}"
-
             if format_type == "csv":
-                content = stats_service.export_to_csv(data, stat_type)
-                mimetype = "text/csv"
-            elif format_type == "txt":
-                content = stats_service.export_to_txt(data, stat_type)
-                mimetype = "text/plain"
+                chunks = stats_service.iter_csv(data, stat_type)
             else:
-                return jsonify({"error": "Invalid format type"}), 400
+                chunks = [stats_service.export_to_txt(data, stat_type)]
 
             return Response(
-                content,
+                stream_with_context(chunks),
                 mimetype=mimetype,
                 headers={"Content-Disposition": f"attachment;filename={filename}"},
             )
@@ -214,6 +248,7 @@ def register_stats_routes(
     @app.route("/api/bowling-figures")
     @login_required
     @limiter.limit("30 per minute")
+    @conditional_stats
     def api_bowling_figures():
         """API endpoint for best bowling figures leaderboard."""
         try:
@@ -246,6 +281,43 @@ def register_stats_routes(
             app.logger.error(f"Error fetching bowling figures: {e}", exc_info=True)
             return jsonify({"error": "An internal error occurred"}), 500
 
+    @app.route("/api/leaderboards")
+    @login_required
+    @limiter.limit("30 per minute")
+    @conditional_stats
+    def api_leaderboards():
+        """API endpoint for every top-N leaderboard in one scope."""
+        try:
+            tournament_id = request.args.get("tournament_id", type=int)
+            limit = request.args.get("limit", 5, type=int)
+            # Omitting match_format means all formats combined.
+            match_format = request.args.get("match_format") or None
+            min_balls = request.args.get("min_balls", type=int)
+            min_overs = request.args.get("min_overs", type=int)
+
+            if limit < 1 or limit > 100:
+                return jsonify({"error": "Limit must be between 1 and 100"}), 400
+            if (min_balls is not None and min_balls < 0) or (min_overs is not None and min_overs < 0):
+                return jsonify({"error": "Qualifiers must not be negative"}), 400
+
+            stats_service = StatsService(app.logger)
+            boards = stats_service.get_leaderboards(
+                current_user.id,
+                tournament_id=tournament_id,
+                match_format=match_format,
+                limit=limit,
+                min_balls=min_balls,
+                min_overs=min_overs,
+            )
+            if "error" in boards:
+                return jsonify({"error": "An internal error occurred"}), 500
+
+            return jsonify({"success": True, "data": boards})
+        except Exception as e:
+            log_exception(e)
+            app.logger.error(f"Error fetching leaderboards: {e}", exc_info=True)
+            return jsonify({"error": "An internal error occurred"}), 500
+
     @app.route("/api/compare-players")
     @login_required
     @limiter.limit("30 per minute")
@@ -418,6 +490,7 @@ def register_stats_routes(
     @app.route("/api/partnerships")
     @login_required
     @limiter.limit("30 per minute")
+    @conditional_stats
     def api_overall_partnerships():
         """API endpoint for overall partnership leaderboard."""
         try:
@@ -428,57 +501,50 @@ def register_stats_routes(
             if limit < 1 or limit > 50:
                 return jsonify({"error": "Limit must be between 1 and 50"}), 400
 
-            batsman_1 = aliased(DBPlayer, name="batsman1")
-            batsman_2 = aliased(DBPlayer, name="batsman2")
-
-            partnerships_q = (
-                db.session.query(
-                    MatchPartnership,
-                    batsman_1.name.label("batsman1_name"),
-                    batsman_2.name.label("batsman2_name"),
-                    Tournament.name.label("tournament_name"),
-                )
-                .join(DBMatch, MatchPartnership.match_id == DBMatch.id)
-                .join(batsman_1, MatchPartnership.batsman1_id == batsman_1.id)
-                .join(batsman_2, MatchPartnership.batsman2_id == batsman_2.id)
-                .outerjoin(Tournament, DBMatch.tournament_id == Tournament.id)
-                .filter(DBMatch.user_id == current_user.id)
-            )
-            if match_format:
-                partnerships_q = partnerships_q.filter(DBMatch.match_format == match_format)
-            partnerships = (
-                partnerships_q
-                .order_by(MatchPartnership.runs.desc())
-                .limit(limit)
-                .all()
-            )
-
-            app.logger.info(
-                f"[Partnerships] Found {len(partnerships)} overall partnership rows (limit={limit}) for user {current_user.id}"
+            stats_service = StatsService(app.logger)
+            result = stats_service.get_overall_partnership_leaderboard(
+                current_user.id,
+                limit,
+                match_format=match_format,
             )
 
-            result = []
-            for p, b1_name, b2_name, tourn_name in partnerships:
-                result.append(
-                    {
-                        "batsman1": b1_name,
-                        "batsman2": b2_name,
-                        "runs": p.runs,
-                        "balls": p.balls,
-                        "wicket": p.wicket_number,
-                        "batsman1_contribution": p.batsman1_contribution,
-                        "batsman2_contribution": p.batsman2_contribution,
-                        "tournament": tourn_name,
-                        "match_id": p.match_id,
-                    }
-                )
-
             return jsonify({"success": True, "data": result, "count": len(result)})
         except Exception as e:
             log_exception(e)
             app.logger.error(f"Error fetching overall partnerships: {e}", exc_info=True)
             return jsonify({"error": "An internal error occurred"}), 500
 
+    @app.route("/api/partnership-records")
+    @login_required
+    @limiter.limit("30 per minute")
+    @conditional_stats
+    def api_partnership_records():
+        """API endpoint for best batting pairs and best stand per wicket."""
+        try:
+            tournament_id = request.args.get("tournament_id", type=int)
+            limit = request.args.get("limit", 10, type=int)
+            # Cricket stats are always format-specific. Default to T20 when
+            # the caller doesn't supply a format (e.g. bookmarked URL).
+            match_format = request.args.get("match_format") or "T20"
+            if limit < 1 or limit > 50:
+                return jsonify({"error": "Limit must be between 1 and 50"}), 400
+
+            stats_service = StatsService(app.logger)
+            records = stats_service.get_partnership_records(
+                current_user.id,
+                tournament_id=tournament_id,
+                match_format=match_format,
+                limit=limit,
+            )
+            if "error" in records:
+                return jsonify({"error": "An internal error occurred"}), 500
+
+            return jsonify({"success": True, "data": records})
+        except Exception as e:
+            log_exception(e)
+            app.logger.error(f"Error fetching partnership records: {e}", exc_info=True)
+            return jsonify({"error": "An internal error occurred"}), 500
+
     # ===== Head-to-Head =====
 
     @app.route("/head-to-head")
@@ -490,6 +556,7 @@ def register_stats_routes(
     @app.route("/api/head-to-head")
     @login_required
     @limiter.limit("30 per minute")
+    @conditional_stats
     def api_head_to_head():
         try:
             team1_id = request.args.get("team1_id", type=int)
@@ -515,6 +582,7 @@ def register_stats_routes(
 
     @app.route("/player/<int:player_id>")
     @login_required
+    @conditional_stats
     def player_profile_page(player_id):
         try:
             # A Player row is bound to one TeamProfile (one format). When the
@@ -543,6 +611,7 @@ def register_stats_routes(
 
     @app.route("/team-stats/<int:team_id>")
     @login_required
+    @conditional_stats
     def team_stats_page(team_id):
         try:
             # Cricket stats are always format-specific. Default to T20 when
@@ -593,42 +662,35 @@ def register_stats_routes(
             if not data:
                 return jsonify({"error": f"No {stat_type} data available"}), 404
 
-            # Build HTML for PDF
-            txt_content = stats_service.export_to_txt(data, stat_type)
-            view_label = f"tournament_{tournament_id}" if view_type == "tournament" else "overall"
-            title = f"{view_label} — {stat_type.title()} Statistics"
-
-            html = f"""<!DOCTYPE html>
-<html><head><meta charset="utf-8"><title>{escape(title)}</title>
-<style>
-body {{ font-family: 'Courier New', monospace; font-size: 10px; margin: 20px; }}
-h1 {{ font-size: 14px; border-bottom: 2px solid #333; padding-bottom: 5px; }}
-pre {{ white-space: pre-wrap; word-wrap: break-word; }}
-.footer {{ margin-top: 20px; font-size: 8px; color: #666; border-top: 1px solid #ccc; padding-top: 5px; }}
-</style></head><body>
-<h1>{escape(title)}</h1>
-<pre>{escape(txt_content)}</pre>
-<div class="footer">Generated by SimCricketX</div>
-</body></html>"""
-
-            try:
-                from weasyprint import HTML as WeasyHTML
-                pdf_bytes = WeasyHTML(string=html).write_pdf()
-                filename = f"{view_label}_{stat_type}_stats.pdf"
-                return Response(
-                    pdf_bytes,
-                    mimetype="application/pdf",
-                    headers={"Content-Disposition": f"attachment;filename={filename}"},
-                )
-            except ImportError:
-                log_exception(source="backend")
-                # Fallback: serve as downloadable HTML
-                filename = f"{view_label}_{stat_type}_stats.html"
-                return Response(
-                    html,
-                    mimetype="text/html",
-                    headers={"Content-Disposition": f"attachment;filename={filename}"},
-                )
+            # Rendering runs on the export worker (services/stats_exports.py);
+            # the artifact is reused until this user's stats version changes.
+            is_tournament = view_type != "overall"
+            job = stats_exports.ExportJob(
+                user_id=current_user.id,
+                version=get_stats_version(current_user.id),
+                view="tournament" if is_tournament else "overall",
+                tournament_id=tournament_id if is_tournament else None,
+                match_format=match_format,
+                stat_type=stat_type,
+            )
+            artifact = stats_exports.artifact_for(app, job)
+            if artifact is None:
+                if not stats_exports.request_export(job):
+                    return jsonify({"error": "Export queue is busy, please retry shortly"}), 503
+                # Rendered inline in synchronous mode (tests).
+                artifact = stats_exports.artifact_for(app, job)
+            if artifact is None:
+                failure = stats_exports.failure_for(job)
+                if failure is not None:
+                    app.logger.error(f"PDF export failed for {job!r}: {failure}")
+                    return jsonify({"error": "Error exporting statistics"}), 500
+                response = jsonify({"success": True, "status": "pending"})
+                response.status_code = 202
+                response.headers["Retry-After"] = "2"
+                return response
+
+            path, mimetype, filename = artifact
+            return send_file(path, mimetype=mimetype, as_attachment=True, download_name=filename)
         except Exception as e:
             log_exception(e)
             app.logger.error(f"Error exporting PDF: {e}", exc_info=True)
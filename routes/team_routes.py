@@ -7,6 +7,8 @@ from flask import flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
+from engine.stats_cache import bump_stats_version
+from engine.tournament_dashboard import bump_team_tournaments
 from utils.exception_tracker import log_exception
 from utils.squad_rules import validate_squad_composition
 
@@ -547,6 +549,8 @@ def register_team_routes(
                         db.session.rollback()
                         return render_template("team_create.html", error=save_err)
 
+                    # Stats views list the user's teams and players.
+                    bump_stats_version(current_user.id)
                     db.session.commit()
 
                     app.logger.info(
@@ -574,6 +578,7 @@ def register_team_routes(
 
                 profile = DBTeamProfile(team_id=new_team.id, format_type="T20")
                 db.session.add(profile)
+                bump_stats_version(current_user.id)
                 db.session.commit()
 
                 app.logger.info(
@@ -712,6 +717,7 @@ def register_team_routes(
         player.batting_hand = entry["batting_hand"]
         player.bowling_type = entry["bowling_type"]
         player.bowling_hand = entry["bowling_hand"]
+        bump_stats_version(current_user.id)
         db.session.commit()
         return json.dumps({
             "ok": True,
@@ -739,6 +745,7 @@ def register_team_routes(
             return json.dumps({"error": "Player not found."}), 404, {"Content-Type": "application/json"}
         name = player.name
         _detach_player_from_squad(player)
+        bump_stats_version(current_user.id)
         db.session.commit()
         return json.dumps({"ok": True, "name": name}), 200, {"Content-Type": "application/json"}
 
@@ -798,6 +805,7 @@ def register_team_routes(
         if error:
             return json.dumps({"error": error}), 400, {"Content-Type": "application/json"}
         team.is_draft = False
+        bump_stats_version(current_user.id)
         db.session.commit()
         return json.dumps({"ok": True}), 200, {"Content-Type": "application/json"}
 
@@ -897,6 +905,7 @@ def register_team_routes(
         if not is_draft:
             team.is_draft = False
 
+        bump_stats_version(current_user.id)
         db.session.commit()
         return json.dumps({"ok": True}), 200, {"Content-Type": "application/json"}
 
@@ -1070,6 +1079,7 @@ def register_team_routes(
             db.session.query(DBPlayer).filter_by(team_id=team.id).delete(synchronize_session=False)
             db.session.query(DBTeamProfile).filter_by(team_id=team.id).delete(synchronize_session=False)
             db.session.delete(team)
+            bump_stats_version(current_user.id)
             db.session.commit()
 
             app.logger.info(
@@ -1217,6 +1227,10 @@ def register_team_routes(
                         if DBPlayer.query.filter_by(profile_id=prof.id).count() == 0:
                             db.session.delete(prof)
 
+                    # Stored tournament dashboards and cached stats views
+                    # carry team and player names.
+                    bump_team_tournaments(team.id)
+                    bump_stats_version(team.user_id)
                     db.session.commit()
                     status_msg = "Draft" if is_draft else "Active"
                     app.logger.info(
@@ -1309,6 +1323,7 @@ def register_team_routes(
                         is_wicketkeeper=p.is_wicketkeeper,
                     ))
 
+            bump_stats_version(user_id)
             db.session.commit()
             app.logger.info(
                 f"Team '{source.short_code}' cloned as '{clone_code}' by {user_id}"
@@ -2,10 +2,14 @@
 
 import json
 import os
+import time
 
-from flask import flash, redirect, render_template, request, url_for
+from flask import Response, flash, jsonify, redirect, render_template, request, stream_with_context, url_for
 from flask_login import current_user, login_required
-from sqlalchemy import func as sa_func
+from engine.playoff_projection import project_tournament
+from engine.stats_cache import bump_stats_version
+from engine.tournament_dashboard import dashboard_for, refresh_dashboard
+from services import tournament_autosim
 from utils.exception_tracker import log_exception
 
 
@@ -64,9 +68,10 @@ def register_tournament_routes(
         scorecards = MatchScorecard.query.filter_by(match_id=match_id).all()
         player_ids = {c.player_id for c in scorecards}
 
-        # 1. Reverse player career stats
-        if reverse_stats and scorecards:
-            reverse_player_aggregates(scorecards, logger=app.logger)
+        # 1. Reverse player career stats and the match's head-to-head /
+        # insights summaries (which count it even without cards)
+        if reverse_stats:
+            reverse_player_aggregates(scorecards, logger=app.logger, match_id=match_id)
 
         # 2. Delete dependent records
         db.session.query(MatchPartnership).filter_by(match_id=match_id).delete(
@@ -255,134 +260,15 @@ def register_tournament_routes(
         if not t or t.user_id != current_user.id:
             return "Tournament not found", 404
 
-        standings = tournament_engine.get_standings(tournament_id)
-
-        # Eagerly load fixtures with relationships to avoid N+1
-        fixtures = (
-            TournamentFixture.query
-            .filter_by(tournament_id=tournament_id)
-            .order_by(TournamentFixture.round_number, TournamentFixture.id)
-            .all()
-        )
-
-        # Identify the next scheduled fixture for highlighting
-        next_fixture_id = None
-        for f in fixtures:
-            if f.status == "Scheduled":
-                next_fixture_id = f.id
-                break
-
-        # Tournament Leaders — live aggregates within this tournament's
-        # matches, top 5 each. Computed directly over DBMatch/MatchScorecard
-        # rather than via TournamentPlayerStatsCache: that cache is only
-        # rebuilt once per match, but update_standings() (which triggers
-        # the rebuild) runs before that same match's MatchScorecard rows
-        # are persisted (Step 10 vs Step 13 in the match-completion flow in
-        # app.py), so the cache always lags one match behind for whoever
-        # just played. Querying live avoids that lag.
-        motm_rows = (
-            db.session.query(DBMatch.motm_player_id, sa_func.count(DBMatch.id))
-            .filter(
-                DBMatch.tournament_id == tournament_id,
-                DBMatch.motm_player_id.isnot(None),
-            )
-            .group_by(DBMatch.motm_player_id)
-            .order_by(sa_func.count(DBMatch.id).desc())
-            .limit(5)
-            .all()
-        )
-
-        top_scorer_rows = (
-            db.session.query(MatchScorecard.player_id, sa_func.sum(MatchScorecard.runs))
-            .join(DBMatch, MatchScorecard.match_id == DBMatch.id)
-            .filter(
-                DBMatch.tournament_id == tournament_id,
-                MatchScorecard.record_type == "batting",
-                MatchScorecard.is_super_over.isnot(True),
-            )
-            .group_by(MatchScorecard.player_id)
-            .order_by(sa_func.sum(MatchScorecard.runs).desc())
-            .limit(5)
-            .all()
-        )
-
-        top_wicket_rows = (
-            db.session.query(
-                MatchScorecard.player_id,
-                sa_func.sum(MatchScorecard.wickets),
-                sa_func.sum(MatchScorecard.runs_conceded),
-            )
-            .join(DBMatch, MatchScorecard.match_id == DBMatch.id)
-            .filter(
-                DBMatch.tournament_id == tournament_id,
-                MatchScorecard.record_type == "bowling",
-                MatchScorecard.is_super_over.isnot(True),
-            )
-            .group_by(MatchScorecard.player_id)
-            .order_by(
-                sa_func.sum(MatchScorecard.wickets).desc(),
-                sa_func.sum(MatchScorecard.runs_conceded).asc(),
-            )
-            .limit(5)
-            .all()
-        )
-
-        # Resolve players/teams for all three leaderboards in one pair of
-        # queries instead of three.
-        all_player_ids = (
-            {pid for pid, _ in motm_rows}
-            | {pid for pid, _ in top_scorer_rows}
-            | {pid for pid, _, _ in top_wicket_rows}
-        )
-        players = {}
-        teams = {}
-        if all_player_ids:
-            players = {
-                p.id: p for p in DBPlayer.query.filter(DBPlayer.id.in_(all_player_ids)).all()
-            }
-            teams = {
-                t2.id: t2 for t2 in DBTeam.query.filter(
-                    DBTeam.id.in_([p.team_id for p in players.values() if p.team_id])
-                ).all()
-            }
-
-        motm_leaderboard = []
-        for player_id, count in motm_rows:
-            player = players.get(player_id)
-            if not player:
-                continue
-            team = teams.get(player.team_id)
-            motm_leaderboard.append({
-                "player_name": player.name,
-                "team_name": team.name if team else "",
-                "awards": count,
-            })
-
-        top_run_scorers = []
-        for player_id, runs in top_scorer_rows:
-            player = players.get(player_id)
-            if not player:
-                continue
-            team = teams.get(player.team_id)
-            top_run_scorers.append({
-                "player_id": player_id,
-                "player_name": player.name,
-                "team_name": team.name if team else "",
-                "runs": runs,
-            })
-
-        top_wicket_takers = []
-        for player_id, wickets, _conceded in top_wicket_rows:
-            player = players.get(player_id)
-            if not player:
-                continue
-            team = teams.get(player.team_id)
-            top_wicket_takers.append({
-                "player_id": player_id,
-                "player_name": player.name,
-                "team_name": team.name if team else "",
-                "wickets": wickets,
-            })
+        # Standings, fixtures by stage and leaders come from the stored
+        # read model (engine/tournament_dashboard.py), rebuilt once the
+        # completion handler has persisted scorecards and MOTM and cached
+        # per Tournament.version, so a warm view runs no further queries.
+        dashboard = dashboard_for(t)
+        standings = dashboard["standings"]
+        fixtures = [f for group in dashboard["stages"] for f in group["fixtures"]]
+        next_fixture_id = dashboard["next_fixture"]["id"] if dashboard["next_fixture"] else None
+        leaders = dashboard["leaders"]
 
         # Pure Knockout is the only mode whose fixtures are never staged
         # 'league' (see TournamentEngine.update_standings), so its
@@ -395,17 +281,35 @@ def register_tournament_routes(
             _format_knockout_stage(t.current_stage) if not has_league_standings else None
         )
 
+        # Monte Carlo qualification odds for the rest of the league
+        # (engine/playoff_projection.py), cached per standings state.
+        projections, projection_runs = {}, 0
+        if has_league_standings and t.status != "Completed":
+            try:
+                projection = project_tournament(t)
+                if projection:
+                    projections = {p["team_id"]: p for p in projection["teams"]}
+                    projection_runs = projection["simulations"]
+            except Exception as e:
+                log_exception(e)
+
         return render_template(
             "tournaments/dashboard.html",
             tournament=t,
             standings=standings,
             fixtures=fixtures,
             next_fixture_id=next_fixture_id,
-            motm_leaderboard=motm_leaderboard,
-            top_run_scorers=top_run_scorers,
-            top_wicket_takers=top_wicket_takers,
+            team_count=dashboard["team_count"],
+            completed_count=dashboard["completed_count"],
+            motm_leaderboard=leaders["motm"],
+            top_run_scorers=leaders["runs"],
+            top_wicket_takers=leaders["wickets"],
+            best_performances=leaders["performances"],
+            milestones=leaders["milestones"],
             has_league_standings=has_league_standings,
             current_round_label=current_round_label,
+            projections=projections,
+            projection_runs=projection_runs,
         )
 
     @app.route("/tournaments/<int:tournament_id>/rename", methods=["POST"])
@@ -427,6 +331,7 @@ def register_tournament_routes(
             return redirect(url_for("tournament_dashboard", tournament_id=tournament_id))
 
         t.name = new_name
+        bump_stats_version(t.user_id)
         db.session.commit()
         flash(f"Tournament renamed to '{new_name}'.", "success")
         return redirect(url_for("tournament_dashboard", tournament_id=tournament_id))
@@ -462,6 +367,7 @@ def register_tournament_routes(
             # Tournament cascades to TournamentTeam, TournamentFixture, and
             # TournamentPlayerStatsCache via relationship cascade on the model.
             db.session.delete(t)
+            bump_stats_version(t.user_id)
             db.session.commit()
             flash("Tournament deleted successfully.", "success")
         except Exception as e:
@@ -517,6 +423,7 @@ def register_tournament_routes(
                 fixture.match_id = None
                 fixture.standings_applied = False
 
+            refresh_dashboard(fixture.tournament_id)
             db.session.commit()
             flash("Match reset successfully. You can now re-simulate.", "success")
             return redirect(
@@ -533,3 +440,58 @@ def register_tournament_routes(
                     tournament_id=fixture.tournament_id if fixture else 0,
                 )
             )
+
+    @app.route("/tournaments/<int:tournament_id>/simulate-remaining", methods=["POST"])
+    @login_required
+    @limiter.limit("5 per minute")
+    def simulate_remaining_fixtures(tournament_id):
+        """Queue a headless run of every remaining fixture (202 + events URL)."""
+        t = db.session.get(Tournament, tournament_id)
+        if not t or t.user_id != current_user.id:
+            return jsonify({"error": "Tournament not found"}), 404
+        if t.status == "Completed":
+            return jsonify({"error": "Tournament is already completed"}), 409
+
+        run = tournament_autosim.request_run(tournament_id, current_user.id)
+        if run is None:
+            return jsonify({"error": "Simulation queue is full, try again shortly"}), 503
+        return jsonify({
+            "finished": run.finished,
+            "summary": run.summary,
+            "events_url": url_for("simulate_remaining_events", tournament_id=tournament_id),
+        }), 202
+
+    @app.route("/tournaments/<int:tournament_id>/simulate-remaining/events")
+    @login_required
+    def simulate_remaining_events(tournament_id):
+        """Server-Sent Events for the tournament's latest simulation run."""
+        t = db.session.get(Tournament, tournament_id)
+        if not t or t.user_id != current_user.id:
+            return jsonify({"error": "Tournament not found"}), 404
+        run = tournament_autosim.run_for(tournament_id)
+        if run is None:
+            return jsonify({"error": "No simulation run for this tournament"}), 404
+
+        # Resume from the browser's last event id after a reconnect.
+        try:
+            offset = int(request.headers.get("Last-Event-ID", -1)) + 1
+        except ValueError:
+            offset = 0
+
+        def stream():
+            index = offset
+            while True:
+                events, finished = run.events_since(index)
+                for event in events:
+                    yield f"id: {index}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                    index += 1
+                if finished and not events:
+                    return
+                if not events:
+                    time.sleep(0.25)
+
+        return Response(
+            stream_with_context(stream()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -0,0 +1,152 @@
+"""
+Fit the fast match model used by engine/playoff_projection.py.
+
+Plays headless engine matches between randomly rated sides and fits, per
+format: the first-innings score (least squares on the batting side's
+batting and the fielding side's bowling; the intercept is the score at
+70/70), the chance a chase succeeds (logistic regression on the target,
+the chaser's batting and the defending side's bowling, holding the pitch
+fixed — a flat pitch raises the target and the chase together, which
+otherwise hides the target's effect), the tie rate, the share of the quota
+a won chase uses and the margin a failed one falls short by. Prints a
+MatchModel to paste into MODELS; nothing is written.
+
+The rating effects are small next to the match-to-match spread, so a few
+hundred matches do not pin down even their sign; use thousands.
+
+Run from project root:
+    python scripts/calibrate_projection.py               # T20, 5000 matches
+    python scripts/calibrate_projection.py ListA
+"""
+import logging
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.CRITICAL)
+
+from engine.format_config import get_format
+from engine.playoff_projection import MatchModel
+from engine.tournament_autosim import play_fixture
+from engine.weather import generate_weather_script
+
+
+def _side(prefix, bat_base, bowl_base, rng):
+    roles = ["Wicketkeeper"] + ["Batsman"] * 5 + ["All-rounder"] * 2 + ["Bowler"] * 3
+    players = []
+    for i, role in enumerate(roles):
+        bat = bat_base - i * 3 + rng.randint(-5, 5) if i < 8 else 35 + rng.randint(-5, 5)
+        bowl = bowl_base + rng.randint(-5, 5) if role in ("Bowler", "All-rounder") else 30
+        players.append({
+            "id": None,
+            "name": f"{prefix}_P{i + 1}",
+            "role": role,
+            "batting_rating": max(10, min(99, bat)),
+            "bowling_rating": max(10, min(99, bowl)),
+            "fielding_rating": 60,
+            "batting_hand": "Right",
+            "bowling_type": "Fast" if i % 2 else "Off spin",
+            "bowling_hand": "Right",
+            "is_captain": i == 0,
+            "will_bowl": role in ("Bowler", "All-rounder"),
+        })
+    return players
+
+
+def _strength(players):
+    """Same summary as playoff_projection.team_strength()."""
+    bats = sorted((p["batting_rating"] for p in players), reverse=True)[:7]
+    bowls = [p["bowling_rating"] for p in players if p["will_bowl"]]
+    return sum(bats) / len(bats), sum(bowls) / len(bowls)
+
+
+def _play(fmt, rng):
+    home = _side("HOM", rng.randint(55, 90), rng.randint(50, 90), rng)
+    away = _side("AWY", rng.randint(55, 90), rng.randint(50, 90), rng)
+    data = {
+        "match_id": f"cal_{rng.random()}", "created_by": "calibrate", "timestamp": "0",
+        "team_home": "HOM_cal", "team_away": "AWY_cal", "stadium": "Calibration Ground",
+        "pitch": rng.choice(["Green", "Dry", "Hard", "Flat", "Dead"]), "toss": "Heads",
+        "toss_winner": rng.choice(["HOM", "AWY"]), "toss_decision": rng.choice(["Bat", "Bowl"]),
+        "simulation_mode": "auto", "match_format": fmt.name, "is_day_night": False,
+        "playing_xi": {"home": home, "away": away}, "substitutes": {"home": [], "away": []},
+        "weather_forecast": "clear",
+        "weather_script": generate_weather_script("clear", fmt.overs, fmt.name, rng=rng),
+    }
+    match = play_fixture(data)
+    home_first = match.first_batting_team_name == "HOM"
+    first, chaser = (home, away) if home_first else (away, home)
+    chase_balls = sum(int(b.get("balls_bowled", 0) or 0)
+                      for b in match.second_innings_bowling_stats.values())
+    return {
+        "target": match.first_innings_score,
+        "chase": match.score,
+        "chase_balls": chase_balls,
+        "pitch": data["pitch"],
+        "first": (_strength(first)[0], _strength(chaser)[1]),
+        "chaser": (_strength(chaser)[0], _strength(first)[1]),
+    }
+
+
+def fit(fmt, rows):
+    target = np.array([r["target"] for r in rows], dtype=float)
+    chase = np.array([r["chase"] for r in rows], dtype=float)
+    first = np.array([r["first"] for r in rows]) - 70
+    chaser = np.array([r["chaser"] for r in rows]) - 70
+
+    X = np.column_stack([np.ones(len(rows)), first])
+    coef, *_ = np.linalg.lstsq(X, target, rcond=None)
+    sd = (target - X @ coef).std()
+
+    # Logistic regression (Newton) for a successful chase. Pitches enter
+    # effect-coded (each column +1 for its pitch, -1 for the last), so the
+    # intercept is the average over pitches and only the first four
+    # coefficients go into the model.
+    won = (chase > target).astype(float)
+    pitches = sorted({r["pitch"] for r in rows})
+    pitch = np.array([r["pitch"] for r in rows])
+    effects = [(pitch == p).astype(float) - (pitch == pitches[-1]) for p in pitches[:-1]]
+    Z = np.column_stack([np.ones(len(rows)), target - target.mean(), chaser, *effects])
+    w = np.zeros(Z.shape[1])
+    for _ in range(50):
+        p = 1 / (1 + np.exp(-Z @ w))
+        H = Z.T @ (Z * (p * (1 - p))[:, None])
+        w += np.linalg.solve(H + 1e-6 * np.eye(len(w)), Z.T @ (won - p))
+
+    quota = fmt.overs * 6
+    fraction = np.array([r["chase_balls"] / quota for r in rows if r["chase"] > r["target"]])
+    short = target[chase < target] - chase[chase < target]
+    return MatchModel(
+        quota_balls=quota,
+        first_mean=round(float(coef[0]), 1),
+        first_bat=round(float(coef[1]), 3),
+        first_bowl=round(float(coef[2]), 3),
+        first_sd=round(float(sd), 1),
+        first_min=int(np.percentile(target, 1)) // 10 * 10,
+        chase_centre=round(float(target.mean()), 1),
+        chase_logit=tuple(round(float(v), 4) for v in w[:4]),
+        tie_rate=round(float((chase == target).mean()), 3),
+        chase_balls=(round(float(fraction.mean()), 3), round(float(fraction.std()), 2)),
+        loss_margin=(round(float(short.mean()), 1), round(float(short.std()), 1)),
+    )
+
+
+def main():
+    fmt = get_format(sys.argv[1] if len(sys.argv) > 1 else "T20")
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    rng = random.Random(20240611)
+    random.seed(20240611)
+    rows = []
+    for i in range(n):
+        rows.append(_play(fmt, rng))
+        if (i + 1) % 50 == 0:
+            print(f"  {i + 1}/{n} matches")
+    print(f"\n{fmt.name}: {fit(fmt, rows)}")
+
+
+if __name__ == "__main__":
+    main()
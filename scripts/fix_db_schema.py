@@ -83,6 +83,8 @@ def ensure_schema(engine, db_obj=None):
         "verify_resend_window_start":  "DATETIME",
         # Force re-verify on next login for pre-existing users
         "force_email_verify":          "BOOLEAN NOT NULL DEFAULT 0",
+        # StatsService cache / ETag version (engine/stats_cache.py)
+        "stats_version":               "INTEGER NOT NULL DEFAULT 0",
     })
 
     # Backfill: pre-existing users (created before email verification was introduced)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rating-sensitivity sweep over the ball-outcome kernel.
+
+Evaluates the exact per-ball outcome distribution for a grid of batting x
+bowling ratings across every pitch, phase and a few balls-faced points, and
+writes strike-rate / dismissal-rate / boundary-rate surfaces. Takes seconds,
+so use it before a full-match calibration run (tests/test_scoring_calibration.py)
+to see whether a config edit moves ratings at all.
+
+Results are cached under data/sweeps/ keyed by the ground config + grid.
+
+Usage:
+    python3 scripts/rating_sweep.py                              # T20 summary
+    python3 scripts/rating_sweep.py --format ListA --csv listA.csv
+    python3 scripts/rating_sweep.py --pitch Hard --pitch Flat --json out.json
+    python3 scripts/rating_sweep.py --config my_ground.json      # a stored format block
+    python3 scripts/rating_sweep.py --bowling-type "Off spin" --fielding 85
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine.rating_sweep import (  # noqa: E402
+    SweepGrid, rating_spread, run_sweep, write_csv, write_json,
+)
+
+DEFAULT_CACHE = os.path.join(ROOT, "data", "sweeps")
+METRICS = ("strike_rate", "dismissal_rate", "boundary_rate")
+
+
+def _ints(text):
+    return tuple(int(x) for x in text.split(",") if x.strip())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--format", default="T20", choices=("T20", "ListA"))
+    parser.add_argument("--pitch", action="append", help="repeatable; default all")
+    parser.add_argument("--batting", type=_ints, help="comma list, e.g. 40,60,80")
+    parser.add_argument("--bowling", type=_ints, help="comma list")
+    parser.add_argument("--balls-faced", type=_ints, help="comma list")
+    parser.add_argument("--bowling-type", default="Medium")
+    parser.add_argument("--fielding", type=int, default=70)
+    parser.add_argument("--config", help="JSON file holding a ground-config format block")
+    parser.add_argument("--csv", help="write the full surface as CSV")
+    parser.add_argument("--json", help="write the full surface as JSON")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    defaults = SweepGrid()
+    grid = SweepGrid(
+        batting=args.batting or defaults.batting,
+        bowling=args.bowling or defaults.bowling,
+        pitches=tuple(args.pitch or ()),
+        balls_faced=args.balls_faced or defaults.balls_faced,
+        bowling_type=args.bowling_type,
+        fielding=args.fielding,
+    )
+    config = None
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+    started = time.perf_counter()
+    rows = run_sweep(grid, ground_config=config, format_name=args.format,
+                     cache_dir=None if args.no_cache else args.cache_dir)
+    elapsed = time.perf_counter() - started
+
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, args.json)
+
+    print(f"\n{args.format} rating sweep: {len(rows)} cells in {elapsed:.2f}s\n")
+    print("Spread (max - min) across the rating range, balls_faced=10:")
+    print(f"{'Pitch':<7} {'Phase':<10} " + "  ".join(f"{m + ' bat/bowl':>26}" for m in METRICS))
+    pitches = sorted({r["pitch"] for r in rows})
+    phases = list(dict.fromkeys(r["phase"] for r in rows))
+    balls = 10 if 10 in grid.balls_faced else grid.balls_faced[0]
+    for pitch in pitches:
+        for phase in phases:
+            cols = []
+            for metric in METRICS:
+                s = rating_spread(rows, metric, pitch=pitch, phase=phase, balls_faced=balls)
+                scale = 1.0 if metric == "strike_rate" else 100.0
+                cols.append(f"{s['batting'] * scale:>12.2f}/{s['bowling'] * scale:<13.2f}")
+            print(f"{pitch:<7} {phase:<10} " + "  ".join(cols))
+    print("\n(strike_rate in SR points; dismissal/boundary rates in percentage points)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
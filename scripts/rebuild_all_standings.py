@@ -2,10 +2,11 @@
 """
 One-time rebuild of every tournament's standings from match data.
 
-Iterates every tournament, zeroes its tournament_teams rows, then replays
-every league-stage match through the same point/NRR rules the engine uses
-at runtime — but with the defensive overs cap applied (so legacy "20.1 in
-a 20-over match" rows no longer skew NRR).
+Recomputes each tournament's tournament_teams rows from its completed
+league matches with the grouped query TournamentEngine.recompute_standings()
+also runs (engine/standings_recompute.py) — points, integer balls faced/bowled
+with the all-out and defensive overs cap (so legacy "20.1 in a 20-over
+match" rows no longer skew NRR), and the NRR derived from them.
 
 This connects DIRECTLY to the SQLite file. No Flask, no SQLAlchemy. Run
 against a backup first; `--apply` is opt-in.
@@ -30,166 +31,35 @@ DEFAULT_DB = os.path.join(
     "cricket_sim.db",
 )
 
-POINTS_WIN = 2
-POINTS_TIE = 1
-POINTS_NO_RESULT = 1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-LEAGUE_STAGE = "league"
-
-NO_RESULT_KEYWORDS = (
-    "abandoned", "no result", "washed out", "called off",
-    "no play", "n/r",
+from engine.standings_recompute import (  # noqa: E402 — stdlib-only module
+    COLUMNS,
+    LEAGUE_STAGE,
+    empty_row,
+    standings_params,
+    standings_sql,
+    table_from_rows,
 )
 
 
-# ---------------------------------------------------------------------------
-# Cricket overs helpers — mirror tournament_engine.py exactly
-# ---------------------------------------------------------------------------
-
-def overs_to_balls(overs):
-    if not overs:
-        return 0
-    try:
-        f = float(overs)
-    except (ValueError, TypeError):
-        return 0
-    if f < 0:
-        return 0
-    whole = int(f)
-    partial = round((f - whole) * 10)
-    if partial > 5:
-        partial = 5
-    return whole * 6 + partial
-
-
 def balls_to_overs(balls):
     return f"{balls // 6}.{balls % 6}"
 
 
-def add_overs(o1, o2):
-    return balls_to_overs(overs_to_balls(o1 or "0.0") + overs_to_balls(o2 or "0.0"))
-
-
-def nrr_overs(actual_overs, wickets, overs_per_side):
-    """ICC all-out rule + defensive cap on overs > full quota."""
-    ops = int(overs_per_side or 20)
-    if wickets is not None and int(wickets) >= 10:
-        return f"{ops}.0"
-    actual = actual_overs or "0.0"
-    if overs_to_balls(actual) > ops * 6:
-        return f"{ops}.0"
-    return actual
-
-
-def calc_nrr(runs_scored, overs_faced, runs_conceded, overs_bowled):
-    bf = overs_to_balls(overs_faced)
-    bb = overs_to_balls(overs_bowled)
-    rrf = (runs_scored or 0) / (bf / 6.0) if bf > 0 else 0.0
-    rra = (runs_conceded or 0) / (bb / 6.0) if bb > 0 else 0.0
-    return round(rrf - rra, 6)
-
-
 def _column_exists(conn, table, column):
     rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
     return any(row[1] == column for row in rows)
 
 
-def is_no_result(match):
-    """Mirror engine._is_no_result: prefer the structured match_status the
-    engine sets directly; fall back to keyword-sniffing result_description
-    (winner=None + (NR keyword OR no balls)) for matches archived before
-    that column existed — permanent fallback, this is never backfilled."""
-    match_status = match.get("match_status")
-    if match_status is not None:
-        return match_status == "no_result"
-
-    if match["winner_team_id"]:
-        return False
-    desc = (match["result_description"] or "").lower()
-    if any(kw in desc for kw in NO_RESULT_KEYWORDS):
-        return True
-    if (
-        overs_to_balls(match["home_team_overs"]) == 0
-        and overs_to_balls(match["away_team_overs"]) == 0
-    ):
-        return True
-    return False
-
-
 # ---------------------------------------------------------------------------
 # Per-tournament rebuild
 # ---------------------------------------------------------------------------
 
-def fresh_team_state(team_id):
-    return {
-        "team_id": team_id,
-        "played": 0, "won": 0, "lost": 0, "tied": 0, "no_result": 0,
-        "points": 0,
-        "runs_scored": 0, "overs_faced": "0.0",
-        "runs_conceded": 0, "overs_bowled": "0.0",
-        "net_run_rate": 0.0,
-    }
-
-
-def apply_match(home, away, match):
-    """Apply one league match's deltas to the two team states (in place)."""
-    home["played"] += 1
-    away["played"] += 1
-
-    nr = is_no_result(match)
-    wid = match["winner_team_id"]
-
-    if nr:
-        home["no_result"] += 1
-        away["no_result"] += 1
-        home["points"] += POINTS_NO_RESULT
-        away["points"] += POINTS_NO_RESULT
-    elif wid == match["home_team_id"]:
-        home["won"] += 1
-        home["points"] += POINTS_WIN
-        away["lost"] += 1
-    elif wid == match["away_team_id"]:
-        away["won"] += 1
-        away["points"] += POINTS_WIN
-        home["lost"] += 1
-    else:
-        home["tied"] += 1
-        away["tied"] += 1
-        home["points"] += POINTS_TIE
-        away["points"] += POINTS_TIE
-
-    if nr:
-        return  # NRR not updated for no-results
-
-    ops = match["overs_per_side"]
-    h_overs = nrr_overs(match["home_team_overs"], match["home_team_wickets"], ops)
-    a_overs = nrr_overs(match["away_team_overs"], match["away_team_wickets"], ops)
-
-    # Home batting / away bowling
-    home["runs_scored"] += match["home_team_score"] or 0
-    home["overs_faced"] = add_overs(home["overs_faced"], h_overs)
-    away["runs_conceded"] += match["home_team_score"] or 0
-    away["overs_bowled"] = add_overs(away["overs_bowled"], h_overs)
-
-    # Away batting / home bowling
-    away["runs_scored"] += match["away_team_score"] or 0
-    away["overs_faced"] = add_overs(away["overs_faced"], a_overs)
-    home["runs_conceded"] += match["away_team_score"] or 0
-    home["overs_bowled"] = add_overs(home["overs_bowled"], a_overs)
-
-    home["net_run_rate"] = calc_nrr(
-        home["runs_scored"], home["overs_faced"],
-        home["runs_conceded"], home["overs_bowled"],
-    )
-    away["net_run_rate"] = calc_nrr(
-        away["runs_scored"], away["overs_faced"],
-        away["runs_conceded"], away["overs_bowled"],
-    )
-
-
 def rebuild_tournament(conn, tournament, *, quiet=False):
     """Return (per_team_diff, league_match_count)."""
     tid = tournament["id"]
+    has_balls = _column_exists(conn, "tournament_teams", "balls_faced")
 
     # Tournament teams (skip BYE/TBD placeholders)
     rows = conn.execute(
@@ -205,75 +75,56 @@ def rebuild_tournament(conn, tournament, *, quiet=False):
         (tid,),
     ).fetchall()
 
-    states = {}
-    before = {}
-    tt_id_by_team = {}
-    for r in rows:
-        if r["is_placeholder"]:
-            continue
-        states[r["team_id"]] = fresh_team_state(r["team_id"])
-        before[r["team_id"]] = {
-            "name": r["short_code"],
-            "played": r["played"], "won": r["won"], "lost": r["lost"],
-            "tied": r["tied"], "no_result": r["no_result"], "points": r["points"],
-            "runs_scored": r["runs_scored"], "overs_faced": r["overs_faced"],
-            "runs_conceded": r["runs_conceded"], "overs_bowled": r["overs_bowled"],
-            "net_run_rate": r["net_run_rate"] or 0.0,
-        }
-        tt_id_by_team[r["team_id"]] = r["tt_id"]
-
-    # League fixtures with linked completed matches.
-    # match_status may not exist on an older DB copy that predates the
-    # add_structured_match_outcome migration — this script talks to sqlite3
-    # directly and doesn't run the app's migration precheck, so check first.
-    match_status_col = ", m.match_status" if _column_exists(conn, "matches", "match_status") else ""
-    matches = conn.execute(
-        f"""
-        SELECT m.id, m.home_team_id, m.away_team_id, m.winner_team_id,
-               m.home_team_score, m.home_team_wickets, m.home_team_overs,
-               m.away_team_score, m.away_team_wickets, m.away_team_overs,
-               COALESCE(m.overs_per_side, 20) AS overs_per_side,
-               m.result_description, m.date{match_status_col}
-        FROM tournament_fixtures tf
+    # One grouped pass over the league matches. match_status may not exist
+    # on an older DB copy that predates the add_structured_match_outcome
+    # migration — this script talks to sqlite3 directly and doesn't run the
+    # app's migration precheck, so check first.
+    table = table_from_rows(conn.execute(
+        standings_sql(_column_exists(conn, "matches", "match_status")),
+        standings_params(tid),
+    ).fetchall())
+    n_matches = conn.execute(
+        """
+        SELECT COUNT(*) FROM tournament_fixtures tf
         JOIN matches m ON m.id = tf.match_id
-        WHERE tf.tournament_id = ? AND tf.stage = ?
-          AND tf.status = 'Completed'
-        ORDER BY COALESCE(m.date, tf.id)
+        WHERE tf.tournament_id = ? AND tf.stage = ? AND tf.status = 'Completed'
         """,
         (tid, LEAGUE_STAGE),
-    ).fetchall()
-
-    skipped = 0
-    for m in matches:
-        h, a = m["home_team_id"], m["away_team_id"]
-        if h not in states or a not in states:
-            # Match references a team that isn't in this tournament's roster
-            # (e.g. data drift). Skip rather than corrupt.
-            skipped += 1
-            continue
-        apply_match(states[h], states[a], dict(m))
+    ).fetchone()[0]
+    # Matches referencing a team outside this tournament's roster (data
+    # drift) are left out of the query rather than corrupting one side.
+    replayed = sum(t["played"] for t in table.values()) // 2
 
     diffs = []
-    for team_id, s in states.items():
-        b = before[team_id]
+    for r in rows:
+        if r["is_placeholder"]:
+            continue
+        s = table.get(r["team_id"]) or {**empty_row(), "net_run_rate": 0.0}
+        after = {column: s[column] for column in COLUMNS}
+        after.update(
+            overs_faced=balls_to_overs(s["balls_faced"]),
+            overs_bowled=balls_to_overs(s["balls_bowled"]),
+            net_run_rate=s["net_run_rate"],
+        )
         diffs.append({
-            "team_id": team_id,
-            "name": b["name"],
-            "before": b,
-            "after": {
-                "played": s["played"], "won": s["won"], "lost": s["lost"],
-                "tied": s["tied"], "no_result": s["no_result"], "points": s["points"],
-                "runs_scored": s["runs_scored"], "overs_faced": s["overs_faced"],
-                "runs_conceded": s["runs_conceded"], "overs_bowled": s["overs_bowled"],
-                "net_run_rate": s["net_run_rate"],
+            "team_id": r["team_id"],
+            "name": r["short_code"],
+            "before": {
+                "played": r["played"], "won": r["won"], "lost": r["lost"],
+                "tied": r["tied"], "no_result": r["no_result"], "points": r["points"],
+                "runs_scored": r["runs_scored"], "overs_faced": r["overs_faced"],
+                "runs_conceded": r["runs_conceded"], "overs_bowled": r["overs_bowled"],
+                "net_run_rate": r["net_run_rate"] or 0.0,
             },
-            "tt_id": tt_id_by_team[team_id],
+            "after": after,
+            "tt_id": r["tt_id"],
+            "has_balls": has_balls,
         })
 
     if not quiet:
-        print_tournament_diff(tournament, diffs, len(matches), skipped)
+        print_tournament_diff(tournament, diffs, replayed, n_matches - replayed)
 
-    return diffs, len(matches)
+    return diffs, replayed
 
 
 def write_team_states(conn, diffs):
@@ -295,6 +146,11 @@ def write_team_states(conn, diffs):
                 d["tt_id"],
             ),
         )
+        if d["has_balls"]:
+            cur.execute(
+                "UPDATE tournament_teams SET balls_faced=?, balls_bowled=? WHERE id=?",
+                (a["balls_faced"], a["balls_bowled"], d["tt_id"]),
+            )
 
 
 # ---------------------------------------------------------------------------
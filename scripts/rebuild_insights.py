@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Rebuild the Statistics Hub insights store (conditions_summaries, player_form_summaries).
+
+Both tables are maintained incrementally at archive time; this regenerates
+them from matches and match_scorecards with the same accumulators
+(engine/insights_store.py), for backfill after a restore, or to repair
+drift. Dry-run by default: the rebuild runs inside a transaction that is
+rolled back unless --apply.
+
+Usage:
+    python3 scripts/rebuild_insights.py                    # dry-run, all users
+    python3 scripts/rebuild_insights.py --apply            # commit
+    python3 scripts/rebuild_insights.py --user a@b.c --apply
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--user", help="only rebuild this user's insights")
+    parser.add_argument("--apply", action="store_true", help="commit the rebuild")
+    args = parser.parse_args(argv)
+
+    os.environ["SIMCRICKETX_SKIP_GLOBAL_APP"] = "1"
+    os.environ["SIMCRICKETX_PRECHECK_RUNNING"] = "1"
+    from app import create_app
+    from database import db
+    from engine.insights_store import rebuild_insights
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        rows = rebuild_insights(user_id=args.user)
+        elapsed = time.perf_counter() - started
+        scope = f"user {args.user}" if args.user else "all users"
+        if args.apply:
+            db.session.commit()
+            print(f"Rebuilt {rows} insights rows for {scope} in {elapsed:.2f}s.")
+        else:
+            db.session.rollback()
+            print(f"[dry-run] Would write {rows} insights rows for {scope} "
+                  f"({elapsed:.2f}s). Re-run with --apply to commit.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable rebuild of every tournament's standings and player stats cache.
+
+Recomputes tournament_teams and tournament_player_stats_cache for each
+tournament from its matches (engine/offline_rebuild.py): worker processes
+read consistent snapshots of the SQLite file, the differing rows are
+written in batched upserts, and the stored dashboards of changed
+tournaments are marked stale. Finished tournaments are recorded in a
+checkpoint file after every batch, so an interrupted run picks up where it
+stopped when started again with the same arguments. Supersedes
+rebuild_all_standings.py for production repairs; run against a backup
+first — dry-run by default, `--apply` is opt-in.
+
+Usage:
+    python3 scripts/rebuild_tournaments.py                       # dry-run, all tournaments
+    python3 scripts/rebuild_tournaments.py --apply               # commit changes
+    python3 scripts/rebuild_tournaments.py --tournament 45 --tournament 46
+    python3 scripts/rebuild_tournaments.py --workers 8 --apply
+    python3 scripts/rebuild_tournaments.py --fresh --apply       # ignore a previous checkpoint
+    python3 scripts/rebuild_tournaments.py --report diffs.json   # every diff as JSON
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(ROOT, "cricket_sim.db")
+
+sys.path.insert(0, ROOT)
+
+from engine import offline_rebuild  # noqa: E402
+
+
+def _format_value(value):
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+def print_result(result, *, quiet=False):
+    standings, cache = result["standings"], result["cache"]
+    if not standings and not cache:
+        if not quiet:
+            print(f"  Tournament {result['tournament_id']}: unchanged ({result['seconds']:.2f}s)")
+        return
+    print(f"  Tournament {result['tournament_id']}: {len(standings)} standings row(s), "
+          f"{len(cache)} cache row(s) differ ({result['seconds']:.2f}s)")
+    if quiet:
+        return
+    for label, key, rows in (("team", "team_id", standings), ("player", "player_id", cache)):
+        for row in rows:
+            changes = ", ".join(
+                f"{column} {_format_value(before)} -> {_format_value(after)}"
+                for column, (before, after) in row["changes"].items()
+            )
+            print(f"      {label} {row[key]}: {changes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB, help="Path to SQLite DB")
+    parser.add_argument("--apply", action="store_true",
+                        help="Commit changes (default: dry-run)")
+    parser.add_argument("--tournament", type=int, action="append", default=None,
+                        help="Rebuild only this tournament id (repeatable)")
+    parser.add_argument("--workers", type=int, default=offline_rebuild.default_workers(),
+                        help="Worker processes (1 = run in-process)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file (default: <db>.rebuild[-dry].json)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Discard an existing checkpoint and start over")
+    parser.add_argument("--report", default=None,
+                        help="Write every tournament's diff to this JSON file")
+    parser.add_argument("--yes", action="store_true",
+                        help="Do not prompt before --apply")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Suppress per-row diffs and unchanged tournaments")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"ERROR: DB not found at {args.db}", file=sys.stderr)
+        sys.exit(2)
+    checkpoint = args.checkpoint or f"{args.db}.rebuild{'' if args.apply else '-dry'}.json"
+    if args.fresh and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    print(f"DB: {args.db}")
+    print(f"Mode: {'APPLY' if args.apply else 'DRY-RUN (use --apply to commit)'}")
+    print(f"Workers: {args.workers}  Checkpoint: {checkpoint}")
+    if args.tournament:
+        print(f"Tournament filter: {', '.join(map(str, args.tournament))}")
+    if args.apply and not args.yes:
+        print("WARNING: --apply will overwrite tournament_teams and")
+        print("         tournament_player_stats_cache rows.")
+        print("         Ensure you have a backup before continuing.")
+        try:
+            confirm = input("Type 'yes' to proceed: ").strip().lower()
+        except EOFError:
+            confirm = ""
+        if confirm != "yes":
+            print("Aborted.")
+            sys.exit(1)
+
+    try:
+        summary = offline_rebuild.rebuild(
+            args.db, apply=args.apply, only=args.tournament, workers=args.workers,
+            checkpoint=checkpoint, on_result=lambda r: print_result(r, quiet=args.quiet),
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    results = summary["results"]
+    changed = [r for r in results if r["standings"] or r["cache"]]
+    rows = sum(len(r["standings"]) + len(r["cache"]) for r in results)
+    if summary["skipped"]:
+        print(f"\nResumed: {summary['skipped']} tournament(s) already done per the checkpoint.")
+    verb = "rewritten" if args.apply else "would be rewritten"
+    print(f"\n{'✓ Committed' if args.apply else 'Dry-run complete'}. "
+          f"{len(results)} tournament(s) in {summary['seconds']:.1f}s, "
+          f"{len(changed)} changed, {rows} row(s) {verb}.")
+    if not args.apply and changed:
+        print("Pass --apply to commit.")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump([offline_rebuild.diff_only(r) for r in results], f, indent=2)
+        print(f"Report: {args.report}")
+    # The checkpoint has served its purpose once the whole run is through.
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Background PDF rendering for statistics exports.
+
+Why this exists
+---------------
+/statistics/export/<stat_type>/pdf used to run WeasyPrint inside the
+request. Rendering is CPU-bound and the app runs on a single gevent worker,
+so one large export stalled every other request until it finished. The
+route now serves a cached artifact when there is one and otherwise queues a
+job here and answers 202; clients poll the same URL.
+
+A render that raises is remembered for that job (which includes the stats
+version) for FAILURE_TTL seconds: polls meanwhile get a 500 instead of 202
+without re-running the render, and the next request after that queues it
+again, so a transient error does not stick.
+
+Artifacts
+---------
+Files live in STATS_EXPORT_DIR (default data/exports/), one directory per
+user, named by the user's stats version (engine/stats_cache.py) plus a hash
+of the export parameters. An artifact is therefore reused until the user's
+stats, or the team / player / tournament names they show, change (every
+such write bumps the version); once the version moves on, older files are unreachable and
+are pruned when the next artifact for that user is written. Without
+WeasyPrint the artifact is the HTML page, as the synchronous route served.
+
+Under gevent the actual rendering runs on the hub's native thread pool, so
+the worker greenlet (and every request) keeps being scheduled meanwhile.
+
+Public API
+----------
+- `start_worker(app)` — call once during create_app()
+- `artifact_for(app, job)` — (path, mimetype, filename) when rendered, else None
+- `request_export(job)` — queue a render unless one is already pending
+- `failure_for(job)` — error message of a failed render of *job*, else None
+- `process_one(job, app)` — exposed for tests / manual flush
+- `set_synchronous_mode(enabled)` — tests render inline
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from markupsafe import escape
+
+from utils.helpers import offload
+
+logger = logging.getLogger("SimCricketX.stats_exports")
+
+
+# ---------------------------------------------------------------------------
+# Module state
+# ---------------------------------------------------------------------------
+
+MAX_QUEUE_SIZE = 50
+FAILURE_TTL = 30  # seconds a failed render answers 500 before it may be retried
+
+_queue: "queue.Queue[ExportJob]" = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+_pending: set = set()
+_failed: dict = {}  # ExportJob -> (error message, failed at); guarded by _pending_lock
+_clock = time.monotonic
+_pending_lock = threading.Lock()
+_worker_thread: threading.Thread | None = None
+_worker_lock = threading.Lock()
+_app_ref = None  # set by start_worker(app)
+_synchronous_mode = False  # set True in tests; bypasses background thread
+
+_MIMETYPES = {"pdf": "application/pdf", "html": "text/html"}
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    """One rendered export: whose stats, at which version, for which view."""
+    user_id: str
+    version: int
+    view: str               # 'overall' | 'tournament'
+    tournament_id: Optional[int]
+    match_format: str
+    stat_type: str          # 'batting' | 'bowling' | 'fielding'
+
+    @property
+    def label(self) -> str:
+        return f"tournament_{self.tournament_id}" if self.view == "tournament" else "overall"
+
+    @property
+    def title(self) -> str:
+        return f"{self.label} — {self.stat_type.title()} Statistics"
+
+    @property
+    def stem(self) -> str:
+        params = "|".join(str(p) for p in (self.view, self.tournament_id, self.match_format, self.stat_type))
+        return f"v{self.version}-" + hashlib.sha1(params.encode("utf-8")).hexdigest()[:16]
+
+    def filename(self, ext: str) -> str:
+        return f"{self.label}_{self.stat_type}_stats.{ext}"
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def start_worker(app) -> None:
+    """Start the background worker if it isn't running (idempotent)."""
+    global _worker_thread, _app_ref
+    with _worker_lock:
+        _app_ref = app
+        if _synchronous_mode:
+            return
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _worker_thread = threading.Thread(
+            target=_run_loop,
+            name="stats-export-worker",
+            daemon=True,
+        )
+        _worker_thread.start()
+
+
+def set_synchronous_mode(enabled: bool) -> None:
+    """Tests use this to make `request_export` render inline."""
+    global _synchronous_mode
+    _synchronous_mode = bool(enabled)
+
+
+def artifact_for(app, job: ExportJob):
+    """(path, mimetype, download filename) of a finished artifact, else None."""
+    directory = _user_dir(app, job.user_id)
+    for ext in ("pdf", "html"):
+        path = os.path.join(directory, f"{job.stem}.{ext}")
+        if os.path.isfile(path):
+            return path, _MIMETYPES[ext], job.filename(ext)
+    return None
+
+
+def failure_for(job: ExportJob) -> Optional[str]:
+    """Why the render of *job* failed, or None if it has not failed recently."""
+    with _pending_lock:
+        return _recent_failure(job)
+
+
+def request_export(job: ExportJob) -> bool:
+    """
+    Queue a render of *job*. Returns True when it is queued, already pending,
+    failed within FAILURE_TTL (see failure_for) or (synchronous mode)
+    rendered; False if the queue is full.
+    """
+    with _pending_lock:
+        if job in _pending or _recent_failure(job) is not None:
+            return True
+        _pending.add(job)
+
+    if _synchronous_mode:
+        try:
+            from flask import current_app, has_app_context  # local import to avoid hard dep
+            app = current_app._get_current_object() if has_app_context() else _app_ref
+            if app is None:
+                return False
+            process_one(job, app)
+            return True
+        finally:
+            _done(job)
+
+    try:
+        _queue.put_nowait(job)
+        return True
+    except queue.Full:
+        _done(job)
+        logger.warning("stats_exports: queue full (size=%d), dropping %r", MAX_QUEUE_SIZE, job)
+        return False
+
+
+def render_html(title: str, table: str) -> str:
+    """The printable page for one exported table."""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(title)}</title>
+<style>
+body {{ font-family: 'Courier New', monospace; font-size: 10px; margin: 20px; }}
+h1 {{ font-size: 14px; border-bottom: 2px solid #333; padding-bottom: 5px; }}
+pre {{ white-space: pre-wrap; word-wrap: break-word; }}
+.footer {{ margin-top: 20px; font-size: 8px; color: #666; border-top: 1px solid #ccc; padding-top: 5px; }}
+</style></head><body>
+<h1>{escape(title)}</h1>
+<pre>{escape(table)}</pre>
+<div class="footer">Generated by SimCricketX</div>
+</body></html>"""
+
+
+# ---------------------------------------------------------------------------
+# Worker internals
+# ---------------------------------------------------------------------------
+
+
+def _done(job: ExportJob) -> None:
+    with _pending_lock:
+        _pending.discard(job)
+
+
+def _recent_failure(job: ExportJob) -> Optional[str]:
+    """Caller holds _pending_lock. Expired failures are forgotten."""
+    entry = _failed.get(job)
+    if entry is None:
+        return None
+    message, failed_at = entry
+    if _clock() - failed_at >= FAILURE_TTL:
+        del _failed[job]
+        return None
+    return message
+
+
+def _record_failure(job: ExportJob, message: str) -> None:
+    now = _clock()
+    with _pending_lock:
+        # Expired failures, and those at older stats versions, never answer again.
+        for stale in [j for j, (_, at) in _failed.items()
+                      if now - at >= FAILURE_TTL or (j.user_id == job.user_id and j.version != job.version)]:
+            del _failed[stale]
+        _failed[job] = (message, now)
+
+
+def _run_loop() -> None:
+    """Daemon worker. On unhandled crash it logs and continues."""
+    while True:
+        try:
+            job = _queue.get()
+        except Exception:
+            import time
+            time.sleep(0.5)
+            continue
+
+        try:
+            if _app_ref is None:
+                logger.error("stats_exports: no app reference, dropping job %r", job)
+                continue
+            process_one(job, _app_ref)
+        except Exception:
+            logger.exception("stats_exports: worker crashed handling %r", job)
+        finally:
+            _done(job)
+            try:
+                _queue.task_done()
+            except Exception:
+                pass
+
+
+def _user_dir(app, user_id) -> str:
+    root = app.config.get("STATS_EXPORT_DIR") or os.path.join(app.root_path, "data", "exports")
+    return os.path.join(root, hashlib.sha1(str(user_id).encode("utf-8")).hexdigest()[:16])
+
+
+def _render_pdf(html: str) -> Optional[bytes]:
+    try:
+        from weasyprint import HTML as WeasyHTML
+    except ImportError:
+        return None
+    return WeasyHTML(string=html).write_pdf()
+
+
+def _export_rows(job: ExportJob):
+    from engine.stats_service import StatsService
+
+    stats_service = StatsService(logger)
+    if job.view == "overall":
+        stats_data = stats_service.get_overall_stats(job.user_id, job.match_format)
+    else:
+        stats_data = stats_service.get_tournament_stats(job.user_id, job.tournament_id, job.match_format)
+    return stats_service, (stats_data or {}).get(job.stat_type) or []
+
+
+def process_one(job: ExportJob, app) -> None:
+    """
+    Render one export to its artifact file. Never raises: a failure is
+    logged and recorded for failure_for().
+    """
+    try:
+        with app.app_context():
+            from engine.stats_cache import get_stats_version
+
+            # Stats changed since the request: the client's next poll
+            # queues a render for the new version instead.
+            if get_stats_version(job.user_id) != job.version:
+                return
+            if artifact_for(app, job) is not None:
+                return
+
+            stats_service, rows = _export_rows(job)
+            html = render_html(job.title, stats_service.export_to_txt(rows, job.stat_type))
+
+        pdf_bytes = offload(_render_pdf, html)
+        content, ext = (pdf_bytes, "pdf") if pdf_bytes is not None else (html.encode("utf-8"), "html")
+        _write_artifact(_user_dir(app, job.user_id), f"{job.stem}.{ext}", content, job.version)
+    except Exception as exc:
+        logger.exception("stats_exports: process_one failed for %r", job)
+        _record_failure(job, f"{type(exc).__name__}: {exc}")
+
+
+def _write_artifact(directory: str, name: str, content: bytes, version: int) -> None:
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Artifacts from older stats versions can never be served again.
+    current = f"v{version}-"
+    for entry in os.listdir(directory):
+        if not entry.startswith(current) and not entry.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                pass
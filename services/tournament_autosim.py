@@ -0,0 +1,208 @@
+"""Background runs of "simulate remaining fixtures" for a tournament.
+
+Why this exists
+---------------
+Simulating the rest of a season headlessly (engine/tournament_autosim.py)
+takes seconds, not milliseconds — too long to hold a request open on the
+single gevent worker. The route queues a run here and answers 202; the
+dashboard follows the run's progress over Server-Sent Events from
+`/tournaments/<id>/simulate-remaining/events`, which replays the run's
+event log from any offset.
+
+One run per tournament at a time; a second request while one is queued or
+running returns the existing run. Runs are processed one after another by
+a single daemon worker (SQLite has one writer anyway) — the concurrency is
+inside a run, where each wave's matches are simulated in a process pool.
+
+Under gevent (app.py monkey-patches threading) the worker is a greenlet on
+the request hub, and a run is seconds of CPU and SQLite work that never
+yields: every playoff wave, and every wave on a small host, is simulated
+in-process. The worker therefore only waits on the queue; each run goes to
+the hub's native threadpool (utils.helpers.offload), and the SSE stream
+keeps reading the run's events on the hub meanwhile.
+
+Public API
+----------
+- `start_worker(app)` — call once during create_app()
+- `request_run(tournament_id, user_id)` — queue a run (or return the live one)
+- `run_for(tournament_id)` — the latest run for a tournament, else None
+- `process_one(run, app)` — exposed for tests / manual flush
+- `set_synchronous_mode(enabled)` — tests run inline
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.helpers import offload
+
+logger = logging.getLogger("SimCricketX.tournament_autosim")
+
+
+# ---------------------------------------------------------------------------
+# Module state
+# ---------------------------------------------------------------------------
+
+MAX_QUEUE_SIZE = 10
+
+_queue: "queue.Queue[AutosimRun]" = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+_runs: dict = {}  # tournament_id -> latest AutosimRun
+_runs_lock = threading.Lock()
+_worker_thread: threading.Thread | None = None
+_worker_lock = threading.Lock()
+_app_ref = None  # set by start_worker(app)
+_synchronous_mode = False  # set True in tests; bypasses background thread
+
+
+@dataclass
+class AutosimRun:
+    """One "simulate remaining fixtures" run and its progress events."""
+    tournament_id: int
+    user_id: str
+    events: list = field(default_factory=list)
+    finished: bool = False
+    summary: Optional[dict] = None
+
+    def emit(self, event: dict) -> None:
+        with _runs_lock:
+            self.events.append(event)
+
+    def events_since(self, offset: int):
+        """(events after *offset*, finished) — read together under the lock."""
+        with _runs_lock:
+            return self.events[offset:], self.finished
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def start_worker(app) -> None:
+    """Start the background worker if it isn't running (idempotent)."""
+    global _worker_thread, _app_ref
+    with _worker_lock:
+        _app_ref = app
+        if _synchronous_mode:
+            return
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _worker_thread = threading.Thread(
+            target=_run_loop,
+            name="tournament-autosim-worker",
+            daemon=True,
+        )
+        _worker_thread.start()
+
+
+def set_synchronous_mode(enabled: bool) -> None:
+    """Tests use this to make `request_run` simulate inline."""
+    global _synchronous_mode
+    _synchronous_mode = bool(enabled)
+
+
+def run_for(tournament_id: int) -> Optional[AutosimRun]:
+    with _runs_lock:
+        return _runs.get(tournament_id)
+
+
+def request_run(tournament_id: int, user_id: str) -> Optional[AutosimRun]:
+    """
+    Queue a run for *tournament_id*. Returns the run (the existing one when
+    a run is already queued or in progress), or None if the queue is full.
+    """
+    with _runs_lock:
+        current = _runs.get(tournament_id)
+        if current is not None and not current.finished:
+            return current
+        run = AutosimRun(tournament_id=tournament_id, user_id=user_id)
+        _runs[tournament_id] = run
+
+    if _synchronous_mode:
+        from flask import current_app, has_app_context  # local import to avoid hard dep
+        app = current_app._get_current_object() if has_app_context() else _app_ref
+        process_one(run, app)
+        return run
+
+    try:
+        _queue.put_nowait(run)
+        return run
+    except queue.Full:
+        with _runs_lock:
+            _runs.pop(tournament_id, None)
+        logger.warning("tournament_autosim: queue full (size=%d), dropping run for %s",
+                       MAX_QUEUE_SIZE, tournament_id)
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Worker internals
+# ---------------------------------------------------------------------------
+
+
+def _run_loop() -> None:
+    """Daemon worker. On unhandled crash it logs and continues."""
+    while True:
+        try:
+            run = _queue.get()
+        except Exception:
+            import time
+            time.sleep(0.5)
+            continue
+
+        try:
+            if _app_ref is None:
+                logger.error("tournament_autosim: no app reference, dropping run for %s", run.tournament_id)
+                _finish(run, {"error": "worker not configured"})
+                continue
+            offload(process_one, run, _app_ref)
+        except Exception:
+            logger.exception("tournament_autosim: worker crashed handling %s", run.tournament_id)
+        finally:
+            try:
+                _queue.task_done()
+            except Exception:
+                pass
+
+
+def _finish(run: AutosimRun, summary: dict) -> None:
+    if "error" in summary:
+        run.emit({"event": "error", **summary})
+    with _runs_lock:
+        run.summary = summary
+        run.finished = True
+
+
+def process_one(run: AutosimRun, app) -> None:
+    """Simulate one tournament's remaining fixtures. Always swallows errors."""
+    summary = {"error": "simulation failed"}
+    try:
+        with app.app_context():
+            from database import db
+            from database.models import Tournament
+            from engine.tournament_autosim import simulate_remaining
+            from engine.tournament_engine import TournamentEngine
+
+            tournament = db.session.get(Tournament, run.tournament_id)
+            if tournament is None or tournament.user_id != run.user_id:
+                summary = {"error": "tournament not found"}
+                return
+            workers = app.config.get("TOURNAMENT_AUTOSIM_WORKERS")
+            try:
+                summary = simulate_remaining(
+                    tournament, run.user_id, TournamentEngine(),
+                    workers=workers, progress=run.emit,
+                )
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+    except Exception:
+        logger.exception("tournament_autosim: process_one failed for %s", run.tournament_id)
+    finally:
+        _finish(run, summary)
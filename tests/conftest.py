@@ -400,6 +400,171 @@ def test_team_2(app, regular_user):
     return db_team
 
 
+# ==================== Engine Match Fixtures ====================
+
+def _engine_squad(names):
+    return [{
+        "name": n,
+        "role": "Bowler" if i >= 6 else "Batsman",
+        "batting_rating": 70, "bowling_rating": 70, "fielding_rating": 70,
+        "batting_hand": "Right", "bowling_type": "Medium", "bowling_hand": "Right",
+        "will_bowl": i >= 6, "is_captain": i == 0, "is_wicketkeeper": i == 4,
+    } for i, n in enumerate(names)]
+
+
+@pytest.fixture(scope="function")
+def make_engine_match():
+    """Factory for an in-memory auto-mode T20 engine Match (no DB rows)
+    between two generic XIs, HOM_1 and AWY_1."""
+    import uuid
+    import engine.match as match_module
+
+    def _make(toss_winner="HOM", toss_decision="Bat"):
+        return match_module.Match({
+            "match_id": str(uuid.uuid4()), "created_by": 1,
+            "timestamp": "2026-08-08T12:00:00",
+            "team_home": "HOM_1", "team_away": "AWY_1",
+            "stadium": "Test Ground", "pitch": "Hard",
+            "toss": "Heads", "toss_winner": toss_winner, "toss_decision": toss_decision,
+            "match_format": "T20", "overs": 20, "simulation_mode": "auto",
+            "rain_probability": 0.0,
+            "playing_xi": {
+                "home": _engine_squad([f"HOME_P{i+1}" for i in range(11)]),
+                "away": _engine_squad([f"AWAY_P{i+1}" for i in range(11)]),
+            },
+            "substitutes": {"home": [], "away": []},
+        })
+
+    return _make
+
+
+# ==================== Archived Match Fixtures ====================
+
+def _stats_xi(prefix):
+    return [{
+        "name": f"{prefix}_P{i+1}",
+        "role": "Bowler" if i < 5 else "Batsman",
+        "batting_rating": 70, "bowling_rating": 70, "fielding_rating": 65,
+        "batting_hand": "Right", "bowling_type": "Medium", "bowling_hand": "Right",
+        "will_bowl": i < 5, "is_captain": i == 0,
+    } for i in range(11)]
+
+
+@pytest.fixture(scope="function")
+def make_stats_match():
+    """Factory for a finished engine Match between test_team (TW) and
+    test_team_2 (TC) with fixed innings stats, ready to archive. The
+    super-over cards it carries must never reach any aggregate."""
+    import uuid
+    import engine.match as match_module
+
+    def _make(user_id, match_id=None, fmt="T20", john_runs=40, champ_wickets=2):
+        data = {
+            "match_id": match_id or str(uuid.uuid4()), "created_by": user_id,
+            "timestamp": "2026-06-03T12:00:00",
+            "team_home": f"TW_{user_id}", "team_away": f"TC_{user_id}",
+            "stadium": "Test Ground", "pitch": "Flat",
+            "toss": "Heads", "toss_winner": "TW", "toss_decision": "Bat",
+            "match_format": fmt, "overs": 20 if fmt == "T20" else 50,
+            "simulation_mode": "auto",
+            "playing_xi": {"home": _stats_xi("H"), "away": _stats_xi("A")},
+            "substitutes": {"home": [], "away": []},
+        }
+        m = match_module.Match(data)
+        m.result = "TW won by 15 runs"
+        m.first_batting_team_name = "TW"
+        m.first_innings_score = john_runs + 25
+        m.score = 50
+        m.wickets = 3
+        m.first_innings_batting_stats = {
+            "John Doe": {"runs": john_runs, "balls": 30, "fours": 4, "sixes": 1},
+            "Batsman 1": {"runs": 0, "balls": 3, "wicket_type": "Bowled", "bowler_out": "Champion 1"},
+        }
+        m.first_innings_bowling_stats = {
+            "Champion 1": {"balls_bowled": 24, "runs": 30, "wickets": champ_wickets, "maidens": 1},
+        }
+        m.second_innings_batting_stats = {
+            "Champ Bat 1": {"runs": 30, "balls": 22, "fours": 3, "sixes": 0},
+        }
+        m.second_innings_bowling_stats = {
+            "Allrounder 1": {"balls_bowled": 24, "runs": 28, "wickets": 1, "maidens": 0},
+        }
+        m.first_innings_partnerships = []
+        m.second_innings_partnerships = []
+        m.super_over_career_batting = {
+            "home": {"John Doe": {"runs": 10, "balls": 5, "fours": 1, "sixes": 1, "wicket_type": ""}},
+        }
+        m.super_over_career_bowling = {
+            "away": {"Champion 1": {"balls_bowled": 6, "runs": 10, "wickets": 3}},
+        }
+        return m
+
+    return _make
+
+
+@pytest.fixture(scope="function")
+def archive_match(app):
+    """Save a make_stats_match() Match through MatchArchiver and commit."""
+    from match_archiver import MatchArchiver
+
+    def _archive(match):
+        arch = MatchArchiver(match.match_data, match)
+        arch.filenames = {"json": f"/tmp/{match.match_data['match_id']}.json"}
+        ok = arch._save_to_database()
+        db.session.commit()
+        return ok
+
+    return _archive
+
+
+@pytest.fixture(scope="function")
+def resim_as_lista(make_stats_match, archive_match):
+    """Archive a T20 match, then re-archive the same id as ListA with fewer
+    runs — a re-sim that changes format, which every aggregate must reverse
+    out of its old bucket. Returns the match id."""
+    import uuid
+
+    def _resim(user_id):
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(user_id, match_id=match_id, john_runs=70))
+        archive_match(make_stats_match(user_id, match_id=match_id, fmt="ListA", john_runs=20))
+        return match_id
+
+    return _resim
+
+
+@pytest.fixture(scope="function")
+def delete_archived_match(app):
+    """Delete a match the way the routes do: reverse its aggregates while
+    the scorecards still exist, then drop the cards and the row."""
+    from match_archiver import reverse_player_aggregates
+
+    def _delete(match_id):
+        reverse_player_aggregates(MatchScorecard.query.filter_by(match_id=match_id).all(),
+                                  match_id=match_id)
+        MatchScorecard.query.filter_by(match_id=match_id).delete()
+        db.session.delete(db.session.get(DBMatch, match_id))
+        db.session.commit()
+
+    return _delete
+
+
+@pytest.fixture(scope="function")
+def assert_rebuild_reproduces(app):
+    """Check that a from-scratch rebuild reproduces an incrementally
+    maintained table: snapshot, run *rebuild*, commit, snapshot again.
+    Returns the snapshot and whatever *rebuild* returned."""
+    def _check(snapshot, rebuild):
+        incremental = snapshot()
+        assert incremental
+        result = rebuild()
+        db.session.commit()
+        assert snapshot() == incremental
+        return incremental, result
+
+    return _check
+
+
 # ==================== Tournament Fixtures ====================
 
 @pytest.fixture(scope="function")
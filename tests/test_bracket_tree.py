@@ -0,0 +1,56 @@
+"""
+Bracket links (engine/bracket_tree.py) and the engine lookups built on them.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import Team as DBTeam, TournamentFixture
+from engine.bracket_tree import IPL_TREE, LOSER, SEMIFINAL_TREE, knockout_tree, tree_for
+from engine.tournament_engine import TournamentEngine
+
+
+def test_knockout_tree_links_adjacent_winners():
+    tree = knockout_tree(8)
+    assert tree.rounds == ((0, 1, 2, 3), (4, 5), (6,))
+    assert tree.feeders(4) == (0, 1) and tree.feeders(6) == (4, 5)
+    assert tree.feeders(0) == ()
+    assert tree.advances_to(3) == 5 and tree.advances_to(6) is None
+    assert tree.descendants(2) == {5, 6}
+
+
+def test_playoff_trees():
+    assert SEMIFINAL_TREE.descendants(1) == {3}
+    assert IPL_TREE.feeders(3) == (1, 2)
+    assert IPL_TREE.advances_to(1, LOSER) == 3 and IPL_TREE.advances_to(1) == 4
+    assert IPL_TREE.descendants(1) == {3, 4}
+    assert IPL_TREE.descendants(2) == {3, 4}
+    assert IPL_TREE.descendants(3) == {4}
+
+
+def test_tree_is_shared_per_shape():
+    assert tree_for("knockout", 16) is tree_for("knockout", 16)
+    assert tree_for("ipl_style", 0) is IPL_TREE
+    assert tree_for("round_robin", 0) is None
+
+
+def test_ipl_qualifier_2_waits_for_both_feeders(app, regular_user):
+    teams = [DBTeam(name=f"Side {i}", short_code=f"SD{i}", user_id=regular_user.id, is_placeholder=False)
+             for i in range(4)]
+    db.session.add_all(teams)
+    db.session.commit()
+    engine = TournamentEngine()
+    t = engine.create_tournament("Tree IPL", regular_user.id, [team.id for team in teams],
+                                 mode=TournamentEngine.MODE_IPL_STYLE)
+    by_stage = {f.stage: f for f in TournamentFixture.query.filter_by(tournament_id=t.id)}
+    q1, elim, q2 = by_stage["qualifier_1"], by_stage["eliminator"], by_stage["qualifier_2"]
+
+    assert engine.get_feeder_fixtures(t, q2) == (q1, elim)
+    q1.status = "Completed"
+    db.session.commit()
+    assert engine.feeders_decided(t, q2) is False
+    elim.status = "Completed"
+    db.session.commit()
+    assert engine.feeders_decided(t, q2) is True
@@ -0,0 +1,138 @@
+"""
+Materialized career stats (PlayerCareerStats, engine/career_stats.py).
+
+StatsService.get_overall_stats() reads the career table when the user has
+rows in it and folds MatchScorecard otherwise. These tests pin that both
+paths produce the same /statistics payload, that re-archiving reverses
+cleanly (including a format change), and that a rebuild reproduces the
+incrementally-maintained table.
+"""
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import Match as DBMatch, Player as DBPlayer, PlayerCareerStats
+from engine.career_stats import COUNTERS, rebuild_career_stats
+from engine.stats_cache import bump_stats_version
+from engine.stats_service import StatsService
+
+
+def _by_player(stats):
+    return {
+        section: sorted(stats[section], key=lambda r: r["player_id"])
+        for section in ("batting", "bowling", "fielding")
+    }
+
+
+def _scorecard_path(user_id, match_format=None):
+    # Emptying the table makes get_overall_stats() fall back to the fold;
+    # the bump keeps the result cache from answering for the table path.
+    PlayerCareerStats.query.delete()
+    bump_stats_version(user_id)
+    stats = StatsService().get_overall_stats(user_id, match_format)
+    db.session.rollback()
+    return stats
+
+
+def _snapshot():
+    return {
+        (r.player_id, r.match_format): (
+            r.matches, r.best_bowling_wickets, r.best_bowling_runs,
+            *(getattr(r, k) for k in COUNTERS),
+        )
+        for r in PlayerCareerStats.query.all()
+    }
+
+
+def test_career_table_matches_scorecard_fold(app, regular_user, test_team, test_team_2,
+                                             make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, john_runs=55, champ_wickets=4))
+        archive_match(make_stats_match(regular_user.id, fmt="ListA", john_runs=101))
+
+        svc = StatsService()
+        assert svc._try_career_stats(regular_user.id) is not None
+        for fmt in (None, "T20", "ListA"):
+            from_table = svc.get_overall_stats(regular_user.id, fmt)
+            assert _by_player(from_table) == _by_player(_scorecard_path(regular_user.id, fmt))
+
+        john = DBPlayer.query.filter_by(name="John Doe").first()
+        row = PlayerCareerStats.query.filter_by(player_id=john.id, match_format="T20").one()
+        # Super-over runs (10 per match) are excluded.
+        assert (row.matches, row.bat_runs, row.bat_fifties) == (2, 95, 1)
+        champ = DBPlayer.query.filter_by(name="Champion 1").first()
+        row = PlayerCareerStats.query.filter_by(player_id=champ.id, match_format="T20").one()
+        assert (row.best_bowling_wickets, row.best_bowling_runs) == (4, 30)
+
+
+def test_re_archive_reverses_including_format_change(app, regular_user, test_team, test_team_2,
+                                                     make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id, champ_wickets=1))
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, champ_wickets=4))
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, fmt="ListA", champ_wickets=2))
+
+        champ = DBPlayer.query.filter_by(name="Champion 1").first()
+        t20 = PlayerCareerStats.query.filter_by(player_id=champ.id, match_format="T20").one()
+        # The 4-wicket match moved to ListA, so the T20 best falls back.
+        assert (t20.matches, t20.bowl_wickets, t20.best_bowling_wickets) == (1, 1, 1)
+        lista = PlayerCareerStats.query.filter_by(player_id=champ.id, match_format="ListA").one()
+        assert (lista.matches, lista.bowl_wickets) == (1, 2)
+
+        stats = StatsService().get_overall_stats(regular_user.id)
+        assert _by_player(stats) == _by_player(_scorecard_path(regular_user.id))
+
+
+def test_rebuild_reproduces_incremental_table(app, regular_user, test_team, test_team_2,
+                                             make_stats_match, archive_match,
+                                             assert_rebuild_reproduces):
+    with app.app_context():
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id))
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, john_runs=12))
+        archive_match(make_stats_match(regular_user.id, fmt="ListA"))
+
+        def from_empty_table():
+            PlayerCareerStats.query.delete()
+            db.session.commit()
+            return rebuild_career_stats(user_id=regular_user.id)
+
+        incremental, written = assert_rebuild_reproduces(_snapshot, from_empty_table)
+        assert written == len(incremental)
+        _, written = assert_rebuild_reproduces(_snapshot, rebuild_career_stats)
+        assert written == len(incremental)
+
+
+def test_format_filter_runs_in_sql(app, regular_user, test_team, test_team_2,
+                                   make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        svc = StatsService()
+        # The user has career rows, just none in ListA: empty, not a fallback.
+        lista = svc._try_career_stats(regular_user.id, "ListA")
+        assert lista == svc._empty_stats()
+        assert svc._try_career_stats(regular_user.id, "T20")["batting"]
+
+
+def test_reversal_keeps_best_figures_from_unformatted_matches(app, regular_user, test_team, test_team_2,
+                                                              make_stats_match, archive_match,
+                                                              delete_archived_match):
+    with app.app_context():
+        legacy_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=legacy_id, champ_wickets=4))
+        # Older rows have no format; they count as T20.
+        db.session.get(DBMatch, legacy_id).match_format = None
+        db.session.commit()
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, champ_wickets=1))
+
+        delete_archived_match(match_id)
+
+        champ = DBPlayer.query.filter_by(name="Champion 1").first()
+        row = PlayerCareerStats.query.filter_by(player_id=champ.id, match_format="T20").one()
+        assert (row.matches, row.best_bowling_wickets, row.best_bowling_runs) == (1, 4, 30)
@@ -12,9 +12,16 @@ from engine.dls import (
     ResourceLedger,
     compute_target,
     g50_from_expected_total,
+    MAX_BALLS,
     overs_from_balls,
+    par_curve,
     par_score,
+    par_score_balls,
+    par_table,
+    resource_column,
+    resource_curve,
     resources_remaining,
+    resources_remaining_balls,
 )
 
 
@@ -71,6 +78,39 @@ class TestResourceTable:
         assert overs_from_balls(-4) == 0.0
 
 
+# ── Per-ball surface ──────────────────────────────────────────────────────────
+
+class TestBallSurface:
+    def test_surface_matches_interpolation_on_every_ball(self):
+        for balls in range(MAX_BALLS + 1):
+            for w in range(10):
+                assert resources_remaining_balls(balls, w) == \
+                    resources_remaining(overs_from_balls(balls), w)
+
+    def test_surface_clamping(self):
+        assert resources_remaining_balls(-6, 0) == 0.0
+        assert resources_remaining_balls(999, 0) == 100.0
+        assert resources_remaining_balls(120, 10) == 0.0
+        assert resources_remaining_balls(60, -2) == resources_remaining_balls(60, 0)
+
+    def test_resource_curve_is_elementwise(self):
+        balls = [120, 119, 90, 33, 0, 400]
+        wkts = [0, 1, 3, 10, 9, -1]
+        expected = [resources_remaining_balls(b, w) for b, w in zip(balls, wkts)]
+        assert resource_curve(balls, wkts) == expected
+
+    def test_resource_curve_rejects_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            resource_curve([120, 119], [0])
+
+    def test_resource_column(self):
+        col = resource_column(2, 120)
+        assert len(col) == 121
+        assert col[120] == resources_remaining(20, 2)
+        assert col == [resources_remaining_balls(b, 2) for b in range(121)]
+        assert resource_column(10, 6) == [0.0] * 7
+
+
 # ── Target computation ────────────────────────────────────────────────────────
 
 class TestComputeTarget:
@@ -161,6 +201,54 @@ class TestParScore:
         assert par_score(274, 100.0, r2, 0, 6) == target - 1
 
 
+class TestParCurve:
+    def test_par_score_balls_matches_overs_path(self):
+        r2 = resources_remaining(43, 0)
+        for balls in range(0, 43 * 6 + 1, 7):
+            for w in range(10):
+                assert par_score_balls(274, 100.0, r2, balls, w) == \
+                    par_score(274, 100.0, r2, overs_from_balls(balls), w)
+
+    def test_par_curve_matches_pointwise(self):
+        r1 = resources_remaining(20, 0)
+        balls = list(range(120, -1, -1))
+        wkts = [min(9, (120 - b) // 13) for b in balls]
+        curve = par_curve(176, r1, r1, balls, wkts)
+        assert curve == [par_score_balls(176, r1, r1, b, w) for b, w in zip(balls, wkts)]
+        assert curve[0] == 0
+        assert curve[-1] == 176
+
+    def test_par_curve_zero_r1(self):
+        assert par_curve(176, 0.0, 56.6, [60, 30], [0, 0]) == [0, 0]
+
+    def test_par_table_shape_and_values(self):
+        r2 = resources_remaining(14, 0)
+        table = par_table(176, 56.6, r2, 14 * 6)
+        assert len(table) == 85
+        assert all(len(row) == 10 for row in table)
+        assert table[84][0] == 0
+        assert table[30][4] == par_score_balls(176, 56.6, r2, 30, 4)
+
+    def test_par_follows_g50_branch_once_team2_passes_r1(self):
+        # Team 1 cut short (R1 = 47.6), Team 2 given 30 overs (R2 = 75.1):
+        # with G50 the par at the end of the allocation is target - 1.
+        r2 = resources_remaining(30, 0)
+        target = compute_target(180, 47.6, r2, g50=245.0)
+        assert par_score_balls(180, 47.6, r2, 0, 3, g50=245.0) == target - 1
+        # Before Team 2 has used R1 the ratio branch still applies.
+        assert par_score_balls(180, 47.6, r2, 150, 0, g50=245.0) == \
+            par_score_balls(180, 47.6, r2, 150, 0)
+        balls, wkts = [180, 90, 0], [0, 2, 3]
+        assert par_curve(180, 47.6, r2, balls, wkts, g50=245.0) == \
+            [par_score_balls(180, 47.6, r2, b, w, g50=245.0) for b, w in zip(balls, wkts)]
+
+    def test_ledger_par_curve_nets_deductions(self):
+        ledger = ResourceLedger(20)
+        ledger.record_interruption(10, 3, 6)
+        curve = ledger.par_curve(176, 56.6, [36, 0], [3, 5])
+        assert curve == par_curve(176, 56.6, ledger.available(), [36, 0], [3, 5])
+
+
 # ── Ledger persistence ────────────────────────────────────────────────────────
 
 class TestResourceLedger:
@@ -172,6 +260,15 @@ class TestResourceLedger:
         assert ledger.available() == pytest.approx(87.3)
         assert len(ledger.interruptions) == 2
 
+    def test_ball_keyed_records_match_over_keyed(self):
+        by_overs, by_balls = ResourceLedger(20), ResourceLedger(20)
+        by_overs.record_interruption(10, 3, 6)
+        by_balls.record_interruption_balls(60, 3, 36)
+        by_overs.record_termination(4, 5)
+        by_balls.record_termination_balls(24, 5)
+        assert by_balls.available() == by_overs.available()
+        assert by_balls.interruptions == by_overs.interruptions
+
     def test_round_trip_serialization(self):
         ledger = ResourceLedger(20)
         ledger.record_interruption(10, 3, 6)
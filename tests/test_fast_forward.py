@@ -0,0 +1,175 @@
+"""Server-side fast-forward (sim to end of innings / sim to result).
+
+Match.fast_forward() loops next_ball() without per-ball HTTP round-trips and
+without the rich commentary engine, but must stop wherever a click-through
+would: manual-mode decisions, the innings break (when asked), the result.
+The compressed ball log has to agree with the live scorecard it replaces.
+"""
+import os
+import random
+import sys
+import uuid
+
+import pytest
+from flask_login import UserMixin
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import create_app
+import engine.match as match_module
+
+
+LEGAL_PREFIXES = ("Wd", "Nb")
+
+
+def _legal(log):
+    return [e for e in log if not e[3].startswith(LEGAL_PREFIXES)]
+
+
+def test_until_innings_stops_at_break_with_consistent_log(make_engine_match):
+    random.seed(11)
+    m = make_engine_match()
+    summary = m.fast_forward(until="innings")
+
+    assert summary["stopped_on"] == "innings_end"
+    assert m.innings == 2
+    log = summary["ball_log"]
+    assert summary["deliveries"] == len(log)
+    assert all(e[0] == 1 for e in log)
+    # The last entry carries the first-innings total.
+    assert log[-1][4] == m.first_innings_score
+    assert len(_legal(log)) <= 120
+    # Cumulative score never decreases and wickets never exceed ten.
+    assert all(a[4] <= b[4] for a, b in zip(log, log[1:]))
+    assert all(0 <= e[5] <= 10 for e in log)
+    assert summary["scorecard_data"] is not None
+
+
+def test_until_result_finishes_match(make_engine_match):
+    random.seed(5)
+    m = make_engine_match()
+    m._create_match_archive = lambda: True
+    summary = m.fast_forward(until="result")
+
+    assert summary["stopped_on"] in {"match_over", "super_over"}
+    if summary["stopped_on"] == "match_over":
+        assert summary["match_over"] is True
+        assert summary["result"] == m.result
+    innings = {e[0] for e in summary["ball_log"]}
+    assert innings == {1, 2}
+
+
+def test_all_out_delivery_is_logged_as_wicket(make_engine_match):
+    m = make_engine_match()
+    random.seed(3)
+
+    def wicket_every_ball(**_kwargs):
+        return {"runs": 0, "batter_out": True, "is_extra": False,
+                "wicket_type": "Bowled", "description": "Bowled."}
+
+    original = match_module.calculate_outcome
+    match_module.calculate_outcome = wicket_every_ball
+    try:
+        summary = m.fast_forward(until="innings")
+    finally:
+        match_module.calculate_outcome = original
+
+    log = summary["ball_log"]
+    assert summary["stopped_on"] == "innings_end"
+    assert len(log) == 10
+    assert [e[3] for e in log] == ["W"] * 10
+    assert log[-1][4:] == [0, 10]
+
+
+def test_rich_commentary_is_skipped_while_fast_forwarding(make_engine_match):
+    random.seed(2)
+    m = make_engine_match()
+    calls = []
+    m.commentary_engine.get_commentary = lambda *a, **k: calls.append(1) or "rich"
+    m.fast_forward(until="innings")
+    assert calls == []
+    assert m._fast_forwarding is False
+
+    m.next_ball()
+    assert calls, "normal next_ball() must still use the commentary engine"
+
+
+def test_rejects_bad_until_and_finished_match(make_engine_match):
+    m = make_engine_match()
+    with pytest.raises(ValueError):
+        m.fast_forward(until="over")
+    m.innings = 3
+    assert m.fast_forward()["error"] == "match_not_in_progress"
+
+
+@pytest.fixture
+def app_client():
+    app = create_app()
+    app.config["TESTING"] = True
+    app.config["WTF_CSRF_ENABLED"] = False
+    client = app.test_client()
+    user_id = f"fast_forward_{uuid.uuid4().hex}@example.com"
+
+    class StubUser(UserMixin):
+        def __init__(self, uid):
+            self.id = uid
+
+    @app.login_manager.user_loader
+    def load_user(uid):
+        return StubUser(uid)
+
+    with client.session_transaction() as sess:
+        sess["_user_id"] = user_id
+
+    yield client, user_id
+
+    with app_module.MATCH_INSTANCES_LOCK:
+        for mid in [mid for mid, m in app_module.MATCH_INSTANCES.items()
+                    if m.data.get("created_by") == user_id]:
+            del app_module.MATCH_INSTANCES[mid]
+
+
+def _register(make_match, user_id, mode="auto"):
+    m = make_match()
+    m.data["created_by"] = user_id
+    m.simulation_mode = mode
+    m.data["simulation_mode"] = mode
+    with app_module.MATCH_INSTANCES_LOCK:
+        app_module.MATCH_INSTANCES[m.data["match_id"]] = m
+    return m
+
+
+def test_route_fast_forwards_innings_and_fills_replay_log(app_client, make_engine_match):
+    client, user_id = app_client
+    m = _register(make_engine_match, user_id)
+
+    resp = client.post(f"/match/{m.data['match_id']}/fast-forward", json={"until": "innings"})
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["stopped_on"] == "innings_end"
+    assert payload["innings_number"] == 2
+    assert "commentary_lines" not in payload and "final" not in payload
+    assert len(m.commentary_replay_log) >= payload["deliveries"]
+
+
+def test_route_stops_on_manual_decision(app_client, make_engine_match):
+    client, user_id = app_client
+    m = _register(make_engine_match, user_id, mode="manual")
+
+    resp = client.post(f"/match/{m.data['match_id']}/fast-forward", json={"until": "result"})
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["stopped_on"] == "decision"
+    assert payload["decision_required"] is True
+    assert payload["decision_options"]
+
+
+def test_route_validates_until_and_ownership(app_client, make_engine_match):
+    client, user_id = app_client
+    m = _register(make_engine_match, user_id)
+    assert client.post(f"/match/{m.data['match_id']}/fast-forward",
+                       json={"until": "tea"}).status_code == 400
+
+    m.data["created_by"] = "someone-else"
+    assert client.post(f"/match/{m.data['match_id']}/fast-forward").status_code == 403
@@ -0,0 +1,129 @@
+"""
+Materialized head-to-head records (TeamPairSummary, engine/head_to_head.py).
+
+Archiving folds each match into its pair's row, re-archiving (including a
+format change) reverses it out again, and a from-scratch rebuild must
+reproduce the incrementally maintained table exactly.
+"""
+import json
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import Match as DBMatch, TeamPairSummary
+from engine.head_to_head import rebuild_head_to_head, reverse_match
+from engine.stats_service import StatsService
+
+
+def _snapshot():
+    return {
+        (r.user_id, r.team_a_id, r.team_b_id, r.match_format): (
+            r.played, r.team_a_wins, r.team_b_wins, r.ties, r.no_results,
+            r.team_a_runs, r.team_b_runs, r.highest_total, r.highest_total_team_id,
+            r.lowest_total, r.lowest_total_team_id,
+            [m["match_id"] for m in json.loads(r.recent_results)],
+            json.loads(r.performers),
+        )
+        for r in TeamPairSummary.query.all()
+    }
+
+
+def test_incremental_summary_matches_rebuild(app, regular_user, test_team, test_team_2,
+                                            make_stats_match, archive_match,
+                                            assert_rebuild_reproduces):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, john_runs=55))
+        archive_match(make_stats_match(regular_user.id, fmt="ListA", john_runs=101))
+
+        incremental, _ = assert_rebuild_reproduces(_snapshot, rebuild_head_to_head)
+        assert len(incremental) == 2
+
+        h2h = StatsService().get_head_to_head(regular_user.id, test_team.id, test_team_2.id, "T20")
+        matches = DBMatch.query.filter_by(match_format="T20").all()
+        winners = [m.winner_team_id for m in matches]
+        assert h2h["summary"]["played"] == 2
+        assert h2h["summary"]["team1_wins"] == winners.count(test_team.id)
+        assert h2h["summary"]["team2_wins"] == winners.count(test_team_2.id)
+        assert {m["match_id"] for m in h2h["matches"]} == {m.id for m in matches}
+        top = {p["name"]: p for p in h2h["top_performers"]["team1"]}
+        # Super-over runs never count.
+        assert top["John Doe"]["runs"] == 40 + 55
+
+        # Both formats combined when no format is given.
+        everything = StatsService().get_head_to_head(regular_user.id, test_team.id, test_team_2.id)
+        assert everything["summary"]["played"] == 3
+
+
+def test_re_archive_and_delete_reverse_the_pair(app, regular_user, test_team, test_team_2,
+                                               make_stats_match, archive_match, resim_as_lista,
+                                               delete_archived_match, assert_rebuild_reproduces):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        match_id = resim_as_lista(regular_user.id)
+
+        rows = {r.match_format: r for r in TeamPairSummary.query.all()}
+        assert rows["T20"].played == 1 and rows["ListA"].played == 1
+        assert match_id not in rows["T20"].recent_results
+
+        assert_rebuild_reproduces(_snapshot, lambda: rebuild_head_to_head(regular_user.id))
+
+    # Deleting the only ListA match drops that pair row entirely.
+    with app.app_context():
+        delete_archived_match(match_id)
+        assert {r.match_format for r in TeamPairSummary.query.all()} == {"T20"}
+
+
+def test_reversal_keeps_null_format_matches_under_t20(app, regular_user, test_team, test_team_2,
+                                                      make_stats_match, archive_match):
+    with app.app_context():
+        legacy_id, other_id = str(uuid.uuid4()), str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=legacy_id))
+        archive_match(make_stats_match(regular_user.id, match_id=other_id))
+        # A pre-format row: apply_match() filed it under "T20".
+        db.session.get(DBMatch, legacy_id).match_format = None
+        db.session.commit()
+
+        reverse_match(other_id)
+        db.session.commit()
+        row = TeamPairSummary.query.one()
+        assert (row.match_format, row.played) == ("T20", 1)
+        assert legacy_id in row.recent_results
+
+
+def test_head_to_head_api_reads_summary(app, authenticated_client, regular_user, test_team, test_team_2,
+                                        make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+
+    resp = authenticated_client.get(
+        f"/api/head-to-head?team1_id={test_team_2.id}&team2_id={test_team.id}&match_format=T20"
+    )
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert data["summary"]["played"] == 1
+    assert data["summary"]["highest_total"]["runs"] >= data["summary"]["lowest_total"]["runs"]
+    assert data["team1_id"] == test_team_2.id
+
+
+def test_deleting_a_match_without_cards_reverses_the_pair(app, authenticated_client, regular_user,
+                                                          test_team, test_team_2,
+                                                          make_stats_match, archive_match):
+    from database.models import MatchScorecard
+
+    with app.app_context():
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id))
+        # An abandoned match: counted in the pair, no scorecards.
+        MatchScorecard.query.filter_by(match_id=match_id).delete()
+        db.session.commit()
+        assert TeamPairSummary.query.count() == 1
+
+    resp = authenticated_client.post("/matches/delete-multiple", json={"match_ids": [match_id]})
+    assert resp.status_code == 200
+    with app.app_context():
+        assert db.session.get(DBMatch, match_id) is None
+        assert TeamPairSummary.query.count() == 0
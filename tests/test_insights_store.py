@@ -0,0 +1,132 @@
+"""
+Statistics Hub insights store (ConditionsSummary / PlayerFormSummary,
+engine/insights_store.py).
+
+Archiving folds each match into its (user, format) accumulators, re-archiving
+and deleting take it out again, and the stored view must always equal a
+fold over the matches themselves — which a from-scratch rebuild reproduces.
+"""
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import ConditionsSummary, Match as DBMatch, PlayerFormSummary
+from engine import insights_store
+from engine.stats_cache import bump_stats_version
+from engine.stats_service import StatsService
+from migrations.add_insights_store import run_migration
+
+
+def _snapshot():
+    return (
+        sorted((r.user_id, r.match_format, r.kind, r.label, r.matches, r.runs, r.wickets)
+               for r in ConditionsSummary.query.all()),
+        sorted((r.user_id, r.match_format, r.player_id, r.runs, r.wickets, r.catches, r.run_outs,
+                r.bat_innings, r.bowl_innings, r.batting_series, r.bowling_series)
+               for r in PlayerFormSummary.query.all()),
+    )
+
+
+def _assert_store_matches_fold(user_id):
+    for fmt in (None, "T20", "ListA"):
+        assert insights_store.stored_insights(user_id, fmt) == insights_store.fold_insights(user_id, None, fmt)
+
+
+def test_incremental_store_matches_fold_and_rebuild(app, regular_user, test_team, test_team_2,
+                                                    make_stats_match, archive_match,
+                                                    assert_rebuild_reproduces):
+    with app.app_context():
+        for runs in (40, 55, 12, 70, 9, 33):
+            archive_match(make_stats_match(regular_user.id, john_runs=runs))
+        archive_match(make_stats_match(regular_user.id, fmt="ListA", john_runs=101))
+
+        _assert_store_matches_fold(regular_user.id)
+        assert_rebuild_reproduces(_snapshot, insights_store.rebuild_insights)
+
+        insights = StatsService().get_insights(regular_user.id, match_format="T20")
+        john = next(f for f in insights["form"]["batting"] if f["player"] == "John Doe")
+        # Last five innings, oldest first; super-over runs never count.
+        assert john["series"] == [55, 12, 70, 9, 33]
+        assert john["total"] == 40 + 55 + 12 + 70 + 9 + 33
+        (venue,) = insights["conditions"]["venues"]
+        assert venue["label"] == "Test Ground" and venue["matches"] == 6
+
+        everything = StatsService().get_insights(regular_user.id)
+        assert everything["conditions"]["venues"][0]["matches"] == 7
+        top = {i["player"]: i for i in everything["impact"]}
+        assert top["John Doe"]["runs"] == 40 + 55 + 12 + 70 + 9 + 33 + 101
+
+
+def test_re_archive_and_delete_reverse_the_store(app, regular_user, test_team, test_team_2,
+                                                 make_stats_match, archive_match, resim_as_lista,
+                                                 delete_archived_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        match_id = resim_as_lista(regular_user.id)
+
+        counts = {r.match_format: r.matches for r in ConditionsSummary.query.filter_by(kind="venue")}
+        assert counts == {"T20": 1, "ListA": 1}
+        _assert_store_matches_fold(regular_user.id)
+
+        delete_archived_match(match_id)
+
+        assert {r.match_format for r in ConditionsSummary.query.all()} == {"T20"}
+        assert {r.match_format for r in PlayerFormSummary.query.all()} == {"T20"}
+        _assert_store_matches_fold(regular_user.id)
+
+
+def test_reversal_subtracts_what_the_match_was_archived_with(app, regular_user, test_team, test_team_2,
+                                                             make_stats_match, archive_match,
+                                                             delete_archived_match):
+    with app.app_context():
+        ids = [str(uuid.uuid4()) for _ in range(7)]
+        for match_id, runs in zip(ids, (40, 55, 12, 70, 9, 33, 61)):
+            archive_match(make_stats_match(regular_user.id, match_id=match_id, john_runs=runs))
+
+        # Re-archiving at another ground moves the match between venues, and
+        # a deleted match inside the form window is refilled from older cards.
+        moved = make_stats_match(regular_user.id, match_id=ids[5], john_runs=80)
+        moved.match_data["stadium"] = "Other Ground"
+        archive_match(moved)
+        delete_archived_match(ids[4])
+
+        venues = {r.label: r.matches for r in ConditionsSummary.query.filter_by(kind="venue")}
+        assert venues == {"Test Ground": 5, "Other Ground": 1}
+        _assert_store_matches_fold(regular_user.id)
+        john = next(f for f in StatsService().get_insights(regular_user.id, match_format="T20")["form"]["batting"]
+                    if f["player"] == "John Doe")
+        assert john["series"] == [55, 12, 70, 61, 80]
+
+
+def test_tournament_view_folds_matches(app, regular_user, test_team, test_team_2,
+                                       make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        match = DBMatch.query.first()
+        assert StatsService().get_insights(regular_user.id, tournament_id=999) == {
+            "impact": [], "form": {"batting": [], "bowling": []},
+            "conditions": {"venues": [], "pitches": []}, "performances": [], "milestones": [],
+        }
+        whole = StatsService().get_insights(regular_user.id)
+        assert [p["label"] for p in whole["conditions"]["pitches"]] == [match.pitch_type]
+
+
+def test_migration_backfills_empty_store(app, regular_user, test_team, test_team_2,
+                                         make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, fmt="ListA"))
+        expected = _snapshot()
+
+        ConditionsSummary.query.delete()
+        PlayerFormSummary.query.delete()
+        bump_stats_version(regular_user.id)
+        db.session.commit()
+        assert StatsService().get_insights(regular_user.id)["impact"] == []
+
+        run_migration(db, app)
+        db.session.expire_all()
+        assert _snapshot() == expected
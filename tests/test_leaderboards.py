@@ -0,0 +1,172 @@
+"""
+Top-K leaderboards (engine/leaderboards.py) vs a brute-force Python sort.
+
+Randomised scorecards, MOTM awards and partnerships across two formats and
+a tournament; every scope and category must match sorting the full lists,
+including qualifier cut-offs and tie-breaks.
+"""
+import os
+import random
+import sys
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import (
+    Match as DBMatch, MatchPartnership, MatchScorecard, Player as DBPlayer, Tournament,
+)
+from engine.leaderboards import compute_leaderboards
+from engine.partnership_index import index_fields
+from engine.stats_service import StatsService
+
+K = 4
+MIN_BALLS = 20
+MIN_OVERS = 3
+
+
+def _seed(user_id, home, away, seed=11):
+    rng = random.Random(seed)
+    tournament = Tournament(user_id=user_id, name="Top-K Cup", format_type="T20")
+    db.session.add(tournament)
+    db.session.flush()
+
+    players = DBPlayer.query.filter(DBPlayer.team_id.in_([home.id, away.id])).all()
+    for i in range(10):
+        match_id = str(uuid.uuid4())
+        match = DBMatch(
+            id=match_id, user_id=user_id, home_team_id=home.id, away_team_id=away.id,
+            result_description="seeded", date=datetime.utcnow(),
+            match_format="ListA" if i % 3 == 2 else "T20", overs_per_side=20,
+            tournament_id=tournament.id if i % 2 == 0 else None,
+            motm_player_id=rng.choice(players).id if i % 4 else None,
+        )
+        db.session.add(match)
+        db.session.flush()
+        for player in players:
+            if rng.random() < 0.3:
+                continue
+            super_over = rng.random() < 0.1
+            db.session.add(MatchScorecard(
+                match_id=match_id, player_id=player.id, team_id=player.team_id,
+                innings_number=3 if super_over else 1, is_super_over=super_over,
+                record_type="batting", runs=rng.choice((None, 0, 4, 12, 30, 30, 55)),
+                balls=rng.choice((None, 0, 6, 12, 25)), is_out=rng.choice((True, False)),
+            ))
+            if rng.random() < 0.5:
+                db.session.add(MatchScorecard(
+                    match_id=match_id, player_id=player.id, team_id=player.team_id,
+                    innings_number=3 if super_over else 2, is_super_over=super_over,
+                    record_type="bowling", balls_bowled=rng.choice((0, 6, 12, 24)),
+                    runs_conceded=rng.choice((None, 6, 12, 24)),
+                    wickets=rng.choice((None, 0, 1, 2, 2, 3)),
+                ))
+        for w in range(3):
+            a, b = rng.sample(players, 2)
+            db.session.add(MatchPartnership(
+                match_id=match_id, innings_number=1, wicket_number=w + 1,
+                batsman1_id=a.id, batsman2_id=b.id,
+                runs=rng.choice((10, 25, 25, 60)), balls=rng.randint(5, 40),
+                **index_fields(match, a.id, b.id, a.team_id),
+            ))
+    db.session.commit()
+    return tournament.id
+
+
+def _reference(user_id, tournament_id=None, match_format=None):
+    def scoped(query):
+        query = query.filter(DBMatch.user_id == user_id)
+        if tournament_id is not None:
+            query = query.filter(DBMatch.tournament_id == tournament_id)
+        if match_format:
+            query = query.filter(DBMatch.match_format == match_format)
+        return query
+
+    cards = scoped(
+        db.session.query(MatchScorecard).join(DBMatch, MatchScorecard.match_id == DBMatch.id)
+        .filter(MatchScorecard.is_super_over.isnot(True))
+    ).all()
+    totals = defaultdict(lambda: dict.fromkeys(("runs", "balls", "wickets", "conceded", "bowled"), 0))
+    spells = []
+    for card in cards:
+        t = totals[card.player_id]
+        if card.record_type == "batting":
+            t["runs"] += card.runs or 0
+            t["balls"] += card.balls or 0
+        else:
+            t["wickets"] += card.wickets or 0
+            t["conceded"] += card.runs_conceded or 0
+            t["bowled"] += card.balls_bowled or 0
+            if (card.wickets or 0) > 0:
+                spells.append((-(card.wickets or 0), card.runs_conceded or 0, card.id, card.player_id))
+
+    awards = Counter(m.motm_player_id for m in scoped(DBMatch.query) if m.motm_player_id)
+    items = sorted(totals.items())
+    return {
+        "most_runs": [(p, t["runs"]) for p, t in sorted(
+            (x for x in items if x[1]["runs"] > 0), key=lambda x: -x[1]["runs"])][:K],
+        "most_wickets": [(p, t["wickets"]) for p, t in sorted(
+            (x for x in items if x[1]["wickets"] > 0),
+            key=lambda x: (-x[1]["wickets"], x[1]["conceded"]))][:K],
+        "best_strike": [(p, round(t["runs"] * 100.0 / t["balls"], 2)) for p, t in sorted(
+            (x for x in items if x[1]["balls"] >= MIN_BALLS and x[1]["balls"] > 0),
+            key=lambda x: -x[1]["runs"] / x[1]["balls"])][:K],
+        "best_economy": [(p, round(t["conceded"] * 6.0 / t["bowled"], 2)) for p, t in sorted(
+            (x for x in items if x[1]["bowled"] >= MIN_OVERS * 6 and x[1]["bowled"] > 0),
+            key=lambda x: x[1]["conceded"] / x[1]["bowled"])][:K],
+        "motm": [(p, n) for p, n in sorted(awards.items(), key=lambda x: (-x[1], x[0]))][:K],
+        "best_figures": [(p, -w, r) for w, r, _, p in sorted(spells)][:K],
+        "partnerships": sorted(
+            (p.runs for p in scoped(
+                db.session.query(MatchPartnership).join(DBMatch, MatchPartnership.match_id == DBMatch.id)
+            )), reverse=True)[:K],
+    }
+
+
+@pytest.mark.parametrize("scope", [
+    {}, {"match_format": "T20"}, {"match_format": "ListA"}, {"tournament": True},
+])
+def test_leaderboards_match_full_sort(app, regular_user, test_team, test_team_2, scope):
+    with app.app_context():
+        tid = _seed(regular_user.id, test_team, test_team_2)
+        kwargs = {"match_format": scope.get("match_format"),
+                  "tournament_id": tid if scope.get("tournament") else None}
+
+        expected = _reference(regular_user.id, **kwargs)
+        boards = compute_leaderboards(regular_user.id, k=K, min_balls=MIN_BALLS,
+                                      min_overs=MIN_OVERS, **kwargs)
+
+        assert [(e["player_id"], e["runs"]) for e in boards["most_runs"]] == expected["most_runs"]
+        assert [(e["player_id"], e["wickets"]) for e in boards["most_wickets"]] == expected["most_wickets"]
+        assert [(e["player_id"], e["strike_rate"]) for e in boards["best_strike"]] == expected["best_strike"]
+        assert [(e["player_id"], e["economy"]) for e in boards["best_economy"]] == expected["best_economy"]
+        assert [(e["player_id"], e["awards"]) for e in boards["motm"]] == expected["motm"]
+        assert [(e["player_id"], e["wickets"], e["runs"]) for e in boards["best_figures"]] == expected["best_figures"]
+        assert [e["runs"] for e in boards["partnerships"]] == expected["partnerships"]
+        assert boards["most_runs"] and boards["motm"] and boards["best_figures"]
+        if not scope:
+            assert boards["best_strike"] and boards["best_economy"] and boards["partnerships"]
+
+
+def test_leaderboards_endpoint_and_dashboard(app, authenticated_client, regular_user, test_team, test_team_2):
+    with app.app_context():
+        tid = _seed(regular_user.id, test_team, test_team_2)
+        expected = _reference(regular_user.id, tournament_id=tid)
+
+    resp = authenticated_client.get(f"/api/leaderboards?tournament_id={tid}&limit={K}&min_balls={MIN_BALLS}")
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert [(e["player_id"], e["runs"]) for e in data["most_runs"]] == expected["most_runs"]
+    assert authenticated_client.get("/api/leaderboards?limit=0").status_code == 400
+
+    # Bowling-figures leaderboard now limits in SQL; order is unchanged.
+    with app.app_context():
+        figures = StatsService().get_bowling_figures_leaderboard(regular_user.id, tid, limit=K)
+    assert [(f["wickets"], f["runs"] or 0) for f in figures] == [(w, r) for _, w, r in expected["best_figures"]]
+
+    page = authenticated_client.get(f"/tournaments/{tid}")
+    assert page.status_code == 200
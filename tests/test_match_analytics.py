@@ -0,0 +1,123 @@
+"""
+Post-match analytics stage (MatchPlayerAnalytics, engine/match_analytics.py).
+
+Archiving a match stores its Impact Index scores, MOTM ranking and the
+career milestones it crossed in one pass; readers (MOTM selection, impact
+scores, the stats and tournament pages) serve the stored rows.
+"""
+import json
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import Match as DBMatch, MatchPlayerAnalytics, MatchScorecard, Player as DBPlayer
+from engine import match_analytics, motm_service
+from engine.stats_service import StatsService
+from match_archiver import MatchArchiver
+from migrations.add_match_analytics import run_migration
+
+
+def _legacy_scores(match_id):
+    """compute_match_impact_scores() as it folds cards without stored rows."""
+    saved = {r.id: r for r in MatchPlayerAnalytics.query.filter_by(match_id=match_id)}
+    for row in saved.values():
+        db.session.delete(row)
+    db.session.flush()
+    try:
+        return StatsService().compute_match_impact_scores(match_id)
+    finally:
+        db.session.rollback()
+
+
+def test_archive_stores_impact_and_motm(app, regular_user, test_team, test_team_2, monkeypatch,
+                                        make_stats_match, archive_match):
+    with app.app_context():
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, john_runs=60, champ_wickets=3))
+
+        stored = StatsService().compute_match_impact_scores(match_id)
+        assert stored == _legacy_scores(match_id)
+        john = next(s for s in stored if s["player_name"] == "John Doe")
+        # Super-over runs never count towards impact.
+        assert john["runs"] == 60
+
+        db_match = db.session.get(DBMatch, match_id)
+        expected = motm_service.rank_candidates(stored, db_match.winner_team_id, db_match.match_status)[0]
+        assert db_match.motm_player_id == expected["player_id"]
+
+        # MOTM selection reads the stored ranking instead of re-scoring.
+        monkeypatch.setattr(StatsService, "compute_match_impact_scores",
+                            lambda *a, **k: (_ for _ in ()).throw(AssertionError("recomputed")))
+        motm = motm_service.select_match_motm(match_id, db_match.winner_team_id, db_match.match_status)
+        assert motm["player_id"] == expected["player_id"]
+        assert motm["weighted_score"] == expected["weighted_score"]
+        assert motm["is_winning_side"] == expected["is_winning_side"]
+
+
+def test_milestones_detected_once_from_career_totals(app, regular_user, test_team, test_team_2,
+                                                     make_stats_match, archive_match):
+    with app.app_context():
+        john = DBPlayer.query.filter_by(name="John Doe").first()
+        john.total_runs = 470
+        db.session.commit()
+
+        match = make_stats_match(regular_user.id, john_runs=40)
+        arch = MatchArchiver(match.match_data, match)
+        arch.filenames = {"json": f"/tmp/{match.match_data['match_id']}.json"}
+        assert arch._save_to_database()
+        db.session.commit()
+        # 470 + 40 + 10 (super over) crosses 500 exactly once.
+        assert arch._milestones == ["John Doe reached 500 career runs!"]
+
+        row = MatchPlayerAnalytics.query.filter_by(player_id=john.id).one()
+        assert json.loads(row.milestones) == arch._milestones
+        assert [m["text"] for m in StatsService().get_insights(regular_user.id)["milestones"]] == arch._milestones
+
+        archive_match(make_stats_match(regular_user.id, john_runs=5))
+        assert len(match_analytics.recent_milestones(regular_user.id)) == 1
+
+
+def test_performances_and_reversal(app, regular_user, test_team, test_team_2,
+                                   make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id, john_runs=20))
+        match_id = str(uuid.uuid4())
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, john_runs=90))
+
+        best = match_analytics.top_performances(regular_user.id, limit=1)[0]
+        assert (best["player"], best["runs"], best["match_id"]) == ("John Doe", 90, match_id)
+        assert StatsService().get_insights(regular_user.id)["performances"][0] == best
+        assert match_analytics.top_performances(regular_user.id, match_format="ListA") == []
+
+        # Re-archiving replaces the match's rows; reversing drops them.
+        archive_match(make_stats_match(regular_user.id, match_id=match_id, john_runs=10))
+        assert MatchPlayerAnalytics.query.filter_by(match_id=match_id).count() == len(
+            StatsService().compute_match_impact_scores(match_id)
+        )
+        from match_archiver import reverse_player_aggregates
+        reverse_player_aggregates(MatchScorecard.query.filter_by(match_id=match_id).all())
+        db.session.commit()
+        assert MatchPlayerAnalytics.query.filter_by(match_id=match_id).count() == 0
+
+
+def test_migration_backfills_impact(app, regular_user, test_team, test_team_2,
+                                    make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        expected = {
+            (r.match_id, r.player_id): (r.impact_score, r.motm_rank, r.weighted_score)
+            for r in MatchPlayerAnalytics.query.all()
+        }
+        assert expected
+        MatchPlayerAnalytics.query.delete()
+        db.session.commit()
+
+        run_migration(db, app)
+        db.session.expire_all()
+        assert {
+            (r.match_id, r.player_id): (r.impact_score, r.motm_rank, r.weighted_score)
+            for r in MatchPlayerAnalytics.query.all()
+        } == expected
@@ -0,0 +1,241 @@
+"""
+Staged, single-transaction tournament match completion
+(engine/match_completion.py).
+"""
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+from database import db
+from database.models import (
+    AdminAuditLog,
+    Match as DBMatch,
+    MatchScorecard,
+    Player as DBPlayer,
+    Team as DBTeam,
+    Tournament,
+    TournamentFixture,
+    TournamentPlayerStatsCache,
+    TournamentTeam,
+)
+from engine import match_ledger
+from engine.match_completion import STAGES, complete_tournament_match
+from engine.tournament_autosim import fixture_match_data, play_fixture, simulate_remaining
+from engine.tournament_engine import TournamentEngine
+
+
+def _sides(user_id, names):
+    teams = []
+    for name, code in names:
+        team = DBTeam(name=name, short_code=code, user_id=user_id,
+                      home_ground=f"{name} Oval", is_placeholder=False, is_draft=False)
+        db.session.add(team)
+        db.session.flush()
+        roles = ["Wicketkeeper"] + ["Batsman"] * 5 + ["All-rounder"] * 6
+        for i, role in enumerate(roles):
+            db.session.add(DBPlayer(
+                team_id=team.id, name=f"{code} Player {i + 1}", role=role,
+                batting_hand="right", bowling_type="medium" if role == "All-rounder" else "",
+                bowling_hand="right", is_wicketkeeper=role == "Wicketkeeper",
+                batting_rating=70 - i * 2, bowling_rating=40 + i * 3, fielding_rating=60,
+            ))
+        teams.append(team)
+    db.session.commit()
+    return teams
+
+
+@pytest.fixture
+def played(app, regular_user):
+    """A round robin of three sides and one of its fixtures played (not yet persisted)."""
+    teams = _sides(regular_user.id, [("Alpha", "ALP"), ("Bravo", "BRV"), ("Charlie", "CHL")])
+    engine = TournamentEngine()
+    t = engine.create_tournament("Pipeline Cup", regular_user.id, [s.id for s in teams],
+                                 mode=TournamentEngine.MODE_ROUND_ROBIN)
+    fixture = TournamentFixture.query.filter_by(tournament_id=t.id).first()
+    data = fixture_match_data(fixture, regular_user.id, random.Random(7))
+    return engine, fixture.id, data, play_fixture(data)
+
+
+def test_completion_is_one_timed_commit(played):
+    engine, fixture_id, data, match = played
+    outcome = {"result": match.result, "commentary": ""}
+    commits = []
+
+    def record(conn):
+        commits.append(1)
+
+    event.listen(db.engine, "commit", record)
+    try:
+        result = complete_tournament_match(match, data["match_id"], outcome, engine)
+    finally:
+        event.remove(db.engine, "commit", record)
+
+    assert len(commits) == 1
+    assert tuple(result["timings"]) == STAGES
+    assert all(ms >= 0 for ms in result["timings"].values())
+    assert match.data["current_state"] == "completed"
+
+    fixture = db.session.get(TournamentFixture, fixture_id)
+    assert fixture.status == "Completed" and fixture.match_id == data["match_id"]
+    assert db.session.get(DBMatch, data["match_id"]).tournament_id == fixture.tournament_id
+    assert MatchScorecard.query.filter_by(match_id=data["match_id"]).count()
+    # Archived before the standings, so the player stats cache already
+    # includes this match.
+    assert TournamentPlayerStatsCache.query.filter_by(tournament_id=fixture.tournament_id).count()
+
+
+def test_failure_rolls_the_whole_match_back(played, monkeypatch):
+    engine, fixture_id, data, match = played
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("standings unavailable")
+
+    monkeypatch.setattr(engine, "update_standings", boom)
+    with pytest.raises(RuntimeError):
+        complete_tournament_match(match, data["match_id"], {"result": match.result}, engine)
+
+    assert match.data.get("current_state") != "completed"
+    assert db.session.get(DBMatch, data["match_id"]) is None
+    assert MatchScorecard.query.filter_by(match_id=data["match_id"]).count() == 0
+    assert db.session.get(TournamentFixture, fixture_id).status == "Scheduled"
+
+
+def test_resimulation_replaces_the_previous_result(played):
+    engine, fixture_id, data, match = played
+    complete_tournament_match(match, data["match_id"], {"result": match.result}, engine)
+
+    replay = play_fixture(data)
+    complete_tournament_match(replay, data["match_id"], {"result": replay.result}, engine)
+
+    fixture = db.session.get(TournamentFixture, fixture_id)
+    assert fixture.status == "Completed" and fixture.match_id == data["match_id"]
+    played_total = sum(tt.played for tt in TournamentTeam.query.filter_by(tournament_id=fixture.tournament_id))
+    assert played_total == 2
+    keys = [(c.player_id, c.innings_number, c.record_type)
+            for c in MatchScorecard.query.filter_by(match_id=data["match_id"])]
+    assert keys and len(keys) == len(set(keys))
+
+
+def test_completion_records_a_ledger(played):
+    engine, fixture_id, data, match = played
+    complete_tournament_match(match, data["match_id"], {"result": match.result}, engine)
+
+    entries = match_ledger.load(data["match_id"])
+    fixture = db.session.get(TournamentFixture, fixture_id)
+    assert {int(t) for t in entries["standings"]} == {fixture.home_team_id, fixture.away_team_id}
+    assert all(delta["played"] == 1 for delta in entries["standings"].values())
+    assert sum(delta["points"] for delta in entries["standings"].values()) == sum(
+        tt.points for tt in TournamentTeam.query.filter_by(tournament_id=fixture.tournament_id))
+    card_players = {c.player_id for c in MatchScorecard.query.filter_by(match_id=data["match_id"])}
+    assert set(entries["players"]) == card_players
+
+
+def test_reversal_replays_the_ledger(played, monkeypatch):
+    engine, fixture_id, data, match = played
+    complete_tournament_match(match, data["match_id"], {"result": match.result}, engine)
+    tournament_id = db.session.get(TournamentFixture, fixture_id).tournament_id
+
+    def no_recompute(*args, **kwargs):
+        raise AssertionError("a ledgered match must not recompute the table")
+
+    monkeypatch.setattr(engine, "recompute_standings", no_recompute)
+    assert engine.reverse_standings(db.session.get(DBMatch, data["match_id"]))
+    db.session.commit()
+
+    for tt in TournamentTeam.query.filter_by(tournament_id=tournament_id):
+        assert (tt.played, tt.points, tt.runs_scored, tt.balls_faced) == (0, 0, 0, 0)
+        assert tt.net_run_rate == 0.0
+    assert match_ledger.load(data["match_id"]) is None
+    assert all(row.runs_scored == 0 and row.matches_played == 0 for row in
+               TournamentPlayerStatsCache.query.filter_by(tournament_id=tournament_id))
+
+
+@pytest.fixture
+def knockout(app, regular_user):
+    """A four-side knockout played to the final."""
+    teams = _sides(regular_user.id, [("Alpha", "ALP"), ("Bravo", "BRV"),
+                                     ("Charlie", "CHL"), ("Delta", "DLT")])
+    engine = TournamentEngine()
+    t = engine.create_tournament("Ledger Cup", regular_user.id, [s.id for s in teams],
+                                 mode=TournamentEngine.MODE_KNOCKOUT)
+    simulate_remaining(t, regular_user.id, engine, workers=1, rng=random.Random(3))
+    # Semis in the order they were applied, then the final.
+    fixtures = (TournamentFixture.query.filter_by(tournament_id=t.id)
+                .order_by(TournamentFixture.round_number, TournamentFixture.id).all())
+    return engine, t.id, fixtures
+
+
+def _image(obj, columns):
+    return {column: getattr(obj, column) for column in columns}
+
+
+def _reverse(engine, fixture):
+    entries = match_ledger.load(fixture.match_id)
+    assert engine.reverse_standings(db.session.get(DBMatch, fixture.match_id))
+    db.session.commit()
+    return entries
+
+
+def test_reversal_restores_the_ledger_images(knockout, monkeypatch):
+    engine, tournament_id, (semi_1, semi_2, final) = knockout
+    assert db.session.get(Tournament, tournament_id).status == "Completed"
+
+    def no_tree(*args, **kwargs):
+        raise AssertionError("an unmoved ledger must not reset from the tree")
+
+    monkeypatch.setattr(engine, "_reset_progression", no_tree)
+    entries = _reverse(engine, final)
+    tournament = db.session.get(Tournament, tournament_id)
+    assert _image(tournament, match_ledger.TOURNAMENT_COLUMNS) == entries["tournament"]["before"]
+    assert tournament.status != "Completed"
+
+    # The second semi completed the round and seeded the final; the first
+    # moved nothing but the tournament state.
+    entries = _reverse(engine, semi_2)
+    (moved,) = entries["fixtures"]
+    assert moved["id"] == final.id
+    assert _image(db.session.get(TournamentFixture, final.id), match_ledger.FIXTURE_COLUMNS) == moved["before"]
+    assert not _reverse(engine, semi_1)["fixtures"]
+    final = db.session.get(TournamentFixture, final.id)
+    # Both slots back on the TBD placeholder.
+    assert final.status == "Locked" and final.home_team_id == final.away_team_id
+
+
+def test_reversal_under_a_later_result_resets_from_the_tree(knockout, monkeypatch):
+    engine, tournament_id, (semi_1, semi_2, final) = knockout
+    _reverse(engine, final)
+    # semi_2 was applied after semi_1 and moved the tournament on to the final.
+    calls = []
+    real = engine._reset_progression
+    monkeypatch.setattr(engine, "_reset_progression",
+                        lambda *args: calls.append(args) or real(*args))
+    _reverse(engine, semi_1)
+    assert len(calls) == 1
+    final = db.session.get(TournamentFixture, final.id)
+    assert final.status == "Locked" and final.home_team_id == final.away_team_id
+
+
+def test_admin_reset_audits_the_undone_results(admin_client, regular_user):
+    teams = _sides(regular_user.id, [("Alpha", "ALP"), ("Bravo", "BRV")])
+    engine = TournamentEngine()
+    t = engine.create_tournament("Audit Cup", regular_user.id, [s.id for s in teams],
+                                 mode=TournamentEngine.MODE_ROUND_ROBIN)
+    simulate_remaining(t, regular_user.id, engine, workers=1)
+    ledgers = match_ledger.tournament_ledgers(t.id)
+    assert ledgers
+
+    assert admin_client.post(f"/admin/tournaments/{t.id}/reset").status_code == 200
+    entry = (AdminAuditLog.query.filter_by(action="reset_tournament")
+             .order_by(AdminAuditLog.id.desc()).first())
+    undone = json.loads(entry.details)["undone"]
+    assert undone == [
+        {"match_id": match_id, "fixture_id": fixture_id, **entries}
+        for match_id, fixture_id, entries in ledgers
+    ]
+    assert not match_ledger.tournament_ledgers(t.id)
@@ -0,0 +1,125 @@
+"""
+Parallel, checkpointed offline rebuild (engine/offline_rebuild.py).
+"""
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import db
+from database.models import (
+    Player as DBPlayer,
+    Team as DBTeam,
+    Tournament,
+    TournamentPlayerStatsCache,
+    TournamentTeam,
+)
+from engine import offline_rebuild
+from engine.tournament_autosim import simulate_remaining
+from engine.tournament_engine import TournamentEngine
+
+
+@pytest.fixture
+def tournaments(app, regular_user):
+    """Two round robins of three sides, every fixture played."""
+    teams = []
+    for name, code in [("Alpha", "ALP"), ("Bravo", "BRV"), ("Charlie", "CHL")]:
+        team = DBTeam(name=name, short_code=code, user_id=regular_user.id,
+                      home_ground=f"{name} Oval", is_placeholder=False, is_draft=False)
+        db.session.add(team)
+        db.session.flush()
+        roles = ["Wicketkeeper"] + ["Batsman"] * 5 + ["All-rounder"] * 6
+        for i, role in enumerate(roles):
+            db.session.add(DBPlayer(
+                team_id=team.id, name=f"{code} Player {i + 1}", role=role,
+                batting_hand="right", bowling_type="medium" if role == "All-rounder" else "",
+                bowling_hand="right", is_wicketkeeper=role == "Wicketkeeper",
+                batting_rating=70 - i * 2, bowling_rating=40 + i * 3, fielding_rating=60,
+            ))
+        teams.append(team)
+    db.session.commit()
+
+    engine = TournamentEngine()
+    ids = []
+    for name in ("Rebuild Cup", "Rebuild Shield"):
+        t = engine.create_tournament(name, regular_user.id, [s.id for s in teams],
+                                     mode=TournamentEngine.MODE_ROUND_ROBIN)
+        simulate_remaining(t, regular_user.id, engine, workers=1)
+        ids.append(t.id)
+    return ids
+
+
+def _db_path():
+    return db.engine.url.database
+
+
+def _corrupt(tournament_id):
+    tt = TournamentTeam.query.filter_by(tournament_id=tournament_id).first()
+    tt.points += 4
+    tt.net_run_rate = 9.5
+    row = TournamentPlayerStatsCache.query.filter_by(tournament_id=tournament_id).first()
+    row.runs_scored += 100
+    db.session.commit()
+    return tt.team_id, row.player_id
+
+
+def _changed(summary):
+    return {r["tournament_id"] for r in summary["results"] if r["standings"] or r["cache"]}
+
+
+def test_rebuilt_tables_match_the_live_engine(tournaments):
+    summary = offline_rebuild.rebuild(_db_path(), workers=1)
+    assert [r["tournament_id"] for r in summary["results"]] == tournaments
+    assert not _changed(summary)
+
+
+def test_dry_run_reports_and_apply_repairs(tournaments, tmp_path):
+    broken, intact = tournaments
+    team_id, player_id = _corrupt(broken)
+    versions = {t.id: t.version for t in Tournament.query}
+
+    dry = offline_rebuild.rebuild(_db_path(), workers=1)
+    assert _changed(dry) == {broken}
+    result = next(r for r in dry["results"] if r["tournament_id"] == broken)
+    assert [r["team_id"] for r in result["standings"]] == [team_id]
+    assert set(result["standings"][0]["changes"]) == {"points", "net_run_rate"}
+    assert [r["player_id"] for r in result["cache"]] == [player_id]
+    assert list(result["cache"][0]["changes"]) == ["runs_scored"]
+    db.session.expire_all()
+    assert TournamentTeam.query.filter_by(tournament_id=broken, team_id=team_id).one().net_run_rate == 9.5
+
+    applied = offline_rebuild.rebuild(_db_path(), apply=True, workers=1,
+                                      checkpoint=str(tmp_path / "rebuild.json"))
+    assert _changed(applied) == {broken}
+    db.session.expire_all()
+    assert db.session.get(Tournament, broken).version == versions[broken] + 1
+    assert db.session.get(Tournament, intact).version == versions[intact]
+
+    assert not _changed(offline_rebuild.rebuild(_db_path(), workers=1))
+
+
+def test_checkpoint_resumes_and_is_run_specific(tournaments, tmp_path):
+    checkpoint = str(tmp_path / "rebuild.json")
+    first = offline_rebuild.rebuild(_db_path(), only=tournaments[:1], workers=1, checkpoint=checkpoint)
+    assert [r["tournament_id"] for r in first["results"]] == tournaments[:1]
+    with open(checkpoint) as f:
+        assert set(json.load(f)["finished"]) == {str(tournaments[0])}
+
+    resumed = offline_rebuild.rebuild(_db_path(), workers=1, checkpoint=checkpoint)
+    assert resumed["skipped"] == 1
+    assert [r["tournament_id"] for r in resumed["results"]] == tournaments[1:]
+
+    with pytest.raises(ValueError):
+        offline_rebuild.rebuild(_db_path(), apply=True, workers=1, checkpoint=checkpoint)
+
+
+def test_worker_pool_matches_in_process(tournaments):
+    _corrupt(tournaments[1])
+    pooled = offline_rebuild.rebuild(_db_path(), workers=2)
+    serial = offline_rebuild.rebuild(_db_path(), workers=1)
+    strip = lambda s: [{**r, "seconds": 0} for r in s["results"]]  # noqa: E731
+    assert strip(pooled) == strip(serial)
+    assert _changed(pooled) == {tournaments[1]}
@@ -0,0 +1,126 @@
+"""
+Partnership index (MatchPartnership scope/pair columns, engine/partnership_index.py).
+
+Archived partnerships carry their match's scope and a canonical player pair,
+the migration backfills rows written without them, and the grouped
+leaderboards and per-player breakdown agree with a fold over the raw rows.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import db
+from database.models import MatchPartnership, Player as DBPlayer
+from engine import partnership_index
+from engine.stats_service import StatsService
+from migrations.add_partnership_index import run_migration
+
+
+def _stand(b1, b2, wicket, runs, c1, c2):
+    return {
+        "batsman1_name": b1, "batsman2_name": b2, "wicket_number": wicket,
+        "runs": runs, "balls": runs, "batsman1_contribution": c1,
+        "batsman2_contribution": c2, "start_over": 0.0, "end_over": 5.0,
+    }
+
+
+@pytest.fixture
+def seed_partnerships(make_stats_match, archive_match):
+    def _archive_with(user_id, stands, **kwargs):
+        match = make_stats_match(user_id, **kwargs)
+        match.first_innings_partnerships = stands
+        archive_match(match)
+
+    def _seed(user_id):
+        _archive_with(user_id, [
+            _stand("John Doe", "Batsman 1", 1, 60, 40, 20),
+            _stand("John Doe", "Allrounder 1", 2, 110, 70, 40),
+        ])
+        _archive_with(user_id, [
+            # Same pair, batting order swapped.
+            _stand("Batsman 1", "John Doe", 1, 55, 25, 30),
+            _stand("Batsman 1", "Allrounder 1", 2, 20, 10, 10),
+        ])
+        _archive_with(user_id, [
+            _stand("John Doe", "Batsman 1", 1, 200, 120, 80),
+        ], fmt="ListA")
+
+    return _seed
+
+
+def _ids(*names):
+    return {p.name: p.id for p in DBPlayer.query.filter(DBPlayer.name.in_(names))}
+
+
+def test_archive_writes_index_columns(app, regular_user, test_team, test_team_2, seed_partnerships):
+    with app.app_context():
+        seed_partnerships(regular_user.id)
+        rows = MatchPartnership.query.all()
+        assert len(rows) == 5
+        for row in rows:
+            assert row.user_id == regular_user.id
+            assert row.batting_team_id == test_team.id
+            assert row.player_a_id == min(row.batsman1_id, row.batsman2_id)
+            assert row.player_b_id == max(row.batsman1_id, row.batsman2_id)
+            assert row.match_format == row.match.match_format
+
+
+def test_grouped_queries_match_raw_rows(app, regular_user, test_team, test_team_2, seed_partnerships):
+    with app.app_context():
+        seed_partnerships(regular_user.id)
+        ids = _ids("John Doe", "Batsman 1", "Allrounder 1")
+        user = regular_user.id
+
+        pairs = partnership_index.best_pairs(user, match_format="T20")
+        assert [(p["runs"], p["partnerships"]) for p in pairs] == [(115, 2), (110, 1), (20, 1)]
+        assert {pairs[0]["batsman1"], pairs[0]["batsman2"]} == {"John Doe", "Batsman 1"}
+        assert pairs[1]["hundreds"] == 1
+
+        by_wicket = partnership_index.best_by_wicket(user, match_format="T20")
+        assert [(s["wicket"], s["runs"]) for s in by_wicket] == [(1, 60), (2, 110)]
+        assert by_wicket[0]["opponent"] == test_team_2.name
+
+        best = partnership_index.best_partnerships(user, limit=2)
+        assert [s["runs"] for s in best] == [200, 110]
+
+        stats = StatsService().get_player_partnership_stats(ids["John Doe"], user, match_format="T20")
+        assert stats["total_partnerships"] == 3
+        assert stats["total_runs"] == 60 + 110 + 55
+        assert stats["milestones"] == {"50+": 3, "100+": 1, "150+": 0, "200+": 0}
+        assert stats["by_position"] == {1: {"count": 2, "runs": 115}, 2: {"count": 1, "runs": 110}}
+        assert [(p["name"], p["count"], p["best"]) for p in stats["partners"]] == [
+            ("Batsman 1", 2, 60), ("Allrounder 1", 1, 110),
+        ]
+        # Contributions are reported from John Doe's side of each stand.
+        assert [(s["runs"], s["player_contribution"]) for s in stats["best_partnerships"]] == [
+            (110, 70), (60, 40), (55, 30),
+        ]
+
+        records = StatsService().get_partnership_records(user, match_format="ListA")
+        assert [p["runs"] for p in records["pairs"]] == [200]
+
+
+def test_migration_backfills_unindexed_rows(app, regular_user, test_team, test_team_2, seed_partnerships):
+    with app.app_context():
+        seed_partnerships(regular_user.id)
+        expected = {
+            r.id: (r.user_id, r.tournament_id, r.match_format, r.batting_team_id, r.player_a_id, r.player_b_id)
+            for r in MatchPartnership.query.all()
+        }
+        MatchPartnership.query.update({
+            MatchPartnership.user_id: None, MatchPartnership.match_format: None,
+            MatchPartnership.player_a_id: None, MatchPartnership.player_b_id: None,
+            MatchPartnership.batting_team_id: None,
+        })
+        db.session.commit()
+        assert partnership_index.best_partnerships(regular_user.id) == []
+
+        run_migration(db, app)
+        db.session.expire_all()
+        assert {
+            r.id: (r.user_id, r.tournament_id, r.match_format, r.batting_team_id, r.player_a_id, r.player_b_id)
+            for r in MatchPartnership.query.all()
+        } == expected
@@ -0,0 +1,100 @@
+"""
+Batched player stat lookups (StatsService._get_players_detailed_stats).
+
+Comparing players loads every requested id in a fixed number of queries, so
+six players cost no more round trips than two, and the batched fold gives
+the same numbers as the single-player path.
+"""
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from database import db
+from database.models import Player as DBPlayer
+from engine.stats_service import StatsService
+
+
+@contextmanager
+def _count_selects():
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _player_ids(*names):
+    rows = DBPlayer.query.filter(DBPlayer.name.in_(names)).all()
+    return [p.id for p in sorted(rows, key=lambda p: names.index(p.name))]
+
+
+def test_compare_players_query_count_is_constant(app, regular_user, test_team, test_team_2,
+                                                 make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, john_runs=75))
+        two = _player_ids("John Doe", "Champion 1")
+        six = _player_ids("John Doe", "Champion 1", "Batsman 1", "Champ Bat 1",
+                          "Allrounder 1", "Champion 2")
+        assert len(six) == 6
+        db.session.expire_all()
+
+        service = StatsService()
+        with _count_selects() as small:
+            service.compare_players(regular_user.id, two, match_format="T20")
+        db.session.expire_all()
+        with _count_selects() as large:
+            comparison = service.compare_players(regular_user.id, six, match_format="T20")
+
+        assert len(large) == len(small)
+        assert [p["player_id"] for p in comparison["players"]] == six
+
+        by_name = {p["player_name"]: p for p in comparison["players"]}
+        assert by_name["John Doe"]["batting"]["runs"] == 40 + 75
+        assert by_name["John Doe"]["matches"] == 2
+        assert by_name["Champion 1"]["bowling"]["wickets"] == 4
+        for pid in six:
+            single = service._get_player_detailed_stats(pid, regular_user.id, match_format="T20")
+            assert single == next(p for p in comparison["players"] if p["player_id"] == pid)
+
+
+def test_compare_players_skips_foreign_and_missing_ids(app, regular_user, admin_user, test_team, test_team_2,
+                                                       make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        ids = _player_ids("John Doe", "Champion 1")
+        service = StatsService()
+
+        comparison = service.compare_players(regular_user.id, ids + [999999], match_format="T20")
+        assert [p["player_id"] for p in comparison["players"]] == ids
+
+        foreign = service.compare_players(admin_user.id, ids, match_format="T20")
+        assert foreign["players"] == []
+
+
+def test_player_profile_uses_batched_lookup(app, regular_user, test_team, test_team_2,
+                                            make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, john_runs=75))
+        (john,) = _player_ids("John Doe")
+
+        profile = StatsService().get_player_profile(john, regular_user.id, "T20")
+        assert profile["batting"]["runs"] == 40 + 75
+        assert profile["matches"] == 2
+        assert len(profile["match_log"]) == 2
+        # Super-over rows never reach the profile.
+        assert all(m["bat_runs"] in (40, 75) for m in profile["match_log"])
+
+        assert StatsService().get_player_profile(999999, regular_user.id) == {"error": "Player not found"}
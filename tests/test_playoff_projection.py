@@ -0,0 +1,153 @@
+"""
+Monte Carlo playoff projections (engine/playoff_projection.py).
+
+The remaining league fixtures are simulated with the fast match model; the
+odds must be proper probabilities, respect results already on the table,
+and be cached until the standings change.
+"""
+import dataclasses
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from database import db
+from database.models import Player as DBPlayer, Team as DBTeam, TournamentFixture, TournamentTeam
+from engine.playoff_projection import MODELS, first_innings_mean, project_tournament, simulate_matches
+from engine.stats_cache import get_cache
+from engine.tournament_dashboard import bump_tournament_version
+from engine.tournament_engine import TournamentEngine
+
+
+@pytest.fixture
+def sides(app, regular_user):
+    """Six sides of 11 players; Alpha is much stronger than the rest."""
+    teams = []
+    for k, (name, code) in enumerate([("Alpha", "ALP"), ("Bravo", "BRV"), ("Charlie", "CHL"),
+                                      ("Delta", "DLT"), ("Echo", "ECH"), ("Foxtrot", "FOX")]):
+        team = DBTeam(name=name, short_code=code, user_id=regular_user.id,
+                      home_ground=f"{name} Oval", is_placeholder=False, is_draft=False)
+        db.session.add(team)
+        db.session.flush()
+        boost = 25 if k == 0 else 0
+        roles = ["Wicketkeeper"] + ["Batsman"] * 5 + ["Bowler"] * 5
+        for i, role in enumerate(roles):
+            db.session.add(DBPlayer(
+                team_id=team.id, name=f"{code} Player {i + 1}", role=role,
+                batting_rating=60 + boost - i, bowling_rating=40 + boost + i * 3, fielding_rating=60,
+            ))
+        teams.append(team)
+    db.session.commit()
+    return teams
+
+
+def _create(regular_user, sides, mode=TournamentEngine.MODE_IPL_STYLE):
+    get_cache().clear()
+    return TournamentEngine().create_tournament("Projection Cup", regular_user.id,
+                                                [s.id for s in sides], mode=mode)
+
+
+def test_match_model_results_are_consistent():
+    rng = np.random.default_rng(7)
+    bat, bowl = np.array([70.0, 70.0]), np.array([70.0, 70.0])
+    home_runs, home_balls, away_runs, away_balls, result = simulate_matches(
+        MODELS["T20"], rng, bat, bowl, np.array([0]), np.array([1]), 5000
+    )
+    assert ((result == 1) == (home_runs > away_runs)).all()
+    assert ((result == 0) == (home_runs == away_runs)).all()
+    assert (np.maximum(home_balls, away_balls) == 120).all()
+    assert 0.4 < (result == 1).mean() < 0.6
+
+
+@pytest.mark.parametrize("fmt", ["T20", "ListA"])
+def test_stronger_batting_raises_the_first_innings(fmt):
+    model = MODELS[fmt]
+    assert first_innings_mean(model, 70.0, 70.0) == model.first_mean
+    assert first_innings_mean(model, 90.0, 70.0) > first_innings_mean(model, 50.0, 70.0)
+    assert model.chase_logit[1] < 0  # a bigger target is harder to chase
+    # Equal seeds give every simulation the same toss and rolls, so the
+    # stronger batting side never scores less, batting first or chasing.
+    home_runs = []
+    for batting in (50.0, 90.0):
+        runs, *_ = simulate_matches(model, np.random.default_rng(5), np.array([batting, 70.0]),
+                                    np.array([70.0, 70.0]), np.array([0]), np.array([1]), 20000)
+        home_runs.append(runs)
+    weak, strong = home_runs
+    assert (strong >= weak).all()
+    assert strong.mean() > weak.mean()
+
+
+@pytest.mark.parametrize("fmt", ["T20", "ListA"])
+def test_stronger_defending_attack_lowers_the_chase(fmt):
+    # Bowling only enters through the chase here; equal seeds give every
+    # simulation the same toss, target and rolls under both attacks.
+    model = dataclasses.replace(MODELS[fmt], first_bowl=0.0)
+    assert model.chase_logit[3] < 0
+    away_wins = []
+    for attack in (50.0, 90.0):
+        *_, result = simulate_matches(model, np.random.default_rng(11), np.array([70.0, 70.0]),
+                                      np.array([attack, 70.0]), np.array([0]), np.array([1]), 20000)
+        away_wins.append(result == -1)
+    weak, strong = away_wins
+    assert strong.sum() < weak.sum()
+    # Only chases of team 0's total change, and only from won to lost.
+    assert not (strong & ~weak).any()
+
+
+def test_probabilities_are_consistent(app, regular_user, sides):
+    t = _create(regular_user, sides)
+    projection = project_tournament(t, simulations=4000, time_budget=30)
+
+    assert projection["simulations"] == 4000
+    assert projection["remaining"] == 30
+    teams = projection["teams"]
+    assert len(teams) == 6
+    assert sum(p["top2"] for p in teams) == pytest.approx(2, abs=0.01)
+    assert sum(p["top4"] for p in teams) == pytest.approx(4, abs=0.01)
+    assert sum(p["title"] for p in teams) == pytest.approx(1, abs=0.01)
+    assert all(p["top2"] <= p["top4"] for p in teams)
+    assert teams[0]["team_name"] == "Alpha" and teams[0]["top4"] > 0.6
+
+
+def test_completed_league_fixes_the_seeds(app, regular_user, sides):
+    t = _create(regular_user, sides)
+    for k, tt in enumerate(TournamentTeam.query.filter_by(tournament_id=t.id).order_by(TournamentTeam.team_id)):
+        tt.played, tt.points, tt.won = 10, 20 - 2 * k, 10 - k
+    for f in TournamentFixture.query.filter_by(tournament_id=t.id, stage=TournamentEngine.STAGE_LEAGUE):
+        f.status = "Completed"
+    db.session.commit()
+
+    teams = {p["team_id"]: p for p in project_tournament(t, simulations=2000)["teams"]}
+    order = [s.id for s in sides]
+    assert [teams[i]["top4"] for i in order] == [1, 1, 1, 1, 0, 0]
+    assert [teams[i]["top2"] for i in order] == [1, 1, 0, 0, 0, 0]
+    assert teams[order[4]]["title"] == 0 and teams[order[5]]["title"] == 0
+
+
+def test_projection_is_cached_until_the_version_changes(app, regular_user, sides):
+    t = _create(regular_user, sides)
+    first = project_tournament(t, simulations=1000)
+    assert project_tournament(t, simulations=1000) == first
+
+    leader = TournamentTeam.query.filter_by(tournament_id=t.id, team_id=sides[5].id).first()
+    leader.played, leader.won, leader.points = 5, 5, 10
+    bump_tournament_version(t.id)
+    db.session.commit()
+    second = project_tournament(t, simulations=1000)
+    fox = next(p for p in second["teams"] if p["team_id"] == sides[5].id)
+    assert second != first and fox["top4"] > 0.5
+
+
+def test_knockout_has_no_projection(app, regular_user, sides):
+    t = _create(regular_user, sides[:4], mode=TournamentEngine.MODE_KNOCKOUT)
+    assert project_tournament(t) is None
+
+
+def test_dashboard_shows_odds(app, authenticated_client, regular_user, sides):
+    with app.app_context():
+        tournament_id = _create(regular_user, sides).id
+    html = authenticated_client.get(f"/tournaments/{tournament_id}").get_data(as_text=True)
+    assert "TOP 4" in html and "simulations" in html
@@ -178,6 +178,29 @@ def test_chase_terminated_is_decided_on_dls_par(app):
     assert m.rain_events_log[-1]["outcome"] in ("chase_terminated", "resume")
 
 
+def test_terminated_chase_par_matches_the_live_par(app):
+    # Innings 1 cut at 10 overs (R2 > R1, so the G50 branch is in play),
+    # then the chase is stopped at an over boundary past the minimum.
+    m = _match(_script({"at_global_over": 10, "overs_lost": 15}))
+    _play_until(m, lambda mm, rr: (mm.innings == 2 and mm.current_over == 6
+                                   and mm.current_ball == 0))
+    if m.innings != 2 or m.current_over != 6:
+        pytest.skip("chase ended inside 6 overs")
+    live_par = m._current_dls_par()   # what the scoreboard shows right now
+    m.weather_script["events"].append(
+        {"at_global_over": m._global_overs_completed(), "overs_lost": 20}
+    )
+
+    r = m.next_ball()   # the over-start rain check terminates the chase
+    assert r.get("match_over") is True
+    assert m.rain_events_log[-1]["outcome"] == "chase_terminated"
+    # The par that decides the match is the one the scoreboard showed, and
+    # the revised target sits exactly one run above it.
+    assert r["dls_par"] == live_par
+    assert r["dls_par"] == m.target - 1
+    assert f"<strong>{r['dls_par']}</strong>" in r["commentary"]
+
+
 # ── Pre-chase reduction (rain at the innings break) ───────────────────────────
 
 def test_rain_at_innings_break_reduces_chase_before_it_starts(app):
@@ -0,0 +1,110 @@
+"""Rating-sensitivity sweep (engine/rating_sweep.py).
+
+The sweep evaluates outcome_weights() analytically instead of sampling
+calculate_outcome(). These tests pin that the two agree and that the cache
+is keyed by the ground config.
+"""
+import copy
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine.rating_sweep as rating_sweep
+from engine.ball_outcome import calculate_outcome, outcome_weights
+from engine.format_config import get_format
+from engine.ground_config import get_defaults
+from engine.rating_sweep import SweepGrid, cell_rates, rating_spread, run_sweep
+
+BATTER = {"name": "B", "batting_rating": 70, "batting_hand": "Right"}
+BOWLER = {"name": "O", "bowling_rating": 60, "fielding_rating": 70,
+          "bowling_hand": "Right", "bowling_type": "Medium"}
+
+SMALL = SweepGrid(batting=(40, 80), bowling=(40, 80), pitches=("Hard",),
+                  balls_faced=(0, 10))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    rating_sweep._memory_cache.clear()
+    yield
+    rating_sweep._memory_cache.clear()
+
+
+@pytest.mark.parametrize("fmt_name", ["T20", "ListA"])
+def test_cell_rates_match_sampled_outcomes(fmt_name):
+    fmt = get_format(fmt_name)
+    over = fmt.middle_phase.start + 1
+    weights = outcome_weights(BATTER, BOWLER, "Hard", {}, over, 10,
+                              balls_faced=10, batting_position=4, format_config=fmt)
+    expected = cell_rates(weights, "Medium", 70)
+
+    random.seed(20260818)
+    n, faced, runs, outs, boundaries = 60000, 0, 0, 0, 0
+    for _ in range(n):
+        r = calculate_outcome(BATTER, BOWLER, "Hard", {}, over, 10,
+                              balls_faced=10, batting_position=4,
+                              fielding_quality=70, format_config=fmt)
+        if r["is_extra"]:
+            continue
+        faced += 1
+        runs += r["runs"]
+        outs += r["batter_out"]
+        boundaries += r["runs"] in (4, 6) and not r.get("dropped_catch")
+
+    assert runs * 100.0 / faced == pytest.approx(expected["strike_rate"], rel=0.03)
+    assert outs / faced == pytest.approx(expected["dismissal_rate"], rel=0.15)
+    assert boundaries / faced == pytest.approx(expected["boundary_rate"], rel=0.06)
+    assert (n - faced) / n == pytest.approx(expected["extras_rate"], rel=0.1)
+
+
+def test_grid_covers_every_axis():
+    rows = run_sweep(SMALL, format_name="T20")
+    assert len(rows) == 2 * 2 * 1 * 3 * 2  # bat x bowl x pitch x phase x balls
+    assert {r["phase"] for r in rows} == {"Powerplay", "Middle", "Death"}
+    assert all(set(r) == set(rating_sweep.FIELDS) for r in rows)
+
+
+def test_better_batter_scores_faster_and_survives_longer():
+    rows = run_sweep(SMALL, format_name="T20")
+    cell = {(r["phase"], r["balls_faced"], r["batting"], r["bowling"]): r for r in rows}
+    weak, strong = cell[("Middle", 10, 40, 40)], cell[("Middle", 10, 80, 40)]
+    assert strong["strike_rate"] > weak["strike_rate"]
+    assert strong["dismissal_rate"] < weak["dismissal_rate"]
+
+
+def test_rating_spread_reports_both_axes():
+    rows = run_sweep(SMALL, format_name="ListA")
+    spread = rating_spread(rows, "strike_rate", pitch="Hard", phase="Middle", balls_faced=10)
+    assert set(spread) == {"batting", "bowling"}
+    assert spread["batting"] >= 0 and spread["bowling"] >= 0
+    with pytest.raises(ValueError):
+        rating_spread(rows, "strike_rate", pitch="Moon")
+
+
+def test_disk_cache_is_keyed_by_ground_config(tmp_path):
+    first = run_sweep(SMALL, format_name="T20", cache_dir=str(tmp_path))
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+
+    # A fresh process (empty memory cache) reads the file back unchanged.
+    rating_sweep._memory_cache.clear()
+    assert run_sweep(SMALL, format_name="T20", cache_dir=str(tmp_path)) == first
+    assert len(list(tmp_path.iterdir())) == 1
+
+    edited = copy.deepcopy(get_defaults("T20"))
+    edited["pitch_profiles"]["Hard"]["scoring_matrix"]["Six"] *= 2
+    changed = run_sweep(SMALL, ground_config=edited, format_name="T20",
+                        cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 2
+    assert changed != first
+
+
+def test_cache_key_follows_the_kernel_source(monkeypatch):
+    config = get_defaults("T20")
+    before = rating_sweep.cache_key(config, "T20", SMALL)
+    monkeypatch.setattr(rating_sweep, "kernel_version", lambda: "edited-kernel")
+    assert rating_sweep.cache_key(config, "T20", SMALL) != before
@@ -180,7 +180,7 @@ class TestSuspectRepair:
         assert final.home_team_id is None
         assert final.away_team_id is None
         assert final.winner_team_id is None
-        # Must land on the state _generate_knockout would have created,
+        # Must land on the state _plan_knockout would have created,
         # not merely a blank one — the dashboard renders this label.
         assert final.stage_description == "Tournament Winner"
 
@@ -0,0 +1,151 @@
+"""Incremental scorecard model (engine/scorecard.py).
+
+The live payload, the HTML innings block and the archiver's text/CSV tables
+all render from one InningsScorecard. These tests pin the incremental
+contract — only rows the ball path marks dirty are re-copied, renders are
+cached until a row changes — and that a played match renders identically
+through the model.
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.scorecard import InningsScorecard, render_scorecard_block
+
+
+def _bat(runs=0, balls=0, wicket_type="", bowler_out="", fielder_out=""):
+    return {
+        "runs": runs, "balls": balls, "ones": 0, "twos": 0, "threes": 0,
+        "fours": 0, "sixes": 0, "dots": 0, "wicket_type": wicket_type,
+        "bowler_out": bowler_out, "fielder_out": fielder_out,
+    }
+
+
+def _bowl(balls=0, runs=0, wickets=0):
+    return {
+        "overs": balls // 6, "balls_bowled": balls, "maidens": 0, "runs": runs,
+        "wickets": wickets, "wides": 0, "noballs": 0, "byes": 0, "legbyes": 0,
+    }
+
+
+def test_sync_only_bumps_version_on_change():
+    batting = {"A": _bat(10, 8), "B": _bat(3, 4), "C": _bat()}
+    bowling = {"X": _bowl(12, 13)}
+    card = InningsScorecard.from_stats(batting, bowling)
+    v = card.version
+    assert card.sync(batting, bowling) is False
+    assert card.version == v
+
+    batting["A"]["runs"] += 4
+    batting["A"]["balls"] += 1
+    assert card.sync(batting, bowling) is True
+    assert card.version == v + 1
+    assert card.batting_lines["A"]["runs"] == 14
+
+
+def test_untouched_rows_are_not_recopied():
+    batting = {"A": _bat(10, 8), "B": _bat(3, 4)}
+    card = InningsScorecard.from_stats(batting, {})
+    line_b = card.batting_lines["B"]
+    batting["A"]["runs"] += 1
+    card.sync(batting, {})
+    assert card.batting_lines["B"] is line_b
+
+
+def test_renders_are_cached_until_a_row_changes():
+    batting = {"A": _bat(10, 8)}
+    bowling = {"X": _bowl(6, 7)}
+    card = InningsScorecard.from_stats(batting, bowling)
+    first = card.batting_table_text()
+    assert card.batting_table_text() is first
+    batting["A"]["runs"] = 11
+    card.sync(batting, bowling)
+    assert card.batting_table_text() is not first
+    assert "11" in card.batting_table_text()
+
+
+def test_refresh_copies_only_dirty_rows():
+    batting = {"A": _bat(10, 8), "B": _bat(3, 4)}
+    bowling = {"X": _bowl(12, 13)}
+    card = InningsScorecard.from_stats(batting, bowling)
+    v = card.version
+    batting["A"]["runs"] += 4
+    batting["B"]["runs"] += 1          # not marked: refresh must not read it
+    bowling["X"]["runs"] += 4
+    card.mark_dirty(batters=["A"], bowlers=["X"])
+    assert card.refresh(batting, bowling) is True
+    assert card.version == v + 1
+    assert card.batting_lines["A"]["runs"] == 14
+    assert card.batting_lines["B"]["runs"] == 3
+    assert card.bowling_lines["X"]["runs"] == 17
+    assert card.refresh(batting, bowling) is False
+
+
+def test_refresh_resyncs_when_stats_are_replaced():
+    card = InningsScorecard.from_stats({"A": _bat(1, 1)}, {})
+    card.refresh({"A": _bat(1, 1), "B": _bat(2, 2)}, {})
+    assert card.batting_lines["B"]["runs"] == 2
+
+
+def test_dropped_players_and_order_follow_the_source():
+    card = InningsScorecard.from_stats({"A": _bat(1, 1), "B": _bat(2, 2)}, {})
+    card.sync({"B": _bat(2, 2), "C": _bat()}, {})
+    assert list(card.batting_lines) == ["B", "C"]
+
+
+def test_payload_rows_are_fresh_copies():
+    xi = [{"name": "A"}, {"name": "B"}]
+    bowl_xi = [{"name": "X", "will_bowl": True}, {"name": "Y", "will_bowl": False}]
+    card = InningsScorecard.from_stats(
+        {"A": _bat(20, 15, "Caught", "X", "F"), "B": _bat()}, {"X": _bowl(9, 11, 1)})
+    players, bowlers = card.match_payload(xi, bowl_xi)
+    assert players[0]["status"] == "c. F b. X"
+    assert players[1]["runs"] == ""
+    assert [b["name"] for b in bowlers] == ["X"]
+    assert bowlers[0]["overs"] == "1.3"
+    players[0]["runs"] = 999
+    again, _ = card.match_payload(xi, bowl_xi)
+    assert again[0]["runs"] == 20
+
+
+def test_missing_dismisser_renders_question_mark():
+    stats = _bat(5, 6, "Caught")
+    del stats["fielder_out"]
+    card = InningsScorecard.from_stats({"A": stats}, {})
+    players, _ = card.match_payload([{"name": "A"}], [])
+    assert players[0]["status"] == "c. ? b. "
+    assert players[0]["fielder_out"] == ""
+
+
+def test_csv_rows_cover_full_lineup():
+    card = InningsScorecard.from_stats({"A": _bat(12, 10, "Bowled", "X")}, {"X": _bowl(13, 20, 1)})
+    rows = card.batting_csv_rows(["A", "B"], "TM")
+    assert rows[0][:4] == ["A", "TM", 12, 10]
+    assert rows[0][10] == "120.00"
+    assert rows[1] == ["B", "TM"] + [""] * 12
+    assert card.bowling_csv_rows("OPP")[0][:3] == ["X", "OPP", "2.1"]
+
+
+def test_html_block_marks_did_not_bat():
+    html = render_scorecard_block({
+        "total_score": 5, "wickets": 0, "overs": "1",
+        "players": [{"name": "A", "runs": "", "balls": ""}], "bowlers": [],
+    }, "1st Innings Scorecard")
+    assert "<td>DNB</td>" in html
+    assert render_scorecard_block(None, "x") == ""
+
+
+def test_live_model_matches_full_rebuild_through_a_match(make_engine_match):
+    random.seed(7)
+    m = make_engine_match()
+    for _ in range(400):
+        if m.innings > 2:
+            break
+        m.next_ball()
+        live = m._live_scorecard()
+        full = InningsScorecard.from_stats(m.batsman_stats, m.bowler_stats)
+        assert live.batting_lines == full.batting_lines
+        assert live.bowling_lines == full.bowling_lines
+    assert m.innings > 2, "match did not finish"
@@ -0,0 +1,137 @@
+"""
+Versioned StatsService result cache and stats ETags (engine/stats_cache.py).
+"""
+import os
+import sys
+import uuid
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from database.models import Match as DBMatch, MatchScorecard, Player as DBPlayer
+from engine.stats_cache import StatsCache, bump_stats_version, get_cache, get_stats_version
+from engine.stats_service import StatsService
+
+
+def _seed_bowling_card(user_id, home, away, wickets):
+    match_id = str(uuid.uuid4())
+    db.session.add(DBMatch(
+        id=match_id, user_id=user_id, home_team_id=home.id, away_team_id=away.id,
+        result_description="seeded", date=datetime.utcnow(),
+        match_format="T20", overs_per_side=20,
+    ))
+    db.session.flush()
+    bowler = DBPlayer.query.filter_by(team_id=home.id).first()
+    db.session.add(MatchScorecard(
+        match_id=match_id, player_id=bowler.id, team_id=home.id,
+        innings_number=2, record_type="bowling",
+        balls_bowled=24, runs_conceded=20, wickets=wickets,
+    ))
+    db.session.commit()
+
+
+def test_lru_evicts_oldest_and_ttl_expires():
+    now = [0.0]
+    cache = StatsCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)  # refreshes "a"
+    cache.put("c", 3)                     # evicts "b", the least recent
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    now[0] = 10.5
+    assert cache.get("c") == (False, None)
+    assert len(cache) == 1
+
+
+def test_cached_values_are_isolated_copies():
+    cache = StatsCache()
+    value = {"leaderboards": {}}
+    cache.put("k", value)
+    value["leaderboards"]["x"] = 1
+    _, first = cache.get("k")
+    first["leaderboards"]["y"] = 2
+    assert cache.get("k") == (True, {"leaderboards": {}})
+
+
+def test_results_are_reused_until_the_version_bumps(app, regular_user, test_team, test_team_2):
+    with app.app_context():
+        _seed_bowling_card(regular_user.id, test_team, test_team_2, wickets=1)
+        svc = StatsService()
+        first = svc.get_overall_stats(regular_user.id, "T20")
+        assert first["bowling"][0]["wickets"] == 1
+
+        # A write that doesn't bump is invisible: the cached result answers.
+        _seed_bowling_card(regular_user.id, test_team, test_team_2, wickets=3)
+        assert svc.get_overall_stats(regular_user.id, "T20") == first
+        assert get_cache().hits >= 1
+
+        bump_stats_version(regular_user.id)
+        db.session.commit()
+        assert get_stats_version(regular_user.id) == 1
+        assert svc.get_overall_stats(regular_user.id, "T20")["bowling"][0]["wickets"] == 4
+
+
+def test_reversal_bumps_the_owner_version(app, regular_user, test_team, test_team_2):
+    from match_archiver import reverse_player_aggregates
+
+    with app.app_context():
+        _seed_bowling_card(regular_user.id, test_team, test_team_2, wickets=2)
+        reverse_player_aggregates(MatchScorecard.query.all())
+        db.session.commit()
+        assert get_stats_version(regular_user.id) == 1
+
+
+def test_stats_api_answers_conditional_requests(app, authenticated_client, regular_user, test_team, test_team_2):
+    with app.app_context():
+        _seed_bowling_card(regular_user.id, test_team, test_team_2, wickets=2)
+
+    first = authenticated_client.get("/api/bowling-figures?match_format=T20")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"stats-')
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    again = authenticated_client.get("/api/bowling-figures?match_format=T20",
+                                     headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+
+    # Different query string -> different representation.
+    other = authenticated_client.get("/api/bowling-figures?match_format=T20&limit=3",
+                                     headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    with app.app_context():
+        bump_stats_version(regular_user.id)
+        db.session.commit()
+    stale = authenticated_client.get("/api/bowling-figures?match_format=T20",
+                                     headers={"If-None-Match": etag})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] != etag
+
+
+def test_team_and_tournament_writes_bump_the_version(app, authenticated_client, regular_user, test_team, test_team_2):
+    from engine.tournament_engine import TournamentEngine
+
+    with app.app_context():
+        _seed_bowling_card(regular_user.id, test_team, test_team_2, wickets=2)
+        player_id = DBPlayer.query.filter_by(team_id=test_team.id).first().id
+    etag = authenticated_client.get("/api/bowling-figures?match_format=T20").headers["ETag"]
+
+    # Squad edits rename / drop players that stats pages list.
+    resp = authenticated_client.post(f"/api/team/{test_team.id}/squad/T20/remove",
+                                     json={"player_id": player_id})
+    assert resp.status_code == 200
+    with app.app_context():
+        assert get_stats_version(regular_user.id) == 1
+    fresh = authenticated_client.get("/api/bowling-figures?match_format=T20",
+                                     headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+
+    with app.app_context():
+        TournamentEngine().create_tournament("Filter Cup", regular_user.id,
+                                             [test_team.id, test_team_2.id])
+        assert get_stats_version(regular_user.id) == 2
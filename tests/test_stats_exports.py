@@ -0,0 +1,205 @@
+"""
+Streaming statistics exports and background PDF artifacts.
+
+CSV exports stream off the database cursor, TXT is tabulate's grid, and the
+PDF route serves a rendered artifact keyed by the user's stats version,
+queueing a render (202) when there is none yet and answering 500 for a while
+once that render has failed.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from tabulate import tabulate
+
+from database import db
+from database.models import PlayerCareerStats
+from engine.stats_cache import bump_stats_version
+from engine.stats_service import StatsService
+from services import stats_exports
+
+ROWS = [
+    {"player": "John Doe", "team": "TW", "matches": 2, "innings": 2, "runs": 115, "balls": 60,
+     "not_outs": 0, "strike_rate": 191.67, "average": 57.5, "zeros": 1, "ones": 10, "twos": 2,
+     "threes": 0, "fours": 8, "sixes": 2, "thirties": 1, "fifties": 1, "hundreds": 0},
+    {"player": "Bob Keeper", "team": "TW", "matches": 2, "innings": 1, "runs": 4, "balls": 6,
+     "not_outs": 1, "strike_rate": 66.67, "average": None, "zeros": 3, "ones": 2, "twos": 1,
+     "threes": 0, "fours": 0, "sixes": 0, "thirties": 0, "fifties": 0, "hundreds": 0},
+]
+
+
+@pytest.fixture
+def export_dir(app, tmp_path):
+    root = tmp_path / "exports"
+    app.config["STATS_EXPORT_DIR"] = str(root)
+    yield root
+    app.config.pop("STATS_EXPORT_DIR", None)
+
+
+def test_streamed_exports_match_whole_document():
+    svc = StatsService()
+    chunks = list(svc.iter_csv(ROWS, "batting"))
+    assert len(chunks) == len(ROWS)
+    assert chunks[0].startswith("player,team,matches,innings,runs,balls")
+
+    columns = svc.EXPORT_COLUMNS["batting"]
+    expected = tabulate([[r[f] for f, _ in columns] for r in ROWS],
+                        headers=[h for _, h in columns], tablefmt="grid")
+    assert svc.export_to_txt(ROWS, "batting") == expected
+    assert svc.export_to_txt([], "batting") == "No data available"
+
+
+def test_export_route_streams(app, authenticated_client, regular_user, test_team, test_team_2,
+                              make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        rows = StatsService().get_overall_stats(regular_user.id, "T20")["batting"]
+
+    response = authenticated_client.get("/statistics/export/batting/csv")
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.get_data(as_text=True) == StatsService().export_to_csv(rows, "batting")
+
+    response = authenticated_client.get("/statistics/export/batting/txt")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == StatsService().export_to_txt(rows, "batting")
+
+
+def test_export_rows_stream_in_page_order(app, regular_user, test_team, test_team_2,
+                                          make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+        archive_match(make_stats_match(regular_user.id, john_runs=12, champ_wickets=1))
+        svc = StatsService()
+
+        def check():
+            page = StatsService().get_overall_stats(regular_user.id, "T20")
+            for stat_type in ("batting", "bowling", "fielding"):
+                streamed = svc.iter_export_rows(regular_user.id, stat_type, match_format="T20")
+                assert "".join(svc.iter_csv(streamed, stat_type)) == svc.export_to_csv(page[stat_type], stat_type)
+
+        check()  # career table
+        PlayerCareerStats.query.delete()
+        bump_stats_version(regular_user.id)
+        check()  # scorecard aggregation
+        db.session.rollback()
+        assert list(svc.iter_export_rows(regular_user.id, "batting", match_format="ListA")) == []
+
+
+def test_pdf_artifact_is_cached_per_stats_version(app, authenticated_client, regular_user,
+                                                  test_team, test_team_2, export_dir, monkeypatch,
+                                                  make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+
+    renders = []
+    real_process = stats_exports.process_one
+    monkeypatch.setattr(stats_exports, "process_one",
+                        lambda job, app_: (renders.append(job), real_process(job, app_)))
+
+    first = authenticated_client.get("/statistics/export/batting/pdf")
+    assert first.status_code == 200
+    assert "attachment" in first.headers["Content-Disposition"]
+    assert b"Batting Statistics" in first.data or first.mimetype == "application/pdf"
+    again = authenticated_client.get("/statistics/export/batting/pdf")
+    assert again.status_code == 200 and again.data == first.data
+    assert len(renders) == 1
+
+    with app.app_context():
+        bump_stats_version(regular_user.id)
+        db.session.commit()
+    assert authenticated_client.get("/statistics/export/batting/pdf").status_code == 200
+    assert len(renders) == 2
+    # The previous version's artifact is pruned once a newer one is written.
+    (user_dir,) = list(export_dir.iterdir())
+    assert all(name.name.startswith(f"v{renders[1].version}-") for name in user_dir.iterdir())
+
+    # A squad edit changes the names an export shows, so it re-renders too.
+    with app.app_context():
+        from database.models import Player as DBPlayer
+        player_id = DBPlayer.query.filter_by(team_id=test_team.id).first().id
+    authenticated_client.post(f"/api/team/{test_team.id}/squad/T20/remove", json={"player_id": player_id})
+    assert authenticated_client.get("/statistics/export/batting/pdf").status_code == 200
+    assert len(renders) == 3
+
+
+def test_pdf_route_queues_when_rendering_in_background(app, authenticated_client, regular_user,
+                                                       test_team, test_team_2, export_dir,
+                                                       make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+
+    stats_exports.set_synchronous_mode(False)
+    try:
+        pending = authenticated_client.get("/statistics/export/bowling/pdf")
+        assert pending.status_code == 202
+        assert pending.headers["Retry-After"]
+        # A second poll doesn't queue a duplicate render.
+        assert authenticated_client.get("/statistics/export/bowling/pdf").status_code == 202
+        assert stats_exports._queue.qsize() == 1
+
+        job = stats_exports._queue.get_nowait()
+        stats_exports.process_one(job, app)
+        stats_exports._done(job)
+    finally:
+        stats_exports.set_synchronous_mode(True)
+
+    ready = authenticated_client.get("/statistics/export/bowling/pdf")
+    assert ready.status_code == 200
+
+
+def test_failed_render_returns_500_without_retrying(app, authenticated_client, regular_user,
+                                                    test_team, test_team_2, export_dir, monkeypatch,
+                                                    make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+
+    renders = []
+
+    def broken(html):
+        renders.append(html)
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(stats_exports, "_render_pdf", broken)
+    assert authenticated_client.get("/statistics/export/fielding/pdf").status_code == 500
+    failed = authenticated_client.get("/statistics/export/fielding/pdf")
+    assert failed.status_code == 500
+    assert failed.get_json()["error"]
+    assert len(renders) == 1
+
+    # New stats are a new job, so the render is tried again.
+    monkeypatch.setattr(stats_exports, "_render_pdf", lambda html: None)
+    with app.app_context():
+        bump_stats_version(regular_user.id)
+        db.session.commit()
+    assert authenticated_client.get("/statistics/export/fielding/pdf").status_code == 200
+
+
+def test_failed_render_is_retried_after_the_failure_expires(app, authenticated_client, regular_user,
+                                                            test_team, test_team_2, export_dir,
+                                                            monkeypatch, make_stats_match, archive_match):
+    with app.app_context():
+        archive_match(make_stats_match(regular_user.id))
+
+    now = [1000.0]
+    monkeypatch.setattr(stats_exports, "_clock", lambda: now[0])
+    renders = []
+
+    def flaky(html):
+        renders.append(html)
+        if len(renders) == 1:
+            raise OSError("No space left on device")
+        return None
+
+    monkeypatch.setattr(stats_exports, "_render_pdf", flaky)
+    assert authenticated_client.get("/statistics/export/batting/pdf").status_code == 500
+    now[0] += stats_exports.FAILURE_TTL - 1
+    assert authenticated_client.get("/statistics/export/batting/pdf").status_code == 500
+    assert len(renders) == 1
+
+    # Same stats version: only the expiry lets the render run again.
+    now[0] += 1
+    assert authenticated_client.get("/statistics/export/batting/pdf").status_code == 200
+    assert len(renders) == 2
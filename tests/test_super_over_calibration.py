@@ -21,10 +21,14 @@ test_scoring_calibration.py.
 """
 
 import random
+import types
 
+import engine.match as match_module
+import engine.super_over_sim as super_over_sim
 from engine.super_over_outcome import calculate_super_over_outcome
 from engine.pressure_engine import PressureEngine
 from engine.format_config import get_format
+from engine.super_over_sim import simulate_super_over_innings, simulate_super_overs
 
 SEEDS = [4101, 4102, 4103, 4104, 4105]
 N_PER_SEED = 3000
@@ -135,3 +139,96 @@ def test_extras_rate_is_within_sane_bounds():
     up the Super Over's extras rate unrecognizably."""
     result = _tally(_batter(70), _bowler(70))
     assert 0.01 < result["extras_rate"] < 0.12
+
+
+# ── Batch simulator (engine/super_over_sim.py) ───────────────────────────────
+
+
+def _xi(prefix, bat, bowl):
+    return [{
+        "name": f"{prefix}{i}", "batting_rating": bat - i, "bowling_rating": bowl - i,
+        "fielding_rating": 70, "batting_hand": "Right", "bowling_type": "Medium",
+        "bowling_hand": "Right", "will_bowl": i >= 6,
+    } for i in range(11)]
+
+
+def test_batch_innings_respects_super_over_limits():
+    random.seed(4201)
+    xi = _xi("H", 80, 70)
+    for _ in range(300):
+        inn = simulate_super_over_innings(xi[:3], _xi("A", 70, 80)[8], xi, "Hard")
+        assert inn["balls"] <= 6
+        assert inn["wickets"] <= 2
+        assert inn["balls"] == 6 or inn["wickets"] == 2
+
+
+def test_batch_chase_stops_at_target():
+    random.seed(4202)
+    xi = _xi("H", 80, 70)
+    assert simulate_super_over_innings(
+        xi[:3], xi[8], xi, "Flat", so_innings=2, target=0)["deliveries"] == 0
+    for _ in range(300):
+        inn = simulate_super_over_innings(xi[:3], xi[8], xi, "Flat", so_innings=2, target=1)
+        # Any run ends a chase of 1, so at most one scoring delivery happened.
+        assert inn["runs"] <= 6
+        if inn["runs"] == 0:
+            assert inn["balls"] == 6 or inn["wickets"] == 2
+
+
+def test_batch_summary_is_seeded_and_worker_independent():
+    home, away = _xi("H", 80, 70), _xi("A", 70, 80)
+    a = simulate_super_overs(home, away, n=1200, seed=99)
+    b = simulate_super_overs(home, away, n=1200, seed=99, workers=2)
+    assert a == b
+    assert abs(sum(a["innings1"]["runs_distribution"].values()) - 1.0) < 1e-9
+    total = a["tie_rate"] + a["first_batting_win_rate"] + a["chasing_win_rate"]
+    assert abs(total - 1.0) < 1e-9
+
+
+def test_batch_stronger_batting_side_scores_more():
+    strong, weak = _xi("S", 92, 60), _xi("W", 45, 60)
+    vs_strong = simulate_super_overs(strong, weak, n=3000, seed=11)
+    vs_weak = simulate_super_overs(weak, strong, n=3000, seed=11)
+    assert vs_strong["innings1"]["mean_runs"] > vs_weak["innings1"]["mean_runs"]
+
+
+# Single; wide + 1 run; no ball hit for 1; run out after 1 (crossed); four;
+# bowled — every branch of the per-ball bookkeeping, ending on wicket two.
+SCRIPTED_BALLS = [
+    {"runs": 1, "batter_out": False, "is_extra": False},
+    {"runs": 2, "batter_out": False, "is_extra": True, "extra_type": "Wide"},
+    {"runs": 2, "batter_out": False, "is_extra": True, "extra_type": "No Ball", "bat_runs": 1},
+    {"runs": 1, "batter_out": True, "is_extra": False, "wicket_type": "Run Out"},
+    {"runs": 4, "batter_out": False, "is_extra": False},
+    {"runs": 0, "batter_out": True, "is_extra": False, "wicket_type": "Bowled"},
+]
+
+
+def _scripted(monkeypatch, module):
+    balls = iter(SCRIPTED_BALLS)
+    monkeypatch.setattr(module, "calculate_super_over_outcome",
+                        lambda **_: dict(next(balls), description="", type="run"))
+
+
+def test_live_super_over_and_batch_share_the_ball_rules(monkeypatch, make_engine_match):
+    # The run-out end comes from the shared module's RNG in both paths.
+    monkeypatch.setattr(super_over_sim, "random", types.SimpleNamespace(choice=lambda ends: "non_striker"))
+
+    m = make_engine_match()
+    m.innings = 4
+    m._setup_super_over()
+    assert m.start_super_over("home").get("super_over_started")
+    batsmen, bowler, fielders = m.super_over_batsmen, m.super_over_bowler, m.super_over_bowling_team
+
+    _scripted(monkeypatch, match_module)
+    for _ in SCRIPTED_BALLS:
+        last = m.next_super_over_ball()
+    assert last["innings_complete"]
+    live = (m.super_over_scores["home"], m.super_over_wickets["home"], m.super_over_ball,
+            sum(s["fours"] + s["sixes"] for s in m.super_over_batsman_stats.values()))
+
+    _scripted(monkeypatch, super_over_sim)
+    batch = simulate_super_over_innings(batsmen, bowler, fielders, m.pitch)
+    assert live == (batch["runs"], batch["wickets"], batch["balls"], batch["boundaries"])
+    assert live == (10, 2, 4, 1)
+    assert batch["deliveries"] == len(SCRIPTED_BALLS)
@@ -0,0 +1,161 @@
+"""
+Headless "simulate remaining fixtures" (engine/tournament_autosim.py).
+
+A run plays every playable fixture wave by wave — league first, then the
+playoffs the standings populate — archiving each match and applying it to
+its fixture and the standings, until the tournament completes.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import db
+from database.models import (
+    Match as DBMatch,
+    MatchScorecard,
+    Player as DBPlayer,
+    Team as DBTeam,
+    Tournament,
+    TournamentFixture,
+    TournamentTeam,
+)
+from engine.tournament_autosim import fixture_match_data, simulate_remaining
+from engine.tournament_engine import TournamentEngine
+
+
+@pytest.fixture
+def squads(app, regular_user):
+    """Four sides of 12 players (keeper, five batters, six all-rounders)."""
+    teams = []
+    for name, code in [("Alpha", "ALP"), ("Bravo", "BRV"), ("Charlie", "CHL"), ("Delta", "DLT")]:
+        team = DBTeam(name=name, short_code=code, user_id=regular_user.id,
+                      home_ground=f"{name} Oval", is_placeholder=False, is_draft=False)
+        db.session.add(team)
+        db.session.flush()
+        roles = ["Wicketkeeper"] + ["Batsman"] * 5 + ["All-rounder"] * 6
+        for i, role in enumerate(roles):
+            db.session.add(DBPlayer(
+                team_id=team.id, name=f"{code} Player {i + 1}", role=role,
+                batting_hand="right", bowling_type="medium" if role == "All-rounder" else "",
+                bowling_hand="right", is_wicketkeeper=role == "Wicketkeeper",
+                batting_rating=70 - i * 2, bowling_rating=40 + i * 3, fielding_rating=60,
+            ))
+        teams.append(team)
+    db.session.commit()
+    return teams
+
+
+def _create(regular_user, squads, mode):
+    engine = TournamentEngine()
+    t = engine.create_tournament("Autosim Cup", regular_user.id, [s.id for s in squads], mode=mode)
+    return engine, t
+
+
+def test_default_lineup_marks_five_bowlers(app, regular_user, squads):
+    engine, t = _create(regular_user, squads, TournamentEngine.MODE_ROUND_ROBIN)
+    fixture = TournamentFixture.query.filter_by(tournament_id=t.id).first()
+    data = fixture_match_data(fixture, regular_user.id)
+    for side in ("home", "away"):
+        xi = data["playing_xi"][side]
+        assert len(xi) == 11 and len(data["substitutes"][side]) == 1
+        assert sum(p["will_bowl"] for p in xi) == 5
+    assert data["fixture_id"] == fixture.id and data["tournament_id"] == t.id
+    assert data["toss_winner"] in {fixture.home_team.short_code, fixture.away_team.short_code}
+
+
+def test_simulates_league_and_playoffs_to_completion(app, regular_user, squads):
+    engine, t = _create(regular_user, squads, TournamentEngine.MODE_IPL_STYLE)
+    events = []
+    summary = simulate_remaining(t, regular_user.id, engine, workers=1, progress=events.append)
+
+    fixtures = TournamentFixture.query.filter_by(tournament_id=t.id).all()
+    assert all(f.status == "Completed" and f.match_id for f in fixtures)
+    assert db.session.get(Tournament, t.id).status == "Completed"
+    assert summary["simulated"] == len(fixtures) and not summary["failed"]
+    # League first, then each playoff round once its feeders are decided.
+    assert summary["waves"] >= 3
+
+    matches = DBMatch.query.filter_by(tournament_id=t.id).all()
+    assert len(matches) == len(fixtures)
+    assert all(m.winner_team_id for m in matches if m.id in
+               {f.match_id for f in fixtures if f.stage != TournamentEngine.STAGE_LEAGUE})
+    assert MatchScorecard.query.filter(MatchScorecard.match_id.in_([m.id for m in matches])).count()
+
+    league = [f for f in fixtures if f.stage == TournamentEngine.STAGE_LEAGUE]
+    played = sum(tt.played for tt in TournamentTeam.query.filter_by(tournament_id=t.id))
+    assert played == 2 * len(league)
+
+    assert events[0] == {"event": "start", "total": len(fixtures)}
+    assert [e["completed"] for e in events if e["event"] == "match"] == list(range(1, len(fixtures) + 1))
+    assert events[-1]["event"] == "done" and events[-1]["status"] == "Completed"
+
+    # Nothing left to play: a second run is a no-op.
+    assert simulate_remaining(t, regular_user.id, engine, workers=1)["simulated"] == 0
+
+
+def test_knockout_runs_waves_in_a_process_pool(app, regular_user, squads):
+    engine, t = _create(regular_user, squads, TournamentEngine.MODE_KNOCKOUT)
+    summary = simulate_remaining(t, regular_user.id, engine, workers=2)
+
+    assert summary["simulated"] == 3 and summary["waves"] == 2
+    final = (TournamentFixture.query.filter_by(tournament_id=t.id)
+             .order_by(TournamentFixture.bracket_position.desc()).first())
+    assert final.status == "Completed" and final.winner_team_id
+    assert db.session.get(Tournament, t.id).status == "Completed"
+
+
+def test_route_streams_progress(app, authenticated_client, regular_user, squads):
+    with app.app_context():
+        _, t = _create(regular_user, squads, TournamentEngine.MODE_ROUND_ROBIN)
+        tournament_id, total = t.id, len(t.fixtures)
+
+    response = authenticated_client.post(f"/tournaments/{tournament_id}/simulate-remaining")
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["finished"] and body["summary"]["simulated"] == total
+
+    stream = authenticated_client.get(body["events_url"])
+    assert stream.mimetype == "text/event-stream"
+    text = stream.get_data(as_text=True)
+    assert text.count("event: match") == total
+    assert text.rstrip().splitlines()[-1].startswith("data: ") and "event: done" in text
+
+    # Resuming after the last event id replays nothing but still terminates.
+    last_id = text.count("id: ") - 1
+    resumed = authenticated_client.get(body["events_url"], headers={"Last-Event-ID": str(last_id)})
+    assert resumed.get_data(as_text=True) == ""
+
+    assert authenticated_client.post(f"/tournaments/{tournament_id}/simulate-remaining").status_code == 409
+
+
+def test_background_run_leaves_the_gevent_hub_responsive(app, regular_user, squads):
+    """conftest imports app, so threading is monkey-patched here as in production."""
+    import gevent
+    from gevent import monkey
+    from services import tournament_autosim as service
+
+    assert monkey.is_module_patched("threading")
+    _, t = _create(regular_user, squads, TournamentEngine.MODE_IPL_STYLE)
+    total = len(t.fixtures)
+    app.config["TOURNAMENT_AUTOSIM_WORKERS"] = 1  # every wave in-process
+    service.set_synchronous_mode(False)
+    try:
+        service.start_worker(app)
+        run = service.request_run(t.id, regular_user.id)
+        # A greenlet on the hub (as a request or the SSE stream would be)
+        # keeps getting scheduled while the run simulates and commits. How
+        # promptly depends on the machine's load, so only the count is checked.
+        wakeups = 0
+        while not run.events_since(0)[1]:
+            gevent.sleep(0.01)
+            wakeups += 1
+    finally:
+        service.set_synchronous_mode(True)
+
+    assert run.summary["simulated"] == total and not run.summary["failed"]
+    assert wakeups > 10
+    db.session.expire_all()
+    assert db.session.get(Tournament, t.id).status == "Completed"
@@ -177,9 +177,9 @@ class TestNRRCalculation:
             tournament_id=t_id, team_id=four_teams[0].id
         ).first()
         stats.runs_scored = 180
-        stats.overs_faced = "20.0"
+        stats.balls_faced = 120
         stats.runs_conceded = 120
-        stats.overs_bowled = "20.0"
+        stats.balls_bowled = 120
         engine._calculate_nrr(stats)
         assert stats.net_run_rate == pytest.approx(3.0, abs=0.001)
 
@@ -190,9 +190,9 @@ class TestNRRCalculation:
             tournament_id=t_id, team_id=four_teams[0].id
         ).first()
         stats.runs_scored = 0
-        stats.overs_faced = "0.0"
+        stats.balls_faced = 0
         stats.runs_conceded = 0
-        stats.overs_bowled = "0.0"
+        stats.balls_bowled = 0
         engine._calculate_nrr(stats)
         assert stats.net_run_rate == 0.0
 
@@ -203,9 +203,9 @@ class TestNRRCalculation:
             tournament_id=t_id, team_id=four_teams[0].id
         ).first()
         stats.runs_scored = 100
-        stats.overs_faced = "17.3"  # 17 overs + 3 balls = 105 balls (= 17.5 decimal overs)
+        stats.balls_faced = 105  # 17.3 overs (= 17.5 decimal overs)
         stats.runs_conceded = 99
-        stats.overs_bowled = "17.3"
+        stats.balls_bowled = 105
         engine._calculate_nrr(stats)
         # Should have more precision than 3 decimals
         nrr_str = f"{stats.net_run_rate:.6f}"
@@ -256,14 +256,14 @@ class TestNRROversCap:
             tournament_id=t_id, team_id=four_teams[0].id
         ).first()
         stats.runs_scored = 180
-        stats.overs_faced = "20.0"
+        stats.balls_faced = 120
         stats.runs_conceded = 120
-        stats.overs_bowled = "20.0"
+        stats.balls_bowled = 120
         engine._calculate_nrr(stats)
         clean_nrr = stats.net_run_rate
 
         # Simulate one match's worth of buggy "20.1" being aggregated in
-        stats.overs_faced = "20.1"
+        stats.balls_faced = 121  # "20.1"
         engine._calculate_nrr(stats)
         buggy_nrr = stats.net_run_rate
         # Without the cap, NRR shifts measurably (~0.05+ on a 3.0 baseline)
@@ -305,6 +305,43 @@ class TestRoundRobinGeneration:
         fixtures = TournamentFixture.query.filter_by(tournament_id=t.id).all()
         assert len(fixtures) == 12
 
+    def test_large_double_rr_is_one_bulk_insert(self, app, engine, regular_user):
+        """20-team DRR: 380 fixtures, every pairing home and away, one INSERT."""
+        from sqlalchemy import event
+
+        teams = [
+            DBTeam(name=f"Club {i}", short_code=f"C{i:02d}", user_id=regular_user.id, is_placeholder=False)
+            for i in range(20)
+        ]
+        db.session.add_all(teams)
+        db.session.commit()
+        team_ids = [team.id for team in teams]
+
+        inserts = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO tournament_fixtures"):
+                inserts.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            t = engine.create_tournament(
+                name="20Team DRR", user_id=regular_user.id,
+                team_ids=team_ids, mode="double_round_robin",
+            )
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert len(inserts) == 1
+
+        fixtures = TournamentFixture.query.filter_by(tournament_id=t.id).all()
+        assert len(fixtures) == 380
+        assert len({(f.home_team_id, f.away_team_id) for f in fixtures}) == 380
+        assert sorted(f.series_match_number for f in fixtures) == list(range(1, 381))
+        for round_number in range(1, 39):
+            playing = [tid for f in fixtures if f.round_number == round_number
+                       for tid in (f.home_team_id, f.away_team_id)]
+            assert sorted(playing) == sorted(team_ids)
+
 
 class TestKnockoutGeneration:
     """Test knockout bracket generation and bye handling."""
@@ -976,6 +1013,112 @@ class TestCleanupFixtureMatchDataCacheRebuild:
         assert db.session.get(DBMatch, match_id) is None
 
 
+class TestBulkPlayerStatsCache:
+    """rebuild_player_stats_cache() aggregates every player in one round of
+    grouped queries and upserts all the cache rows in one statement."""
+
+    def _setup(self, engine, regular_user, four_teams, extra_players=0):
+        t_id = _create_tournament(regular_user, four_teams, engine)
+        fixtures = (TournamentFixture.query.filter_by(tournament_id=t_id)
+                    .order_by(TournamentFixture.id).limit(2).all())
+        home = fixtures[0].home_team_id
+        batter = DBPlayer(team_id=home, name="Bulk Batter", role="Batsman")
+        bowler = DBPlayer(team_id=home, name="Bulk Bowler", role="Bowler")
+        idle = DBPlayer(team_id=home, name="Bulk Idle", role="Batsman")
+        extras = [DBPlayer(team_id=home, name=f"Bulk Extra {i}", role="Batsman")
+                  for i in range(extra_players)]
+        db.session.add_all([batter, bowler, idle, *extras])
+        db.session.flush()
+
+        def card(match_id, player, **kw):
+            kw.setdefault("record_type", "batting")
+            return MatchScorecard(match_id=match_id, player_id=player.id, team_id=home,
+                                  innings_number=1, **kw)
+
+        for k, fixture in enumerate(fixtures):
+            match = DBMatch(id=str(uuid.uuid4()), user_id=regular_user.id, tournament_id=t_id,
+                            home_team_id=fixture.home_team_id, away_team_id=fixture.away_team_id,
+                            match_format="T20")
+            db.session.add(match)
+            db.session.flush()
+            db.session.add_all([
+                card(match.id, batter, runs=[55, 104][k], balls=[40, 60][k], fours=5, sixes=2,
+                     is_out=k == 0, catches=1),
+                # Non-striker who never faced: not an innings.
+                card(match.id, bowler, runs=0, balls=0, is_out=False),
+                card(match.id, bowler, record_type="bowling", balls_bowled=24,
+                     runs_conceded=[30, 20][k], wickets=[5, 2][k], maidens=k),
+                # Super-over cards count for fielding and matches, nothing else.
+                card(match.id, bowler, record_type="bowling", balls_bowled=6, runs_conceded=9,
+                     wickets=1, is_super_over=True, run_outs=1),
+                *(card(match.id, p, runs=10, balls=8, is_out=True) for p in extras),
+            ])
+            fixture.match_id = match.id
+        db.session.commit()
+        return t_id, batter, bowler, idle, extras
+
+    def _cache(self, t_id, player):
+        return TournamentPlayerStatsCache.query.filter_by(tournament_id=t_id, player_id=player.id).first()
+
+    def test_aggregates(self, app, engine, regular_user, four_teams):
+        t_id, batter, bowler, idle, _ = self._setup(engine, regular_user, four_teams)
+        engine.rebuild_player_stats_cache(t_id, {batter.id, bowler.id, idle.id})
+        db.session.commit()
+
+        bat = self._cache(t_id, batter)
+        assert (bat.matches_played, bat.innings_batted, bat.runs_scored, bat.balls_faced) == (2, 2, 159, 100)
+        assert (bat.not_outs, bat.highest_score, bat.fifties, bat.centuries) == (1, 104, 1, 1)
+        assert bat.batting_average == 159.0 and bat.batting_strike_rate == 159.0
+        assert (bat.fours, bat.sixes, bat.catches, bat.innings_bowled) == (10, 4, 2, 0)
+        assert bat.team_id == batter.team_id
+
+        bowl = self._cache(t_id, bowler)
+        assert (bowl.matches_played, bowl.innings_batted, bowl.innings_bowled) == (2, 0, 2)
+        assert (bowl.overs_bowled, bowl.runs_conceded, bowl.wickets_taken, bowl.maidens) == ("8.0", 50, 7, 1)
+        assert (bowl.best_bowling_wickets, bowl.best_bowling_runs, bowl.five_wicket_hauls) == (5, 30, 1)
+        assert bowl.bowling_economy == 6.25 and bowl.bowling_average == 7.14
+        assert bowl.run_outs == 2 and bowl.batting_average is None
+
+        assert self._cache(t_id, idle).matches_played == 0
+
+    def test_query_count_does_not_grow_with_players(self, app, engine, regular_user, four_teams):
+        from sqlalchemy import event
+
+        t_id, batter, _, _, extras = self._setup(engine, regular_user, four_teams, extra_players=20)
+        one_id, many_ids = batter.id, {batter.id, *(p.id for p in extras)}
+        statements = []
+
+        def count(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            engine.rebuild_player_stats_cache(t_id, {one_id})
+            one = len(statements)
+            statements.clear()
+            engine.rebuild_player_stats_cache(t_id, many_ids)
+            many = len(statements)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count)
+        db.session.commit()
+        assert many == one <= 5
+        assert all(self._cache(t_id, p).runs_scored == 20 for p in extras)
+
+    def test_whole_tournament_mode_zeroes_stale_rows(self, app, engine, regular_user, four_teams):
+        t_id, batter, bowler, idle, _ = self._setup(engine, regular_user, four_teams)
+        stale = self._cache(t_id, idle) or TournamentPlayerStatsCache(
+            tournament_id=t_id, player_id=idle.id, team_id=idle.team_id)
+        stale.runs_scored, stale.matches_played = 77, 3
+        db.session.add(stale)
+        db.session.commit()
+
+        engine.rebuild_player_stats_cache(t_id)
+        db.session.commit()
+        assert self._cache(t_id, batter).runs_scored == 159
+        assert self._cache(t_id, bowler).wickets_taken == 7
+        assert (stale.runs_scored, stale.matches_played) == (0, 0)
+
+
 class TestIPLStyleGeneration:
     """Test IPL-style tournament generation."""
 
@@ -1180,6 +1323,93 @@ class TestIPLPlayoffResimulation:
             assert fixtures[key].status == "Completed"
 
 
+class TestStandingsRecompute:
+    """recompute_standings() rebuilds the table in one grouped query and
+    must agree exactly with the incremental update_standings() path."""
+
+    # (home score/wkts/overs, away score/wkts/overs, winner, status, description)
+    RESULTS = [
+        ((180, 4, "20.0"), (150, 10, "17.2"), "home", "completed", None),     # all out -> full quota
+        ((140, 6, "20.1"), (141, 3, "18.4"), "away", "completed", None),      # legacy "20.1" capped
+        ((160, 8, "20.0"), (160, 9, "20.0"), None, "tied", None),
+        ((40, 1, "5.0"), (0, 0, "0.0"), None, "no_result", None),
+        ((0, 0, "0.0"), (0, 0, "0.0"), None, None, "Match abandoned"),       # legacy no-result
+        ((199, 5, "20.0"), (120, 10, "19.5"), "home", "completed", None),
+    ]
+
+    COLUMNS = ("played", "won", "lost", "tied", "no_result", "points", "runs_scored",
+               "balls_faced", "runs_conceded", "balls_bowled", "overs_faced", "overs_bowled",
+               "net_run_rate")
+
+    def _play_league(self, engine, regular_user, four_teams):
+        t_id = _create_tournament(regular_user, four_teams, engine)
+        fixtures = (TournamentFixture.query.filter_by(tournament_id=t_id)
+                    .order_by(TournamentFixture.id).all())
+        matches = []
+        for fixture, (home, away, winner, status, description) in zip(fixtures, self.RESULTS):
+            match = DBMatch(
+                id=str(uuid.uuid4()), user_id=regular_user.id, tournament_id=t_id,
+                home_team_id=fixture.home_team_id, away_team_id=fixture.away_team_id,
+                winner_team_id={"home": fixture.home_team_id, "away": fixture.away_team_id}.get(winner),
+                home_team_score=home[0], home_team_wickets=home[1], home_team_overs=home[2],
+                away_team_score=away[0], away_team_wickets=away[1], away_team_overs=away[2],
+                match_status=status, result_description=description,
+                match_format="T20", overs_per_side=20,
+            )
+            db.session.add(match)
+            db.session.flush()
+            fixture.match_id = match.id
+            db.session.commit()
+            engine.update_standings(match, commit=True)
+            matches.append(match)
+        return t_id, matches
+
+    def _table(self, t_id):
+        return {
+            tt.team_id: tuple(getattr(tt, c) for c in self.COLUMNS)
+            for tt in TournamentTeam.query.filter_by(tournament_id=t_id)
+        }
+
+    def test_matches_incremental_updates(self, app, engine, regular_user, four_teams):
+        t_id, _ = self._play_league(engine, regular_user, four_teams)
+        incremental = self._table(t_id)
+        assert sum(row[0] for row in incremental.values()) == 12
+        assert sum(row[4] for row in incremental.values()) == 4  # two no-results
+
+        TournamentTeam.query.filter_by(tournament_id=t_id).update({
+            "played": 9, "points": 99, "balls_faced": 1, "balls_bowled": 1, "net_run_rate": 5.0,
+        })
+        assert engine.recompute_standings(t_id) == 4
+        db.session.commit()
+        assert self._table(t_id) == incremental
+
+    def test_reversal_matches_a_table_without_the_match(self, app, engine, regular_user, four_teams):
+        t_id, matches = self._play_league(engine, regular_user, four_teams)
+        engine.reverse_standings(matches[1], commit=True)
+        reversed_table = self._table(t_id)
+
+        engine.recompute_standings(t_id)
+        db.session.commit()
+        assert self._table(t_id) == reversed_table
+        assert sum(row[0] for row in reversed_table.values()) == 10
+
+    def test_migration_backfills_ball_counters(self, app, engine, regular_user, four_teams):
+        from sqlalchemy import text
+        from migrations.add_standings_ball_counters import run_migration
+
+        t_id, _ = self._play_league(engine, regular_user, four_teams)
+        expected = {tt.team_id: (tt.balls_faced, tt.balls_bowled)
+                    for tt in TournamentTeam.query.filter_by(tournament_id=t_id)}
+        db.session.execute(text("ALTER TABLE tournament_teams DROP COLUMN balls_faced"))
+        db.session.execute(text("ALTER TABLE tournament_teams DROP COLUMN balls_bowled"))
+        db.session.commit()
+
+        run_migration(db, app)
+        db.session.expire_all()
+        assert {tt.team_id: (tt.balls_faced, tt.balls_bowled)
+                for tt in TournamentTeam.query.filter_by(tournament_id=t_id)} == expected
+
+
 class TestCustomSeries:
     """Test custom series validation and generation."""
 
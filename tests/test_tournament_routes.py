@@ -247,10 +247,11 @@ class TestTournamentDashboardStandingsVisibility:
 class TestTournamentDashboardLeaders:
     """
     Regression tests for the "Most Runs" / "Most Wickets" dashboard
-    widgets. These are computed live over MatchScorecard rather than via
-    TournamentPlayerStatsCache, which lags one match behind (see the
-    comment in tournament_dashboard()) -- so they're verified directly
-    against the rendered dashboard rather than the cache table.
+    widgets. These are aggregated over MatchScorecard into the stored
+    dashboard (engine/tournament_dashboard.py) rather than read from
+    TournamentPlayerStatsCache, which lags one match behind -- so they're
+    verified directly against the rendered dashboard rather than the cache
+    table.
     """
 
     def _make_match(self, tournament_id, home_team, away_team, user_id):
@@ -360,6 +361,100 @@ class TestTournamentDashboardLeaders:
         assert batter.name in body
 
 
+class TestTournamentDashboardReadModel:
+    """
+    The dashboard is served from a stored read model cached per
+    Tournament.version (engine/tournament_dashboard.py): a warm view must not
+    touch fixtures, standings or scorecards, and anything that changes the
+    tournament must bump the version so the next view shows it.
+    """
+
+    def _view(self, client, tournament_id):
+        from sqlalchemy import event
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            response = client.get(f"/tournaments/{tournament_id}")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        return response.data.decode(), statements
+
+    def test_warm_view_reads_only_the_tournament(self, authenticated_client, regular_user, test_team, test_team_2):
+        t = TournamentEngine().create_tournament(
+            name="Warm View", user_id=regular_user.id,
+            team_ids=[test_team.id, test_team_2.id], mode="knockout",
+        )
+        _, cold = self._view(authenticated_client, t.id)
+        assert any("tournament_fixtures" in s for s in cold)
+
+        body, warm = self._view(authenticated_client, t.id)
+        assert "Final" in body
+        assert not any(
+            table in s for s in warm
+            for table in ("tournament_fixtures", "tournament_teams", "match_scorecards", "tournament_dashboards")
+        )
+
+    def test_bumped_version_rebuilds_the_stored_dashboard(
+        self, authenticated_client, regular_user, test_team, test_team_2
+    ):
+        from database.models import TournamentDashboard
+        from engine.tournament_dashboard import bump_tournament_version
+
+        t = TournamentEngine().create_tournament(
+            name="Bump Check", user_id=regular_user.id,
+            team_ids=[test_team.id, test_team_2.id], mode="round_robin",
+        )
+        tournament_id = t.id
+        self._view(authenticated_client, tournament_id)
+
+        batter = DBPlayer.query.filter_by(team_id=test_team.id).first()
+        match = DBMatch(
+            id=str(uuid.uuid4()), user_id=regular_user.id, tournament_id=tournament_id,
+            home_team_id=test_team.id, away_team_id=test_team_2.id, match_format="T20",
+        )
+        db.session.add(match)
+        db.session.flush()
+        db.session.add(MatchScorecard(
+            match_id=match.id, player_id=batter.id, team_id=test_team.id,
+            innings_number=1, record_type="batting", runs=64, balls=40, is_out=True,
+        ))
+        db.session.commit()
+        body, _ = self._view(authenticated_client, tournament_id)
+        assert batter.name not in body     # unchanged version: still the stored view
+
+        bump_tournament_version(tournament_id)
+        db.session.commit()
+        body, _ = self._view(authenticated_client, tournament_id)
+        assert batter.name in body
+        stored = db.session.get(TournamentDashboard, tournament_id)
+        assert stored.version == db.session.get(Tournament, tournament_id).version == 1
+
+    def test_refresh_never_downgrades_a_newer_row(self, app, regular_user, test_team, test_team_2):
+        from database.models import TournamentDashboard
+        from engine.tournament_dashboard import _store, refresh_dashboard
+
+        t = TournamentEngine().create_tournament(
+            name="Refresh Check", user_id=regular_user.id,
+            team_ids=[test_team.id, test_team_2.id], mode="round_robin",
+        )
+        payload = refresh_dashboard(t.id)
+        db.session.commit()
+        assert payload["fixture_count"] == 1 and payload["next_fixture"]["status"] == "Scheduled"
+        assert [s["stage"] for s in payload["stages"]] == ["league"]
+
+        _store(t.id, 0, {"stale": True})
+        db.session.commit()
+        db.session.expire_all()
+        stored = db.session.get(TournamentDashboard, t.id)
+        assert stored.version == 1 and "stale" not in stored.payload
+
+
 class TestTournamentDeletionRoute:
     """Tests for tournament deletion."""
 
@@ -35,3 +35,18 @@ def safe_print(*args, **kwargs):
             log_exception(source="backend")
             pass # If it still fails, just suppress it
 
+
+
+def offload(fn, *args):
+    """
+    Run *fn* on a native thread when gevent has patched threading, so CPU-
+    or SQLite-bound work in a background worker doesn't stall the hub (and
+    every request on it). Otherwise, or without gevent, call it directly.
+    """
+    try:
+        from gevent import get_hub, monkey
+        if monkey.is_module_patched("threading"):
+            return get_hub().threadpool.apply(fn, args)
+    except ImportError:
+        pass
+    return fn(*args)